@@ -10,9 +10,19 @@ Matndan summa va kategoriya aniqlash:
 
 Functions:
     - parse_expense_text: Asosiy parser
+    - parse_expense_items: Ko'p qatorli (chek) matnni bandlarga ajratib tahlil qilish
     - extract_amount: Summa ajratish
     - detect_category: Kategoriya aniqlash
+    - detect_category_source: Kategoriya va uning manbai (kalit so'z, xato, zaxira)
     - parse_date_text: Sana aniqlash
+    - tokenize: Matnni bir o'tishda tokenlarga ajratish
+    - reload_keywords: Kalit so'zlar o'zgarganda avtomat va keshlarni yangilash
+
+Classes:
+    - Token: Lekser tokeni
+    - KeywordAutomaton: Kalit so'zlarni bir o'tishda topish (Aho-Corasick)
+    - TypoIndex: Xato yozilgan so'zlarni topish (SymSpell o'chirish indeksi)
+    - ParseCache: Tahlil natijalari uchun LRU kesh
 
 Author: SmartWallet AI Team
 Version: 1.0.0
@@ -20,33 +30,619 @@ Version: 1.0.0
 
 import re
 import logging
-from typing import Optional, Tuple, Dict, Any
+from collections import deque, OrderedDict
+from typing import Optional, Tuple, Dict, List, Set, Iterable, Any, NamedTuple
 from decimal import Decimal
 from datetime import datetime, timedelta, date
 
-from config import Categories
+from config import Categories, AIConfig
 
 # Logger
 logger = logging.getLogger(__name__)
 
 
 # =====================================================
-# REGEX PATTERNS
+# LEXER
+# =====================================================
+# Bitta o'tishli lekser: sana (DD.MM.YYYY), raqam (50000, 50 000, 50,000)
+# va so'z tokenlari. So'zlar keyin valyuta yoki nisbiy sana sifatida
+# tasniflanadi.
+# So'z tarmog'i birinchi (tokenlarning ko'pchiligi so'z), raqamli
+# tarmoqlar esa faqat raqamdan boshlanadigan joyda sinaladi.
+_TOKEN_PATTERN = re.compile(
+    r"(?P<word>[^\W\d_]+(?:['ʻ’`-][^\W\d_]+)*'?)"
+    r"|(?=\d)(?:(?P<date>\d{1,2}[./]\d{1,2}[./]\d{2,4})(?!\d)"
+    r"|(?P<number>\d{1,3}(?:[ ,]\d{3})+(?!\d)|\d+))"
+)
+
+TOKEN_NUMBER = 'number'
+TOKEN_CURRENCY = 'currency'
+TOKEN_DATE = 'date'
+TOKEN_WORD = 'word'
+
+# Valyuta so'zlari (summadan keyin keladi)
+CURRENCY_WORDS = frozenset([
+    'so', "so'", "so'm", 'soʻm', 'so’m', 'som', 'sum', 'uzs', 'сум', 'сўм'
+])
+
+# Nisbiy sana so'zlari: bugundan necha kun farq
+RELATIVE_DATE_WORDS = {
+    'bugun': 0, 'today': 0, 'сегодня': 0, 'bugün': 0,
+    'kecha': -1, 'yesterday': -1, 'вчера': -1, 'dün': -1,
+    'ertaga': 1, 'tomorrow': 1, 'завтра': 1, 'yarın': 1,
+}
+
+# "3 kun", "2 hafta", "1 oy" - birlik va uning kunlardagi qiymati
+# (soddalashtirilgan: 1 oy ≈ 30 kun)
+DATE_UNIT_DAYS = {
+    'kun': 1, 'kundan': 1, 'day': 1, 'days': 1, 'день': 1, 'дня': 1, 'дней': 1, 'gün': 1,
+    'hafta': 7, 'haftadan': 7, 'week': 7, 'weeks': 7, 'неделя': 7, 'недели': 7,
+    'неделю': 7, 'недель': 7,
+    'oy': 30, 'oydan': 30, 'month': 30, 'months': 30, 'месяц': 30, 'месяца': 30,
+    'месяцев': 30, 'ay': 30,
+}
+
+# "12 mart" ko'rinishidagi sanalar uchun oy nomlari
+MONTH_NAMES = {
+    'yanvar': 1, 'fevral': 2, 'mart': 3, 'aprel': 4, 'may': 5, 'iyun': 6,
+    'iyul': 7, 'avgust': 8, 'sentabr': 9, 'oktabr': 10, 'noyabr': 11, 'dekabr': 12,
+}
+
+MIN_AMOUNT = Decimal(1)
+MAX_AMOUNT = Decimal(1_000_000_000)
+
+
+class Token(NamedTuple):
+    """Lekser tokeni (start/end - matndagi pozitsiya)"""
+    kind: str
+    text: str
+    start: int
+    end: int
+    value: Any = None
+
+
+def tokenize(text: str) -> List[Token]:
+    """
+    Matnni bir marta o'qib tokenlarga ajratish
+    
+    Args:
+        text: Kichik harfli matn
+    
+    Returns:
+        List[Token]: number (value=Decimal), currency, date (value=date
+            yoki noto'g'ri sana bo'lsa None) va word tokenlari
+    """
+    tokens = []
+    today = None
+    
+    for match in _TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        token_text = match.group()
+        start, end = match.span()
+        value = None
+        
+        if kind == TOKEN_WORD:
+            if token_text in CURRENCY_WORDS:
+                kind = TOKEN_CURRENCY
+            elif token_text in RELATIVE_DATE_WORDS:
+                kind = TOKEN_DATE
+                today = today or date.today()
+                value = today + timedelta(days=RELATIVE_DATE_WORDS[token_text])
+        elif kind == TOKEN_NUMBER:
+            value = Decimal(token_text.replace(' ', '').replace(',', ''))
+        elif kind == TOKEN_DATE:
+            day, month, year = (int(part) for part in token_text.replace('/', '.').split('.'))
+            if year < 100:
+                year += 2000
+            try:
+                value = date(year, month, day)
+            except ValueError:
+                value = None
+        
+        tokens.append(Token(kind, token_text, start, end, value))
+    
+    return tokens
+
+
+# =====================================================
+# KEYWORD AUTOMATON
 # =====================================================
-# Summa pattern'lari
-AMOUNT_PATTERNS = [
-    r'(\d+[\s,]?\d*)\s*so[\'m]?',  # 50000 so'm, 50000som
-    r'(\d+[\s,]?\d*)\s*UZS',        # 50000 UZS
-    r'(\d+[\s,]?\d*)\s*сум',        # 50000 сум (rus)
-    r'(\d{1,3}(?:[\s,]\d{3})+)',    # 50 000 yoki 50,000
-    r'(\d+)',                        # Oddiy raqam
-]
+def _is_word_char(char: str) -> bool:
+    """re'dagi \\w bilan bir xil: harf, raqam yoki '_'"""
+    return char.isalnum() or char == '_'
+
+
+def _at_word_boundary(text: str, position: int) -> bool:
+    """re'dagi \\b bilan bir xil: position chegaradami"""
+    before = position > 0 and _is_word_char(text[position - 1])
+    after = position < len(text) and _is_word_char(text[position])
+    return before != after
+
+
+class KeywordAutomaton:
+    """
+    Kategoriya kalit so'zlari uchun Aho-Corasick avtomati
+    
+    Barcha kalit so'zlar bitta trie'ga yig'iladi va fail havolalari bilan
+    to'ldiriladi. Matn bir marta chapdan o'ngga o'qiladi va barcha
+    mosliklar (ichma-ich va ustma-ust bo'lganlari ham) topiladi; har bir
+    moslik uchun so'z chegarasi (\\b) alohida tekshiriladi.
+    
+    Ball hisoblash avvalgidek: kalit so'z to'liq so'z sifatida uchrasa
+    10, faqat so'z ichida uchrasa 5 ball.
+    """
+    
+    WHOLE_WORD_SCORE = 10
+    PARTIAL_SCORE = 5
+    
+    def __init__(self, keywords: Dict[str, List[str]]):
+        """
+        Args:
+            keywords: {category_key: [kalit so'zlar]} (Categories.KEYWORDS)
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+        self.keywords: List[str] = []
+        self.category_keywords: Dict[str, List[int]] = {}
+        
+        index: Dict[str, int] = {}
+        for category_key, words in keywords.items():
+            keyword_ids = []
+            for word in words:
+                word = word.lower()
+                if word not in index:
+                    index[word] = len(self.keywords)
+                    self.keywords.append(word)
+                    self._insert(word, index[word])
+                # Takroriy kalit so'z (masalan 'restoran' ikki marta) ikki
+                # marta ball beradi - eski xatti-harakat saqlanadi
+                keyword_ids.append(index[word])
+            self.category_keywords[category_key] = keyword_ids
+        
+        self._lengths = [len(word) for word in self.keywords]
+        self._build_failures()
+    
+    def _insert(self, word: str, keyword_id: int):
+        """Kalit so'zni trie'ga qo'shish"""
+        node = 0
+        for char in word:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = child
+        self._output[node] += (keyword_id,)
+    
+    def _build_failures(self):
+        """Fail havolalarini BFS bilan qurish va chiqishlarni birlashtirish"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target
+                self._output[child] += self._output[target]
+    
+    def find(self, text: str) -> List[Tuple[int, int, int, bool]]:
+        """
+        Matndagi barcha kalit so'z mosliklari
+        
+        Args:
+            text: Kichik harfli matn
+        
+        Returns:
+            List[Tuple[int, int, int, bool]]: [(start, end, keyword_id, whole_word), ...]
+        """
+        goto, fail, output, lengths = self._goto, self._fail, self._output, self._lengths
+        matches = []
+        node = 0
+        
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for keyword_id in output[node]:
+                end = position + 1
+                start = end - lengths[keyword_id]
+                matches.append((
+                    start, end, keyword_id,
+                    _at_word_boundary(text, start) and _at_word_boundary(text, end)
+                ))
+        
+        return matches
+    
+    def hits(self, text: str) -> Dict[int, bool]:
+        """
+        Topilgan kalit so'zlar
+        
+        Args:
+            text: Kichik harfli matn
+        
+        Returns:
+            Dict[int, bool]: {keyword_id: kamida bir marta to'liq so'z bo'lib uchradimi}
+        """
+        found: Dict[int, bool] = {}
+        for _, _, keyword_id, whole_word in self.find(text):
+            found[keyword_id] = found.get(keyword_id, False) or whole_word
+        return found
+    
+    def scores(self, text: str, hits: Optional[Dict[int, bool]] = None) -> Dict[str, int]:
+        """
+        Har bir kategoriya uchun ball (Categories.KEYWORDS tartibida)
+        
+        Args:
+            text: Kichik harfli matn
+            hits: Oldindan hisoblangan hits(text) natijasi
+        
+        Returns:
+            Dict[str, int]: {category_key: ball} - barcha kategoriyalar, 0 ham
+        """
+        if hits is None:
+            hits = self.hits(text)
+        
+        return {
+            category_key: sum(
+                self.WHOLE_WORD_SCORE if hits[keyword_id] else self.PARTIAL_SCORE
+                for keyword_id in keyword_ids
+                if keyword_id in hits
+            )
+            for category_key, keyword_ids in self.category_keywords.items()
+        }
+    
+    def remove_keywords(self, text: str, category_key: str) -> str:
+        """
+        Kategoriyaning to'liq so'z bo'lib uchragan kalit so'zlarini olib tashlash
+        
+        Args:
+            text: Kichik harfli matn
+            category_key: Kategoriya kaliti
+        
+        Returns:
+            str: Kalit so'zlarsiz matn
+        """
+        wanted = set(self.category_keywords.get(category_key, ()))
+        spans = sorted(
+            (start, end)
+            for start, end, keyword_id, whole_word in self.find(text)
+            if whole_word and keyword_id in wanted
+        )
+        if not spans:
+            return text
+        
+        parts = []
+        cursor = 0
+        for start, end in spans:
+            if start > cursor:
+                parts.append(text[cursor:start])
+            cursor = max(cursor, end)
+        parts.append(text[cursor:])
+        return ''.join(parts)
+
 
-# Sana pattern'lari
-DATE_PATTERNS = [
-    r'(\d{1,2})[./](\d{1,2})[./](\d{2,4})',  # DD.MM.YYYY
-    r'(\d{1,2})\s+(yanvar|fevral|mart|aprel|may|iyun|iyul|avgust|sentabr|oktabr|noyabr|dekabr)',  # DD Month
-]
+# Import paytida bir marta quriladi (reload_keywords() qayta quradi)
+_keyword_automaton = KeywordAutomaton(Categories.KEYWORDS)
+
+
+# =====================================================
+# TYPO INDEX
+# =====================================================
+def edit_distance(first: str, second: str, max_distance: Optional[int] = None) -> int:
+    """
+    Damerau-Levenshtein (optimal string alignment) masofasi
+    
+    Args:
+        first: Birinchi so'z
+        second: Ikkinchi so'z
+        max_distance: Shundan oshsa hisoblash to'xtatiladi
+    
+    Returns:
+        int: Masofa (max_distance oshsa max_distance + 1)
+    """
+    if max_distance is not None and abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+    
+    previous_previous: List[int] = []
+    previous = list(range(len(second) + 1))
+    for i in range(1, len(first) + 1):
+        current = [i] + [0] * len(second)
+        for j in range(1, len(second) + 1):
+            cost = 0 if first[i - 1] == second[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost
+            )
+            if (i > 1 and j > 1 and first[i - 1] == second[j - 2]
+                    and first[i - 2] == second[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    
+    return previous[-1]
+
+
+class TypoIndex:
+    """
+    Xato yozilgan so'zlar uchun SymSpell o'chirish indeksi
+    
+    Har bir atamadan max_distance tagacha harf o'chirib hosil qilingan
+    variantlar indeksga yoziladi. So'rovda kiruvchi so'zning o'chirish
+    variantlari qidiriladi va nomzodlar edit_distance bilan tekshiriladi -
+    har bir so'rov bir necha o'nlab dict qidiruvi.
+    
+    Qisqa so'zlarga ruxsat etilgan masofa kichik (allowed_distance):
+    "non" -> "nor" kabi noto'g'ri tuzatishlar bo'lmasligi uchun.
+    """
+    
+    def __init__(self, terms: Iterable[str], max_distance: Optional[int] = None):
+        """
+        Args:
+            terms: Atamalar (bitta so'zdan iborat bo'lganlari indekslanadi)
+            max_distance: Maksimal masofa (None - AIConfig.TYPO_MAX_DISTANCE)
+        """
+        self.max_distance = AIConfig.TYPO_MAX_DISTANCE if max_distance is None else max_distance
+        self.terms: List[str] = []
+        self._term_ids: Dict[str, int] = {}
+        self._deletes: Dict[str, List[int]] = {}
+        
+        for term in terms:
+            term = term.lower()
+            if term in self._term_ids or ' ' in term:
+                continue
+            term_id = len(self.terms)
+            self.terms.append(term)
+            self._term_ids[term] = term_id
+            for variant in self._variants(term, self.allowed_distance(term)):
+                self._deletes.setdefault(variant, []).append(term_id)
+    
+    def allowed_distance(self, word: str) -> int:
+        """So'z uzunligiga qarab ruxsat etilgan masofa (<5: 0, <8: 1, aks holda 2)"""
+        if len(word) < 5:
+            return 0
+        if len(word) < 8:
+            return min(1, self.max_distance)
+        return min(2, self.max_distance)
+    
+    @staticmethod
+    def _variants(word: str, distance: int) -> Set[str]:
+        """So'zning o'zi va distance tagacha harf o'chirilgan variantlari"""
+        variants = {word}
+        frontier = {word}
+        for _ in range(distance):
+            frontier = {
+                candidate[:index] + candidate[index + 1:]
+                for candidate in frontier
+                for index in range(len(candidate))
+            }
+            variants |= frontier
+        return variants
+    
+    def lookup(self, word: str) -> Optional[Tuple[str, int]]:
+        """
+        Eng yaqin atamani topish
+        
+        Teng masofadagi nomzodlardan birinchi qo'shilgan atama tanlanadi.
+        
+        Args:
+            word: Kichik harfli so'z
+        
+        Returns:
+            Optional[Tuple[str, int]]: (atama, masofa) yoki None
+        """
+        if word in self._term_ids:
+            return word, 0
+        
+        distance = self.allowed_distance(word)
+        if distance == 0:
+            return None
+        
+        best_id = len(self.terms)
+        best_distance = distance + 1
+        checked: Set[int] = set()
+        for variant in self._variants(word, distance):
+            for term_id in self._deletes.get(variant, ()):
+                if term_id in checked:
+                    continue
+                checked.add(term_id)
+                limit = min(best_distance, distance, self.allowed_distance(self.terms[term_id]))
+                found = edit_distance(word, self.terms[term_id], limit)
+                if found <= limit and (found, term_id) < (best_distance, best_id):
+                    best_id, best_distance = term_id, found
+        
+        if best_id == len(self.terms):
+            return None
+        return self.terms[best_id], best_distance
+
+
+def _build_typo_index(keywords: Dict[str, List[str]]) -> Tuple[TypoIndex, Dict[str, str]]:
+    """Kalit so'zlar uchun TypoIndex va {atama: category_key}"""
+    categories: Dict[str, str] = {}
+    for category_key, words in keywords.items():
+        for word in words:
+            categories.setdefault(word.lower(), category_key)
+    return TypoIndex(categories), categories
+
+
+_typo_index, _typo_categories = _build_typo_index(Categories.KEYWORDS)
+
+# Xato yozilgan kalit so'z topilganda kategoriya ishonchi
+TYPO_CONFIDENCE = 0.5
+
+# Bot buyruqlari va menyu so'zlari
+COMMAND_WORDS = frozenset([
+    'start', 'help', 'cancel', 'expense', 'income', 'menu', 'settings', 'back',
+    'yordam', 'bekor', 'menyu', 'sozlamalar', 'orqaga',
+    'помощь', 'отмена', 'меню', 'настройки', 'назад',
+    'yardım', 'iptal', 'menü', 'ayarlar', 'geri',
+])
+
+# Typo fallback hech qachon kategoriyaga "tuzatmaydigan" so'zlar:
+# daromad lug'ati ("kirim" kiyim emas) va buyruqlar
+TYPO_EXCLUDED_WORDS = frozenset(
+    part
+    for words in Categories.INCOME_KEYWORDS.values()
+    for word in words
+    for part in word.lower().split()
+) | COMMAND_WORDS
+
+# Kategoriya manbai (parse_expense_text natijasidagi 'category_source')
+CATEGORY_SOURCE_KEYWORD = 'keyword'    # kalit so'z topildi
+CATEGORY_SOURCE_TYPO = 'typo'          # xato yozilgan kalit so'z
+CATEGORY_SOURCE_FALLBACK = 'fallback'  # hech narsa topilmadi - 'other'
+
+
+def lookup_keyword(word: str) -> Optional[Tuple[str, str, int]]:
+    """
+    So'zga eng yaqin kategoriya kalit so'zi (xatolarga chidamli)
+    
+    Args:
+        word: Kichik harfli so'z
+    
+    Returns:
+        Optional[Tuple[str, str, int]]: (kalit so'z, category_key, masofa) yoki None
+    """
+    match = _typo_index.lookup(word)
+    if match is None:
+        return None
+    return match[0], _typo_categories[match[0]], match[1]
+
+
+def is_typo_candidate(word: str) -> bool:
+    """
+    Kategoriya typo fallback'i bu so'zni tuzatishi mumkinmi
+    
+    Qisqa so'zlar (AIConfig.TYPO_MIN_LENGTH) va TYPO_EXCLUDED_WORDS
+    tuzatilmaydi - ular boshqa kalit so'zga 1 harf bilan juda oson tushadi.
+    
+    Args:
+        word: Kichik harfli so'z
+    """
+    return len(word) >= AIConfig.TYPO_MIN_LENGTH and word not in TYPO_EXCLUDED_WORDS
+
+
+# =====================================================
+# PARSE CACHE
+# =====================================================
+class ParseCache:
+    """
+    Tahlil natijalari uchun LRU kesh
+    
+    - Kalit: normalize_text(text).lower() (ParseCache.key)
+    - Hajm: AIConfig.PARSE_CACHE_SIZE (eng eski ishlatilgan birinchi chiqariladi)
+    - hit/miss/eviction hisoblagichlari - keshni o'lchash uchun
+    
+    Handler'lar event loop'da ishlaydi, shuning uchun lock kerak emas.
+    Yaratilgan har bir kesh ro'yxatga olinadi - reload_keywords() ularning
+    hammasini tozalaydi.
+    """
+    
+    def __init__(self, name: str, max_size: Optional[int] = None):
+        """
+        Args:
+            name: Kesh nomi (statistika uchun)
+            max_size: Maksimal yozuvlar soni (None - AIConfig.PARSE_CACHE_SIZE)
+        """
+        self.name = name
+        self.max_size = AIConfig.PARSE_CACHE_SIZE if max_size is None else max_size
+        self._items: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _parse_caches.append(self)
+    
+    @staticmethod
+    def key(text: str) -> str:
+        """Kesh kaliti: bo'sh joylari normallashgan, kichik harfli matn"""
+        return normalize_text(text).lower()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Keshdan natijani olish
+        
+        Returns:
+            Optional[Any]: Natija yoki None (topilmasa)
+        """
+        if self.max_size <= 0:
+            return None
+        
+        value = self._items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """Natijani keshga yozish"""
+        if self.max_size <= 0:
+            return
+        
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        """Keshni to'liq tozalash"""
+        self._items.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Kesh statistikasi
+        
+        Returns:
+            Dict: size, max_size, hits, misses, evictions, hit_rate
+        """
+        total = self.hits + self.misses
+        return {
+            'size': len(self._items),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+_parse_caches: List[ParseCache] = []
+
+# parse_expense_text natijalari
+_expense_parse_cache = ParseCache('expense')
+
+
+def get_parse_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Barcha tahlil keshlarining statistikasi
+    
+    Returns:
+        Dict: {kesh nomi: get_stats()}
+    """
+    return {cache.name: cache.get_stats() for cache in _parse_caches}
+
+
+def reload_keywords() -> None:
+    """
+    Categories.KEYWORDS o'zgarganda chaqiriladi: avtomat va typo indeksini
+    qayta quradi, barcha tahlil keshlarini tozalaydi
+    """
+    global _keyword_automaton, _typo_index, _typo_categories
+    _keyword_automaton = KeywordAutomaton(Categories.KEYWORDS)
+    _typo_index, _typo_categories = _build_typo_index(Categories.KEYWORDS)
+    for cache in _parse_caches:
+        cache.clear()
+    logger.info(f"Kalit so'zlar qayta yuklandi: {len(_keyword_automaton.keywords)} ta")
 
 
 # =====================================================
@@ -56,6 +652,9 @@ def parse_expense_text(text: str) -> Dict[str, Any]:
     """
     Matnni tahlil qilish va summa + kategoriya aniqlash
     
+    Natija normallashgan matn bo'yicha keshlanadi (ParseCache) - takroriy
+    xabarlar uchun kategoriya va tavsif qayta hisoblanmaydi.
+    
     Args:
         text: Foydalanuvchi matni
         
@@ -64,52 +663,112 @@ def parse_expense_text(text: str) -> Dict[str, Any]:
             'amount': Decimal | None,
             'category_key': str | None,
             'description': str | None,
-            'confidence': float  # 0-1 oralig'ida
+            'confidence': float,  # 0-1 oralig'ida
+            'category_source': str | None  # CATEGORY_SOURCE_*
         }
     """
     result = {
         'amount': None,
         'category_key': None,
         'description': None,
-        'confidence': 0.0
+        'confidence': 0.0,
+        'category_source': None
     }
     
     if not text:
         return result
     
-    text = text.strip().lower()
+    key = ParseCache.key(text)
+    cached = _expense_parse_cache.get(key)
+    if cached is not None:
+        # Chaqiruvchi natijani o'zgartirsa ham kesh buzilmasin
+        return dict(cached)
+    
+    text = key
+    
+    # Matn bir marta tokenlarga ajratiladi - summa va tavsif shu tokenlardan
+    tokens = tokenize(text)
     
     # Summa aniqlash
-    amount = extract_amount(text)
+    amount = extract_amount(text, tokens)
     if amount:
         result['amount'] = amount
         result['confidence'] += 0.5
     
     # Kategoriya aniqlash
-    category_key, category_confidence = detect_category(text)
+    category_key, category_confidence, category_source = detect_category_source(text, tokens)
     if category_key:
         result['category_key'] = category_key
         result['confidence'] += category_confidence * 0.5
+        result['category_source'] = category_source
     
     # Tavsif ajratish (summa va kategoriyadan tashqari qism)
-    description = extract_description(text, amount, category_key)
+    description = extract_description(text, amount, category_key, tokens)
     if description:
         result['description'] = description
     
     logger.info(f"Parsed text: '{text}' → Amount: {amount}, Category: {category_key}, Confidence: {result['confidence']:.2f}")
     
+    _expense_parse_cache.set(key, dict(result))
     return result
 
 
+# =====================================================
+# MULTI-ITEM (RECEIPT) PARSING
+# =====================================================
+# Bandlar ajratgichi: yangi qator, ';' yoki vergul (minglik "50,000"
+# ichidagi vergul emas - undan keyin raqam keladi)
+_ITEM_SEPARATOR = re.compile(r'[\r\n;]+|,(?=\s*[^\d\s])')
+
+
+def split_expense_items(text: str) -> List[str]:
+    """
+    Matnni alohida bandlarga ajratish
+    
+    "non 5000\ngo'sht 80000" yoki "non 5000, taksi 20000" -> 2 ta band
+    
+    Args:
+        text: Foydalanuvchi matni
+    
+    Returns:
+        List[str]: Bo'sh bo'lmagan bandlar (asl ko'rinishida)
+    """
+    if not text:
+        return []
+    return [item.strip() for item in _ITEM_SEPARATOR.split(text) if item.strip()]
+
+
+def parse_expense_items(text: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Har bir bandni parse_expense_text bilan tahlil qilish
+    
+    Bandlar keshlangan parser orqali o'tadi - chekdagi takroriy qatorlar
+    ("non 5000") qayta hisoblanmaydi.
+    
+    Args:
+        text: Ko'p qatorli matn
+    
+    Returns:
+        List[Tuple[str, Dict]]: [(band matni, parse_expense_text natijasi), ...]
+    """
+    return [(item, parse_expense_text(item)) for item in split_expense_items(text)]
+
+
 # =====================================================
 # EXTRACT AMOUNT
 # =====================================================
-def extract_amount(text: str) -> Optional[Decimal]:
+def extract_amount(text: str, tokens: Optional[List[Token]] = None) -> Optional[Decimal]:
     """
     Matndan summa ajratish
     
+    Ustuvorlik: valyuta so'zi bilan kelgan raqam ("50000 so'm"), keyin
+    minglik guruhli raqam ("50 000"), keyin birinchi oddiy raqam.
+    Sana birligi yoki oy nomi bilan kelgan raqamlar ("3 kun", "15 mart")
+    summa hisoblanmaydi.
+    
     Args:
         text: Matn
+        tokens: Oldindan hisoblangan tokenize(text) natijasi
         
     Returns:
         Optional[Decimal]: Summa yoki None
@@ -117,70 +776,82 @@ def extract_amount(text: str) -> Optional[Decimal]:
     if not text:
         return None
     
-    # Har bir pattern'ni sinab ko'rish
-    for pattern in AMOUNT_PATTERNS:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            # Topilgan raqamni olish
-            amount_str = match.group(1)
-            
-            # Bo'sh joy va vergullarni olib tashlash
-            amount_str = amount_str.replace(' ', '').replace(',', '')
-            
-            try:
-                amount = Decimal(amount_str)
-                
-                # Mantiqiy tekshirish (1 dan katta, 1 milliarddan kichik)
-                if 1 <= amount <= 1_000_000_000:
-                    return amount
-            except (ValueError, ArithmeticError):
-                continue
+    if tokens is None:
+        tokens = tokenize(text.lower())
     
-    return None
+    with_currency = grouped = plain = None
+    
+    for index, token in enumerate(tokens):
+        if token.kind != TOKEN_NUMBER or not MIN_AMOUNT <= token.value <= MAX_AMOUNT:
+            continue
+        
+        following = tokens[index + 1] if index + 1 < len(tokens) else None
+        if following is not None and following.kind == TOKEN_WORD and (
+                following.text in DATE_UNIT_DAYS or following.text in MONTH_NAMES):
+            continue
+        
+        if following is not None and following.kind == TOKEN_CURRENCY:
+            with_currency = token.value
+            break
+        if grouped is None and (' ' in token.text or ',' in token.text):
+            grouped = token.value
+        if plain is None:
+            plain = token.value
+    
+    if with_currency is not None:
+        return with_currency
+    return grouped if grouped is not None else plain
 
 
 # =====================================================
 # DETECT CATEGORY
 # =====================================================
-def detect_category(text: str) -> Tuple[Optional[str], float]:
+def detect_category(text: str, tokens: Optional[List[Token]] = None) -> Tuple[Optional[str], float]:
     """
     Matndan kategoriya aniqlash
     
+    Kalit so'z topilmasa, matndagi so'zlar xato yozilgan kalit so'z
+    sifatida tekshiriladi ("taksy" -> "taksi").
+    
     Args:
         text: Matn
+        tokens: Oldindan hisoblangan tokenize(text.lower()) natijasi
         
     Returns:
         Tuple[Optional[str], float]: (category_key, confidence)
     """
+    category_key, confidence, _ = detect_category_source(text, tokens)
+    return category_key, confidence
+
+
+def detect_category_source(
+    text: str,
+    tokens: Optional[List[Token]] = None
+) -> Tuple[Optional[str], float, Optional[str]]:
+    """
+    detect_category + kategoriya manbai
+    
+    Returns:
+        Tuple[Optional[str], float, Optional[str]]: (category_key, confidence, CATEGORY_SOURCE_*)
+    """
     if not text:
-        return None, 0.0
+        return None, 0.0, None
     
     text = text.lower()
     
-    # Har bir kategoriya uchun keyword matching
+    # Barcha kalit so'zlar bitta o'tishda topiladi
+    hits = _keyword_automaton.hits(text)
     category_scores = {}
     
-    for category_key, keywords in Categories.KEYWORDS.items():
-        score = 0
-        matched_keywords = []
-        
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            
-            # To'liq so'z match (yuqori ball)
-            if re.search(rf'\b{re.escape(keyword_lower)}\b', text):
-                score += 10
-                matched_keywords.append(keyword)
-            
-            # Qisman match (past ball)
-            elif keyword_lower in text:
-                score += 5
-                matched_keywords.append(keyword)
-        
+    for category_key, score in _keyword_automaton.scores(text, hits).items():
         if score > 0:
             category_scores[category_key] = {
                 'score': score,
-                'keywords': matched_keywords
+                'keywords': [
+                    _keyword_automaton.keywords[keyword_id]
+                    for keyword_id in _keyword_automaton.category_keywords[category_key]
+                    if keyword_id in hits
+                ]
             }
     
     # Eng yuqori ball olgan kategoriyani tanlash
@@ -194,10 +865,22 @@ def detect_category(text: str) -> Tuple[Optional[str], float]:
         confidence = min(max_score / 10.0, 1.0)
         
         logger.info(f"Category detected: {category_key} (confidence: {confidence:.2f}, keywords: {best_category[1]['keywords']})")
-        return category_key, confidence
+        return category_key, confidence, CATEGORY_SOURCE_KEYWORD
+    
+    # Xato yozilgan kalit so'zlar
+    if tokens is None:
+        tokens = tokenize(text)
+    for token in tokens:
+        if token.kind != TOKEN_WORD or not is_typo_candidate(token.text):
+            continue
+        match = lookup_keyword(token.text)
+        if match is not None:
+            keyword, category_key, _ = match
+            logger.info(f"Category detected (typo): {category_key} ('{token.text}' ≈ '{keyword}')")
+            return category_key, TYPO_CONFIDENCE, CATEGORY_SOURCE_TYPO
     
     # Agar kategoriya topilmasa, 'other'
-    return 'other', 0.3
+    return 'other', 0.3, CATEGORY_SOURCE_FALLBACK
 
 
 # =====================================================
@@ -206,7 +889,8 @@ def detect_category(text: str) -> Tuple[Optional[str], float]:
 def extract_description(
     text: str,
     amount: Optional[Decimal],
-    category_key: Optional[str]
+    category_key: Optional[str],
+    tokens: Optional[List[Token]] = None
 ) -> Optional[str]:
     """
     Matndan tavsif ajratish (summa va kategoriya so'zlarini olib tashlash)
@@ -215,6 +899,7 @@ def extract_description(
         text: Asl matn
         amount: Topilgan summa
         category_key: Topilgan kategoriya
+        tokens: Oldindan hisoblangan tokenize(text.lower()) natijasi
         
     Returns:
         Optional[str]: Tavsif
@@ -224,18 +909,23 @@ def extract_description(
     
     description = text.lower()
     
-    # Summa so'zlarini olib tashlash
+    # Summa va valyuta tokenlarini olib tashlash
     if amount:
-        amount_str = str(amount).replace('.', '')
-        description = re.sub(rf'\b{amount_str}\b', '', description, flags=re.IGNORECASE)
-        description = re.sub(r'\bso[\'m]?\b', '', description, flags=re.IGNORECASE)
-        description = re.sub(r'\bUZS\b', '', description, flags=re.IGNORECASE)
-        description = re.sub(r'\bсум\b', '', description, flags=re.IGNORECASE)
+        if tokens is None:
+            tokens = tokenize(description)
+        
+        parts = []
+        cursor = 0
+        for token in tokens:
+            if token.kind == TOKEN_CURRENCY or (token.kind == TOKEN_NUMBER and token.value == amount):
+                parts.append(description[cursor:token.start])
+                cursor = token.end
+        parts.append(description[cursor:])
+        description = ''.join(parts)
     
     # Kategoriya keyword'larini olib tashlash
     if category_key and category_key in Categories.KEYWORDS:
-        for keyword in Categories.KEYWORDS[category_key]:
-            description = re.sub(rf'\b{re.escape(keyword.lower())}\b', '', description, flags=re.IGNORECASE)
+        description = _keyword_automaton.remove_keywords(description, category_key)
     
     # Ortiqcha bo'sh joylarni tozalash
     description = re.sub(r'\s+', ' ', description).strip()
@@ -250,12 +940,16 @@ def extract_description(
 # =====================================================
 # PARSE DATE TEXT
 # =====================================================
-def parse_date_text(text: str) -> Optional[date]:
+def parse_date_text(text: str, tokens: Optional[List[Token]] = None) -> Optional[date]:
     """
     Matndan sana aniqlash
     
+    Qo'llab-quvvatlanadi: "bugun"/"kecha"/"ertaga", "15.03.2024",
+    "12 mart", "3 kun", "2 hafta", "1 oy" (bugundan keyin).
+    
     Args:
         text: Matn
+        tokens: Oldindan hisoblangan tokenize(text.lower()) natijasi
         
     Returns:
         Optional[date]: Sana yoki None
@@ -263,57 +957,30 @@ def parse_date_text(text: str) -> Optional[date]:
     if not text:
         return None
     
-    text = text.strip().lower()
-    
-    # Maxsus so'zlar
-    today = date.today()
-    
-    # "bugun", "today"
-    if text in ['bugun', 'today', 'сегодня', 'bugün']:
-        return today
-    
-    # "kecha", "yesterday"
-    if text in ['kecha', 'yesterday', 'вчера', 'dün']:
-        return today - timedelta(days=1)
+    if tokens is None:
+        tokens = tokenize(text.strip().lower())
     
-    # "ertaga", "tomorrow"
-    if text in ['ertaga', 'tomorrow', 'завтра', 'yarın']:
-        return today + timedelta(days=1)
+    # Aniq sana yoki nisbiy so'z ("15.03.2024", "kecha")
+    for token in tokens:
+        if token.kind == TOKEN_DATE and token.value is not None:
+            return token.value
     
-    # DD.MM.YYYY format
-    match = re.search(r'(\d{1,2})[./](\d{1,2})[./](\d{2,4})', text)
-    if match:
-        try:
-            day = int(match.group(1))
-            month = int(match.group(2))
-            year = int(match.group(3))
-            
-            # Yilni to'liq formatga keltirish
-            if year < 100:
-                year += 2000
-            
-            return date(year, month, day)
-        except (ValueError, OverflowError):
-            pass
-    
-    # "3 kun", "3 days"
-    match = re.search(r'(\d+)\s*(kun|day|дня|дней|gün)', text)
-    if match:
-        days = int(match.group(1))
-        return today + timedelta(days=days)
-    
-    # "2 hafta", "2 weeks"
-    match = re.search(r'(\d+)\s*(hafta|week|недел|hafta)', text)
-    if match:
-        weeks = int(match.group(1))
-        return today + timedelta(weeks=weeks)
-    
-    # "1 oy", "1 month"
-    match = re.search(r'(\d+)\s*(oy|month|месяц|ay)', text)
-    if match:
-        months = int(match.group(1))
-        # Soddalashtirilgan: 1 oy ≈ 30 kun
-        return today + timedelta(days=months * 30)
+    # Raqam + birlik ("3 kun", "12 mart")
+    for token, following in zip(tokens, tokens[1:]):
+        if token.kind != TOKEN_NUMBER or following.kind != TOKEN_WORD:
+            continue
+        
+        if following.text in DATE_UNIT_DAYS:
+            try:
+                return date.today() + timedelta(days=int(token.value) * DATE_UNIT_DAYS[following.text])
+            except OverflowError:
+                return None
+        
+        if following.text in MONTH_NAMES:
+            try:
+                return date(date.today().year, MONTH_NAMES[following.text], int(token.value))
+            except ValueError:
+                continue
     
     return None
 
@@ -331,7 +998,7 @@ def is_valid_amount(amount: Decimal) -> bool:
     Returns:
         bool: To'g'ri summa
     """
-    return 1 <= amount <= 1_000_000_000
+    return MIN_AMOUNT <= amount <= MAX_AMOUNT
 
 
 # =====================================================
@@ -402,22 +1069,11 @@ def get_category_suggestions(text: str, top_n: int = 3) -> list:
     """
     text = text.lower()
     
-    category_scores = {}
-    
-    for category_key, keywords in Categories.KEYWORDS.items():
-        score = 0
-        
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            
-            if re.search(rf'\b{re.escape(keyword_lower)}\b', text):
-                score += 10
-            elif keyword_lower in text:
-                score += 5
-        
-        if score > 0:
-            confidence = min(score / 10.0, 1.0)
-            category_scores[category_key] = confidence
+    category_scores = {
+        category_key: min(score / 10.0, 1.0)
+        for category_key, score in _keyword_automaton.scores(text).items()
+        if score > 0
+    }
     
     # Eng yuqori skorli kategoriyalarni tanlash
     sorted_categories = sorted(
@@ -496,21 +1152,18 @@ def fuzzy_match(text: str, keyword: str, threshold: float = 0.8) -> bool:
     Returns:
         bool: Match topildi
     """
-    # Oddiy Levenshtein distance alternative
-    # Agar uzunlik farqi katta bo'lsa, False
-    len_diff = abs(len(text) - len(keyword))
-    if len_diff > 3:
-        return False
+    text = text.lower()
+    keyword = keyword.lower()
     
     # Oddiy substring match
-    if keyword.lower() in text.lower():
+    if keyword in text:
         return True
     
-    # Boshlanish match
-    if text.lower().startswith(keyword[:3].lower()):
-        return True
-    
-    return False
+    # O'xshashlik = 1 - masofa / uzunroq so'z uzunligi
+    longest = max(len(text), len(keyword))
+    if not longest:
+        return False
+    return (longest - edit_distance(text, keyword)) / longest >= threshold
 
 
 # =====================================================
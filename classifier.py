@@ -0,0 +1,411 @@
+"""
+SmartWallet AI Bot - Category Classifier
+========================================
+Foydalanuvchi tasdiqlagan xarajatlardan o'rganadigan kategoriya modeli
+
+Har bir foydalanuvchi uchun multinomial naive Bayes: xarajat matnidagi
+so'zlar (ai_parser.tokenize) va tanlangan kategoriya bo'yicha siyrak
+hisoblagichlar user_category_tokens jadvalida saqlanadi. Model faqat
+tasdiqlangan yoki kalit so'z bilan topilgan kategoriyalardan o'rganadi
+('other' zaxira kategoriyasidan emas) va faqat kalit so'z topilmaganda
+kategoriyani to'ldiradi. Bekor qilingan/o'chirilgan xarajat modeldan
+ayiriladi.
+
+Classes:
+    - CategoryClassifier: Foydalanuvchi modellari (LRU) va bashorat
+
+Usage:
+    parsed = await category_classifier.apply(telegram_id, text, parse_expense_text(text))
+    await category_classifier.learn(telegram_id, text, category_key, expense_id)
+    await category_classifier.forget(telegram_id, expense_id)
+
+Author: SmartWallet AI Team
+Version: 1.0.0
+"""
+
+import logging
+import math
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple, Any, Iterable
+
+from config import AIConfig, Features
+from database.db_manager import get_async_db_manager, category_registry
+from database.models import UserCategoryToken
+from utils.ai_parser import tokenize, ParseCache, TOKEN_WORD, CATEGORY_SOURCE_KEYWORD
+
+logger = logging.getLogger(__name__)
+
+# user_category_tokens.token ustuni uzunligi
+MAX_TOKEN_LENGTH = 64
+
+# apply() kategoriyani shaxsiy model bilan to'ldirganda 'category_source'
+CATEGORY_SOURCE_MODEL = 'model'
+
+# extract_features natijalari (takroriy iboralar qayta tokenlanmaydi)
+_features_cache = ParseCache('features')
+
+
+def extract_features(text: Optional[str]) -> Tuple[str, ...]:
+    """
+    Klassifikator uchun so'zlar (raqam, valyuta va sanalarsiz)
+    
+    Args:
+        text: Xarajat matni
+    
+    Returns:
+        Tuple[str, ...]: Kichik harfli so'zlar
+    """
+    if not text:
+        return ()
+    
+    key = ParseCache.key(text)
+    features = _features_cache.get(key)
+    if features is None:
+        features = tuple(
+            token.text
+            for token in tokenize(key)
+            if token.kind == TOKEN_WORD and 1 < len(token.text) <= MAX_TOKEN_LENGTH
+        )
+        _features_cache.set(key, features)
+    return features
+
+
+# =====================================================
+# USER MODEL
+# =====================================================
+class _UserModel:
+    """
+    Bitta foydalanuvchining naive Bayes hisoblagichlari
+    
+    Laplace silliqlash bilan:
+        score(c) = log P(c) + sum_t log((n(t, c) + 1) / (N(c) + V))
+    n(t, c) = 0 bo'lgan tokenlarning hissasi -log(N(c) + V) ga teng, shuning
+    uchun faqat nolga teng bo'lmagan hisoblagichlar aylanib chiqiladi.
+    Modelda uchramagan so'zlar e'tiborga olinmaydi.
+    """
+    
+    __slots__ = ('doc_counts', 'token_counts', 'category_totals', '_log_priors', '_log_denominators')
+    
+    def __init__(self):
+        self.doc_counts: Dict[int, int] = {}
+        self.token_counts: Dict[str, Dict[int, int]] = {}
+        self.category_totals: Dict[int, int] = {}
+        self._log_priors: Optional[Dict[int, float]] = None
+        self._log_denominators: Optional[Dict[int, float]] = None
+    
+    @property
+    def total_docs(self) -> int:
+        return sum(self.doc_counts.values())
+    
+    def add(self, token: str, category_id: int, count: int) -> None:
+        """Hisoblagichni o'zgartirish (token = DOC_TOKEN - hujjatlar soni, manfiy - ayirish)"""
+        if token == UserCategoryToken.DOC_TOKEN:
+            self.doc_counts[category_id] = max(0, self.doc_counts.get(category_id, 0) + count)
+        else:
+            counts = self.token_counts.setdefault(token, {})
+            old = counts.get(category_id, 0)
+            new = max(0, old + count)
+            if new:
+                counts[category_id] = new
+            else:
+                counts.pop(category_id, None)
+                if not counts:
+                    del self.token_counts[token]
+            self.category_totals[category_id] = self.category_totals.get(category_id, 0) + new - old
+        self._log_priors = None
+    
+    def _prepare(self) -> None:
+        """Kategoriya bo'yicha log prior va maxrajlarni hisoblash"""
+        total_docs = self.total_docs
+        vocabulary = len(self.token_counts)
+        self._log_priors = {
+            category_id: math.log(docs / total_docs)
+            for category_id, docs in self.doc_counts.items()
+            if docs > 0
+        }
+        self._log_denominators = {
+            category_id: math.log(self.category_totals.get(category_id, 0) + vocabulary)
+            for category_id in self._log_priors
+        }
+    
+    def predict(self, features: Tuple[str, ...]) -> Tuple[Optional[int], float]:
+        """
+        Eng ehtimolli kategoriya
+        
+        Args:
+            features: extract_features() natijasi
+        
+        Returns:
+            Tuple[Optional[int], float]: (category_id, posterior) - tanish
+                so'z bo'lmasa (None, 0.0)
+        """
+        known = [self.token_counts[token] for token in features if token in self.token_counts]
+        if not known:
+            return None, 0.0
+        
+        if self._log_priors is None:
+            self._prepare()
+        
+        scores = {
+            category_id: log_prior - len(known) * self._log_denominators[category_id]
+            for category_id, log_prior in self._log_priors.items()
+        }
+        for counts in known:
+            for category_id, count in counts.items():
+                if category_id in scores:
+                    scores[category_id] += math.log(count + 1)
+        
+        best_id = max(scores, key=scores.get)
+        best_score = scores[best_id]
+        normalizer = sum(math.exp(score - best_score) for score in scores.values())
+        return best_id, 1.0 / normalizer
+
+
+# =====================================================
+# CATEGORY CLASSIFIER CLASS
+# =====================================================
+class CategoryClassifier:
+    """
+    Foydalanuvchi modellari uchun LRU va bashorat/o'rganish API
+    
+    Model birinchi so'rovda DB'dan yuklanadi va xotirada saqlanadi
+    (AIConfig.CLASSIFIER_CACHE_USERS ta foydalanuvchigacha). learn() avval
+    DB'ga yozadi, keyin xotiradagi modelni (yuklangan bo'lsa) yangilaydi.
+    """
+    
+    def __init__(self, max_users: Optional[int] = None):
+        """
+        Args:
+            max_users: Xotirada saqlanadigan modellar soni
+        """
+        self.max_users = max_users or AIConfig.CLASSIFIER_CACHE_USERS
+        self._models: "OrderedDict[int, _UserModel]" = OrderedDict()
+        # expense_id -> (telegram_id, category_key, tokens) - forget() uchun
+        self._ledger: "OrderedDict[int, Tuple[int, str, Dict[str, int]]]" = OrderedDict()
+        self.predictions = 0
+        self.overrides = 0
+    
+    async def _get_model(self, telegram_id: int) -> _UserModel:
+        """Modelni LRU'dan olish yoki DB'dan yuklash"""
+        model = self._models.get(telegram_id)
+        if model is not None:
+            self._models.move_to_end(telegram_id)
+            return model
+        
+        rows = await get_async_db_manager().get_category_tokens(telegram_id)
+        
+        # Yuklash paytida boshqa so'rov modelni qo'shgan bo'lishi mumkin
+        model = self._models.get(telegram_id)
+        if model is None:
+            model = _UserModel()
+            for token, category_id, count in rows:
+                model.add(token, category_id, count)
+            self._models[telegram_id] = model
+            while len(self._models) > self.max_users:
+                self._models.popitem(last=False)
+        return model
+    
+    async def predict(self, telegram_id: int, text: str) -> Tuple[Optional[str], float]:
+        """
+        Foydalanuvchi modeli bo'yicha kategoriya
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            text: Xarajat matni
+        
+        Returns:
+            Tuple[Optional[str], float]: (category_key, confidence) - model
+                yetarlicha ishonchli bo'lmasa (None, 0.0)
+        """
+        if not Features.CATEGORY_LEARNING or not telegram_id:
+            return None, 0.0
+        
+        features = extract_features(text)
+        if not features:
+            return None, 0.0
+        
+        model = await self._get_model(telegram_id)
+        if model.total_docs < AIConfig.CLASSIFIER_MIN_DOCS:
+            return None, 0.0
+        
+        self.predictions += 1
+        category_id, confidence = model.predict(features)
+        if category_id is None or confidence < AIConfig.CLASSIFIER_MIN_CONFIDENCE:
+            return None, 0.0
+        
+        category = category_registry.get_by_id(category_id)
+        if category is None:
+            return None, 0.0
+        return category.key, confidence
+    
+    async def apply(self, telegram_id: int, text: str, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        parse_expense_text natijasiga foydalanuvchi modelini qo'llash
+        
+        Kalit so'z topilgan bo'lsa natija o'zgarmaydi. Aks holda (xato
+        yozilgan kalit so'z yoki 'other') model ishonchli bashorat bersa,
+        kategoriya shu bilan to'ldiriladi.
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            text: Xarajat matni
+            parsed: parse_expense_text() natijasi
+        
+        Returns:
+            Dict: parsed (yoki kategoriyasi almashtirilgan nusxa)
+        """
+        if parsed.get('category_source') == CATEGORY_SOURCE_KEYWORD:
+            return parsed
+        
+        category_key, confidence = await self.predict(telegram_id, text)
+        if category_key is None:
+            return parsed
+        
+        if category_key != parsed['category_key']:
+            self.overrides += 1
+            logger.info(f"Shaxsiy model: {parsed['category_key']} → {category_key} ({confidence:.2f})")
+        
+        result = dict(parsed)
+        result['category_key'] = category_key
+        result['confidence'] = (0.5 if parsed['amount'] else 0.0) + confidence * 0.5
+        result['category_source'] = CATEGORY_SOURCE_MODEL
+        return result
+    
+    @staticmethod
+    def is_learnable(parsed: Dict[str, Any]) -> bool:
+        """
+        Tasdiqlanmagan natijadan o'rganish mumkinmi
+        
+        Faqat kalit so'z bilan topilgan kategoriya - 'other' zaxirasi,
+        xato yozilgan so'z va modelning o'z bashorati o'rgatilmaydi.
+        """
+        return parsed.get('category_source') == CATEGORY_SOURCE_KEYWORD
+    
+    async def learn(
+        self,
+        telegram_id: int,
+        text: Optional[str],
+        category_key: str,
+        expense_id: Optional[int] = None
+    ) -> bool:
+        """
+        Saqlangan xarajatdan o'rganish
+        
+        Faqat foydalanuvchi tasdiqlagan yoki kalit so'z bilan topilgan
+        (is_learnable) kategoriya uchun chaqiriladi.
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            text: Foydalanuvchi yozgan matn
+            category_key: Yakuniy (tasdiqlangan yoki tuzatilgan) kategoriya
+            expense_id: Saqlangan xarajat ID (forget() uchun)
+        
+        Returns:
+            bool: Model yangilandi
+        """
+        return await self.learn_many(telegram_id, [(text, category_key, expense_id)]) > 0
+    
+    async def learn_many(
+        self,
+        telegram_id: int,
+        items: Iterable[Tuple[Optional[str], str, Optional[int]]]
+    ) -> int:
+        """
+        Ko'p saqlangan xarajatdan o'rganish (chek, CSV import)
+        
+        Natija har biri uchun learn() chaqirilgandek, lekin hisoblagichlar
+        kategoriya bo'yicha yig'ilib, har bir kategoriyaga bitta yozuv qilinadi.
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            items: (matn, category_key, expense_id) uchliklari
+        
+        Returns:
+            int: O'rganilgan xarajatlar soni
+        """
+        if not Features.CATEGORY_LEARNING or not telegram_id:
+            return 0
+        
+        # category_key -> (hujjatlar soni, {token: soni}, [(expense_id, tokens)])
+        grouped: Dict[str, Tuple[int, Dict[str, int], list]] = {}
+        for text, category_key, expense_id in items:
+            features = extract_features(text) if category_key else None
+            if not features:
+                continue
+            docs, tokens, entries = grouped.get(category_key, (0, {}, []))
+            own: Dict[str, int] = {}
+            for token in features:
+                own[token] = own.get(token, 0) + 1
+                tokens[token] = tokens.get(token, 0) + 1
+            if expense_id:
+                entries.append((expense_id, own))
+            grouped[category_key] = (docs + 1, tokens, entries)
+        
+        learned = 0
+        for category_key, (docs, tokens, entries) in grouped.items():
+            if not await self._update(telegram_id, category_key, tokens, docs):
+                continue
+            learned += docs
+            for expense_id, own in entries:
+                self._ledger[expense_id] = (telegram_id, category_key, own)
+                self._ledger.move_to_end(expense_id)
+        
+        while len(self._ledger) > AIConfig.CLASSIFIER_LEDGER_SIZE:
+            self._ledger.popitem(last=False)
+        return learned
+    
+    async def forget(self, telegram_id: int, expense_id: int) -> bool:
+        """
+        Bekor qilingan yoki o'chirilgan xarajatni modeldan ayirish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            expense_id: Xarajat ID
+        
+        Returns:
+            bool: Ayirildi (xarajat learn() orqali o'rganilgan bo'lsa)
+        """
+        entry = self._ledger.get(expense_id)
+        if entry is None or entry[0] != telegram_id:
+            return False
+        
+        del self._ledger[expense_id]
+        _, category_key, tokens = entry
+        return await self._update(
+            telegram_id, category_key, {token: -count for token, count in tokens.items()}, -1
+        )
+    
+    async def _update(self, telegram_id: int, category_key: str, tokens: Dict[str, int], docs: int) -> bool:
+        """Hisoblagichlarni DB'da va xotiradagi modelda o'zgartirish"""
+        saved = await get_async_db_manager().add_category_tokens(
+            telegram_id, category_key, tokens, docs=docs
+        )
+        if not saved:
+            return False
+        
+        model = self._models.get(telegram_id)
+        category_id = category_registry.get_id(category_key)
+        if model is not None and category_id is not None:
+            model.add(UserCategoryToken.DOC_TOKEN, category_id, docs)
+            for token, count in tokens.items():
+                model.add(token, category_id, count)
+        return True
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Klassifikator statistikasi
+        
+        Returns:
+            Dict: users (xotiradagi modellar), predictions, overrides, ledger
+        """
+        return {
+            'users': len(self._models),
+            'max_users': self.max_users,
+            'predictions': self.predictions,
+            'overrides': self.overrides,
+            'ledger': len(self._ledger),
+        }
+
+
+# Global instance
+category_classifier = CategoryClassifier()
@@ -63,6 +63,9 @@ class BotConfig:
     WEBHOOK_URL: Optional[str] = os.getenv('WEBHOOK_URL')
     WEBHOOK_PORT: int = int(os.getenv('WEBHOOK_PORT', '8443'))
     
+    # Bir vaqtda qayta ishlanadigan update'lar (turli chatlar; chat ichida ketma-ket)
+    CONCURRENT_UPDATES: int = int(os.getenv('CONCURRENT_UPDATES', '32'))
+    
     # Rate limiting
     RATE_LIMIT_PER_SECOND: int = int(os.getenv('RATE_LIMIT_PER_SECOND', '3'))
     SESSION_TIMEOUT_HOURS: int = int(os.getenv('SESSION_TIMEOUT_HOURS', '24'))
@@ -88,6 +91,22 @@ class DatabaseConfig:
     POOL_SIZE: int = int(os.getenv('DB_POOL_SIZE', '10'))
     MAX_OVERFLOW: int = int(os.getenv('DB_MAX_OVERFLOW', '20'))
     
+    # Thread pool rejimi (sync DatabaseManager'ni handler'lardan thread'da ishlatish)
+    USE_THREAD_POOL: bool = os.getenv('DB_USE_THREAD_POOL', 'False').lower() == 'true'
+    THREAD_POOL_MAX_PENDING: int = int(os.getenv('DB_THREAD_POOL_MAX_PENDING', '100'))
+    THREAD_POOL_ACQUIRE_TIMEOUT: float = float(os.getenv('DB_THREAD_POOL_ACQUIRE_TIMEOUT', '10'))
+    
+    # Write-behind rejimi (tezkor xarajat/daromadlarni batch bilan yozish)
+    WRITE_BEHIND: bool = os.getenv('DB_WRITE_BEHIND', 'False').lower() == 'true'
+    WRITE_BEHIND_FLUSH_MS: int = int(os.getenv('DB_WRITE_BEHIND_FLUSH_MS', '200'))
+    WRITE_BEHIND_BATCH_SIZE: int = int(os.getenv('DB_WRITE_BEHIND_BATCH_SIZE', '100'))
+    
+    # SQLite PRAGMA sozlamalari (har bir ulanishda o'rnatiladi)
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+    SQLITE_SYNCHRONOUS: str = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE: int = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv('SQLITE_CACHE_SIZE_KB', '65536'))
+    
     @classmethod
     def get_url(cls, async_mode: bool = False) -> str:
         """
@@ -107,14 +126,16 @@ class DatabaseConfig:
     # Async URL (agar kerak bo'lsa)
     @classmethod
     def get_async_url(cls) -> str:
-        """Async database URL"""
-        url = cls.get_url()
+        """Async database URL (sync engine bilan bir xil bazaga ulanadi)"""
+        url = cls.DATABASE_URL
         # SQLite uchun aiosqlite
         if url.startswith('sqlite:'):
             return url.replace('sqlite:', 'sqlite+aiosqlite:')
         # PostgreSQL uchun asyncpg
         elif url.startswith('postgresql:'):
             return url.replace('postgresql:', 'postgresql+asyncpg:')
+        elif url.startswith('postgresql+psycopg2:'):
+            return url.replace('postgresql+psycopg2:', 'postgresql+asyncpg:')
         return url
 
 
@@ -136,6 +157,7 @@ class AppConfig:
     
     # Cache settings
     CACHE_TTL: int = int(os.getenv('CACHE_TTL', '300'))
+    CACHE_MAX_SIZE: int = int(os.getenv('CACHE_MAX_SIZE', '10000'))
 
 
 # =====================================================
@@ -262,6 +284,19 @@ class Categories:
         'utilities': ['kommunal', 'elektr', 'gaz', 'suv', 'коммунальные', 'utilities']
     }
     
+    # Daromad kalit so'zlari (tezkor kiritishda daromadni aniqlash uchun)
+    INCOME_KEYWORDS = {
+        'uz': ['oylik', 'maosh', 'ish haqi', 'daromad', 'kirim', 'oldi', 'bonus', 
+               'freelance', 'freelans', 'mukofot', 'stipendiya', 'pension',
+               'ustama', 'grant', 'investitsiya', 'foyda', 'daromat'],
+        'ru': ['зарплата', 'оклад', 'доход', 'получил', 'бонус', 'фриланс',
+               'премия', 'стипендия', 'пенсия', 'надбавка', 'грант',
+               'инвестиция', 'прибыль'],
+        'en': ['salary', 'wage', 'income', 'received', 'bonus', 'freelance',
+               'reward', 'scholarship', 'pension', 'allowance', 'grant',
+               'investment', 'profit']
+    }
+    
     @classmethod
     def get_color(cls, category_key: str) -> str:
         """Kategoriya rangini olish"""
@@ -286,6 +321,10 @@ class SchedulerConfig:
     """Scheduler sozlamalari"""
     # Eslatmalarni tekshirish intervali (soniyalarda)
     REMINDER_CHECK_INTERVAL: int = int(os.getenv('REMINDER_CHECK_INTERVAL', '3600'))
+    # Scheduler xotiraga bir martada yuklaydigan eslatmalar soni
+    REMINDER_BATCH_SIZE: int = int(os.getenv('REMINDER_BATCH_SIZE', '500'))
+    # Shuncha oynada yuborilmagan eslatma bekor qilinadi (bot bloklangan va h.k.)
+    REMINDER_MAX_ATTEMPTS: int = int(os.getenv('REMINDER_MAX_ATTEMPTS', '3'))
     
     # Default eslatma kunlari
     DEFAULT_REMINDER_DAYS: int = int(os.getenv('DEFAULT_REMINDER_DAYS', '3'))
@@ -299,6 +338,20 @@ class SchedulerConfig:
     
     # Haftalik xulosani yuborish kuni (0=Dushanba, 6=Yakshanba)
     WEEKLY_SUMMARY_DAY: int = int(os.getenv('WEEKLY_SUMMARY_DAY', '6'))
+    # Bir vaqtda yuborilayotgan xulosalar soni - restart bo'lsa ko'pi bilan
+    # shuncha xulosa qayta yuboriladi (checkpoint har bir yakunlangan foydalanuvchidan keyin)
+    SUMMARY_BATCH_SIZE: int = int(os.getenv('SUMMARY_BATCH_SIZE', '20'))
+    
+    # Muddati o'tgan qarzlarni yangilash (sweep) intervali va bo'lak hajmi
+    OVERDUE_SWEEP_INTERVAL: int = int(os.getenv('OVERDUE_SWEEP_INTERVAL', '3600'))
+    OVERDUE_SWEEP_CHUNK: int = int(os.getenv('OVERDUE_SWEEP_CHUNK', '1000'))
+    
+    # Chiquvchi xabarlar (dispatcher) - Telegram flood limitlari
+    DISPATCH_RATE: float = float(os.getenv('DISPATCH_RATE', '30'))  # xabar/soniya (global)
+    DISPATCH_PER_CHAT_INTERVAL: float = float(os.getenv('DISPATCH_PER_CHAT_INTERVAL', '1.0'))
+    DISPATCH_WORKERS: int = int(os.getenv('DISPATCH_WORKERS', '8'))
+    DISPATCH_MAX_RETRIES: int = int(os.getenv('DISPATCH_MAX_RETRIES', '3'))
+    DISPATCH_QUEUE_SIZE: int = int(os.getenv('DISPATCH_QUEUE_SIZE', '10000'))
 
 
 # =====================================================
@@ -318,6 +371,24 @@ class AIConfig:
         'ru': 'ru_core_news_sm',
         'en': 'en_core_web_sm',
     }
+    
+    # Tahlil natijalari keshi (LRU) hajmi; 0 - keshsiz
+    PARSE_CACHE_SIZE: int = int(os.getenv('PARSE_CACHE_SIZE', '2048'))
+    
+    # Shaxsiy kategoriya modeli: kamida shuncha xarajatdan keyin ishlaydi,
+    # va shu ishonchdan past bashoratlar e'tiborga olinmaydi
+    CLASSIFIER_MIN_DOCS: int = int(os.getenv('CLASSIFIER_MIN_DOCS', '3'))
+    CLASSIFIER_MIN_CONFIDENCE: float = float(os.getenv('CLASSIFIER_MIN_CONFIDENCE', '0.6'))
+    # Xotirada saqlanadigan foydalanuvchi modellari soni
+    CLASSIFIER_CACHE_USERS: int = int(os.getenv('CLASSIFIER_CACHE_USERS', '1000'))
+    # O'rganilgan so'nggi xarajatlar (bekor qilinsa/o'chirilsa modeldan ayiriladi)
+    CLASSIFIER_LEDGER_SIZE: int = int(os.getenv('CLASSIFIER_LEDGER_SIZE', '10000'))
+    
+    # Xato yozilgan kalit so'zlar uchun maksimal tahrir masofasi (0 - o'chirilgan)
+    TYPO_MAX_DISTANCE: int = int(os.getenv('TYPO_MAX_DISTANCE', '2'))
+    # Kategoriya typo fallback'i shundan qisqa so'zlarni tuzatmaydi:
+    # 5 harfli so'zda 1 ta farq juda ko'p ("kirim" -> "kiyim")
+    TYPO_MIN_LENGTH: int = int(os.getenv('TYPO_MIN_LENGTH', '6'))
 
 
 # =====================================================
@@ -342,6 +413,30 @@ class ReportConfig:
     ENABLE_PDF: bool = os.getenv('ENABLE_EXPORT_PDF', 'True').lower() == 'true'
     ENABLE_HTML: bool = os.getenv('ENABLE_EXPORT_HTML', 'True').lower() == 'true'
     ENABLE_EXCEL: bool = os.getenv('ENABLE_EXPORT_EXCEL', 'True').lower() == 'true'
+    
+    # Ma'lumotlarni eksport qilish (CSV / Excel)
+    # Kursordan bir martada olinadigan qatorlar soni
+    EXPORT_BATCH_SIZE: int = int(os.getenv('EXPORT_BATCH_SIZE', '1000'))
+    # Shu hajmgacha fayl xotirada, kattarog'i vaqtinchalik faylda
+    EXPORT_SPOOL_SIZE: int = int(os.getenv('EXPORT_SPOOL_SIZE', str(8 * 1024 * 1024)))
+
+
+# =====================================================
+# IMPORT CONFIGURATION
+# =====================================================
+class ImportConfig:
+    """CSV (bank ko'chirmasi) import sozlamalari"""
+    # Bitta tranzaksiyada yoziladigan qatorlar soni
+    CHUNK_SIZE: int = int(os.getenv('IMPORT_CHUNK_SIZE', '1000'))
+    
+    # Fayl hajmi chegarasi (Telegram Bot API yuklab olish chegarasi 20 MB)
+    MAX_FILE_SIZE: int = int(os.getenv('IMPORT_MAX_FILE_SIZE', str(20 * 1024 * 1024)))
+    
+    # Bitta fayldagi maksimal qatorlar soni
+    MAX_ROWS: int = int(os.getenv('IMPORT_MAX_ROWS', '200000'))
+    
+    # Progress xabarini yangilash oralig'i (soniya)
+    PROGRESS_INTERVAL: float = float(os.getenv('IMPORT_PROGRESS_INTERVAL', '3'))
 
 
 # =====================================================
@@ -352,6 +447,8 @@ class Features:
     CHARTS: bool = os.getenv('ENABLE_CHARTS', 'True').lower() == 'true'
     AI_PARSER: bool = os.getenv('ENABLE_AI_PARSER', 'True').lower() == 'true'
     REMINDERS: bool = os.getenv('ENABLE_REMINDERS', 'True').lower() == 'true'
+    SUMMARIES: bool = os.getenv('ENABLE_SUMMARIES', 'True').lower() == 'true'
+    CATEGORY_LEARNING: bool = os.getenv('ENABLE_CATEGORY_LEARNING', 'True').lower() == 'true'
     BACKUP: bool = os.getenv('ENABLE_BACKUP', 'True').lower() == 'true'
 
 
@@ -13,30 +13,3179 @@ Author: SmartWallet AI Team
 Version: 1.0.0
 """
 
+import asyncio
+import functools
 import logging
-from typing import Optional, List, Dict, Any, Tuple
-from datetime import datetime, date, timedelta
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple, Callable, Union, Iterator
+from datetime import datetime, date, time as dt_time, timedelta
 from decimal import Decimal
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import Mapping
 
-from sqlalchemy import create_engine, select, func, and_, or_, desc, asc, extract
+from sqlalchemy import (
+    create_engine, select, update, insert, delete, inspect, func, and_, or_, desc, asc,
+    extract, literal, null, cast, union_all, case, Integer, Date, event
+)
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool, StaticPool, AsyncAdaptedQueuePool
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
-from config import DatabaseConfig
-from .models import Base, User, Expense, Income, Debt, Reminder, Category, init_categories
+from config import AppConfig, BotConfig, DatabaseConfig, ReportConfig, SchedulerConfig
+from .models import (
+    Base, User, Expense, Income, Debt, Reminder, Category,
+    DailyUserCategoryTotal, MonthlyUserTotal, JobCheckpoint, UserCategoryToken,
+    init_categories
+)
 
 # Logger
 logger = logging.getLogger(__name__)
 
 
+# =====================================================
+# CATEGORY REGISTRY
+# =====================================================
+class CategoryRegistry:
+    """
+    Kategoriyalar uchun process-wide xotira keshi
+    
+    Kategoriyalar statik (init_categories orqali yuklanadi), shuning uchun
+    create_tables() da bir marta o'qiladi va har bir xarajat uchun
+    kategoriya qidirish oddiy dict lookup bo'ladi.
+    
+    Xaritalar o'zgarmas (MappingProxyType) - qayta yuklashda butunlay
+    almashtiriladi. Kategoriyalar o'zgarsa invalidate() chaqiriladi,
+    keyingi murojaatda DatabaseManager qaytadan yuklaydi.
+    """
+    
+    def __init__(self):
+        self._by_key: Mapping[str, Category] = MappingProxyType({})
+        self._by_id: Mapping[int, Category] = MappingProxyType({})
+        self._loaded = False
+        self._lock = threading.Lock()
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Registry yuklanganmi"""
+        return self._loaded
+    
+    def load(self, session: Session) -> None:
+        """
+        Kategoriyalarni database'dan yuklash
+        
+        Args:
+            session: SQLAlchemy session (sync yoki run_sync orqali)
+        """
+        categories = session.execute(select(Category)).scalars().all()
+        for category in categories:
+            session.expunge(category)
+        
+        with self._lock:
+            self._by_key = MappingProxyType({c.key: c for c in categories})
+            self._by_id = MappingProxyType({c.id: c for c in categories})
+            self._loaded = True
+        logger.info(f"Kategoriya registry yuklandi: {len(categories)} ta")
+    
+    def invalidate(self) -> None:
+        """Keshni bekor qilish - keyingi murojaatda qayta yuklanadi"""
+        with self._lock:
+            self._by_key = MappingProxyType({})
+            self._by_id = MappingProxyType({})
+            self._loaded = False
+        logger.info("Kategoriya registry bekor qilindi")
+    
+    def get(self, key: Optional[str]) -> Optional[Category]:
+        """Kategoriyani key bo'yicha olish"""
+        return self._by_key.get(key)
+    
+    def get_by_id(self, category_id: Optional[int]) -> Optional[Category]:
+        """Kategoriyani ID bo'yicha olish"""
+        return self._by_id.get(category_id)
+    
+    def get_id(self, key: Optional[str]) -> Optional[int]:
+        """Kategoriya ID sini key bo'yicha olish"""
+        category = self._by_key.get(key)
+        return category.id if category else None
+    
+    def all(self, is_active: bool = True) -> List[Category]:
+        """Barcha kategoriyalar ro'yxati"""
+        return [c for c in self._by_key.values() if c.is_active or not is_active]
+
+
+# Process-wide instance
+category_registry = CategoryRegistry()
+
+
+# =====================================================
+# USER PROFILE CACHE
+# =====================================================
+class UserProfileCache:
+    """
+    Foydalanuvchi profili (User) uchun LRU + TTL kesh
+    
+    - Kalit: telegram_id
+    - TTL: AppConfig.CACHE_TTL soniya
+    - Hajm: AppConfig.CACHE_MAX_SIZE (eng eski ishlatilgan birinchi chiqariladi)
+    - hit/miss/eviction hisoblagichlari - keshni o'lchash uchun
+    """
+    
+    def __init__(self, max_size: int = AppConfig.CACHE_MAX_SIZE, ttl: int = AppConfig.CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: "OrderedDict[int, Tuple[float, User]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, telegram_id: int) -> Optional[User]:
+        """
+        Keshdan foydalanuvchini olish
+        
+        Returns:
+            Optional[User]: User yoki None (topilmasa / muddati o'tgan bo'lsa)
+        """
+        if self.ttl <= 0 or self.max_size <= 0:
+            return None
+        
+        with self._lock:
+            item = self._items.get(telegram_id)
+            if item is None:
+                self.misses += 1
+                return None
+            
+            expires_at, user = item
+            if expires_at < time.monotonic():
+                del self._items[telegram_id]
+                self.misses += 1
+                return None
+            
+            self._items.move_to_end(telegram_id)
+            self.hits += 1
+            return user
+    
+    def set(self, telegram_id: int, user: User) -> None:
+        """Foydalanuvchini keshga yozish"""
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        
+        with self._lock:
+            self._items[telegram_id] = (time.monotonic() + self.ttl, user)
+            self._items.move_to_end(telegram_id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, telegram_id: Optional[int] = None) -> None:
+        """
+        Keshni bekor qilish
+        
+        Args:
+            telegram_id: Bitta foydalanuvchi (None bo'lsa butun kesh)
+        """
+        with self._lock:
+            if telegram_id is None:
+                self._items.clear()
+            else:
+                self._items.pop(telegram_id, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Kesh statistikasi
+        
+        Returns:
+            Dict: size, max_size, hits, misses, evictions, hit_rate
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._items),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+def _profile_matches(
+    user: User,
+    username: Optional[str],
+    first_name: Optional[str],
+    last_name: Optional[str]
+) -> bool:
+    """Keshdagi profil yangi ma'lumotlar bilan mosmi (yangilash kerak emasmi)"""
+    return (
+        (not username or user.username == username) and
+        (not first_name or user.first_name == first_name) and
+        (not last_name or user.last_name == last_name)
+    )
+
+
+# Process-wide instance
+user_cache = UserProfileCache()
+
+
+# =====================================================
+# ROLLUP HELPERS
+# =====================================================
+def _apply_monthly_rollup(
+    session: Session,
+    user_id: int,
+    when: datetime,
+    expense_total: Decimal = Decimal('0'),
+    expense_count: int = 0,
+    income_total: Decimal = Decimal('0'),
+    income_count: int = 0
+) -> None:
+    """
+    monthly_user_totals jadvaliga delta qo'shish (commit qilinmaydi)
+    
+    Chaqiruvchi tranzaksiyasi ichida ishlaydi - yozuv bilan birga
+    commit yoki rollback bo'ladi.
+    """
+    result = session.execute(
+        update(MonthlyUserTotal).where(
+            MonthlyUserTotal.user_id == user_id,
+            MonthlyUserTotal.year == when.year,
+            MonthlyUserTotal.month == when.month
+        ).values(
+            expense_total=MonthlyUserTotal.expense_total + expense_total,
+            expense_count=MonthlyUserTotal.expense_count + expense_count,
+            income_total=MonthlyUserTotal.income_total + income_total,
+            income_count=MonthlyUserTotal.income_count + income_count
+        ).execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        session.execute(insert(MonthlyUserTotal).values(
+            user_id=user_id,
+            year=when.year,
+            month=when.month,
+            expense_total=expense_total,
+            expense_count=expense_count,
+            income_total=income_total,
+            income_count=income_count
+        ))
+
+
+def _apply_expense_rollup(
+    session: Session,
+    user_id: int,
+    category_id: Optional[int],
+    when: datetime,
+    amount: Decimal,
+    count: int
+) -> None:
+    """
+    Xarajat rollup'larini (kunlik + oylik) delta bilan yangilash
+    
+    O'chirishda amount va count manfiy beriladi.
+    """
+    day = when.date()
+    result = session.execute(
+        update(DailyUserCategoryTotal).where(
+            DailyUserCategoryTotal.user_id == user_id,
+            DailyUserCategoryTotal.category_id == category_id,
+            DailyUserCategoryTotal.day == day
+        ).values(
+            expense_total=DailyUserCategoryTotal.expense_total + amount,
+            expense_count=DailyUserCategoryTotal.expense_count + count
+        ).execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        session.execute(insert(DailyUserCategoryTotal).values(
+            user_id=user_id,
+            category_id=category_id,
+            day=day,
+            expense_total=amount,
+            expense_count=count
+        ))
+    
+    _apply_monthly_rollup(session, user_id, when, expense_total=amount, expense_count=count)
+
+
+def _apply_income_rollup(
+    session: Session,
+    user_id: int,
+    when: datetime,
+    amount: Decimal,
+    count: int
+) -> None:
+    """Daromad rollup'ini (oylik) delta bilan yangilash"""
+    _apply_monthly_rollup(session, user_id, when, income_total=amount, income_count=count)
+
+
+def _rebuild_rollups(session: Session, telegram_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Rollup jadvallarini xom expenses/incomes jadvallaridan qayta qurish
+    
+    Mavjud bazalarni backfill qilish yoki nomuvofiqlikni tuzatish uchun.
+    
+    Args:
+        session: SQLAlchemy session
+        telegram_id: Faqat bitta foydalanuvchi (None bo'lsa hammasi)
+        
+    Returns:
+        Dict: {'daily': qatorlar soni, 'monthly': qatorlar soni}
+    """
+    daily_delete = delete(DailyUserCategoryTotal)
+    monthly_delete = delete(MonthlyUserTotal)
+    expense_filter = []
+    income_filter = []
+    if telegram_id is not None:
+        daily_delete = daily_delete.where(DailyUserCategoryTotal.user_id == telegram_id)
+        monthly_delete = monthly_delete.where(MonthlyUserTotal.user_id == telegram_id)
+        expense_filter.append(Expense.user_id == telegram_id)
+        income_filter.append(Income.user_id == telegram_id)
+    
+    session.execute(daily_delete)
+    session.execute(monthly_delete)
+    
+    # Kunlik xarajatlar
+    expense_day = func.date(Expense.expense_date)
+    daily_rows = []
+    for user_id, category_id, day, total, count in session.execute(
+        select(
+            Expense.user_id, Expense.category_id, expense_day,
+            func.sum(Expense.amount), func.count(Expense.id)
+        ).where(*expense_filter).group_by(Expense.user_id, Expense.category_id, expense_day)
+    ):
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        daily_rows.append({
+            'user_id': user_id,
+            'category_id': category_id,
+            'day': day,
+            'expense_total': total or Decimal('0'),
+            'expense_count': count or 0
+        })
+    
+    # Oylik xarajat va daromadlar
+    monthly: Dict[Tuple[int, int, int], Dict[str, Any]] = {}
+    
+    def monthly_row(user_id: int, year: int, month: int) -> Dict[str, Any]:
+        key = (user_id, int(year), int(month))
+        if key not in monthly:
+            monthly[key] = {
+                'user_id': user_id, 'year': int(year), 'month': int(month),
+                'expense_total': Decimal('0'), 'expense_count': 0,
+                'income_total': Decimal('0'), 'income_count': 0
+            }
+        return monthly[key]
+    
+    expense_year = extract('year', Expense.expense_date)
+    expense_month = extract('month', Expense.expense_date)
+    for user_id, year, month, total, count in session.execute(
+        select(
+            Expense.user_id, expense_year, expense_month,
+            func.sum(Expense.amount), func.count(Expense.id)
+        ).where(*expense_filter).group_by(Expense.user_id, expense_year, expense_month)
+    ):
+        row = monthly_row(user_id, year, month)
+        row['expense_total'] = total or Decimal('0')
+        row['expense_count'] = count or 0
+    
+    income_year = extract('year', Income.income_date)
+    income_month = extract('month', Income.income_date)
+    for user_id, year, month, total, count in session.execute(
+        select(
+            Income.user_id, income_year, income_month,
+            func.sum(Income.amount), func.count(Income.id)
+        ).where(*income_filter).group_by(Income.user_id, income_year, income_month)
+    ):
+        row = monthly_row(user_id, year, month)
+        row['income_total'] = total or Decimal('0')
+        row['income_count'] = count or 0
+    
+    if daily_rows:
+        session.execute(insert(DailyUserCategoryTotal), daily_rows)
+    if monthly:
+        session.execute(insert(MonthlyUserTotal), list(monthly.values()))
+    
+    return {'daily': len(daily_rows), 'monthly': len(monthly)}
+
+
+def _bulk_insert(
+    session: Session,
+    expenses: List[Dict[str, Any]],
+    incomes: List[Dict[str, Any]]
+) -> Tuple[List[Optional[int]], List[Optional[int]]]:
+    """
+    Xarajat va daromadlarni bitta executemany bilan qo'shish (commit qilinmaydi)
+    
+    Rollup'lar ham shu tranzaksiyada yangilanadi - bir xil
+    (user, kategoriya, kun) uchun deltalar oldindan yig'iladi.
+    
+    Args:
+        session: SQLAlchemy session
+        expenses: [{'telegram_id', 'amount', 'category_key', 'description', 'expense_date'}]
+        incomes: [{'telegram_id', 'amount', 'source', 'income_type', 'is_recurring', 'income_date'}]
+        
+    Returns:
+        tuple: (xarajat ID'lari, daromad ID'lari) - kirish tartibida,
+               kategoriya topilmagan xarajat uchun None
+    """
+    now = datetime.now()
+    expense_ids: List[Optional[int]] = [None] * len(expenses)
+    income_ids: List[Optional[int]] = [None] * len(incomes)
+    
+    # Xarajatlar
+    expense_rows = []
+    expense_positions = []
+    for position, item in enumerate(expenses):
+        category_id = category_registry.get_id(item.get('category_key'))
+        if category_id is None:
+            logger.error(f"Kategoriya topilmadi: {item.get('category_key')}")
+            continue
+        expense_rows.append({
+            'user_id': item['telegram_id'],
+            'category_id': category_id,
+            'amount': item['amount'],
+            'description': item.get('description'),
+            'expense_date': item.get('expense_date') or now
+        })
+        expense_positions.append(position)
+    
+    if expense_rows:
+        result = session.execute(
+            insert(Expense).returning(Expense.id, sort_by_parameter_order=True),
+            expense_rows
+        )
+        for position, new_id in zip(expense_positions, result.scalars()):
+            expense_ids[position] = new_id
+        
+        daily_deltas: Dict[Tuple[int, Optional[int], date], List] = {}
+        for row in expense_rows:
+            key = (row['user_id'], row['category_id'], row['expense_date'].date())
+            delta = daily_deltas.setdefault(key, [Decimal('0'), 0, row['expense_date']])
+            delta[0] += Decimal(str(row['amount']))
+            delta[1] += 1
+        for (user_id, category_id, _), (amount, count, when) in daily_deltas.items():
+            _apply_expense_rollup(session, user_id, category_id, when, amount, count)
+    
+    # Daromadlar
+    if incomes:
+        income_rows = [{
+            'user_id': item['telegram_id'],
+            'amount': item['amount'],
+            'source': item.get('source'),
+            'income_type': item.get('income_type') or 'other',
+            'is_recurring': item.get('is_recurring', False),
+            'income_date': item.get('income_date') or now
+        } for item in incomes]
+        
+        result = session.execute(
+            insert(Income).returning(Income.id, sort_by_parameter_order=True),
+            income_rows
+        )
+        income_ids = list(result.scalars())
+        
+        for row in income_rows:
+            _apply_income_rollup(session, row['user_id'], row['income_date'], Decimal(str(row['amount'])), 1)
+    
+    return expense_ids, income_ids
+
+
+def _is_day_aligned(start_date: Optional[datetime], end_date: Optional[datetime]) -> bool:
+    """
+    Oraliq to'liq kunlardan iboratmi (00:00 - 23:59:59)
+    
+    Faqat shunday oraliqlar uchun rollup jadvallardan o'qish mumkin.
+    filters.get_*_range() funksiyalari doim shunday oraliq qaytaradi.
+    """
+    if start_date is None or end_date is None:
+        return False
+    return start_date.time() == dt_time.min and end_date.time() >= dt_time(23, 59, 59)
+
+
+def _split_full_months(
+    start_day: date,
+    end_day: date
+) -> Tuple[Optional[Tuple[int, int]], List[Tuple[date, date]]]:
+    """
+    Kunlar oralig'ini to'liq oylar va chekka kunlarga ajratish
+    
+    Returns:
+        tuple: ((birinchi_oy_index, oxirgi_oy_index) yoki None,
+                [(chekka_boshi, chekka_oxiri), ...])
+        Oy index = year * 12 + month
+    """
+    if start_day.day == 1:
+        first_full = start_day
+    else:
+        first_full = (start_day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    after_full = (end_day + timedelta(days=1)).replace(day=1)
+    
+    if first_full >= after_full:
+        return None, [(start_day, end_day)]
+    
+    last_full = after_full - timedelta(days=1)
+    edges = []
+    if start_day < first_full:
+        edges.append((start_day, first_full - timedelta(days=1)))
+    if after_full <= end_day:
+        edges.append((after_full, end_day))
+    
+    return (first_full.year * 12 + first_full.month, last_full.year * 12 + last_full.month), edges
+
+
+def _month_index_filter(month_range: Tuple[int, int]):
+    """MonthlyUserTotal uchun oy index oralig'i filtri"""
+    month_index = MonthlyUserTotal.year * 12 + MonthlyUserTotal.month
+    return month_index.between(month_range[0], month_range[1])
+
+
+def _total_expenses_stmt(
+    telegram_id: int,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+):
+    """
+    Jami xarajat so'rovi - imkon bo'lsa rollup jadvallardan
+    
+    To'liq oylar monthly_user_totals dan, chekka kunlar
+    daily_user_category_totals dan o'qiladi.
+    """
+    if start_date is None and end_date is None:
+        return select(func.sum(MonthlyUserTotal.expense_total)).where(
+            MonthlyUserTotal.user_id == telegram_id
+        )
+    
+    if not _is_day_aligned(start_date, end_date):
+        stmt = select(func.sum(Expense.amount)).where(Expense.user_id == telegram_id)
+        if start_date:
+            stmt = stmt.where(Expense.expense_date >= start_date)
+        if end_date:
+            stmt = stmt.where(Expense.expense_date <= end_date)
+        return stmt
+    
+    month_range, edges = _split_full_months(start_date.date(), end_date.date())
+    parts = []
+    if month_range:
+        parts.append(select(func.sum(MonthlyUserTotal.expense_total)).where(
+            MonthlyUserTotal.user_id == telegram_id,
+            _month_index_filter(month_range)
+        ).scalar_subquery())
+    if edges:
+        parts.append(select(func.sum(DailyUserCategoryTotal.expense_total)).where(
+            DailyUserCategoryTotal.user_id == telegram_id,
+            or_(*[DailyUserCategoryTotal.day.between(a, b) for a, b in edges])
+        ).scalar_subquery())
+    
+    total = func.coalesce(parts[0], 0)
+    for part in parts[1:]:
+        total = total + func.coalesce(part, 0)
+    return select(total)
+
+
+def _total_income_stmt(
+    telegram_id: int,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+):
+    """
+    Jami daromad so'rovi - imkon bo'lsa rollup jadvaldan
+    
+    To'liq oylar monthly_user_totals dan, chekka kunlar esa
+    incomes jadvalidan (idx_income_user_date) o'qiladi.
+    """
+    if start_date is None and end_date is None:
+        return select(func.sum(MonthlyUserTotal.income_total)).where(
+            MonthlyUserTotal.user_id == telegram_id
+        )
+    
+    if not _is_day_aligned(start_date, end_date):
+        stmt = select(func.sum(Income.amount)).where(Income.user_id == telegram_id)
+        if start_date:
+            stmt = stmt.where(Income.income_date >= start_date)
+        if end_date:
+            stmt = stmt.where(Income.income_date <= end_date)
+        return stmt
+    
+    month_range, edges = _split_full_months(start_date.date(), end_date.date())
+    parts = []
+    if month_range:
+        parts.append(select(func.sum(MonthlyUserTotal.income_total)).where(
+            MonthlyUserTotal.user_id == telegram_id,
+            _month_index_filter(month_range)
+        ).scalar_subquery())
+    if edges:
+        parts.append(select(func.sum(Income.amount)).where(
+            Income.user_id == telegram_id,
+            or_(*[
+                Income.income_date.between(
+                    datetime.combine(a, dt_time.min),
+                    datetime.combine(b, dt_time.max)
+                ) for a, b in edges
+            ])
+        ).scalar_subquery())
+    
+    total = func.coalesce(parts[0], 0)
+    for part in parts[1:]:
+        total = total + func.coalesce(part, 0)
+    return select(total)
+
+
+def _expenses_by_category_stmt(
+    telegram_id: int,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+):
+    """
+    Kategoriya bo'yicha xarajatlar so'rovi - imkon bo'lsa rollup jadvaldan
+    
+    Qatorlar: (Category, total, count)
+    """
+    if (start_date is None and end_date is None) or _is_day_aligned(start_date, end_date):
+        stmt = select(
+            Category,
+            func.sum(DailyUserCategoryTotal.expense_total).label('total'),
+            func.sum(DailyUserCategoryTotal.expense_count).label('count')
+        ).join(
+            DailyUserCategoryTotal, DailyUserCategoryTotal.category_id == Category.id
+        ).where(
+            DailyUserCategoryTotal.user_id == telegram_id
+        )
+        if start_date is not None:
+            stmt = stmt.where(DailyUserCategoryTotal.day.between(start_date.date(), end_date.date()))
+        return stmt.group_by(Category.id).having(
+            func.sum(DailyUserCategoryTotal.expense_count) > 0
+        ).order_by(desc('total'))
+    
+    stmt = select(
+        Category,
+        func.sum(Expense.amount).label('total'),
+        func.count(Expense.id).label('count')
+    ).join(
+        Expense, Expense.category_id == Category.id
+    ).where(
+        Expense.user_id == telegram_id
+    )
+    if start_date:
+        stmt = stmt.where(Expense.expense_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Expense.expense_date <= end_date)
+    return stmt.group_by(Category.id).order_by(desc('total'))
+
+
+# =====================================================
+# REPORT SNAPSHOT HELPERS
+# =====================================================
+def _report_aggregate_stmt(telegram_id: int, start_date: datetime, end_date: datetime):
+    """
+    Hisobot uchun barcha agregatlarni bitta so'rovda olish
+    
+    Davrdagi xarajatlar CTE'ga olinadi, keyin UNION ALL orqali
+    kategoriya, kun va daromad bo'yicha yig'indilar qaytariladi.
+    
+    Qatorlar: (kind, category_id, day, total, count)
+        kind = 'category' | 'day' | 'income'
+    
+    Oraliq to'liq kunlardan iborat bo'lsa, xarajatlar xom jadval o'rniga
+    daily_user_category_totals rollup jadvalidan o'qiladi.
+    """
+    if _is_day_aligned(start_date, end_date):
+        period_expenses = select(
+            DailyUserCategoryTotal.category_id.label('category_id'),
+            DailyUserCategoryTotal.day.label('day'),
+            DailyUserCategoryTotal.expense_total.label('amount'),
+            DailyUserCategoryTotal.expense_count.label('count')
+        ).where(
+            DailyUserCategoryTotal.user_id == telegram_id,
+            DailyUserCategoryTotal.day.between(start_date.date(), end_date.date()),
+            DailyUserCategoryTotal.expense_count > 0
+        ).cte('period_expenses')
+        row_count = func.sum(period_expenses.c.count)
+    else:
+        period_expenses = select(
+            Expense.category_id.label('category_id'),
+            func.date(Expense.expense_date).label('day'),
+            Expense.amount.label('amount')
+        ).where(
+            Expense.user_id == telegram_id,
+            Expense.expense_date >= start_date,
+            Expense.expense_date <= end_date
+        ).cte('period_expenses')
+        row_count = func.count()
+    
+    by_category = select(
+        literal('category').label('kind'),
+        period_expenses.c.category_id.label('category_id'),
+        cast(null(), Date).label('day'),
+        func.sum(period_expenses.c.amount).label('total'),
+        row_count.label('count')
+    ).group_by(period_expenses.c.category_id)
+    
+    by_day = select(
+        literal('day'),
+        cast(null(), Integer),
+        period_expenses.c.day,
+        func.sum(period_expenses.c.amount),
+        row_count
+    ).group_by(period_expenses.c.day)
+    
+    income_total = select(
+        literal('income'),
+        cast(null(), Integer),
+        cast(null(), Date),
+        func.sum(Income.amount),
+        func.count(Income.id)
+    ).where(
+        Income.user_id == telegram_id,
+        Income.income_date >= start_date,
+        Income.income_date <= end_date
+    )
+    
+    return union_all(by_category, by_day, income_total)
+
+
+def _build_report_snapshot(
+    aggregate_rows: List[Tuple],
+    categories: Dict[int, Category],
+    expenses: List[Expense],
+    incomes: List[Income]
+) -> Dict[str, Any]:
+    """
+    Agregat qatorlaridan hisobot snapshot'ini yig'ish
+    
+    Returns:
+        Dict: get_report_snapshot() natijasi
+    """
+    expenses_by_category = []
+    daily_totals: Dict[date, Decimal] = {}
+    total_expense = Decimal('0.00')
+    expense_count = 0
+    total_income = Decimal('0.00')
+    income_count = 0
+    
+    for kind, category_id, day, total, count in aggregate_rows:
+        total = Decimal(str(total)) if total is not None else Decimal('0.00')
+        if kind == 'category':
+            total_expense += total
+            expense_count += count or 0
+            category = categories.get(category_id)
+            if category:
+                expenses_by_category.append({
+                    'category': category,
+                    'total': total,
+                    'count': count or 0
+                })
+        elif kind == 'day':
+            # SQLite func.date() satr qaytaradi, PostgreSQL esa date
+            if isinstance(day, str):
+                day = date.fromisoformat(day)
+            daily_totals[day] = total
+        elif kind == 'income':
+            total_income = total
+            income_count = count or 0
+    
+    expenses_by_category.sort(key=lambda item: item['total'], reverse=True)
+    
+    return {
+        'total_expense': total_expense,
+        'total_income': total_income,
+        'balance': total_income - total_expense,
+        'expense_count': expense_count,
+        'income_count': income_count,
+        'expenses_by_category': expenses_by_category,
+        'daily_totals': daily_totals,
+        'expenses': expenses,
+        'incomes': incomes,
+    }
+
+
+# =====================================================
+# PERIOD SUMMARY HELPERS
+# =====================================================
+def _period_summaries(
+    session: Session,
+    start_day: date,
+    end_day: date,
+    after_user_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Davr ichida faol bo'lgan barcha foydalanuvchilar uchun xulosa
+    
+    Foydalanuvchilar soniga bog'liq bo'lmagan uchta GROUP BY so'rov:
+    xarajatlar (kunlik rollup, user + kategoriya), daromadlar (user) va
+    faol foydalanuvchilar tili.
+    
+    Args:
+        session: Sync session (async manager'dan run_sync orqali)
+        start_day: Boshlanish kuni (shu kun ham kiradi)
+        end_day: Tugash kuni (shu kun ham kiradi)
+        after_user_id: Faqat shu ID'dan keyingi foydalanuvchilar (checkpoint)
+        
+    Returns:
+        List[Dict]: telegram_id bo'yicha saralangan xulosalar
+    """
+    start_dt = datetime.combine(start_day, dt_time.min)
+    end_dt = datetime.combine(end_day, dt_time.max)
+    
+    daily_filter = and_(
+        DailyUserCategoryTotal.day >= start_day,
+        DailyUserCategoryTotal.day <= end_day
+    )
+    income_filter = and_(
+        Income.income_date >= start_dt,
+        Income.income_date <= end_dt
+    )
+    if after_user_id is not None:
+        daily_filter = and_(daily_filter, DailyUserCategoryTotal.user_id > after_user_id)
+        income_filter = and_(income_filter, Income.user_id > after_user_id)
+    
+    users = session.execute(
+        select(User.telegram_id, User.language).where(
+            User.is_active == True,
+            or_(
+                User.telegram_id.in_(select(DailyUserCategoryTotal.user_id).where(daily_filter)),
+                User.telegram_id.in_(select(Income.user_id).where(income_filter))
+            )
+        ).order_by(User.telegram_id)
+    ).all()
+    
+    summaries = {
+        telegram_id: {
+            'user_id': telegram_id,
+            'language': language or 'uz',
+            'total_expense': Decimal('0.00'),
+            'expense_count': 0,
+            'total_income': Decimal('0.00'),
+            'income_count': 0,
+            'top_category_id': None,
+            'top_category_total': Decimal('0.00'),
+        }
+        for telegram_id, language in users
+    }
+    if not summaries:
+        return []
+    
+    expense_rows = session.execute(
+        select(
+            DailyUserCategoryTotal.user_id,
+            DailyUserCategoryTotal.category_id,
+            func.sum(DailyUserCategoryTotal.expense_total),
+            func.sum(DailyUserCategoryTotal.expense_count)
+        ).where(daily_filter).group_by(
+            DailyUserCategoryTotal.user_id,
+            DailyUserCategoryTotal.category_id
+        )
+    ).all()
+    
+    for user_id, category_id, total, count in expense_rows:
+        summary = summaries.get(user_id)
+        if summary is None:
+            continue
+        total = Decimal(str(total or 0))
+        summary['total_expense'] += total
+        summary['expense_count'] += int(count or 0)
+        if total > summary['top_category_total']:
+            summary['top_category_id'] = category_id
+            summary['top_category_total'] = total
+    
+    income_rows = session.execute(
+        select(
+            Income.user_id,
+            func.sum(Income.amount),
+            func.count(Income.id)
+        ).where(income_filter).group_by(Income.user_id)
+    ).all()
+    
+    for user_id, total, count in income_rows:
+        summary = summaries.get(user_id)
+        if summary is None:
+            continue
+        summary['total_income'] = Decimal(str(total or 0))
+        summary['income_count'] = int(count or 0)
+    
+    result = list(summaries.values())
+    for summary in result:
+        summary['balance'] = summary['total_income'] - summary['total_expense']
+    return result
+
+
+def _load_job_checkpoint(session: Session, name: str) -> Optional[Dict[str, Any]]:
+    """Checkpoint'ni dict ko'rinishida olish"""
+    checkpoint = session.get(JobCheckpoint, name)
+    if checkpoint is None:
+        return None
+    return {
+        'period_key': checkpoint.period_key,
+        'last_user_id': checkpoint.last_user_id,
+        'completed': checkpoint.completed,
+    }
+
+
+def _store_job_checkpoint(
+    session: Session,
+    name: str,
+    period_key: str,
+    last_user_id: Optional[int],
+    completed: bool
+) -> None:
+    """Checkpoint'ni yaratish yoki yangilash"""
+    session.merge(JobCheckpoint(
+        name=name,
+        period_key=period_key,
+        last_user_id=last_user_id,
+        completed=completed
+    ))
+
+
+# =====================================================
+# CATEGORY CLASSIFIER HELPERS
+# =====================================================
+def _load_category_tokens(session: Session, telegram_id: int) -> List[Tuple[str, int, int]]:
+    """Foydalanuvchining barcha (token, category_id, count) qatorlari"""
+    rows = session.execute(
+        select(
+            UserCategoryToken.token,
+            UserCategoryToken.category_id,
+            UserCategoryToken.count
+        ).where(UserCategoryToken.user_id == telegram_id)
+    ).all()
+    return [(token, category_id, count) for token, category_id, count in rows]
+
+
+def _apply_category_tokens(
+    session: Session,
+    telegram_id: int,
+    category_id: int,
+    tokens: Dict[str, int],
+    docs: int = 1
+) -> None:
+    """
+    Hujjat va token hisoblagichlarini delta bilan o'zgartirish (commit qilinmaydi)
+    
+    Rollup'lar kabi: avval UPDATE, qator bo'lmasa INSERT. Manfiy delta
+    (bekor qilingan xarajat) hisoblagichni noldan pastga tushirmaydi.
+    """
+    deltas = {UserCategoryToken.DOC_TOKEN: docs}
+    deltas.update(tokens)
+    
+    for token, count in deltas.items():
+        new_count = UserCategoryToken.count + count
+        if count < 0:
+            new_count = case((new_count < 0, 0), else_=new_count)
+        result = session.execute(
+            update(UserCategoryToken).where(
+                UserCategoryToken.user_id == telegram_id,
+                UserCategoryToken.token == token,
+                UserCategoryToken.category_id == category_id
+            ).values(
+                count=new_count
+            ).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0 and count > 0:
+            session.execute(insert(UserCategoryToken).values(
+                user_id=telegram_id,
+                token=token,
+                category_id=category_id,
+                count=count
+            ))
+
+
+# =====================================================
+# DEBT HELPERS
+# =====================================================
+ACTIVE_DEBT_STATUSES = ('active', 'partially_paid')
+
+
+def _debt_statistics_stmt(telegram_id: int):
+    """
+    Qarz statistikasi uchun bitta GROUP BY so'rov
+    
+    Har bir debt_type uchun bitta qator: jami, faol qoldiq, to'langan,
+    soni va muddati o'tganlar soni. Debt ob'ektlari yuklanmaydi.
+    """
+    active_remaining = case(
+        (Debt.status.in_(ACTIVE_DEBT_STATUSES), Debt.amount - Debt.paid_amount),
+        else_=0
+    )
+    overdue_flag = case((Debt.status == 'overdue', 1), else_=0)
+    
+    return select(
+        Debt.debt_type,
+        func.coalesce(func.sum(Debt.amount), 0),
+        func.coalesce(func.sum(active_remaining), 0),
+        func.coalesce(func.sum(Debt.paid_amount), 0),
+        func.count(Debt.id),
+        func.coalesce(func.sum(overdue_flag), 0),
+    ).where(
+        Debt.user_id == telegram_id
+    ).group_by(Debt.debt_type)
+
+
+def _build_debt_statistics(rows) -> Dict[str, Any]:
+    """
+    GROUP BY natijasini get_debt_statistics formatiga aylantirish
+    
+    Qarzi bo'lmagan tur ham nol qiymatlar bilan qaytadi.
+    """
+    stats = {
+        debt_type: {
+            'total': Decimal('0.00'),
+            'active': Decimal('0.00'),
+            'paid': Decimal('0.00'),
+            'count': 0,
+            'overdue': 0
+        }
+        for debt_type in ('given', 'taken')
+    }
+    
+    for debt_type, total, active, paid, count, overdue in rows:
+        stats[debt_type] = {
+            'total': Decimal(str(total)),
+            'active': Decimal(str(active)),
+            'paid': Decimal(str(paid)),
+            'count': int(count),
+            'overdue': int(overdue)
+        }
+    
+    return stats
+
+
+def _overdue_debts_filter(today: date):
+    """Muddati o'tgan (lekin hali 'overdue' belgilanmagan) qarzlar sharti"""
+    return and_(
+        Debt.status.in_(ACTIVE_DEBT_STATUSES),
+        Debt.due_date < today
+    )
+
+
+def _sweep_overdue_chunk(session: Session, today: date, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Bitta bo'lak muddati o'tgan qarzni 'overdue' holatiga o'tkazish
+    
+    UPDATE ... WHERE id IN (SELECT id ... LIMIT :chunk) RETURNING id, user_id -
+    ORM ob'ektlari yuklanmaydi. RETURNING qo'llanmaydigan bazalarda
+    avval id'lar tanlanadi, keyin shu id'lar yangilanadi.
+    
+    Args:
+        session: Sync session (async manager'dan run_sync orqali)
+        today: Bugungi sana
+        chunk_size: Bo'lak hajmi
+        
+    Returns:
+        List[Tuple[int, int]]: (debt_id, user_id) juftliklari
+    """
+    candidates = select(Debt.id).where(_overdue_debts_filter(today)).limit(chunk_size)
+    values = {'status': 'overdue', 'updated_at': func.now()}
+    
+    if session.get_bind().dialect.update_returning:
+        stmt = update(Debt).where(
+            Debt.id.in_(candidates.scalar_subquery())
+        ).values(**values).returning(Debt.id, Debt.user_id)
+        rows = session.execute(stmt, execution_options={'synchronize_session': False}).all()
+        return [(row[0], row[1]) for row in rows]
+    
+    rows = [(row[0], row[1]) for row in session.execute(
+        select(Debt.id, Debt.user_id).where(_overdue_debts_filter(today)).limit(chunk_size)
+    ).all()]
+    if rows:
+        session.execute(
+            update(Debt).where(Debt.id.in_([row[0] for row in rows])).values(**values),
+            execution_options={'synchronize_session': False}
+        )
+    return rows
+
+
+# =====================================================
+# REMINDER HELPERS
+# =====================================================
+_reminder_listeners: List[Callable[[Reminder], None]] = []
+
+
+def add_reminder_listener(callback: Callable[[Reminder], None]) -> None:
+    """
+    Yangi eslatma qo'shilganda chaqiriladigan hook'ni ro'yxatdan o'tkazish
+    
+    Callback add_reminder() commit'dan keyin chaqiriladi - thread pool
+    rejimida worker thread'dan ham chaqirilishi mumkin.
+    """
+    if callback not in _reminder_listeners:
+        _reminder_listeners.append(callback)
+
+
+def remove_reminder_listener(callback: Callable[[Reminder], None]) -> None:
+    """Hook'ni ro'yxatdan o'chirish"""
+    if callback in _reminder_listeners:
+        _reminder_listeners.remove(callback)
+
+
+def _notify_reminder_added(reminder: Reminder) -> None:
+    """Barcha hook'larni chaqirish (hook xatosi eslatma qo'shishni buzmaydi)"""
+    for callback in list(_reminder_listeners):
+        try:
+            callback(reminder)
+        except Exception as e:
+            logger.error(f"Reminder listener xatosi: {e}")
+
+
+def _upcoming_reminders_stmt(
+    until: datetime,
+    after: Optional[Tuple[datetime, int]],
+    limit: int
+):
+    """
+    Yuborilmagan eslatmalar - (reminder_date, id) bo'yicha keyset
+    
+    idx_reminder_sent (is_sent, reminder_date) indeksidan o'qiladi.
+    """
+    stmt = select(Reminder).where(
+        Reminder.is_sent == False,
+        Reminder.reminder_date <= until
+    )
+    
+    if after is not None:
+        after_date, after_id = after
+        stmt = stmt.where(or_(
+            Reminder.reminder_date > after_date,
+            and_(Reminder.reminder_date == after_date, Reminder.id > after_id)
+        ))
+    
+    return stmt.order_by(asc(Reminder.reminder_date), asc(Reminder.id)).limit(limit)
+
+
+def _mark_reminders_sent_stmt(reminder_ids: List[int]):
+    """Eslatmalarni bitta UPDATE bilan yuborilgan deb belgilash"""
+    return update(Reminder).where(
+        Reminder.id.in_(reminder_ids),
+        Reminder.is_sent == False
+    ).values(is_sent=True, sent_at=datetime.now())
+
+
+# =====================================================
+# SCHEMA HELPERS
+# =====================================================
+# Mavjud jadvallarga keyinroq qo'shilgan indekslar. create_all faqat yangi
+# jadval yaratganda indeks quradi, eski bazalarda ular alohida yaratiladi.
+ADDED_INDEXES = frozenset({
+    'idx_debt_user_created',    # qarzlar ro'yxati keyset tartibi (user_id, created_at)
+    'idx_debt_status_due',      # muddati o'tgan qarzlar sweep'i (status, due_date)
+})
+
+
+def _ensure_indexes(connection) -> None:
+    """
+    ADDED_INDEXES ni CREATE INDEX IF NOT EXISTS bilan yaratish
+    
+    Args:
+        connection: Sync connection (async engine'da run_sync orqali)
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in ADDED_INDEXES:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+# =====================================================
+# KEYSET PAGINATION HELPERS
+# =====================================================
+PAGE_NEXT = 'next'
+PAGE_PREV = 'prev'
+
+
+def _keyset_page_stmt(
+    stmt,
+    model,
+    date_col,
+    user_id: int,
+    cursor: Optional[int],
+    direction: str,
+    limit: int
+):
+    """
+    Statement'ga keyset sahifalash shartlarini qo'shish
+    
+    Tartib (date_col DESC, id DESC). Cursor - sahifa chegarasidagi yozuv id'si,
+    uning sanasi subquery orqali olinadi, shuning uchun callback data'da faqat
+    id saqlanadi. OFFSET ishlatilmaydi - baza faqat bitta sahifa (+1 qator,
+    keyingi sahifa borligini bilish uchun) qaytaradi.
+    
+    Anchor faqat shu foydalanuvchining yozuvlari ichidan qidiriladi. Topilmasa
+    (o'chirilgan yoki boshqa foydalanuvchiniki) subquery NULL qaytaradi va
+    so'rov bo'sh chiqadi - chaqiruvchi _keyset_fallback_needed bilan birinchi
+    sahifani oladi.
+    
+    Args:
+        stmt: Asosiy select (foydalanuvchi filtri bilan)
+        model: ORM model (Expense, Income, Debt)
+        date_col: Saralash ustuni
+        user_id: Foydalanuvchi ID (anchor shu bilan cheklanadi)
+        cursor: Chegara yozuv id'si (None = birinchi sahifa)
+        direction: PAGE_NEXT (eskiroq) yoki PAGE_PREV (yangiroq)
+        limit: Sahifa hajmi
+    """
+    if cursor is not None:
+        anchor = select(date_col).where(
+            model.id == cursor,
+            model.user_id == user_id
+        ).scalar_subquery()
+        if direction == PAGE_PREV:
+            stmt = stmt.where(or_(
+                date_col > anchor,
+                and_(date_col == anchor, model.id > cursor)
+            ))
+        else:
+            stmt = stmt.where(or_(
+                date_col < anchor,
+                and_(date_col == anchor, model.id < cursor)
+            ))
+    
+    if direction == PAGE_PREV:
+        stmt = stmt.order_by(asc(date_col), asc(model.id))
+    else:
+        stmt = stmt.order_by(desc(date_col), desc(model.id))
+    
+    return stmt.limit(limit + 1)
+
+
+def _keyset_fallback_needed(rows: List[Any], cursor: Optional[int]) -> bool:
+    """
+    Cursor bilan so'ralgan sahifa bo'shmi (anchor topilmadi)
+    
+    Cursor faqat mavjud qo'shni yozuvdan beriladi, shuning uchun bo'sh
+    natija anchor yo'qolganini bildiradi - birinchi sahifa qaytariladi.
+    """
+    return cursor is not None and not rows
+
+
+def _keyset_page_result(
+    rows: List[Any],
+    cursor: Optional[int],
+    direction: str,
+    limit: int
+) -> Tuple[List[Any], Optional[int], Optional[int]]:
+    """
+    Keyset so'rov natijasini sahifaga aylantirish
+    
+    Returns:
+        Tuple: (items, prev_cursor, next_cursor) - cursor None bo'lsa
+        o'sha yo'nalishda sahifa yo'q
+    """
+    has_more = len(rows) > limit
+    items = list(rows[:limit])
+    
+    if not items:
+        return [], None, None
+    
+    if direction == PAGE_PREV:
+        items.reverse()
+        prev_cursor = items[0].id if has_more else None
+        # Orqaga yurilgan - cursor yozuvi keyingi sahifada turibdi
+        next_cursor = items[-1].id
+    else:
+        prev_cursor = items[0].id if cursor is not None else None
+        next_cursor = items[-1].id if has_more else None
+    
+    return items, prev_cursor, next_cursor
+
+
+def _expenses_page_stmt(
+    telegram_id: int,
+    cursor: Optional[int],
+    direction: str,
+    limit: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+):
+    """Xarajatlar sahifasi uchun statement (category oldindan yuklangan)"""
+    from sqlalchemy.orm import joinedload
+    
+    stmt = select(Expense).options(
+        joinedload(Expense.category)
+    ).where(Expense.user_id == telegram_id)
+    
+    if start_date:
+        stmt = stmt.where(Expense.expense_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Expense.expense_date <= end_date)
+    
+    return _keyset_page_stmt(stmt, Expense, Expense.expense_date, telegram_id, cursor, direction, limit)
+
+
+def _incomes_page_stmt(
+    telegram_id: int,
+    cursor: Optional[int],
+    direction: str,
+    limit: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+):
+    """Daromadlar sahifasi uchun statement"""
+    stmt = select(Income).where(Income.user_id == telegram_id)
+    
+    if start_date:
+        stmt = stmt.where(Income.income_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Income.income_date <= end_date)
+    
+    return _keyset_page_stmt(stmt, Income, Income.income_date, telegram_id, cursor, direction, limit)
+
+
+def _debts_page_stmt(
+    telegram_id: int,
+    cursor: Optional[int],
+    direction: str,
+    limit: int,
+    debt_type: Optional[str] = None,
+    status: Optional[str] = None
+):
+    """Qarzlar sahifasi uchun statement"""
+    stmt = select(Debt).where(Debt.user_id == telegram_id)
+    
+    if debt_type:
+        stmt = stmt.where(Debt.debt_type == debt_type)
+    if status:
+        stmt = stmt.where(Debt.status == status)
+    
+    return _keyset_page_stmt(stmt, Debt, Debt.created_at, telegram_id, cursor, direction, limit)
+
+
+# =====================================================
+# EXPORT HELPERS
+# =====================================================
+def _export_rows_stmt(telegram_id: int):
+    """
+    Eksport uchun barcha xarajat va daromadlar - sana bo'yicha bitta oqim
+    
+    Ustunlar: (date, type, category, amount, description). Daromadlar uchun
+    category = income_type, description = source.
+    """
+    expenses = select(
+        Expense.expense_date.label('date'),
+        literal('expense').label('type'),
+        Category.key.label('category'),
+        Expense.amount.label('amount'),
+        Expense.description.label('description')
+    ).outerjoin(
+        Category, Expense.category_id == Category.id
+    ).where(Expense.user_id == telegram_id)
+    
+    incomes = select(
+        Income.income_date,
+        literal('income'),
+        Income.income_type,
+        Income.amount,
+        Income.source
+    ).where(Income.user_id == telegram_id)
+    
+    rows = union_all(expenses, incomes).subquery('export_rows')
+    return select(rows).order_by(rows.c.date)
+
+
+# =====================================================
+# ENGINE SETTINGS
+# =====================================================
+def _is_sqlite_memory(url) -> bool:
+    """SQLite URL xotiradagi bazaga ishora qiladimi"""
+    database = url.database or ''
+    return database in ('', ':memory:') or url.query.get('mode') == 'memory'
+
+
+def _install_sqlite_pragmas(engine: Engine) -> None:
+    """
+    Har bir yangi SQLite ulanishida PRAGMA'larni o'rnatish
+    
+    journal_mode=WAL - o'quvchilar yozuvchini bloklamaydi (hisobotlar
+    xarajat qo'shish paytida kutmaydi). WAL rejimida synchronous=NORMAL
+    xavfsiz va har bir commit'dagi fsync'ni olib tashlaydi.
+    busy_timeout - "database is locked" xatosi o'rniga qulf bo'shashini kutish.
+    
+    Args:
+        engine: Sync engine (async engine uchun engine.sync_engine)
+    """
+    pragmas = [
+        f"PRAGMA busy_timeout={DatabaseConfig.SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={DatabaseConfig.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={DatabaseConfig.SQLITE_MMAP_SIZE}",
+        # Manfiy qiymat - KiB hisobida
+        f"PRAGMA cache_size=-{DatabaseConfig.SQLITE_CACHE_SIZE_KB}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _engine_options(url: str, async_mode: bool = False) -> Dict[str, Any]:
+    """
+    Dialektga mos engine parametrlari
+    
+    PostgreSQL uchun oddiy QueuePool (pool_size + max_overflow).
+    SQLite fayl bazasi uchun pool hajmi cheklangan (max_overflow=0): bitta
+    yozuvchi bo'lgani uchun ortiqcha ulanishlar faqat qulf uchun kurashadi.
+    Xotiradagi SQLite uchun StaticPool - barcha session'lar bitta bazani ko'radi.
+    
+    Args:
+        url: Database URL
+        async_mode: Async engine uchunmi
+        
+    Returns:
+        Dict: create_engine / create_async_engine kwargs
+    """
+    parsed = make_url(url)
+    
+    if parsed.get_backend_name() != 'sqlite':
+        return {
+            'pool_size': DatabaseConfig.POOL_SIZE,
+            'max_overflow': DatabaseConfig.MAX_OVERFLOW,
+            'echo': False,  # SQL log'larni ko'rsatmaslik (production)
+            'pool_pre_ping': True,  # Connection'ni tekshirish
+        }
+    
+    # Ulanish thread'lar orasida pool orqali almashadi
+    options: Dict[str, Any] = {
+        'echo': False,
+        'connect_args': {'check_same_thread': False},
+    }
+    
+    if _is_sqlite_memory(parsed):
+        options['poolclass'] = StaticPool
+    else:
+        # Lokal fayl - pre_ping kerak emas (uzilib qoladigan tarmoq yo'q)
+        options['poolclass'] = AsyncAdaptedQueuePool if async_mode else QueuePool
+        options['pool_size'] = DatabaseConfig.POOL_SIZE
+        options['max_overflow'] = 0
+    
+    return options
+
+
 # =====================================================
 # DATABASE MANAGER CLASS
 # =====================================================
-class DatabaseManager:
+class DatabaseManager:
+    """
+    Database bilan ishlash uchun asosiy class
+    Singleton pattern ishlatadi
+    """
+    
+    _instance = None
+    _engine = None
+    _session_factory = None
+    
+    def __new__(cls):
+        """Singleton pattern - faqat bitta instance"""
+        if cls._instance is None:
+            cls._instance = super(DatabaseManager, cls).__new__(cls)
+        return cls._instance
+    
+    def __init__(self):
+        """Database engine va session factory yaratish"""
+        if self._engine is None:
+            try:
+                # Sync engine
+                url = DatabaseConfig.DATABASE_URL
+                self._engine = create_engine(url, **_engine_options(url))
+                
+                if self._engine.dialect.name == 'sqlite':
+                    _install_sqlite_pragmas(self._engine)
+                
+                # Session factory
+                self._session_factory = sessionmaker(
+                    bind=self._engine,
+                    expire_on_commit=False
+                )
+                
+                logger.info("Database engine yaratildi")
+            except Exception as e:
+                logger.error(f"Database engine yaratishda xato: {e}")
+                raise
+    
+    def get_session(self) -> Session:
+        """
+        Yangi session yaratish
+        
+        Returns:
+            Session: SQLAlchemy session
+        """
+        return self._session_factory()
+    
+    @asynccontextmanager
+    async def session_scope(self):
+        """
+        Context manager - avtomatik commit/rollback
+        
+        Usage:
+            async with db_manager.session_scope() as session:
+                session.add(user)
+        """
+        session = self.get_session()
+        try:
+            yield session
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Session xatosi: {e}")
+            raise
+        finally:
+            session.close()
+    
+    async def create_tables(self):
+        """
+        Barcha jadvallarni yaratish
+        """
+        try:
+            rollups_existed = inspect(self._engine).has_table(MonthlyUserTotal.__tablename__)
+            Base.metadata.create_all(self._engine)
+            with self._engine.begin() as conn:
+                _ensure_indexes(conn)
+            logger.info("Database jadvallar yaratildi/tekshirildi")
+            
+            # Kategoriyalarni qo'shish
+            session = self.get_session()
+            try:
+                init_categories(session)
+                logger.info("Kategoriyalar yuklandi")
+            except Exception as e:
+                logger.error(f"Kategoriyalarni yuklashda xato: {e}")
+            finally:
+                session.close()
+            
+            self.load_categories()
+            
+            # Rollup jadvallar yangi yaratilgan bo'lsa - mavjud ma'lumotdan to'ldirish
+            if not rollups_existed:
+                self.rebuild_rollups()
+                
+        except Exception as e:
+            logger.error(f"Jadvallarni yaratishda xato: {e}")
+            raise
+    
+    async def close(self):
+        """Database connection'ni yopish"""
+        if self._engine:
+            self._engine.dispose()
+            logger.info("Database connection yopildi")
+    
+    
+    # =====================================================
+    # USER OPERATIONS
+    # =====================================================
+    
+    def get_or_create_user(
+        self, 
+        telegram_id: int, 
+        username: Optional[str] = None,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        language: str = 'uz'
+    ) -> User:
+        """
+        Foydalanuvchini olish yoki yangi yaratish
+        
+        Args:
+            telegram_id: Telegram user ID
+            username: Username
+            first_name: Ism
+            last_name: Familiya
+            language: Til
+            
+        Returns:
+            User: User object
+        """
+        # Keshda bo'lsa va ma'lumotlar o'zgarmagan bo'lsa - database'ga murojaat yo'q
+        cached = user_cache.get(telegram_id)
+        if cached and _profile_matches(cached, username, first_name, last_name):
+            return cached
+        
+        session = self.get_session()
+        try:
+            # Mavjud foydalanuvchini qidirish
+            user = session.query(User).filter(User.telegram_id == telegram_id).first()
+            
+            if user:
+                # Ma'lumotlarni yangilash
+                updated = False
+                if username and user.username != username:
+                    user.username = username
+                    updated = True
+                if first_name and user.first_name != first_name:
+                    user.first_name = first_name
+                    updated = True
+                if last_name and user.last_name != last_name:
+                    user.last_name = last_name
+                    updated = True
+                
+                if updated:
+                    session.commit()
+                    logger.info(f"User {telegram_id} ma'lumotlari yangilandi")
+            else:
+                # Yangi foydalanuvchi yaratish
+                user = User(
+                    telegram_id=telegram_id,
+                    username=username,
+                    first_name=first_name,
+                    last_name=last_name,
+                    language=language,
+                    is_active=True
+                )
+                session.add(user)
+                session.commit()
+                logger.info(f"Yangi foydalanuvchi yaratildi: {telegram_id}")
+            
+            user_cache.set(telegram_id, user)
+            return user
+        except Exception as e:
+            session.rollback()
+            logger.error(f"get_or_create_user xatosi: {e}")
+            raise
+        finally:
+            session.close()
+    
+    def update_user_language(self, telegram_id: int, language: str) -> bool:
+        """
+        Foydalanuvchi tilini yangilash
+        
+        Args:
+            telegram_id: Telegram user ID
+            language: Yangi til
+            
+        Returns:
+            bool: Muvaffaqiyatli bajarildi
+        """
+        session = self.get_session()
+        try:
+            user = session.query(User).filter(User.telegram_id == telegram_id).first()
+            if user:
+                user.language = language
+                session.commit()
+                user_cache.invalidate(telegram_id)
+                logger.info(f"User {telegram_id} til yangilandi: {language}")
+                return True
+            return False
+        except Exception as e:
+            session.rollback()
+            logger.error(f"update_user_language xatosi: {e}")
+            return False
+        finally:
+            session.close()
+    
+    def get_user_language(self, telegram_id: int) -> str:
+        """
+        Foydalanuvchi tilini olish
+        
+        Args:
+            telegram_id: Telegram user ID
+            
+        Returns:
+            str: Til kodi (uz, ru, en, tr, ar)
+        """
+        cached = user_cache.get(telegram_id)
+        if cached:
+            return cached.language
+        
+        session = self.get_session()
+        try:
+            user = session.query(User).filter(User.telegram_id == telegram_id).first()
+            if user:
+                user_cache.set(telegram_id, user)
+            return user.language if user else 'uz'
+        finally:
+            session.close()
+    
+    
+    # =====================================================
+    # CATEGORY OPERATIONS
+    # =====================================================
+    
+    def load_categories(self) -> None:
+        """Kategoriya registry'ni database'dan (qayta) yuklash"""
+        session = self.get_session()
+        try:
+            category_registry.load(session)
+        except Exception as e:
+            logger.error(f"Kategoriya registry yuklashda xato: {e}")
+        finally:
+            session.close()
+    
+    def _ensure_categories(self) -> None:
+        """Registry bekor qilingan yoki yuklanmagan bo'lsa - yuklash"""
+        if not category_registry.is_loaded:
+            self.load_categories()
+    
+    def get_all_categories(self, is_active: bool = True) -> List[Category]:
+        """
+        Barcha kategoriyalarni olish
+        
+        Args:
+            is_active: Faqat faol kategoriyalar
+            
+        Returns:
+            List[Category]: Kategoriyalar ro'yxati
+        """
+        self._ensure_categories()
+        return category_registry.all(is_active)
+    
+    def get_category_by_key(self, key: str) -> Optional[Category]:
+        """
+        Kategoriyani key bo'yicha olish (registry'dan)
+        
+        Args:
+            key: Kategoriya key
+            
+        Returns:
+            Optional[Category]: Kategoriya yoki None
+        """
+        self._ensure_categories()
+        return category_registry.get(key)
+    
+    
+    # =====================================================
+    # EXPENSE OPERATIONS
+    # =====================================================
+    
+    def add_expense(
+        self,
+        telegram_id: int,
+        amount: Decimal,
+        category_key: str,
+        description: Optional[str] = None,
+        expense_date: Optional[datetime] = None
+    ) -> Optional[Expense]:
+        """
+        Xarajat qo'shish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            amount: Summa
+            category_key: Kategoriya key
+            description: Tavsif
+            expense_date: Xarajat sanasi
+            
+        Returns:
+            Optional[Expense]: Yaratilgan xarajat
+        """
+        self._ensure_categories()
+        category_id = category_registry.get_id(category_key)
+        if category_id is None:
+            logger.error(f"Kategoriya topilmadi: {category_key}")
+            return None
+        
+        session = self.get_session()
+        try:
+            # Xarajat yaratish
+            expense = Expense(
+                user_id=telegram_id,
+                category_id=category_id,
+                amount=amount,
+                description=description,
+                expense_date=expense_date or datetime.now()
+            )
+            
+            session.add(expense)
+            _apply_expense_rollup(session, telegram_id, category_id, expense.expense_date, amount, 1)
+            session.commit()
+            logger.info(f"Xarajat qo'shildi: {telegram_id}, {amount}, {category_key}")
+            return expense
+        except Exception as e:
+            session.rollback()
+            logger.error(f"add_expense xatosi: {e}")
+            return None
+        finally:
+            session.close()
+    
+    def get_user_expenses(
+        self,
+        telegram_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category_key: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Expense]:
+        """
+        Foydalanuvchi xarajatlarini olish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            start_date: Boshlanish sanasi
+            end_date: Tugash sanasi
+            category_key: Kategoriya filtri
+            limit: Maksimal soni
+            
+        Returns:
+            List[Expense]: Xarajatlar ro'yxati
+        """
+        from sqlalchemy.orm import joinedload
+        
+        session = self.get_session()
+        try:
+            # EAGER LOADING - category ni oldindan yuklash
+            query = session.query(Expense).options(
+                joinedload(Expense.category)
+            ).filter(Expense.user_id == telegram_id)
+            
+            if start_date:
+                query = query.filter(Expense.expense_date >= start_date)
+            if end_date:
+                query = query.filter(Expense.expense_date <= end_date)
+            if category_key:
+                self._ensure_categories()
+                category_id = category_registry.get_id(category_key)
+                if category_id is not None:
+                    query = query.filter(Expense.category_id == category_id)
+            
+            query = query.order_by(desc(Expense.expense_date))
+            
+            if limit:
+                query = query.limit(limit)
+            
+            return query.all()
+        finally:
+            session.close()
+    
+    def get_user_expenses_page(
+        self,
+        telegram_id: int,
+        cursor: Optional[int] = None,
+        direction: str = PAGE_NEXT,
+        limit: int = 10,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Tuple[List[Expense], Optional[int], Optional[int]]:
+        """
+        Xarajatlarni keyset sahifalash bilan olish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            cursor: Chegara xarajat id'si (None = birinchi sahifa)
+            direction: PAGE_NEXT yoki PAGE_PREV
+            limit: Sahifa hajmi
+            start_date: Boshlanish sanasi
+            end_date: Tugash sanasi
+            
+        Returns:
+            Tuple: (xarajatlar, prev_cursor, next_cursor)
+        """
+        session = self.get_session()
+        try:
+            rows = session.execute(_expenses_page_stmt(
+                telegram_id, cursor, direction, limit, start_date, end_date
+            )).scalars().all()
+            
+            # Anchor topilmadi (o'chirilgan / boshqa foydalanuvchiniki) - birinchi sahifa
+            if _keyset_fallback_needed(rows, cursor):
+                rows = session.execute(_expenses_page_stmt(
+                    telegram_id, None, PAGE_NEXT, limit, start_date, end_date
+                )).scalars().all()
+                return _keyset_page_result(rows, None, PAGE_NEXT, limit)
+            
+            return _keyset_page_result(rows, cursor, direction, limit)
+        except Exception as e:
+            logger.error(f"get_user_expenses_page xatosi: {e}")
+            return [], None, None
+        finally:
+            session.close()
+    
+    def get_total_expenses(
+        self,
+        telegram_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Decimal:
+        """
+        Jami xarajatlar summasini hisoblash
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            start_date: Boshlanish sanasi
+            end_date: Tugash sanasi
+            
+        Returns:
+            Decimal: Jami summa
+        """
+        session = self.get_session()
+        try:
+            result = session.execute(
+                _total_expenses_stmt(telegram_id, start_date, end_date)
+            ).scalar()
+            return Decimal(str(result)) if result else Decimal('0.00')
+        finally:
+            session.close()
+    
+    def get_expenses_by_category(
+        self,
+        telegram_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Kategoriya bo'yicha xarajatlar statistikasi
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            start_date: Boshlanish sanasi
+            end_date: Tugash sanasi
+            
+        Returns:
+            List[Dict]: [{'category': Category, 'total': Decimal, 'count': int}]
+        """
+        session = self.get_session()
+        try:
+            query = session.execute(
+                _expenses_by_category_stmt(telegram_id, start_date, end_date)
+            )
+            
+            results = []
+            for category, total, count in query.all():
+                results.append({
+                    'category': category,
+                    'total': total or Decimal('0.00'),
+                    'count': count or 0
+                })
+            
+            return results
+        finally:
+            session.close()
+    
+    def delete_expense(self, expense_id: int, telegram_id: int) -> bool:
+        """
+        Xarajatni o'chirish
+        
+        Args:
+            expense_id: Xarajat ID
+            telegram_id: Foydalanuvchi ID (xavfsizlik uchun)
+            
+        Returns:
+            bool: Muvaffaqiyatli o'chirildi
+        """
+        session = self.get_session()
+        try:
+            expense = session.query(Expense).filter(
+                and_(Expense.id == expense_id, Expense.user_id == telegram_id)
+            ).first()
+            
+            if expense:
+                _apply_expense_rollup(
+                    session, expense.user_id, expense.category_id,
+                    expense.expense_date, -expense.amount, -1
+                )
+                session.delete(expense)
+                session.commit()
+                logger.info(f"Xarajat o'chirildi: {expense_id}")
+                return True
+            return False
+        except Exception as e:
+            session.rollback()
+            logger.error(f"delete_expense xatosi: {e}")
+            return False
+        finally:
+            session.close()
+    
+    def get_expense_by_id(self, expense_id: int, telegram_id: int) -> Optional[Expense]:
+        """
+        Xarajatni ID bo'yicha olish
+        
+        Args:
+            expense_id: Xarajat ID
+            telegram_id: Foydalanuvchi ID (xavfsizlik uchun)
+            
+        Returns:
+            Optional[Expense]: Xarajat yoki None
+        """
+        from sqlalchemy.orm import joinedload
+        
+        session = self.get_session()
+        try:
+            expense = session.query(Expense).options(
+                joinedload(Expense.category)
+            ).filter(
+                and_(Expense.id == expense_id, Expense.user_id == telegram_id)
+            ).first()
+            return expense
+        finally:
+            session.close()
+    
+    
+    # =====================================================
+    # INCOME OPERATIONS
+    # =====================================================
+    
+    def add_income(
+        self,
+        telegram_id: int,
+        amount: Decimal,
+        source: Optional[str] = None,
+        income_type: str = 'other',
+        is_recurring: bool = False,
+        income_date: Optional[datetime] = None
+    ) -> Optional[Income]:
+        """
+        Daromad qo'shish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            amount: Summa
+            source: Manba
+            income_type: Daromad turi
+            is_recurring: Takrorlanuvchi
+            income_date: Daromad sanasi
+            
+        Returns:
+            Optional[Income]: Yaratilgan daromad
+        """
+        session = self.get_session()
+        try:
+            income = Income(
+                user_id=telegram_id,
+                amount=amount,
+                source=source,
+                income_type=income_type,
+                is_recurring=is_recurring,
+                income_date=income_date or datetime.now()
+            )
+            
+            session.add(income)
+            _apply_income_rollup(session, telegram_id, income.income_date, amount, 1)
+            session.commit()
+            logger.info(f"Daromad qo'shildi: {telegram_id}, {amount}")
+            return income
+        except Exception as e:
+            session.rollback()
+            logger.error(f"add_income xatosi: {e}")
+            return None
+        finally:
+            session.close()
+    
+    def get_user_incomes(
+        self,
+        telegram_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[Income]:
+        """
+        Foydalanuvchi daromadlarini olish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            start_date: Boshlanish sanasi
+            end_date: Tugash sanasi
+            limit: Maksimal soni
+            
+        Returns:
+            List[Income]: Daromadlar ro'yxati
+        """
+        session = self.get_session()
+        try:
+            query = session.query(Income).filter(Income.user_id == telegram_id)
+            
+            if start_date:
+                query = query.filter(Income.income_date >= start_date)
+            if end_date:
+                query = query.filter(Income.income_date <= end_date)
+            
+            query = query.order_by(desc(Income.income_date))
+            
+            if limit:
+                query = query.limit(limit)
+            
+            return query.all()
+        finally:
+            session.close()
+    
+    def get_user_incomes_page(
+        self,
+        telegram_id: int,
+        cursor: Optional[int] = None,
+        direction: str = PAGE_NEXT,
+        limit: int = 10,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Tuple[List[Income], Optional[int], Optional[int]]:
+        """
+        Daromadlarni keyset sahifalash bilan olish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            cursor: Chegara daromad id'si (None = birinchi sahifa)
+            direction: PAGE_NEXT yoki PAGE_PREV
+            limit: Sahifa hajmi
+            start_date: Boshlanish sanasi
+            end_date: Tugash sanasi
+            
+        Returns:
+            Tuple: (daromadlar, prev_cursor, next_cursor)
+        """
+        session = self.get_session()
+        try:
+            rows = session.execute(_incomes_page_stmt(
+                telegram_id, cursor, direction, limit, start_date, end_date
+            )).scalars().all()
+            
+            # Anchor topilmadi (o'chirilgan / boshqa foydalanuvchiniki) - birinchi sahifa
+            if _keyset_fallback_needed(rows, cursor):
+                rows = session.execute(_incomes_page_stmt(
+                    telegram_id, None, PAGE_NEXT, limit, start_date, end_date
+                )).scalars().all()
+                return _keyset_page_result(rows, None, PAGE_NEXT, limit)
+            
+            return _keyset_page_result(rows, cursor, direction, limit)
+        except Exception as e:
+            logger.error(f"get_user_incomes_page xatosi: {e}")
+            return [], None, None
+        finally:
+            session.close()
+    
+    def get_total_income(
+        self,
+        telegram_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Decimal:
+        """
+        Jami daromad summasini hisoblash
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            start_date: Boshlanish sanasi
+            end_date: Tugash sanasi
+            
+        Returns:
+            Decimal: Jami summa
+        """
+        session = self.get_session()
+        try:
+            result = session.execute(
+                _total_income_stmt(telegram_id, start_date, end_date)
+            ).scalar()
+            return Decimal(str(result)) if result else Decimal('0.00')
+        finally:
+            session.close()
+    
+    def delete_income(self, income_id: int, telegram_id: int) -> bool:
+        """
+        Daromadni o'chirish
+        
+        Args:
+            income_id: Daromad ID
+            telegram_id: Foydalanuvchi ID (xavfsizlik uchun)
+            
+        Returns:
+            bool: Muvaffaqiyatli o'chirildi
+        """
+        session = self.get_session()
+        try:
+            income = session.query(Income).filter(
+                and_(Income.id == income_id, Income.user_id == telegram_id)
+            ).first()
+            
+            if income:
+                _apply_income_rollup(session, income.user_id, income.income_date, -income.amount, -1)
+                session.delete(income)
+                session.commit()
+                logger.info(f"Daromad o'chirildi: {income_id}")
+                return True
+            return False
+        except Exception as e:
+            session.rollback()
+            logger.error(f"delete_income xatosi: {e}")
+            return False
+        finally:
+            session.close()
+    
+    def get_income_by_id(self, income_id: int, telegram_id: int) -> Optional[Income]:
+        """
+        Daromadni ID bo'yicha olish
+        
+        Args:
+            income_id: Daromad ID
+            telegram_id: Foydalanuvchi ID (xavfsizlik uchun)
+            
+        Returns:
+            Optional[Income]: Daromad yoki None
+        """
+        session = self.get_session()
+        try:
+            income = session.query(Income).filter(
+                and_(Income.id == income_id, Income.user_id == telegram_id)
+            ).first()
+            return income
+        finally:
+            session.close()
+    
+    
+    # =====================================================
+    # DEBT OPERATIONS
+    # =====================================================
+    
+    def add_debt(
+        self,
+        telegram_id: int,
+        person_name: str,
+        amount: Decimal,
+        debt_type: str,
+        due_date: Optional[date] = None,
+        description: Optional[str] = None,
+        reminder_days: Optional[int] = None
+    ) -> Optional['Debt']:
+        """
+        Qarz qo'shish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            person_name: Shaxs ismi
+            amount: Summa
+            debt_type: Qarz turi ('given' yoki 'taken')
+            due_date: Qaytarish sanasi
+            description: Izoh
+            reminder_days: Eslatma kunlari oldin
+            
+        Returns:
+            Optional[Debt]: Yaratilgan qarz
+        """
+        session = self.get_session()
+        try:
+            debt = Debt(
+                user_id=telegram_id,
+                person_name=person_name,
+                amount=amount,
+                debt_type=debt_type,
+                due_date=due_date,
+                description=description,
+                status='active',
+                paid_amount=Decimal('0'),
+                reminder_days=reminder_days
+            )
+            
+            session.add(debt)
+            session.commit()
+            session.refresh(debt)
+            logger.info(f"Qarz qo'shildi: {telegram_id}, {person_name}, {amount}, {debt_type}")
+            
+            return debt
+        except Exception as e:
+            session.rollback()
+            logger.error(f"add_debt xatosi: {e}")
+            return None
+        finally:
+            session.close()
+    
+    def get_user_debts(
+        self,
+        telegram_id: int,
+        debt_type: Optional[str] = None,
+        status: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List['Debt']:
+        """
+        Foydalanuvchi qarzlarini olish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            debt_type: Qarz turi ('given', 'taken', None=hammasi)
+            status: Holat ('active', 'paid', 'overdue', None=hammasi)
+            start_date: Boshlanish sanasi
+            end_date: Tugash sanasi
+            
+        Returns:
+            List[Debt]: Qarzlar ro'yxati
+        """
+        session = self.get_session()
+        try:
+            query = session.query(Debt).filter(Debt.user_id == telegram_id)
+            
+            if debt_type:
+                query = query.filter(Debt.debt_type == debt_type)
+            
+            if status:
+                query = query.filter(Debt.status == status)
+            
+            if start_date:
+                query = query.filter(Debt.created_at >= start_date)
+            
+            if end_date:
+                query = query.filter(Debt.created_at <= end_date)
+            
+            debts = query.order_by(desc(Debt.created_at)).all()
+            return debts
+        except Exception as e:
+            logger.error(f"get_user_debts xatosi: {e}")
+            return []
+        finally:
+            session.close()
+    
+    def get_user_debts_page(
+        self,
+        telegram_id: int,
+        debt_type: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[int] = None,
+        direction: str = PAGE_NEXT,
+        limit: int = 10
+    ) -> Tuple[List['Debt'], Optional[int], Optional[int]]:
+        """
+        Qarzlarni keyset sahifalash bilan olish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            debt_type: Qarz turi ('given', 'taken', None=hammasi)
+            status: Holat ('active', 'paid', 'overdue', None=hammasi)
+            cursor: Chegara qarz id'si (None = birinchi sahifa)
+            direction: PAGE_NEXT yoki PAGE_PREV
+            limit: Sahifa hajmi
+            
+        Returns:
+            Tuple: (qarzlar, prev_cursor, next_cursor)
+        """
+        session = self.get_session()
+        try:
+            rows = session.execute(_debts_page_stmt(
+                telegram_id, cursor, direction, limit, debt_type, status
+            )).scalars().all()
+            
+            # Anchor topilmadi (o'chirilgan / boshqa foydalanuvchiniki) - birinchi sahifa
+            if _keyset_fallback_needed(rows, cursor):
+                rows = session.execute(_debts_page_stmt(
+                    telegram_id, None, PAGE_NEXT, limit, debt_type, status
+                )).scalars().all()
+                return _keyset_page_result(rows, None, PAGE_NEXT, limit)
+            
+            return _keyset_page_result(rows, cursor, direction, limit)
+        except Exception as e:
+            logger.error(f"get_user_debts_page xatosi: {e}")
+            return [], None, None
+        finally:
+            session.close()
+    
+    def get_debt_by_id(
+        self,
+        debt_id: int,
+        telegram_id: int
+    ) -> Optional['Debt']:
+        """
+        ID bo'yicha qarzni olish
+        
+        Args:
+            debt_id: Qarz ID
+            telegram_id: Foydalanuvchi ID
+            
+        Returns:
+            Optional[Debt]: Qarz
+        """
+        session = self.get_session()
+        try:
+            debt = session.query(Debt).filter(
+                Debt.id == debt_id,
+                Debt.user_id == telegram_id
+            ).first()
+            return debt
+        except Exception as e:
+            logger.error(f"get_debt_by_id xatosi: {e}")
+            return None
+        finally:
+            session.close()
+    
+    def update_debt(
+        self,
+        debt_id: int,
+        telegram_id: int,
+        **kwargs
+    ) -> Optional['Debt']:
+        """
+        Qarzni yangilash
+        
+        Args:
+            debt_id: Qarz ID
+            telegram_id: Foydalanuvchi ID
+            **kwargs: Yangilanadigan maydonlar
+            
+        Returns:
+            Optional[Debt]: Yangilangan qarz
+        """
+        session = self.get_session()
+        try:
+            debt = session.query(Debt).filter(
+                Debt.id == debt_id,
+                Debt.user_id == telegram_id
+            ).first()
+            
+            if not debt:
+                return None
+            
+            # Allowed fields
+            allowed_fields = ['person_name', 'amount', 'due_date', 'description', 
+                            'status', 'paid_amount', 'reminder_days']
+            
+            for key, value in kwargs.items():
+                if key in allowed_fields and hasattr(debt, key):
+                    setattr(debt, key, value)
+            
+            session.commit()
+            session.refresh(debt)
+            logger.info(f"Qarz yangilandi: {debt_id}")
+            return debt
+        except Exception as e:
+            session.rollback()
+            logger.error(f"update_debt xatosi: {e}")
+            return None
+        finally:
+            session.close()
+    
+    def mark_debt_paid(
+        self,
+        debt_id: int,
+        telegram_id: int,
+        paid_amount: Optional[Decimal] = None
+    ) -> bool:
+        """
+        Qarzni to'langan deb belgilash (to'liq yoki qisman)
+        
+        Args:
+            debt_id: Qarz ID
+            telegram_id: Foydalanuvchi ID
+            paid_amount: To'langan summa (None bo'lsa to'liq to'langan)
+            
+        Returns:
+            bool: Muvaffaqiyatli belgilandi
+        """
+        session = self.get_session()
+        try:
+            debt = session.query(Debt).filter(
+                Debt.id == debt_id,
+                Debt.user_id == telegram_id
+            ).first()
+            
+            if not debt:
+                return False
+            
+            if paid_amount is None:
+                # To'liq to'landi
+                debt.paid_amount = debt.amount
+                debt.status = 'paid'
+            else:
+                # Qisman to'landi
+                debt.paid_amount += paid_amount
+                if debt.paid_amount >= debt.amount:
+                    debt.status = 'paid'
+                else:
+                    debt.status = 'partially_paid'
+            
+            session.commit()
+            logger.info(f"Qarz to'langan deb belgilandi: {debt_id}")
+            return True
+        except Exception as e:
+            session.rollback()
+            logger.error(f"mark_debt_paid xatosi: {e}")
+            return False
+        finally:
+            session.close()
+    
+    def delete_debt(
+        self,
+        debt_id: int,
+        telegram_id: int
+    ) -> bool:
+        """
+        Qarzni o'chirish
+        
+        Args:
+            debt_id: Qarz ID
+            telegram_id: Foydalanuvchi ID
+            
+        Returns:
+            bool: Muvaffaqiyatli o'chirildi
+        """
+        session = self.get_session()
+        try:
+            debt = session.query(Debt).filter(
+                Debt.id == debt_id,
+                Debt.user_id == telegram_id
+            ).first()
+            
+            if debt:
+                session.delete(debt)
+                session.commit()
+                logger.info(f"Qarz o'chirildi: {debt_id}")
+                return True
+            return False
+        except Exception as e:
+            session.rollback()
+            logger.error(f"delete_debt xatosi: {e}")
+            return False
+        finally:
+            session.close()
+    
+    def get_overdue_debts(
+        self,
+        telegram_id: Optional[int] = None
+    ) -> List['Debt']:
+        """
+        Muddati o'tgan qarzlarni olish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID (None bo'lsa barcha foydalanuvchilar)
+            
+        Returns:
+            List[Debt]: Muddati o'tgan qarzlar
+        """
+        session = self.get_session()
+        try:
+            # Faqat o'qish - statusni sweep_overdue_debts() yangilaydi
+            query = session.query(Debt).filter(
+                or_(Debt.status == 'overdue', _overdue_debts_filter(date.today()))
+            )
+            
+            if telegram_id:
+                query = query.filter(Debt.user_id == telegram_id)
+            
+            return query.all()
+        except Exception as e:
+            logger.error(f"get_overdue_debts xatosi: {e}")
+            return []
+        finally:
+            session.close()
+    
+    def sweep_overdue_debts(
+        self,
+        chunk_size: Optional[int] = None,
+        on_chunk: Optional[Callable[[List[Tuple[int, int]]], Any]] = None
+    ) -> int:
+        """
+        Muddati o'tgan qarzlarni 'overdue' holatiga o'tkazish (set-based)
+        
+        Har bir bo'lak alohida tranzaksiyada yangilanadi - yozuv qulfi
+        qisqa turadi va xotira bo'lak hajmi bilan cheklangan.
+        
+        Args:
+            chunk_size: Bo'lak hajmi (default SchedulerConfig.OVERDUE_SWEEP_CHUNK)
+            on_chunk: Har bir bo'lak uchun (debt_id, user_id) ro'yxati bilan chaqiriladi
+            
+        Returns:
+            int: Yangilangan qarzlar soni
+        """
+        chunk_size = chunk_size or SchedulerConfig.OVERDUE_SWEEP_CHUNK
+        today = date.today()
+        total = 0
+        
+        session = self.get_session()
+        try:
+            while True:
+                rows = _sweep_overdue_chunk(session, today, chunk_size)
+                session.commit()
+                
+                if not rows:
+                    break
+                
+                total += len(rows)
+                if on_chunk:
+                    on_chunk(rows)
+                
+                if len(rows) < chunk_size:
+                    break
+            
+            if total:
+                logger.info(f"Muddati o'tgan qarzlar yangilandi: {total}")
+            return total
+        except Exception as e:
+            session.rollback()
+            logger.error(f"sweep_overdue_debts xatosi: {e}")
+            return total
+        finally:
+            session.close()
+    
+    def get_debts_with_reminders(
+        self,
+        telegram_id: Optional[int] = None,
+        days_before: int = 3
+    ) -> List['Debt']:
+        """
+        Eslatma kerak bo'lgan qarzlarni olish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            days_before: Necha kun oldin eslatish
+            
+        Returns:
+            List[Debt]: Qarzlar ro'yxati
+        """
+        session = self.get_session()
+        try:
+            reminder_date = date.today() + timedelta(days=days_before)
+            
+            query = session.query(Debt).filter(
+                Debt.status.in_(['active', 'partially_paid']),
+                Debt.due_date == reminder_date,
+                Debt.reminder_days == days_before
+            )
+            
+            if telegram_id:
+                query = query.filter(Debt.user_id == telegram_id)
+            
+            debts = query.all()
+            return debts
+        except Exception as e:
+            logger.error(f"get_debts_with_reminders xatosi: {e}")
+            return []
+        finally:
+            session.close()
+    
+    def get_debt_statistics(
+        self,
+        telegram_id: int
+    ) -> Dict[str, Any]:
+        """
+        Qarzlar statistikasini olish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            
+        Returns:
+            Dict: Statistika ma'lumotlari
+        """
+        session = self.get_session()
+        try:
+            rows = session.execute(_debt_statistics_stmt(telegram_id)).all()
+            return _build_debt_statistics(rows)
+        except Exception as e:
+            logger.error(f"get_debt_statistics xatosi: {e}")
+            return {'given': {}, 'taken': {}}
+        finally:
+            session.close()
+    
+    
+    # =====================================================
+    # REMINDER OPERATIONS
+    # =====================================================
+    
+    def add_reminder(
+        self,
+        telegram_id: int,
+        reminder_type: str,
+        reminder_date: datetime,
+        debt_id: Optional[int] = None,
+        message: Optional[str] = None
+    ) -> Optional[Reminder]:
+        """
+        Eslatma qo'shish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            reminder_type: Eslatma turi
+            reminder_date: Eslatma sanasi
+            debt_id: Qarz ID (Reminder modelida ustun yo'q - saqlanmaydi)
+            message: Xabar
+            
+        Returns:
+            Optional[Reminder]: Yaratilgan eslatma
+        """
+        session = self.get_session()
+        try:
+            reminder = Reminder(
+                user_id=telegram_id,
+                reminder_type=reminder_type,
+                reminder_date=reminder_date,
+                message=message,
+                is_sent=False
+            )
+            
+            session.add(reminder)
+            session.commit()
+            logger.info(f"Eslatma qo'shildi: {telegram_id}, {reminder_type}")
+            _notify_reminder_added(reminder)
+            return reminder
+        except Exception as e:
+            session.rollback()
+            logger.error(f"add_reminder xatosi: {e}")
+            return None
+        finally:
+            session.close()
+    
+    def get_pending_reminders(self) -> List[Reminder]:
+        """
+        Yuborilmagan eslatmalarni olish
+        
+        Returns:
+            List[Reminder]: Eslatmalar ro'yxati
+        """
+        session = self.get_session()
+        try:
+            now = datetime.now()
+            
+            query = session.query(Reminder).filter(
+                and_(
+                    Reminder.is_sent == False,
+                    Reminder.reminder_date <= now
+                )
+            ).order_by(asc(Reminder.reminder_date))
+            
+            return query.all()
+        finally:
+            session.close()
+    
+    def mark_reminder_sent(self, reminder_id: int) -> bool:
+        """
+        Eslatmani yuborilgan deb belgilash
+        
+        Args:
+            reminder_id: Eslatma ID
+            
+        Returns:
+            bool: Muvaffaqiyatli belgilandi
+        """
+        session = self.get_session()
+        try:
+            reminder = session.query(Reminder).filter(Reminder.id == reminder_id).first()
+            
+            if reminder:
+                reminder.is_sent = True
+                reminder.sent_at = datetime.now()
+                session.commit()
+                return True
+            return False
+        except Exception as e:
+            session.rollback()
+            logger.error(f"mark_reminder_sent xatosi: {e}")
+            return False
+        finally:
+            session.close()
+    
+    def get_upcoming_reminders(
+        self,
+        until: datetime,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 500
+    ) -> List[Reminder]:
+        """
+        Yuborilmagan eslatmalarni bo'laklab olish (scheduler uchun)
+        
+        Args:
+            until: Shu vaqtgacha bo'lgan eslatmalar
+            after: Oxirgi yuklangan (reminder_date, id) - keyingi bo'lak uchun
+            limit: Bo'lak hajmi
+            
+        Returns:
+            List[Reminder]: (reminder_date, id) bo'yicha saralangan eslatmalar
+        """
+        session = self.get_session()
+        try:
+            return session.execute(
+                _upcoming_reminders_stmt(until, after, limit)
+            ).scalars().all()
+        except Exception as e:
+            logger.error(f"get_upcoming_reminders xatosi: {e}")
+            return []
+        finally:
+            session.close()
+    
+    def mark_reminders_sent(self, reminder_ids: List[int]) -> int:
+        """
+        Bir nechta eslatmani bitta UPDATE bilan yuborilgan deb belgilash
+        
+        Args:
+            reminder_ids: Eslatma ID'lari
+            
+        Returns:
+            int: Belgilangan eslatmalar soni
+        """
+        if not reminder_ids:
+            return 0
+        
+        session = self.get_session()
+        try:
+            result = session.execute(
+                _mark_reminders_sent_stmt(reminder_ids),
+                execution_options={'synchronize_session': False}
+            )
+            session.commit()
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            logger.error(f"mark_reminders_sent xatosi: {e}")
+            return 0
+        finally:
+            session.close()
+    
+    
+    # =====================================================
+    # PERIOD SUMMARIES
+    # =====================================================
+    
+    def get_period_summaries(
+        self,
+        start_day: date,
+        end_day: date,
+        after_user_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Davr bo'yicha barcha faol foydalanuvchilar xulosasi (kunlik/haftalik)
+        
+        Args:
+            start_day: Boshlanish kuni
+            end_day: Tugash kuni
+            after_user_id: Checkpoint - shu ID'dan keyingilar
+            
+        Returns:
+            List[Dict]: telegram_id bo'yicha saralangan xulosalar
+        """
+        session = self.get_session()
+        try:
+            return _period_summaries(session, start_day, end_day, after_user_id)
+        except Exception as e:
+            logger.error(f"get_period_summaries xatosi: {e}")
+            return []
+        finally:
+            session.close()
+    
+    def get_job_checkpoint(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Davriy vazifa checkpoint'ini olish
+        
+        Args:
+            name: Vazifa nomi
+            
+        Returns:
+            Optional[Dict]: period_key, last_user_id, completed
+        """
+        session = self.get_session()
+        try:
+            return _load_job_checkpoint(session, name)
+        finally:
+            session.close()
+    
+    def save_job_checkpoint(
+        self,
+        name: str,
+        period_key: str,
+        last_user_id: Optional[int] = None,
+        completed: bool = False
+    ) -> bool:
+        """
+        Davriy vazifa checkpoint'ini saqlash
+        
+        Args:
+            name: Vazifa nomi
+            period_key: Davr kaliti
+            last_user_id: Oxirgi qayta ishlangan foydalanuvchi
+            completed: Davr tugallandimi
+            
+        Returns:
+            bool: Saqlandi
+        """
+        session = self.get_session()
+        try:
+            _store_job_checkpoint(session, name, period_key, last_user_id, completed)
+            session.commit()
+            return True
+        except Exception as e:
+            session.rollback()
+            logger.error(f"save_job_checkpoint xatosi: {e}")
+            return False
+        finally:
+            session.close()
+    
+    
+    # =====================================================
+    # CATEGORY CLASSIFIER
+    # =====================================================
+    
+    def get_category_tokens(self, telegram_id: int) -> List[Tuple[str, int, int]]:
+        """
+        Foydalanuvchi klassifikatori hisoblagichlarini olish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            
+        Returns:
+            List[Tuple[str, int, int]]: [(token, category_id, count), ...]
+        """
+        session = self.get_session()
+        try:
+            return _load_category_tokens(session, telegram_id)
+        except Exception as e:
+            logger.error(f"get_category_tokens xatosi: {e}")
+            return []
+        finally:
+            session.close()
+    
+    def add_category_tokens(
+        self,
+        telegram_id: int,
+        category_key: str,
+        tokens: Dict[str, int],
+        docs: int = 1
+    ) -> bool:
+        """
+        Saqlangan xarajatdan klassifikatorni o'rgatish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            category_key: Tanlangan kategoriya
+            tokens: {token: soni}
+            docs: Nechta xarajatdan yig'ilgan (manfiy - ayirish)
+            
+        Returns:
+            bool: Saqlandi
+        """
+        self._ensure_categories()
+        category_id = category_registry.get_id(category_key)
+        if category_id is None:
+            logger.error(f"Kategoriya topilmadi: {category_key}")
+            return False
+        
+        session = self.get_session()
+        try:
+            _apply_category_tokens(session, telegram_id, category_id, tokens, docs)
+            session.commit()
+            return True
+        except Exception as e:
+            session.rollback()
+            logger.error(f"add_category_tokens xatosi: {e}")
+            return False
+        finally:
+            session.close()
+    
+    
+    # =====================================================
+    # BULK OPERATIONS
+    # =====================================================
+    
+    def bulk_add(
+        self,
+        expenses: Optional[List[Dict[str, Any]]] = None,
+        incomes: Optional[List[Dict[str, Any]]] = None
+    ) -> Tuple[List[Optional[int]], List[Optional[int]]]:
+        """
+        Ko'p xarajat/daromadni bitta tranzaksiyada qo'shish
+        
+        Args:
+            expenses: add_expense parametrlari ro'yxati (dict)
+            incomes: add_income parametrlari ro'yxati (dict)
+            
+        Returns:
+            tuple: (xarajat ID'lari, daromad ID'lari) - kirish tartibida
+        """
+        expenses = expenses or []
+        incomes = incomes or []
+        if expenses:
+            self._ensure_categories()
+        
+        session = self.get_session()
+        try:
+            expense_ids, income_ids = _bulk_insert(session, expenses, incomes)
+            session.commit()
+            logger.info(f"Bulk qo'shildi: {len(expenses)} xarajat, {len(incomes)} daromad")
+            return expense_ids, income_ids
+        except Exception as e:
+            session.rollback()
+            logger.error(f"bulk_add xatosi: {e}")
+            raise
+        finally:
+            session.close()
+    
+    
+    # =====================================================
+    # EXPORT (STREAMING)
+    # =====================================================
+    
+    def iter_export_rows(self, telegram_id: int, batch_size: Optional[int] = None) -> Iterator[Tuple]:
+        """
+        Foydalanuvchining butun tarixini oqim bilan o'qish (generator)
+        
+        yield_per server-side kursor ishlatadi - xotirada bir vaqtda faqat
+        batch_size ta qator bo'ladi, List[Expense] yig'ilmaydi. Session
+        generator tugaganda (yoki yopilganda) yopiladi.
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            batch_size: Kursordan bir martada olinadigan qatorlar soni
+            
+        Yields:
+            Tuple: (date, 'expense' | 'income', category, amount, description)
+        """
+        session = self.get_session()
+        try:
+            result = session.execute(
+                _export_rows_stmt(telegram_id).execution_options(
+                    yield_per=batch_size or ReportConfig.EXPORT_BATCH_SIZE
+                )
+            )
+            for row in result:
+                yield tuple(row)
+        except Exception as e:
+            logger.error(f"iter_export_rows xatosi: {e}")
+            raise
+        finally:
+            session.close()
+    
+    
+    # =====================================================
+    # STATISTICS & ANALYTICS
+    # =====================================================
+    
+    def get_balance(
+        self,
+        telegram_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Decimal:
+        """
+        Balansni hisoblash (daromad - xarajat)
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            start_date: Boshlanish sanasi
+            end_date: Tugash sanasi
+            
+        Returns:
+            Decimal: Balans
+        """
+        total_income = self.get_total_income(telegram_id, start_date, end_date)
+        total_expense = self.get_total_expenses(telegram_id, start_date, end_date)
+        return total_income - total_expense
+    
+    def get_daily_expenses_trend(
+        self,
+        telegram_id: int,
+        days: int = 7
+    ) -> List[Dict[str, Any]]:
+        """
+        Kunlik xarajatlar trendi
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            days: Necha kunlik ma'lumot
+            
+        Returns:
+            List[Dict]: [{'date': date, 'total': Decimal}]
+        """
+        session = self.get_session()
+        try:
+            start_date = datetime.now() - timedelta(days=days)
+            
+            query = session.query(
+                func.date(Expense.expense_date).label('date'),
+                func.sum(Expense.amount).label('total')
+            ).filter(
+                and_(
+                    Expense.user_id == telegram_id,
+                    Expense.expense_date >= start_date
+                )
+            ).group_by(
+                func.date(Expense.expense_date)
+            ).order_by(asc('date'))
+            
+            results = []
+            for date_obj, total in query.all():
+                results.append({
+                    'date': date_obj,
+                    'total': total or Decimal('0.00')
+                })
+            
+            return results
+        finally:
+            session.close()
+    
+    def get_report_snapshot(
+        self,
+        telegram_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        top_n: int = ReportConfig.MAX_TRANSACTIONS
+    ) -> Dict[str, Any]:
+        """
+        Hisobot uchun barcha ma'lumotlarni bitta session'da olish
+        
+        Args:
+            telegram_id: Foydalanuvchi ID
+            start_date: Boshlanish sanasi
+            end_date: Tugash sanasi
+            top_n: Oxirgi tranzaksiyalar soni
+            
+        Returns:
+            Dict: total_expense, total_income, balance, expense_count,
+                  income_count, expenses_by_category, daily_totals,
+                  expenses (oxirgi top_n), incomes (oxirgi top_n)
+        """
+        from sqlalchemy.orm import joinedload
+        
+        session = self.get_session()
+        try:
+            aggregate_rows = session.execute(
+                _report_aggregate_stmt(telegram_id, start_date, end_date)
+            ).all()
+            
+            self._ensure_categories()
+            categories = {
+                row[1]: category_registry.get_by_id(row[1])
+                for row in aggregate_rows if row[0] == 'category'
+            }
+            
+            expenses = session.execute(
+                select(Expense).options(joinedload(Expense.category)).where(
+                    Expense.user_id == telegram_id,
+                    Expense.expense_date >= start_date,
+                    Expense.expense_date <= end_date
+                ).order_by(desc(Expense.expense_date)).limit(top_n)
+            ).scalars().all()
+            
+            incomes = session.execute(
+                select(Income).where(
+                    Income.user_id == telegram_id,
+                    Income.income_date >= start_date,
+                    Income.income_date <= end_date
+                ).order_by(desc(Income.income_date)).limit(top_n)
+            ).scalars().all()
+            
+            return _build_report_snapshot(aggregate_rows, categories, list(expenses), list(incomes))
+        finally:
+            session.close()
+    
+    def rebuild_rollups(self, telegram_id: Optional[int] = None) -> Dict[str, int]:
+        """
+        Rollup jadvallarini (kunlik/oylik yig'indilar) qayta qurish
+        
+        Args:
+            telegram_id: Faqat bitta foydalanuvchi (None bo'lsa hammasi)
+            
+        Returns:
+            Dict: {'daily': qatorlar soni, 'monthly': qatorlar soni}
+        """
+        session = self.get_session()
+        try:
+            result = _rebuild_rollups(session, telegram_id)
+            session.commit()
+            logger.info(f"Rollup jadvallar qayta qurildi: {result}")
+            return result
+        except Exception as e:
+            session.rollback()
+            logger.error(f"rebuild_rollups xatosi: {e}")
+            raise
+        finally:
+            session.close()
+
+    
+    # =====================================================
+    # DEBT STATISTICS (YANGI QO'SHILDI)
+    # =====================================================
+    
+
+
+# =====================================================
+# ASYNC DATABASE MANAGER CLASS
+# =====================================================
+class AsyncDatabaseManager:
     """
-    Database bilan ishlash uchun asosiy class
+    DatabaseManager'ning async varianti (aiosqlite / asyncpg)
+    
+    Metodlar DatabaseManager bilan bir xil nom va parametrlarga ega,
+    faqat await qilinadi va event loop'ni bloklamaydi.
     Singleton pattern ishlatadi
     """
     
@@ -47,39 +3196,35 @@ class DatabaseManager:
     def __new__(cls):
         """Singleton pattern - faqat bitta instance"""
         if cls._instance is None:
-            cls._instance = super(DatabaseManager, cls).__new__(cls)
+            cls._instance = super(AsyncDatabaseManager, cls).__new__(cls)
         return cls._instance
     
     def __init__(self):
-        """Database engine va session factory yaratish"""
+        """Async engine va session factory yaratish"""
         if self._engine is None:
             try:
-                # Sync engine
-                self._engine = create_engine(
-                    DatabaseConfig.DATABASE_URL,
-                    pool_size=DatabaseConfig.POOL_SIZE,
-                    max_overflow=DatabaseConfig.MAX_OVERFLOW,
-                    echo=False,  # SQL log'larni ko'rsatmaslik (production)
-                    pool_pre_ping=True  # Connection'ni tekshirish
-                )
+                url = DatabaseConfig.get_async_url()
+                self._engine = create_async_engine(url, **_engine_options(url, async_mode=True))
                 
-                # Session factory
-                self._session_factory = sessionmaker(
+                if self._engine.dialect.name == 'sqlite':
+                    _install_sqlite_pragmas(self._engine.sync_engine)
+                
+                self._session_factory = async_sessionmaker(
                     bind=self._engine,
                     expire_on_commit=False
                 )
                 
-                logger.info("Database engine yaratildi")
+                logger.info("Async database engine yaratildi")
             except Exception as e:
-                logger.error(f"Database engine yaratishda xato: {e}")
+                logger.error(f"Async database engine yaratishda xato: {e}")
                 raise
     
-    def get_session(self) -> Session:
+    def get_session(self) -> AsyncSession:
         """
-        Yangi session yaratish
+        Yangi async session yaratish
         
         Returns:
-            Session: SQLAlchemy session
+            AsyncSession: SQLAlchemy async session
         """
         return self._session_factory()
     
@@ -89,56 +3234,58 @@ class DatabaseManager:
         Context manager - avtomatik commit/rollback
         
         Usage:
-            async with db_manager.session_scope() as session:
+            async with async_db_manager.session_scope() as session:
                 session.add(user)
         """
         session = self.get_session()
         try:
             yield session
-            session.commit()
+            await session.commit()
         except Exception as e:
-            session.rollback()
-            logger.error(f"Session xatosi: {e}")
+            await session.rollback()
+            logger.error(f"Async session xatosi: {e}")
             raise
         finally:
-            session.close()
+            await session.close()
     
     async def create_tables(self):
         """
         Barcha jadvallarni yaratish
         """
         try:
-            Base.metadata.create_all(self._engine)
-            logger.info("Database jadvallar yaratildi/tekshirildi")
+            async with self._engine.begin() as conn:
+                rollups_existed = await conn.run_sync(
+                    lambda sync_conn: inspect(sync_conn).has_table(MonthlyUserTotal.__tablename__)
+                )
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(_ensure_indexes)
+            logger.info("Database jadvallar yaratildi/tekshirildi (async)")
             
-            # Kategoriyalarni qo'shish
-            session = self.get_session()
-            try:
-                init_categories(session)
-                logger.info("Kategoriyalar yuklandi")
-            except Exception as e:
-                logger.error(f"Kategoriyalarni yuklashda xato: {e}")
-            finally:
-                session.close()
-                
+            async with self.session_scope() as session:
+                await session.run_sync(init_categories)
+            
+            await self.load_categories()
+            
+            if not rollups_existed:
+                await self.rebuild_rollups()
         except Exception as e:
-            logger.error(f"Jadvallarni yaratishda xato: {e}")
+            logger.error(f"Jadvallarni yaratishda xato (async): {e}")
             raise
     
     async def close(self):
-        """Database connection'ni yopish"""
+        """Async database connection'ni yopish"""
         if self._engine:
-            self._engine.dispose()
-            logger.info("Database connection yopildi")
+            await self._engine.dispose()
+            logger.info("Async database connection yopildi")
     
     
     # =====================================================
     # USER OPERATIONS
     # =====================================================
     
-    def get_or_create_user(
-        self, 
-        telegram_id: int, 
+    async def get_or_create_user(
+        self,
+        telegram_id: int,
         username: Optional[str] = None,
         first_name: Optional[str] = None,
         last_name: Optional[str] = None,
@@ -147,149 +3294,141 @@ class DatabaseManager:
         """
         Foydalanuvchini olish yoki yangi yaratish
         
-        Args:
-            telegram_id: Telegram user ID
-            username: Username
-            first_name: Ism
-            last_name: Familiya
-            language: Til
-            
         Returns:
             User: User object
         """
-        session = self.get_session()
-        try:
-            # Mavjud foydalanuvchini qidirish
-            user = session.query(User).filter(User.telegram_id == telegram_id).first()
-            
-            if user:
-                # Ma'lumotlarni yangilash
-                updated = False
-                if username and user.username != username:
-                    user.username = username
-                    updated = True
-                if first_name and user.first_name != first_name:
-                    user.first_name = first_name
-                    updated = True
-                if last_name and user.last_name != last_name:
-                    user.last_name = last_name
-                    updated = True
+        cached = user_cache.get(telegram_id)
+        if cached and _profile_matches(cached, username, first_name, last_name):
+            return cached
+        
+        async with self.get_session() as session:
+            try:
+                user = (await session.execute(
+                    select(User).where(User.telegram_id == telegram_id)
+                )).scalar_one_or_none()
                 
-                if updated:
-                    session.commit()
-                    logger.info(f"User {telegram_id} ma'lumotlari yangilandi")
-            else:
-                # Yangi foydalanuvchi yaratish
-                user = User(
-                    telegram_id=telegram_id,
-                    username=username,
-                    first_name=first_name,
-                    last_name=last_name,
-                    language=language,
-                    is_active=True
-                )
-                session.add(user)
-                session.commit()
-                logger.info(f"Yangi foydalanuvchi yaratildi: {telegram_id}")
-            
-            return user
-        except Exception as e:
-            session.rollback()
-            logger.error(f"get_or_create_user xatosi: {e}")
-            raise
-        finally:
-            session.close()
+                if user:
+                    updated = False
+                    if username and user.username != username:
+                        user.username = username
+                        updated = True
+                    if first_name and user.first_name != first_name:
+                        user.first_name = first_name
+                        updated = True
+                    if last_name and user.last_name != last_name:
+                        user.last_name = last_name
+                        updated = True
+                    
+                    if updated:
+                        await session.commit()
+                        logger.info(f"User {telegram_id} ma'lumotlari yangilandi")
+                else:
+                    user = User(
+                        telegram_id=telegram_id,
+                        username=username,
+                        first_name=first_name,
+                        last_name=last_name,
+                        language=language,
+                        is_active=True
+                    )
+                    session.add(user)
+                    await session.commit()
+                    logger.info(f"Yangi foydalanuvchi yaratildi: {telegram_id}")
+                
+                user_cache.set(telegram_id, user)
+                return user
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"get_or_create_user xatosi: {e}")
+                raise
     
-    def update_user_language(self, telegram_id: int, language: str) -> bool:
+    async def update_user_language(self, telegram_id: int, language: str) -> bool:
         """
         Foydalanuvchi tilini yangilash
         
-        Args:
-            telegram_id: Telegram user ID
-            language: Yangi til
-            
         Returns:
             bool: Muvaffaqiyatli bajarildi
         """
-        session = self.get_session()
-        try:
-            user = session.query(User).filter(User.telegram_id == telegram_id).first()
-            if user:
-                user.language = language
-                session.commit()
-                logger.info(f"User {telegram_id} til yangilandi: {language}")
-                return True
-            return False
-        except Exception as e:
-            session.rollback()
-            logger.error(f"update_user_language xatosi: {e}")
-            return False
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            try:
+                user = (await session.execute(
+                    select(User).where(User.telegram_id == telegram_id)
+                )).scalar_one_or_none()
+                if user:
+                    user.language = language
+                    await session.commit()
+                    user_cache.invalidate(telegram_id)
+                    logger.info(f"User {telegram_id} til yangilandi: {language}")
+                    return True
+                return False
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"update_user_language xatosi: {e}")
+                return False
     
-    def get_user_language(self, telegram_id: int) -> str:
+    async def get_user_language(self, telegram_id: int) -> str:
         """
         Foydalanuvchi tilini olish
         
-        Args:
-            telegram_id: Telegram user ID
-            
         Returns:
             str: Til kodi (uz, ru, en, tr, ar)
         """
-        session = self.get_session()
-        try:
-            user = session.query(User).filter(User.telegram_id == telegram_id).first()
+        cached = user_cache.get(telegram_id)
+        if cached:
+            return cached.language
+        
+        async with self.get_session() as session:
+            user = (await session.execute(
+                select(User).where(User.telegram_id == telegram_id)
+            )).scalar_one_or_none()
+            if user:
+                user_cache.set(telegram_id, user)
             return user.language if user else 'uz'
-        finally:
-            session.close()
     
     
     # =====================================================
     # CATEGORY OPERATIONS
     # =====================================================
     
-    def get_all_categories(self, is_active: bool = True) -> List[Category]:
+    async def load_categories(self) -> None:
+        """Kategoriya registry'ni database'dan (qayta) yuklash"""
+        try:
+            async with self.get_session() as session:
+                await session.run_sync(category_registry.load)
+        except Exception as e:
+            logger.error(f"Kategoriya registry yuklashda xato: {e}")
+    
+    async def _ensure_categories(self) -> None:
+        """Registry bekor qilingan yoki yuklanmagan bo'lsa - yuklash"""
+        if not category_registry.is_loaded:
+            await self.load_categories()
+    
+    async def get_all_categories(self, is_active: bool = True) -> List[Category]:
         """
         Barcha kategoriyalarni olish
         
-        Args:
-            is_active: Faqat faol kategoriyalar
-            
         Returns:
             List[Category]: Kategoriyalar ro'yxati
         """
-        session = self.get_session()
-        try:
-            query = session.query(Category)
-            if is_active:
-                query = query.filter(Category.is_active == True)
-            return query.all()
-        finally:
-            session.close()
+        await self._ensure_categories()
+        return category_registry.all(is_active)
     
-    def get_category_by_key(self, key: str) -> Optional[Category]:
+    async def get_category_by_key(self, key: str) -> Optional[Category]:
         """
-        Kategoriyani key bo'yicha olish
+        Kategoriyani key bo'yicha olish (registry'dan)
         
-        Args:
-            key: Kategoriya key
-            
         Returns:
             Optional[Category]: Kategoriya yoki None
         """
-        session = self.get_session()
-        try:
-            return session.query(Category).filter(Category.key == key).first()
-        finally:
-            session.close()
+        await self._ensure_categories()
+        return category_registry.get(key)
     
     
     # =====================================================
     # EXPENSE OPERATIONS
     # =====================================================
     
-    def add_expense(
+    async def add_expense(
         self,
         telegram_id: int,
         amount: Decimal,
@@ -300,45 +3439,38 @@ class DatabaseManager:
         """
         Xarajat qo'shish
         
-        Args:
-            telegram_id: Foydalanuvchi ID
-            amount: Summa
-            category_key: Kategoriya key
-            description: Tavsif
-            expense_date: Xarajat sanasi
-            
         Returns:
             Optional[Expense]: Yaratilgan xarajat
         """
-        session = self.get_session()
-        try:
-            # Kategoriyani topish
-            category = session.query(Category).filter(Category.key == category_key).first()
-            if not category:
-                logger.error(f"Kategoriya topilmadi: {category_key}")
-                return None
-            
-            # Xarajat yaratish
-            expense = Expense(
-                user_id=telegram_id,
-                category_id=category.id,
-                amount=amount,
-                description=description,
-                expense_date=expense_date or datetime.now()
-            )
-            
-            session.add(expense)
-            session.commit()
-            logger.info(f"Xarajat qo'shildi: {telegram_id}, {amount}, {category_key}")
-            return expense
-        except Exception as e:
-            session.rollback()
-            logger.error(f"add_expense xatosi: {e}")
+        await self._ensure_categories()
+        category_id = category_registry.get_id(category_key)
+        if category_id is None:
+            logger.error(f"Kategoriya topilmadi: {category_key}")
             return None
-        finally:
-            session.close()
+        
+        async with self.get_session() as session:
+            try:
+                expense = Expense(
+                    user_id=telegram_id,
+                    category_id=category_id,
+                    amount=amount,
+                    description=description,
+                    expense_date=expense_date or datetime.now()
+                )
+                
+                session.add(expense)
+                await session.run_sync(
+                    _apply_expense_rollup, telegram_id, category_id, expense.expense_date, amount, 1
+                )
+                await session.commit()
+                logger.info(f"Xarajat qo'shildi: {telegram_id}, {amount}, {category_key}")
+                return expense
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"add_expense xatosi: {e}")
+                return None
     
-    def get_user_expenses(
+    async def get_user_expenses(
         self,
         telegram_id: int,
         start_date: Optional[datetime] = None,
@@ -349,77 +3481,94 @@ class DatabaseManager:
         """
         Foydalanuvchi xarajatlarini olish
         
-        Args:
-            telegram_id: Foydalanuvchi ID
-            start_date: Boshlanish sanasi
-            end_date: Tugash sanasi
-            category_key: Kategoriya filtri
-            limit: Maksimal soni
-            
         Returns:
-            List[Expense]: Xarajatlar ro'yxati
+            List[Expense]: Xarajatlar ro'yxati (category oldindan yuklangan)
         """
         from sqlalchemy.orm import joinedload
         
-        session = self.get_session()
-        try:
-            # EAGER LOADING - category ni oldindan yuklash
-            query = session.query(Expense).options(
+        async with self.get_session() as session:
+            # Async session'da lazy loading yo'q - category ni oldindan yuklash
+            stmt = select(Expense).options(
                 joinedload(Expense.category)
-            ).filter(Expense.user_id == telegram_id)
+            ).where(Expense.user_id == telegram_id)
             
             if start_date:
-                query = query.filter(Expense.expense_date >= start_date)
+                stmt = stmt.where(Expense.expense_date >= start_date)
             if end_date:
-                query = query.filter(Expense.expense_date <= end_date)
+                stmt = stmt.where(Expense.expense_date <= end_date)
             if category_key:
-                category = session.query(Category).filter(Category.key == category_key).first()
-                if category:
-                    query = query.filter(Expense.category_id == category.id)
+                await self._ensure_categories()
+                category_id = category_registry.get_id(category_key)
+                if category_id is not None:
+                    stmt = stmt.where(Expense.category_id == category_id)
             
-            query = query.order_by(desc(Expense.expense_date))
+            stmt = stmt.order_by(desc(Expense.expense_date))
             
             if limit:
-                query = query.limit(limit)
+                stmt = stmt.limit(limit)
             
-            return query.all()
-        finally:
-            session.close()
+            return list((await session.execute(stmt)).scalars().all())
     
-    def get_total_expenses(
+    async def get_user_expenses_page(
         self,
         telegram_id: int,
+        cursor: Optional[int] = None,
+        direction: str = PAGE_NEXT,
+        limit: int = 10,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
-    ) -> Decimal:
+    ) -> Tuple[List[Expense], Optional[int], Optional[int]]:
         """
-        Jami xarajatlar summasini hisoblash
+        Xarajatlarni keyset sahifalash bilan olish
         
         Args:
             telegram_id: Foydalanuvchi ID
+            cursor: Chegara xarajat id'si (None = birinchi sahifa)
+            direction: PAGE_NEXT yoki PAGE_PREV
+            limit: Sahifa hajmi
             start_date: Boshlanish sanasi
             end_date: Tugash sanasi
             
+        Returns:
+            Tuple: (xarajatlar, prev_cursor, next_cursor)
+        """
+        async with self.get_session() as session:
+            try:
+                rows = (await session.execute(_expenses_page_stmt(
+                    telegram_id, cursor, direction, limit, start_date, end_date
+                ))).scalars().all()
+                
+                # Anchor topilmadi (o'chirilgan / boshqa foydalanuvchiniki) - birinchi sahifa
+                if _keyset_fallback_needed(rows, cursor):
+                    rows = (await session.execute(_expenses_page_stmt(
+                        telegram_id, None, PAGE_NEXT, limit, start_date, end_date
+                    ))).scalars().all()
+                    return _keyset_page_result(rows, None, PAGE_NEXT, limit)
+                
+                return _keyset_page_result(rows, cursor, direction, limit)
+            except Exception as e:
+                logger.error(f"get_user_expenses_page xatosi: {e}")
+                return [], None, None
+    
+    async def get_total_expenses(
+        self,
+        telegram_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Decimal:
+        """
+        Jami xarajatlar summasini hisoblash
+        
         Returns:
             Decimal: Jami summa
         """
-        session = self.get_session()
-        try:
-            query = session.query(func.sum(Expense.amount)).filter(
-                Expense.user_id == telegram_id
-            )
-            
-            if start_date:
-                query = query.filter(Expense.expense_date >= start_date)
-            if end_date:
-                query = query.filter(Expense.expense_date <= end_date)
-            
-            result = query.scalar()
-            return result or Decimal('0.00')
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            result = (await session.execute(
+                _total_expenses_stmt(telegram_id, start_date, end_date)
+            )).scalar()
+            return Decimal(str(result)) if result else Decimal('0.00')
     
-    def get_expenses_by_category(
+    async def get_expenses_by_category(
         self,
         telegram_id: int,
         start_date: Optional[datetime] = None,
@@ -428,35 +3577,14 @@ class DatabaseManager:
         """
         Kategoriya bo'yicha xarajatlar statistikasi
         
-        Args:
-            telegram_id: Foydalanuvchi ID
-            start_date: Boshlanish sanasi
-            end_date: Tugash sanasi
-            
         Returns:
             List[Dict]: [{'category': Category, 'total': Decimal, 'count': int}]
         """
-        session = self.get_session()
-        try:
-            query = session.query(
-                Category,
-                func.sum(Expense.amount).label('total'),
-                func.count(Expense.id).label('count')
-            ).join(
-                Expense, Expense.category_id == Category.id
-            ).filter(
-                Expense.user_id == telegram_id
-            )
-            
-            if start_date:
-                query = query.filter(Expense.expense_date >= start_date)
-            if end_date:
-                query = query.filter(Expense.expense_date <= end_date)
-            
-            query = query.group_by(Category.id).order_by(desc('total'))
+        async with self.get_session() as session:
+            stmt = _expenses_by_category_stmt(telegram_id, start_date, end_date)
             
             results = []
-            for category, total, count in query.all():
+            for category, total, count in (await session.execute(stmt)).all():
                 results.append({
                     'category': category,
                     'total': total or Decimal('0.00'),
@@ -464,114 +3592,99 @@ class DatabaseManager:
                 })
             
             return results
-        finally:
-            session.close()
     
-    def delete_expense(self, expense_id: int, telegram_id: int) -> bool:
+    async def delete_expense(self, expense_id: int, telegram_id: int) -> bool:
         """
         Xarajatni o'chirish
         
-        Args:
-            expense_id: Xarajat ID
-            telegram_id: Foydalanuvchi ID (xavfsizlik uchun)
-            
         Returns:
             bool: Muvaffaqiyatli o'chirildi
         """
-        session = self.get_session()
-        try:
-            expense = session.query(Expense).filter(
-                and_(Expense.id == expense_id, Expense.user_id == telegram_id)
-            ).first()
-            
-            if expense:
-                session.delete(expense)
-                session.commit()
-                logger.info(f"Xarajat o'chirildi: {expense_id}")
-                return True
-            return False
-        except Exception as e:
-            session.rollback()
-            logger.error(f"delete_expense xatosi: {e}")
-            return False
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            try:
+                expense = (await session.execute(
+                    select(Expense).where(
+                        and_(Expense.id == expense_id, Expense.user_id == telegram_id)
+                    )
+                )).scalar_one_or_none()
+                
+                if expense:
+                    await session.run_sync(
+                        _apply_expense_rollup, expense.user_id, expense.category_id,
+                        expense.expense_date, -expense.amount, -1
+                    )
+                    await session.delete(expense)
+                    await session.commit()
+                    logger.info(f"Xarajat o'chirildi: {expense_id}")
+                    return True
+                return False
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"delete_expense xatosi: {e}")
+                return False
     
-    def get_expense_by_id(self, expense_id: int, telegram_id: int) -> Optional[Expense]:
+    async def get_expense_by_id(self, expense_id: int, telegram_id: int) -> Optional[Expense]:
         """
         Xarajatni ID bo'yicha olish
         
-        Args:
-            expense_id: Xarajat ID
-            telegram_id: Foydalanuvchi ID (xavfsizlik uchun)
-            
         Returns:
             Optional[Expense]: Xarajat yoki None
         """
         from sqlalchemy.orm import joinedload
         
-        session = self.get_session()
-        try:
-            expense = session.query(Expense).options(
-                joinedload(Expense.category)
-            ).filter(
-                and_(Expense.id == expense_id, Expense.user_id == telegram_id)
-            ).first()
-            return expense
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            return (await session.execute(
+                select(Expense).options(
+                    joinedload(Expense.category)
+                ).where(
+                    and_(Expense.id == expense_id, Expense.user_id == telegram_id)
+                )
+            )).scalar_one_or_none()
     
     
     # =====================================================
     # INCOME OPERATIONS
-    # =====================================================
-    
-    def add_income(
-        self,
-        telegram_id: int,
-        amount: Decimal,
-        source: Optional[str] = None,
-        income_type: str = 'other',
-        is_recurring: bool = False,
-        income_date: Optional[datetime] = None
-    ) -> Optional[Income]:
-        """
-        Daromad qo'shish
-        
-        Args:
-            telegram_id: Foydalanuvchi ID
-            amount: Summa
-            source: Manba
-            income_type: Daromad turi
-            is_recurring: Takrorlanuvchi
-            income_date: Daromad sanasi
-            
-        Returns:
-            Optional[Income]: Yaratilgan daromad
-        """
-        session = self.get_session()
-        try:
-            income = Income(
-                user_id=telegram_id,
-                amount=amount,
-                source=source,
-                income_type=income_type,
-                is_recurring=is_recurring,
-                income_date=income_date or datetime.now()
-            )
-            
-            session.add(income)
-            session.commit()
-            logger.info(f"Daromad qo'shildi: {telegram_id}, {amount}")
-            return income
-        except Exception as e:
-            session.rollback()
-            logger.error(f"add_income xatosi: {e}")
-            return None
-        finally:
-            session.close()
+    # =====================================================
     
-    def get_user_incomes(
+    async def add_income(
+        self,
+        telegram_id: int,
+        amount: Decimal,
+        source: Optional[str] = None,
+        income_type: str = 'other',
+        is_recurring: bool = False,
+        income_date: Optional[datetime] = None
+    ) -> Optional[Income]:
+        """
+        Daromad qo'shish
+        
+        Returns:
+            Optional[Income]: Yaratilgan daromad
+        """
+        async with self.get_session() as session:
+            try:
+                income = Income(
+                    user_id=telegram_id,
+                    amount=amount,
+                    source=source,
+                    income_type=income_type,
+                    is_recurring=is_recurring,
+                    income_date=income_date or datetime.now()
+                )
+                
+                session.add(income)
+                await session.run_sync(
+                    _apply_income_rollup, telegram_id, income.income_date, amount, 1
+                )
+                await session.commit()
+                logger.info(f"Daromad qo'shildi: {telegram_id}, {amount}")
+                return income
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"add_income xatosi: {e}")
+                return None
+    
+    async def get_user_incomes(
         self,
         telegram_id: int,
         start_date: Optional[datetime] = None,
@@ -581,122 +3694,132 @@ class DatabaseManager:
         """
         Foydalanuvchi daromadlarini olish
         
-        Args:
-            telegram_id: Foydalanuvchi ID
-            start_date: Boshlanish sanasi
-            end_date: Tugash sanasi
-            limit: Maksimal soni
-            
         Returns:
             List[Income]: Daromadlar ro'yxati
         """
-        session = self.get_session()
-        try:
-            query = session.query(Income).filter(Income.user_id == telegram_id)
+        async with self.get_session() as session:
+            stmt = select(Income).where(Income.user_id == telegram_id)
             
             if start_date:
-                query = query.filter(Income.income_date >= start_date)
+                stmt = stmt.where(Income.income_date >= start_date)
             if end_date:
-                query = query.filter(Income.income_date <= end_date)
+                stmt = stmt.where(Income.income_date <= end_date)
             
-            query = query.order_by(desc(Income.income_date))
+            stmt = stmt.order_by(desc(Income.income_date))
             
             if limit:
-                query = query.limit(limit)
+                stmt = stmt.limit(limit)
             
-            return query.all()
-        finally:
-            session.close()
+            return list((await session.execute(stmt)).scalars().all())
     
-    def get_total_income(
+    async def get_user_incomes_page(
         self,
         telegram_id: int,
+        cursor: Optional[int] = None,
+        direction: str = PAGE_NEXT,
+        limit: int = 10,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
-    ) -> Decimal:
+    ) -> Tuple[List[Income], Optional[int], Optional[int]]:
         """
-        Jami daromad summasini hisoblash
+        Daromadlarni keyset sahifalash bilan olish
         
         Args:
             telegram_id: Foydalanuvchi ID
+            cursor: Chegara daromad id'si (None = birinchi sahifa)
+            direction: PAGE_NEXT yoki PAGE_PREV
+            limit: Sahifa hajmi
             start_date: Boshlanish sanasi
             end_date: Tugash sanasi
             
+        Returns:
+            Tuple: (daromadlar, prev_cursor, next_cursor)
+        """
+        async with self.get_session() as session:
+            try:
+                rows = (await session.execute(_incomes_page_stmt(
+                    telegram_id, cursor, direction, limit, start_date, end_date
+                ))).scalars().all()
+                
+                # Anchor topilmadi (o'chirilgan / boshqa foydalanuvchiniki) - birinchi sahifa
+                if _keyset_fallback_needed(rows, cursor):
+                    rows = (await session.execute(_incomes_page_stmt(
+                        telegram_id, None, PAGE_NEXT, limit, start_date, end_date
+                    ))).scalars().all()
+                    return _keyset_page_result(rows, None, PAGE_NEXT, limit)
+                
+                return _keyset_page_result(rows, cursor, direction, limit)
+            except Exception as e:
+                logger.error(f"get_user_incomes_page xatosi: {e}")
+                return [], None, None
+    
+    async def get_total_income(
+        self,
+        telegram_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Decimal:
+        """
+        Jami daromad summasini hisoblash
+        
         Returns:
             Decimal: Jami summa
         """
-        session = self.get_session()
-        try:
-            query = session.query(func.sum(Income.amount)).filter(
-                Income.user_id == telegram_id
-            )
-            
-            if start_date:
-                query = query.filter(Income.income_date >= start_date)
-            if end_date:
-                query = query.filter(Income.income_date <= end_date)
-            
-            result = query.scalar()
-            return result or Decimal('0.00')
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            result = (await session.execute(
+                _total_income_stmt(telegram_id, start_date, end_date)
+            )).scalar()
+            return Decimal(str(result)) if result else Decimal('0.00')
     
-    def delete_income(self, income_id: int, telegram_id: int) -> bool:
+    async def delete_income(self, income_id: int, telegram_id: int) -> bool:
         """
         Daromadni o'chirish
         
-        Args:
-            income_id: Daromad ID
-            telegram_id: Foydalanuvchi ID (xavfsizlik uchun)
-            
         Returns:
             bool: Muvaffaqiyatli o'chirildi
         """
-        session = self.get_session()
-        try:
-            income = session.query(Income).filter(
-                and_(Income.id == income_id, Income.user_id == telegram_id)
-            ).first()
-            
-            if income:
-                session.delete(income)
-                session.commit()
-                logger.info(f"Daromad o'chirildi: {income_id}")
-                return True
-            return False
-        except Exception as e:
-            session.rollback()
-            logger.error(f"delete_income xatosi: {e}")
-            return False
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            try:
+                income = (await session.execute(
+                    select(Income).where(
+                        and_(Income.id == income_id, Income.user_id == telegram_id)
+                    )
+                )).scalar_one_or_none()
+                
+                if income:
+                    await session.run_sync(
+                        _apply_income_rollup, income.user_id, income.income_date, -income.amount, -1
+                    )
+                    await session.delete(income)
+                    await session.commit()
+                    logger.info(f"Daromad o'chirildi: {income_id}")
+                    return True
+                return False
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"delete_income xatosi: {e}")
+                return False
     
-    def get_income_by_id(self, income_id: int, telegram_id: int) -> Optional[Income]:
+    async def get_income_by_id(self, income_id: int, telegram_id: int) -> Optional[Income]:
         """
         Daromadni ID bo'yicha olish
         
-        Args:
-            income_id: Daromad ID
-            telegram_id: Foydalanuvchi ID (xavfsizlik uchun)
-            
         Returns:
             Optional[Income]: Daromad yoki None
         """
-        session = self.get_session()
-        try:
-            income = session.query(Income).filter(
-                and_(Income.id == income_id, Income.user_id == telegram_id)
-            ).first()
-            return income
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            return (await session.execute(
+                select(Income).where(
+                    and_(Income.id == income_id, Income.user_id == telegram_id)
+                )
+            )).scalar_one_or_none()
     
     
     # =====================================================
     # DEBT OPERATIONS
     # =====================================================
     
-    def add_debt(
+    async def add_debt(
         self,
         telegram_id: int,
         person_name: str,
@@ -709,46 +3832,35 @@ class DatabaseManager:
         """
         Qarz qo'shish
         
-        Args:
-            telegram_id: Foydalanuvchi ID
-            person_name: Shaxs ismi
-            amount: Summa
-            debt_type: Qarz turi ('given' yoki 'taken')
-            due_date: Qaytarish sanasi
-            description: Izoh
-            reminder_days: Eslatma kunlari oldin
-            
         Returns:
             Optional[Debt]: Yaratilgan qarz
         """
-        session = self.get_session()
-        try:
-            debt = Debt(
-                user_id=telegram_id,
-                person_name=person_name,
-                amount=amount,
-                debt_type=debt_type,
-                due_date=due_date,
-                description=description,
-                status='active',
-                paid_amount=Decimal('0'),
-                reminder_days=reminder_days
-            )
-            
-            session.add(debt)
-            session.commit()
-            session.refresh(debt)
-            logger.info(f"Qarz qo'shildi: {telegram_id}, {person_name}, {amount}, {debt_type}")
-            
-            return debt
-        except Exception as e:
-            session.rollback()
-            logger.error(f"add_debt xatosi: {e}")
-            return None
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            try:
+                debt = Debt(
+                    user_id=telegram_id,
+                    person_name=person_name,
+                    amount=amount,
+                    debt_type=debt_type,
+                    due_date=due_date,
+                    description=description,
+                    status='active',
+                    paid_amount=Decimal('0'),
+                    reminder_days=reminder_days
+                )
+                
+                session.add(debt)
+                await session.commit()
+                await session.refresh(debt)
+                logger.info(f"Qarz qo'shildi: {telegram_id}, {person_name}, {amount}, {debt_type}")
+                
+                return debt
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"add_debt xatosi: {e}")
+                return None
     
-    def get_user_debts(
+    async def get_user_debts(
         self,
         telegram_id: int,
         debt_type: Optional[str] = None,
@@ -759,41 +3871,70 @@ class DatabaseManager:
         """
         Foydalanuvchi qarzlarini olish
         
+        Returns:
+            List[Debt]: Qarzlar ro'yxati
+        """
+        async with self.get_session() as session:
+            try:
+                stmt = select(Debt).where(Debt.user_id == telegram_id)
+                
+                if debt_type:
+                    stmt = stmt.where(Debt.debt_type == debt_type)
+                if status:
+                    stmt = stmt.where(Debt.status == status)
+                if start_date:
+                    stmt = stmt.where(Debt.created_at >= start_date)
+                if end_date:
+                    stmt = stmt.where(Debt.created_at <= end_date)
+                
+                stmt = stmt.order_by(desc(Debt.created_at))
+                return list((await session.execute(stmt)).scalars().all())
+            except Exception as e:
+                logger.error(f"get_user_debts xatosi: {e}")
+                return []
+    
+    async def get_user_debts_page(
+        self,
+        telegram_id: int,
+        debt_type: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[int] = None,
+        direction: str = PAGE_NEXT,
+        limit: int = 10
+    ) -> Tuple[List['Debt'], Optional[int], Optional[int]]:
+        """
+        Qarzlarni keyset sahifalash bilan olish
+        
         Args:
             telegram_id: Foydalanuvchi ID
             debt_type: Qarz turi ('given', 'taken', None=hammasi)
             status: Holat ('active', 'paid', 'overdue', None=hammasi)
-            start_date: Boshlanish sanasi
-            end_date: Tugash sanasi
+            cursor: Chegara qarz id'si (None = birinchi sahifa)
+            direction: PAGE_NEXT yoki PAGE_PREV
+            limit: Sahifa hajmi
             
         Returns:
-            List[Debt]: Qarzlar ro'yxati
+            Tuple: (qarzlar, prev_cursor, next_cursor)
         """
-        session = self.get_session()
-        try:
-            query = session.query(Debt).filter(Debt.user_id == telegram_id)
-            
-            if debt_type:
-                query = query.filter(Debt.debt_type == debt_type)
-            
-            if status:
-                query = query.filter(Debt.status == status)
-            
-            if start_date:
-                query = query.filter(Debt.created_at >= start_date)
-            
-            if end_date:
-                query = query.filter(Debt.created_at <= end_date)
-            
-            debts = query.order_by(desc(Debt.created_at)).all()
-            return debts
-        except Exception as e:
-            logger.error(f"get_user_debts xatosi: {e}")
-            return []
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            try:
+                rows = (await session.execute(_debts_page_stmt(
+                    telegram_id, cursor, direction, limit, debt_type, status
+                ))).scalars().all()
+                
+                # Anchor topilmadi (o'chirilgan / boshqa foydalanuvchiniki) - birinchi sahifa
+                if _keyset_fallback_needed(rows, cursor):
+                    rows = (await session.execute(_debts_page_stmt(
+                        telegram_id, None, PAGE_NEXT, limit, debt_type, status
+                    ))).scalars().all()
+                    return _keyset_page_result(rows, None, PAGE_NEXT, limit)
+                
+                return _keyset_page_result(rows, cursor, direction, limit)
+            except Exception as e:
+                logger.error(f"get_user_debts_page xatosi: {e}")
+                return [], None, None
     
-    def get_debt_by_id(
+    async def get_debt_by_id(
         self,
         debt_id: int,
         telegram_id: int
@@ -801,27 +3942,19 @@ class DatabaseManager:
         """
         ID bo'yicha qarzni olish
         
-        Args:
-            debt_id: Qarz ID
-            telegram_id: Foydalanuvchi ID
-            
         Returns:
             Optional[Debt]: Qarz
         """
-        session = self.get_session()
-        try:
-            debt = session.query(Debt).filter(
-                Debt.id == debt_id,
-                Debt.user_id == telegram_id
-            ).first()
-            return debt
-        except Exception as e:
-            logger.error(f"get_debt_by_id xatosi: {e}")
-            return None
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            try:
+                return (await session.execute(
+                    select(Debt).where(Debt.id == debt_id, Debt.user_id == telegram_id)
+                )).scalar_one_or_none()
+            except Exception as e:
+                logger.error(f"get_debt_by_id xatosi: {e}")
+                return None
     
-    def update_debt(
+    async def update_debt(
         self,
         debt_id: int,
         telegram_id: int,
@@ -830,44 +3963,35 @@ class DatabaseManager:
         """
         Qarzni yangilash
         
-        Args:
-            debt_id: Qarz ID
-            telegram_id: Foydalanuvchi ID
-            **kwargs: Yangilanadigan maydonlar
-            
         Returns:
             Optional[Debt]: Yangilangan qarz
         """
-        session = self.get_session()
-        try:
-            debt = session.query(Debt).filter(
-                Debt.id == debt_id,
-                Debt.user_id == telegram_id
-            ).first()
-            
-            if not debt:
-                return None
-            
-            # Allowed fields
-            allowed_fields = ['person_name', 'amount', 'due_date', 'description', 
-                            'status', 'paid_amount', 'reminder_days']
-            
-            for key, value in kwargs.items():
-                if key in allowed_fields and hasattr(debt, key):
-                    setattr(debt, key, value)
-            
-            session.commit()
-            session.refresh(debt)
-            logger.info(f"Qarz yangilandi: {debt_id}")
-            return debt
-        except Exception as e:
-            session.rollback()
-            logger.error(f"update_debt xatosi: {e}")
-            return None
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            try:
+                debt = (await session.execute(
+                    select(Debt).where(Debt.id == debt_id, Debt.user_id == telegram_id)
+                )).scalar_one_or_none()
+                
+                if not debt:
+                    return None
+                
+                allowed_fields = ['person_name', 'amount', 'due_date', 'description',
+                                'status', 'paid_amount', 'reminder_days']
+                
+                for key, value in kwargs.items():
+                    if key in allowed_fields and hasattr(debt, key):
+                        setattr(debt, key, value)
+                
+                await session.commit()
+                await session.refresh(debt)
+                logger.info(f"Qarz yangilandi: {debt_id}")
+                return debt
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"update_debt xatosi: {e}")
+                return None
     
-    def mark_debt_paid(
+    async def mark_debt_paid(
         self,
         debt_id: int,
         telegram_id: int,
@@ -876,47 +4000,37 @@ class DatabaseManager:
         """
         Qarzni to'langan deb belgilash (to'liq yoki qisman)
         
-        Args:
-            debt_id: Qarz ID
-            telegram_id: Foydalanuvchi ID
-            paid_amount: To'langan summa (None bo'lsa to'liq to'langan)
-            
         Returns:
             bool: Muvaffaqiyatli belgilandi
         """
-        session = self.get_session()
-        try:
-            debt = session.query(Debt).filter(
-                Debt.id == debt_id,
-                Debt.user_id == telegram_id
-            ).first()
-            
-            if not debt:
-                return False
-            
-            if paid_amount is None:
-                # To'liq to'landi
-                debt.paid_amount = debt.amount
-                debt.status = 'paid'
-            else:
-                # Qisman to'landi
-                debt.paid_amount += paid_amount
-                if debt.paid_amount >= debt.amount:
+        async with self.get_session() as session:
+            try:
+                debt = (await session.execute(
+                    select(Debt).where(Debt.id == debt_id, Debt.user_id == telegram_id)
+                )).scalar_one_or_none()
+                
+                if not debt:
+                    return False
+                
+                if paid_amount is None:
+                    debt.paid_amount = debt.amount
                     debt.status = 'paid'
                 else:
-                    debt.status = 'partially_paid'
-            
-            session.commit()
-            logger.info(f"Qarz to'langan deb belgilandi: {debt_id}")
-            return True
-        except Exception as e:
-            session.rollback()
-            logger.error(f"mark_debt_paid xatosi: {e}")
-            return False
-        finally:
-            session.close()
+                    debt.paid_amount += paid_amount
+                    if debt.paid_amount >= debt.amount:
+                        debt.status = 'paid'
+                    else:
+                        debt.status = 'partially_paid'
+                
+                await session.commit()
+                logger.info(f"Qarz to'langan deb belgilandi: {debt_id}")
+                return True
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"mark_debt_paid xatosi: {e}")
+                return False
     
-    def delete_debt(
+    async def delete_debt(
         self,
         debt_id: int,
         telegram_id: int
@@ -924,72 +4038,95 @@ class DatabaseManager:
         """
         Qarzni o'chirish
         
-        Args:
-            debt_id: Qarz ID
-            telegram_id: Foydalanuvchi ID
-            
         Returns:
             bool: Muvaffaqiyatli o'chirildi
         """
-        session = self.get_session()
-        try:
-            debt = session.query(Debt).filter(
-                Debt.id == debt_id,
-                Debt.user_id == telegram_id
-            ).first()
-            
-            if debt:
-                session.delete(debt)
-                session.commit()
-                logger.info(f"Qarz o'chirildi: {debt_id}")
-                return True
-            return False
-        except Exception as e:
-            session.rollback()
-            logger.error(f"delete_debt xatosi: {e}")
-            return False
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            try:
+                debt = (await session.execute(
+                    select(Debt).where(Debt.id == debt_id, Debt.user_id == telegram_id)
+                )).scalar_one_or_none()
+                
+                if debt:
+                    await session.delete(debt)
+                    await session.commit()
+                    logger.info(f"Qarz o'chirildi: {debt_id}")
+                    return True
+                return False
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"delete_debt xatosi: {e}")
+                return False
     
-    def get_overdue_debts(
+    async def get_overdue_debts(
         self,
         telegram_id: Optional[int] = None
     ) -> List['Debt']:
         """
         Muddati o'tgan qarzlarni olish
         
-        Args:
-            telegram_id: Foydalanuvchi ID (None bo'lsa barcha foydalanuvchilar)
-            
         Returns:
             List[Debt]: Muddati o'tgan qarzlar
         """
-        session = self.get_session()
-        try:
-            query = session.query(Debt).filter(
-                Debt.status.in_(['active', 'partially_paid']),
-                Debt.due_date < date.today()
-            )
-            
-            if telegram_id:
-                query = query.filter(Debt.user_id == telegram_id)
-            
-            debts = query.all()
-            
-            # Statusni yangilash
-            for debt in debts:
-                debt.status = 'overdue'
-            session.commit()
-            
-            return debts
-        except Exception as e:
-            session.rollback()
-            logger.error(f"get_overdue_debts xatosi: {e}")
-            return []
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            try:
+                # Faqat o'qish - statusni sweep_overdue_debts() yangilaydi
+                stmt = select(Debt).where(
+                    or_(Debt.status == 'overdue', _overdue_debts_filter(date.today()))
+                )
+                
+                if telegram_id:
+                    stmt = stmt.where(Debt.user_id == telegram_id)
+                
+                return list((await session.execute(stmt)).scalars().all())
+            except Exception as e:
+                logger.error(f"get_overdue_debts xatosi: {e}")
+                return []
     
-    def get_debts_with_reminders(
+    async def sweep_overdue_debts(
+        self,
+        chunk_size: Optional[int] = None,
+        on_chunk: Optional[Callable[[List[Tuple[int, int]]], Any]] = None
+    ) -> int:
+        """
+        Muddati o'tgan qarzlarni 'overdue' holatiga o'tkazish (set-based)
+        
+        on_chunk oddiy funksiya yoki coroutine bo'lishi mumkin.
+        
+        Returns:
+            int: Yangilangan qarzlar soni
+        """
+        chunk_size = chunk_size or SchedulerConfig.OVERDUE_SWEEP_CHUNK
+        today = date.today()
+        total = 0
+        
+        async with self.get_session() as session:
+            try:
+                while True:
+                    rows = await session.run_sync(_sweep_overdue_chunk, today, chunk_size)
+                    await session.commit()
+                    
+                    if not rows:
+                        break
+                    
+                    total += len(rows)
+                    if on_chunk:
+                        result = on_chunk(rows)
+                        if asyncio.iscoroutine(result):
+                            await result
+                    
+                    if len(rows) < chunk_size:
+                        break
+                
+                if total:
+                    logger.info(f"Muddati o'tgan qarzlar yangilandi (async): {total}")
+                return total
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"sweep_overdue_debts xatosi: {e}")
+                return total
+    
+    async def get_debts_with_reminders(
         self,
         telegram_id: Optional[int] = None,
         days_before: int = 3
@@ -997,198 +4134,312 @@ class DatabaseManager:
         """
         Eslatma kerak bo'lgan qarzlarni olish
         
-        Args:
-            telegram_id: Foydalanuvchi ID
-            days_before: Necha kun oldin eslatish
-            
         Returns:
             List[Debt]: Qarzlar ro'yxati
         """
-        session = self.get_session()
-        try:
-            reminder_date = date.today() + timedelta(days=days_before)
-            
-            query = session.query(Debt).filter(
-                Debt.status.in_(['active', 'partially_paid']),
-                Debt.due_date == reminder_date,
-                Debt.reminder_days == days_before
-            )
-            
-            if telegram_id:
-                query = query.filter(Debt.user_id == telegram_id)
-            
-            debts = query.all()
-            return debts
-        except Exception as e:
-            logger.error(f"get_debts_with_reminders xatosi: {e}")
-            return []
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            try:
+                reminder_date = date.today() + timedelta(days=days_before)
+                
+                stmt = select(Debt).where(
+                    Debt.status.in_(['active', 'partially_paid']),
+                    Debt.due_date == reminder_date,
+                    Debt.reminder_days == days_before
+                )
+                
+                if telegram_id:
+                    stmt = stmt.where(Debt.user_id == telegram_id)
+                
+                return list((await session.execute(stmt)).scalars().all())
+            except Exception as e:
+                logger.error(f"get_debts_with_reminders xatosi: {e}")
+                return []
     
-    def get_debt_statistics(
+    async def get_debt_statistics(
         self,
         telegram_id: int
     ) -> Dict[str, Any]:
         """
         Qarzlar statistikasini olish
         
-        Args:
-            telegram_id: Foydalanuvchi ID
-            
         Returns:
             Dict: Statistika ma'lumotlari
         """
-        session = self.get_session()
-        try:
-            # Bergan qarzlar
-            given_debts = session.query(Debt).filter(
-                Debt.user_id == telegram_id,
-                Debt.debt_type == 'given'
-            ).all()
-            
-            given_total = sum(d.amount for d in given_debts)
-            given_active = sum(d.amount - d.paid_amount for d in given_debts if d.status in ['active', 'partially_paid'])
-            given_paid = sum(d.paid_amount for d in given_debts)
-            
-            # Olgan qarzlar
-            taken_debts = session.query(Debt).filter(
-                Debt.user_id == telegram_id,
-                Debt.debt_type == 'taken'
-            ).all()
-            
-            taken_total = sum(d.amount for d in taken_debts)
-            taken_active = sum(d.amount - d.paid_amount for d in taken_debts if d.status in ['active', 'partially_paid'])
-            taken_paid = sum(d.paid_amount for d in taken_debts)
-            
-            # Muddati o'tganlar
-            overdue_given = len([d for d in given_debts if d.status == 'overdue'])
-            overdue_taken = len([d for d in taken_debts if d.status == 'overdue'])
+        async with self.get_session() as session:
+            try:
+                rows = (await session.execute(_debt_statistics_stmt(telegram_id))).all()
+                return _build_debt_statistics(rows)
+            except Exception as e:
+                logger.error(f"get_debt_statistics xatosi: {e}")
+                return {'given': {}, 'taken': {}}
+    
+    
+    # =====================================================
+    # REMINDER OPERATIONS
+    # =====================================================
+    
+    async def add_reminder(
+        self,
+        telegram_id: int,
+        reminder_type: str,
+        reminder_date: datetime,
+        debt_id: Optional[int] = None,
+        message: Optional[str] = None
+    ) -> Optional[Reminder]:
+        """
+        Eslatma qo'shish
+        
+        Returns:
+            Optional[Reminder]: Yaratilgan eslatma
+        """
+        async with self.get_session() as session:
+            try:
+                reminder = Reminder(
+                    user_id=telegram_id,
+                    reminder_type=reminder_type,
+                    reminder_date=reminder_date,
+                    message=message,
+                    is_sent=False
+                )
+                
+                session.add(reminder)
+                await session.commit()
+                logger.info(f"Eslatma qo'shildi: {telegram_id}, {reminder_type}")
+                _notify_reminder_added(reminder)
+                return reminder
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"add_reminder xatosi: {e}")
+                return None
+    
+    async def get_pending_reminders(self) -> List[Reminder]:
+        """
+        Yuborilmagan eslatmalarni olish
+        
+        Returns:
+            List[Reminder]: Eslatmalar ro'yxati
+        """
+        async with self.get_session() as session:
+            stmt = select(Reminder).where(
+                and_(
+                    Reminder.is_sent == False,
+                    Reminder.reminder_date <= datetime.now()
+                )
+            ).order_by(asc(Reminder.reminder_date))
             
-            return {
-                'given': {
-                    'total': given_total,
-                    'active': given_active,
-                    'paid': given_paid,
-                    'count': len(given_debts),
-                    'overdue': overdue_given
-                },
-                'taken': {
-                    'total': taken_total,
-                    'active': taken_active,
-                    'paid': taken_paid,
-                    'count': len(taken_debts),
-                    'overdue': overdue_taken
-                }
-            }
-        except Exception as e:
-            logger.error(f"get_debt_statistics xatosi: {e}")
-            return {'given': {}, 'taken': {}}
-        finally:
-            session.close()
+            return list((await session.execute(stmt)).scalars().all())
+    
+    async def mark_reminder_sent(self, reminder_id: int) -> bool:
+        """
+        Eslatmani yuborilgan deb belgilash
+        
+        Returns:
+            bool: Muvaffaqiyatli belgilandi
+        """
+        async with self.get_session() as session:
+            try:
+                reminder = (await session.execute(
+                    select(Reminder).where(Reminder.id == reminder_id)
+                )).scalar_one_or_none()
+                
+                if reminder:
+                    reminder.is_sent = True
+                    reminder.sent_at = datetime.now()
+                    await session.commit()
+                    return True
+                return False
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"mark_reminder_sent xatosi: {e}")
+                return False
+    
+    async def get_upcoming_reminders(
+        self,
+        until: datetime,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 500
+    ) -> List[Reminder]:
+        """
+        Yuborilmagan eslatmalarni bo'laklab olish (scheduler uchun)
+        
+        Returns:
+            List[Reminder]: (reminder_date, id) bo'yicha saralangan eslatmalar
+        """
+        async with self.get_session() as session:
+            try:
+                return list((await session.execute(
+                    _upcoming_reminders_stmt(until, after, limit)
+                )).scalars().all())
+            except Exception as e:
+                logger.error(f"get_upcoming_reminders xatosi: {e}")
+                return []
+    
+    async def mark_reminders_sent(self, reminder_ids: List[int]) -> int:
+        """
+        Bir nechta eslatmani bitta UPDATE bilan yuborilgan deb belgilash
+        
+        Returns:
+            int: Belgilangan eslatmalar soni
+        """
+        if not reminder_ids:
+            return 0
+        
+        async with self.get_session() as session:
+            try:
+                result = await session.execute(
+                    _mark_reminders_sent_stmt(reminder_ids),
+                    execution_options={'synchronize_session': False}
+                )
+                await session.commit()
+                return result.rowcount
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"mark_reminders_sent xatosi: {e}")
+                return 0
+    
+    
+    # =====================================================
+    # PERIOD SUMMARIES
+    # =====================================================
+    
+    async def get_period_summaries(
+        self,
+        start_day: date,
+        end_day: date,
+        after_user_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Davr bo'yicha barcha faol foydalanuvchilar xulosasi (kunlik/haftalik)
+        
+        Returns:
+            List[Dict]: telegram_id bo'yicha saralangan xulosalar
+        """
+        async with self.get_session() as session:
+            try:
+                return await session.run_sync(
+                    _period_summaries, start_day, end_day, after_user_id
+                )
+            except Exception as e:
+                logger.error(f"get_period_summaries xatosi: {e}")
+                return []
+    
+    async def get_job_checkpoint(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Davriy vazifa checkpoint'ini olish
+        
+        Returns:
+            Optional[Dict]: period_key, last_user_id, completed
+        """
+        async with self.get_session() as session:
+            return await session.run_sync(_load_job_checkpoint, name)
+    
+    async def save_job_checkpoint(
+        self,
+        name: str,
+        period_key: str,
+        last_user_id: Optional[int] = None,
+        completed: bool = False
+    ) -> bool:
+        """
+        Davriy vazifa checkpoint'ini saqlash
+        
+        Returns:
+            bool: Saqlandi
+        """
+        async with self.get_session() as session:
+            try:
+                await session.run_sync(
+                    _store_job_checkpoint, name, period_key, last_user_id, completed
+                )
+                await session.commit()
+                return True
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"save_job_checkpoint xatosi: {e}")
+                return False
     
     
     # =====================================================
-    # REMINDER OPERATIONS
+    # CATEGORY CLASSIFIER
     # =====================================================
     
-    def add_reminder(
-        self,
-        telegram_id: int,
-        reminder_type: str,
-        reminder_date: datetime,
-        debt_id: Optional[int] = None,
-        message: Optional[str] = None
-    ) -> Optional[Reminder]:
+    async def get_category_tokens(self, telegram_id: int) -> List[Tuple[str, int, int]]:
         """
-        Eslatma qo'shish
+        Foydalanuvchi klassifikatori hisoblagichlarini olish
         
-        Args:
-            telegram_id: Foydalanuvchi ID
-            reminder_type: Eslatma turi
-            reminder_date: Eslatma sanasi
-            debt_id: Qarz ID (agar qarz eslatmasi bo'lsa)
-            message: Xabar
-            
         Returns:
-            Optional[Reminder]: Yaratilgan eslatma
+            List[Tuple[str, int, int]]: [(token, category_id, count), ...]
         """
-        session = self.get_session()
-        try:
-            reminder = Reminder(
-                user_id=telegram_id,
-                debt_id=debt_id,
-                reminder_type=reminder_type,
-                reminder_date=reminder_date,
-                message=message,
-                is_sent=False
-            )
-            
-            session.add(reminder)
-            session.commit()
-            logger.info(f"Eslatma qo'shildi: {telegram_id}, {reminder_type}")
-            return reminder
-        except Exception as e:
-            session.rollback()
-            logger.error(f"add_reminder xatosi: {e}")
-            return None
-        finally:
-            session.close()
+        async with self.get_session() as session:
+            try:
+                return await session.run_sync(_load_category_tokens, telegram_id)
+            except Exception as e:
+                logger.error(f"get_category_tokens xatosi: {e}")
+                return []
     
-    def get_pending_reminders(self) -> List[Reminder]:
+    async def add_category_tokens(
+        self,
+        telegram_id: int,
+        category_key: str,
+        tokens: Dict[str, int],
+        docs: int = 1
+    ) -> bool:
         """
-        Yuborilmagan eslatmalarni olish
+        Saqlangan xarajatdan klassifikatorni o'rgatish
         
         Returns:
-            List[Reminder]: Eslatmalar ro'yxati
+            bool: Saqlandi
         """
-        session = self.get_session()
-        try:
-            now = datetime.now()
-            
-            query = session.query(Reminder).filter(
-                and_(
-                    Reminder.is_sent == False,
-                    Reminder.reminder_date <= now
+        await self._ensure_categories()
+        category_id = category_registry.get_id(category_key)
+        if category_id is None:
+            logger.error(f"Kategoriya topilmadi: {category_key}")
+            return False
+        
+        async with self.get_session() as session:
+            try:
+                await session.run_sync(
+                    _apply_category_tokens, telegram_id, category_id, tokens, docs
                 )
-            ).order_by(asc(Reminder.reminder_date))
-            
-            return query.all()
-        finally:
-            session.close()
+                await session.commit()
+                return True
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"add_category_tokens xatosi: {e}")
+                return False
     
-    def mark_reminder_sent(self, reminder_id: int) -> bool:
+    
+    # =====================================================
+    # BULK OPERATIONS
+    # =====================================================
+    
+    async def bulk_add(
+        self,
+        expenses: Optional[List[Dict[str, Any]]] = None,
+        incomes: Optional[List[Dict[str, Any]]] = None
+    ) -> Tuple[List[Optional[int]], List[Optional[int]]]:
         """
-        Eslatmani yuborilgan deb belgilash
+        Ko'p xarajat/daromadni bitta tranzaksiyada qo'shish
         
-        Args:
-            reminder_id: Eslatma ID
-            
         Returns:
-            bool: Muvaffaqiyatli belgilandi
+            tuple: (xarajat ID'lari, daromad ID'lari) - kirish tartibida
         """
-        session = self.get_session()
-        try:
-            reminder = session.query(Reminder).filter(Reminder.id == reminder_id).first()
-            
-            if reminder:
-                reminder.is_sent = True
-                reminder.sent_at = datetime.now()
-                session.commit()
-                return True
-            return False
-        except Exception as e:
-            session.rollback()
-            logger.error(f"mark_reminder_sent xatosi: {e}")
-            return False
-        finally:
-            session.close()
+        expenses = expenses or []
+        incomes = incomes or []
+        if expenses:
+            await self._ensure_categories()
+        
+        async with self.session_scope() as session:
+            expense_ids, income_ids = await session.run_sync(_bulk_insert, expenses, incomes)
+        logger.info(f"Bulk qo'shildi: {len(expenses)} xarajat, {len(incomes)} daromad")
+        return expense_ids, income_ids
     
     
     # =====================================================
     # STATISTICS & ANALYTICS
     # =====================================================
     
-    def get_balance(
+    async def get_balance(
         self,
         telegram_id: int,
         start_date: Optional[datetime] = None,
@@ -1197,19 +4448,14 @@ class DatabaseManager:
         """
         Balansni hisoblash (daromad - xarajat)
         
-        Args:
-            telegram_id: Foydalanuvchi ID
-            start_date: Boshlanish sanasi
-            end_date: Tugash sanasi
-            
         Returns:
             Decimal: Balans
         """
-        total_income = self.get_total_income(telegram_id, start_date, end_date)
-        total_expense = self.get_total_expenses(telegram_id, start_date, end_date)
+        total_income = await self.get_total_income(telegram_id, start_date, end_date)
+        total_expense = await self.get_total_expenses(telegram_id, start_date, end_date)
         return total_income - total_expense
     
-    def get_daily_expenses_trend(
+    async def get_daily_expenses_trend(
         self,
         telegram_id: int,
         days: int = 7
@@ -1217,21 +4463,16 @@ class DatabaseManager:
         """
         Kunlik xarajatlar trendi
         
-        Args:
-            telegram_id: Foydalanuvchi ID
-            days: Necha kunlik ma'lumot
-            
         Returns:
             List[Dict]: [{'date': date, 'total': Decimal}]
         """
-        session = self.get_session()
-        try:
+        async with self.get_session() as session:
             start_date = datetime.now() - timedelta(days=days)
             
-            query = session.query(
+            stmt = select(
                 func.date(Expense.expense_date).label('date'),
                 func.sum(Expense.amount).label('total')
-            ).filter(
+            ).where(
                 and_(
                     Expense.user_id == telegram_id,
                     Expense.expense_date >= start_date
@@ -1241,18 +4482,403 @@ class DatabaseManager:
             ).order_by(asc('date'))
             
             results = []
-            for date_obj, total in query.all():
+            for date_obj, total in (await session.execute(stmt)).all():
                 results.append({
                     'date': date_obj,
                     'total': total or Decimal('0.00')
                 })
             
             return results
+    
+    async def get_report_snapshot(
+        self,
+        telegram_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        top_n: int = ReportConfig.MAX_TRANSACTIONS
+    ) -> Dict[str, Any]:
+        """
+        Hisobot uchun barcha ma'lumotlarni bitta session'da olish
+        
+        Returns:
+            Dict: DatabaseManager.get_report_snapshot() bilan bir xil
+        """
+        from sqlalchemy.orm import joinedload
+        
+        async with self.get_session() as session:
+            aggregate_rows = (await session.execute(
+                _report_aggregate_stmt(telegram_id, start_date, end_date)
+            )).all()
+            
+            await self._ensure_categories()
+            categories = {
+                row[1]: category_registry.get_by_id(row[1])
+                for row in aggregate_rows if row[0] == 'category'
+            }
+            
+            expenses = (await session.execute(
+                select(Expense).options(joinedload(Expense.category)).where(
+                    Expense.user_id == telegram_id,
+                    Expense.expense_date >= start_date,
+                    Expense.expense_date <= end_date
+                ).order_by(desc(Expense.expense_date)).limit(top_n)
+            )).scalars().all()
+            
+            incomes = (await session.execute(
+                select(Income).where(
+                    Income.user_id == telegram_id,
+                    Income.income_date >= start_date,
+                    Income.income_date <= end_date
+                ).order_by(desc(Income.income_date)).limit(top_n)
+            )).scalars().all()
+            
+            return _build_report_snapshot(aggregate_rows, categories, list(expenses), list(incomes))
+    
+    async def rebuild_rollups(self, telegram_id: Optional[int] = None) -> Dict[str, int]:
+        """
+        Rollup jadvallarini (kunlik/oylik yig'indilar) qayta qurish
+        
+        Returns:
+            Dict: {'daily': qatorlar soni, 'monthly': qatorlar soni}
+        """
+        async with self.session_scope() as session:
+            result = await session.run_sync(_rebuild_rollups, telegram_id)
+        logger.info(f"Rollup jadvallar qayta qurildi (async): {result}")
+        return result
+
+
+# =====================================================
+# THREAD POOL DATABASE MANAGER (OPT-IN)
+# =====================================================
+class DatabaseBusyError(Exception):
+    """Thread pool to'lib qolganda (backpressure) ko'tariladigan xato"""
+
+
+class ThreadPoolDatabaseManager:
+    """
+    Sync DatabaseManager metodlarini cheklangan ThreadPoolExecutor'da
+    ishlatuvchi wrapper - AsyncDatabaseManager bilan bir xil (await qilinadigan)
+    interfeys beradi.
+    
+    - Worker'lar soni DatabaseConfig.POOL_SIZE dan olinadi
+    - Handler'lar ChatUpdateProcessor orqali parallel ishlaydi, shuning uchun
+      bir vaqtda BotConfig.CONCURRENT_UPDATES tagacha chaqiruv keladi
+    - Bir vaqtda kutayotgan chaqiruvlar THREAD_POOL_MAX_PENDING bilan cheklanadi
+      (CONCURRENT_UPDATES dan kam emas - oddiy yuklama rad etilmasin)
+    - Limit to'lsa, chaqiruv THREAD_POOL_ACQUIRE_TIMEOUT gacha kutadi, keyin
+      DatabaseBusyError ko'tariladi
+    
+    Singleton pattern ishlatadi
+    """
+    
+    _instance = None
+    _executor = None
+    
+    def __new__(cls):
+        """Singleton pattern - faqat bitta instance"""
+        if cls._instance is None:
+            cls._instance = super(ThreadPoolDatabaseManager, cls).__new__(cls)
+        return cls._instance
+    
+    def __init__(self):
+        """Executor va metrikalarni yaratish"""
+        if self._executor is None:
+            self._db = DatabaseManager()
+            self._max_workers = max(1, DatabaseConfig.POOL_SIZE)
+            self._max_pending = max(
+                self._max_workers, BotConfig.CONCURRENT_UPDATES, DatabaseConfig.THREAD_POOL_MAX_PENDING
+            )
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix='db-worker'
+            )
+            self._semaphore: Optional[asyncio.Semaphore] = None
+            
+            # Metrikalar
+            self._lock = threading.Lock()
+            self._in_flight = 0
+            self._completed = 0
+            self._rejected = 0
+            self._total_wait = 0.0
+            self._max_wait = 0.0
+            
+            logger.info(f"DB thread pool yaratildi: {self._max_workers} worker, {self._max_pending} navbat")
+    
+    def __getattr__(self, name: str):
+        """DatabaseManager metodini thread pool'da ishlaydigan coroutine sifatida qaytarish"""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self._db, name)
+        if not callable(attr) or asyncio.iscoroutinefunction(attr):
+            return attr
+        
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+        
+        return wrapper
+    
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Sync funksiyani thread pool'da bajarish
+        
+        Args:
+            func: Bajariladigan funksiya
+            *args, **kwargs: Funksiya parametrlari
+            
+        Returns:
+            Any: Funksiya natijasi
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_pending)
+        
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(),
+                timeout=DatabaseConfig.THREAD_POOL_ACQUIRE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._rejected += 1
+            logger.warning(f"DB thread pool to'lgan, chaqiruv rad etildi: {func.__name__}")
+            raise DatabaseBusyError(f"DB thread pool to'lgan: {func.__name__}")
+        
+        enqueued_at = time.monotonic()
+        with self._lock:
+            self._in_flight += 1
+        
+        def call():
+            wait = time.monotonic() - enqueued_at
+            with self._lock:
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            return func(*args, **kwargs)
+        
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, call)
         finally:
-            session.close()
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+            self._semaphore.release()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Thread pool metrikalari
+        
+        Returns:
+            Dict: workers, in_flight, queue_depth, completed, rejected,
+                  avg_wait_ms, max_wait_ms
+        """
+        with self._lock:
+            return {
+                'workers': self._max_workers,
+                'max_pending': self._max_pending,
+                'in_flight': self._in_flight,
+                'queue_depth': max(0, self._in_flight - self._max_workers),
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'avg_wait_ms': (self._total_wait / self._completed * 1000) if self._completed else 0.0,
+                'max_wait_ms': self._max_wait * 1000,
+            }
+    
+    async def close(self):
+        """Executor'ni to'xtatish va database connection'ni yopish"""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            logger.info(f"DB thread pool to'xtatildi: {self.get_metrics()}")
+        await self._db.close()
+
 
+def get_async_db_manager() -> Union[AsyncDatabaseManager, ThreadPoolDatabaseManager]:
+    """
+    Handler'lar uchun await qilinadigan database manager
     
-    # =====================================================
-    # DEBT STATISTICS (YANGI QO'SHILDI)
-    # =====================================================
+    DatabaseConfig.USE_THREAD_POOL yoqilgan bo'lsa sync DatabaseManager
+    thread pool orqali ishlatiladi, aks holda AsyncDatabaseManager.
     
+    Returns:
+        AsyncDatabaseManager yoki ThreadPoolDatabaseManager
+    """
+    if DatabaseConfig.USE_THREAD_POOL:
+        return ThreadPoolDatabaseManager()
+    return AsyncDatabaseManager()
+
+
+
+# =====================================================
+# WRITE-BEHIND QUEUE (OPT-IN)
+# =====================================================
+class WriteBehindQueue:
+    """
+    add_expense / add_income uchun write-behind batching navbati
+    
+    Yozuvlar asyncio navbatiga qo'yiladi va har WRITE_BEHIND_FLUSH_MS
+    millisekundda yoki WRITE_BEHIND_BATCH_SIZE ta yig'ilganda bitta
+    tranzaksiyada (executemany) yoziladi. Chaqiruvchi yangi yozuv ID'si
+    bilan yakunlanadigan future oladi.
+    
+    Singleton pattern ishlatadi
+    """
+    
+    _instance = None
+    _initialized = False
+    
+    def __new__(cls):
+        """Singleton pattern - faqat bitta instance"""
+        if cls._instance is None:
+            cls._instance = super(WriteBehindQueue, cls).__new__(cls)
+        return cls._instance
+    
+    def __init__(self):
+        """Navbat parametrlarini sozlash (worker birinchi yozuvda ishga tushadi)"""
+        if not self._initialized:
+            self._db = DatabaseManager()
+            self._flush_interval = max(1, DatabaseConfig.WRITE_BEHIND_FLUSH_MS) / 1000
+            self._batch_size = max(1, DatabaseConfig.WRITE_BEHIND_BATCH_SIZE)
+            self._queue: Optional[asyncio.Queue] = None
+            self._worker: Optional[asyncio.Task] = None
+            self._closed = False
+            self._initialized = True
+    
+    def _ensure_worker(self) -> None:
+        """Navbat va worker task'ni yaratish (event loop ichida)"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+    
+    async def _submit(self, kind: str, params: Dict[str, Any]) -> asyncio.Future:
+        """Yozuvni navbatga qo'yish"""
+        if self._closed:
+            raise RuntimeError("WriteBehindQueue yopilgan")
+        
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((kind, params, future))
+        return future
+    
+    async def submit_expense(
+        self,
+        telegram_id: int,
+        amount: Decimal,
+        category_key: str,
+        description: Optional[str] = None,
+        expense_date: Optional[datetime] = None
+    ) -> asyncio.Future:
+        """
+        Xarajatni navbatga qo'yish
+        
+        Returns:
+            asyncio.Future: Yangi xarajat ID'si (kategoriya topilmasa None)
+        """
+        return await self._submit('expense', {
+            'telegram_id': telegram_id,
+            'amount': amount,
+            'category_key': category_key,
+            'description': description,
+            'expense_date': expense_date or datetime.now()
+        })
+    
+    async def submit_income(
+        self,
+        telegram_id: int,
+        amount: Decimal,
+        source: Optional[str] = None,
+        income_type: str = 'other',
+        is_recurring: bool = False,
+        income_date: Optional[datetime] = None
+    ) -> asyncio.Future:
+        """
+        Daromadni navbatga qo'yish
+        
+        Returns:
+            asyncio.Future: Yangi daromad ID'si
+        """
+        return await self._submit('income', {
+            'telegram_id': telegram_id,
+            'amount': amount,
+            'source': source,
+            'income_type': income_type,
+            'is_recurring': is_recurring,
+            'income_date': income_date or datetime.now()
+        })
+    
+    async def _run(self) -> None:
+        """Worker - navbatdan batch yig'ib yozish"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            
+            batch = [item]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            await self._flush_batch(batch)
+    
+    async def _flush_batch(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> None:
+        """Batch'ni thread'da bitta tranzaksiyada yozish va future'larni yakunlash"""
+        expenses = [params for kind, params, _ in batch if kind == 'expense']
+        incomes = [params for kind, params, _ in batch if kind == 'income']
+        
+        try:
+            loop = asyncio.get_running_loop()
+            expense_ids, income_ids = await loop.run_in_executor(
+                None, functools.partial(self._db.bulk_add, expenses, incomes)
+            )
+        except Exception as e:
+            logger.error(f"Write-behind batch yozishda xato ({len(batch)} ta): {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        expense_ids = iter(expense_ids)
+        income_ids = iter(income_ids)
+        for kind, _, future in batch:
+            new_id = next(expense_ids) if kind == 'expense' else next(income_ids)
+            if not future.done():
+                future.set_result(new_id)
+        
+        logger.debug(f"Write-behind batch yozildi: {len(expenses)} xarajat, {len(incomes)} daromad")
+    
+    async def close(self) -> None:
+        """
+        Navbatni yopish - qolgan barcha yozuvlar database'ga yoziladi
+        
+        shutdown_handler'dan chaqiriladi.
+        """
+        self._closed = True
+        if self._queue is None:
+            return
+        
+        if self._worker and not self._worker.done():
+            await self._queue.put(None)
+            await self._worker
+        
+        # Worker to'xtagandan keyin navbatda qolganlar
+        remaining = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                remaining.append(item)
+        if remaining:
+            await self._flush_batch(remaining)
+        
+        logger.info("Write-behind navbati yopildi")
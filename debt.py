@@ -11,11 +11,13 @@ from datetime import datetime, date, timedelta
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 
-from database.db_manager import DatabaseManager
+from database.db_manager import get_async_db_manager
+from keyboards.inline import get_pagination_keyboard
+from utils.filters import parse_page_callback
 from utils.translations import get_text, format_currency
 
 logger = logging.getLogger(__name__)
-db_manager = DatabaseManager()
+db_manager = get_async_db_manager()
 
 
 # =====================================================
@@ -354,7 +356,7 @@ async def handle_debt_save(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     language = context.user_data.get('language', 'uz')
     telegram_id = context.user_data.get('telegram_id')
     
-    debt = db_manager.add_debt(
+    debt = await db_manager.add_debt(
         telegram_id=telegram_id,
         person_name=context.user_data.get('temp_debt_person'),
         amount=context.user_data.get('temp_debt_amount'),
@@ -423,7 +425,15 @@ async def list_debts(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     telegram_id = context.user_data.get('telegram_id')
     
     debt_type = 'given' if 'debt_list_given' in query.data else 'taken'
-    debts = db_manager.get_user_debts(telegram_id=telegram_id, debt_type=debt_type, status='active')
+    prefix = f'debt_list_{debt_type}'
+    cursor, direction, page = parse_page_callback(query.data, prefix)
+    # Baza faqat bitta sahifani qaytaradi (keyset)
+    debts, prev_cursor, next_cursor = await db_manager.get_user_debts_page(
+        telegram_id=telegram_id, debt_type=debt_type, status='active',
+        cursor=cursor, direction=direction, limit=10
+    )
+    if prev_cursor is None:
+        page = 1
     
     if not debts:
         no_data = get_text('no_debts_found', language)
@@ -434,7 +444,7 @@ async def list_debts(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     header = '📤 <b>Bergan qarzlarim</b>\n\n' if debt_type == 'given' else '📥 <b>Olgan qarzlarim</b>\n\n'
     
     keyboard_buttons = []
-    for debt in debts[:10]:
+    for debt in debts:
         amount_fmt = f"{debt.amount:,.0f}".replace(',', ' ')
         due_text = debt.due_date.strftime('%d.%m') if debt.due_date else '-'
         
@@ -447,9 +457,13 @@ async def list_debts(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
         btn_text = f"{debt.person_name} • {amount_fmt} • {due_text}{days_left}"
         keyboard_buttons.append([InlineKeyboardButton(btn_text, callback_data=f'debt_view_{debt.id}')])
     
-    keyboard_buttons.append([InlineKeyboardButton('« Orqaga', callback_data='debt_menu')])
+    keyboard = get_pagination_keyboard(
+        page, None, prefix, language,
+        prev_cursor=prev_cursor, next_cursor=next_cursor,
+        rows=keyboard_buttons, back_callback='debt_menu'
+    )
     
-    await query.edit_message_text(text=header + "Tanlang:", reply_markup=InlineKeyboardMarkup(keyboard_buttons), parse_mode='HTML')
+    await query.edit_message_text(text=header + "Tanlang:", reply_markup=keyboard, parse_mode='HTML')
 
 
 async def view_debt_details(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -459,7 +473,7 @@ async def view_debt_details(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     telegram_id = context.user_data.get('telegram_id')
     debt_id = int(query.data.replace('debt_view_', ''))
-    debt = db_manager.get_debt_by_id(debt_id, telegram_id)
+    debt = await db_manager.get_debt_by_id(debt_id, telegram_id)
     
     if not debt:
         await query.edit_message_text("❌ Qarz topilmadi")
@@ -512,7 +526,7 @@ async def debt_statistics(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await query.answer()
     
     telegram_id = context.user_data.get('telegram_id')
-    stats = db_manager.get_debt_statistics(telegram_id)
+    stats = await db_manager.get_debt_statistics(telegram_id)
     
     given = stats.get('given', {})
     taken = stats.get('taken', {})
@@ -548,7 +562,7 @@ async def mark_debt_paid(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     telegram_id = context.user_data.get('telegram_id')
     debt_id = int(query.data.replace('debt_paid_full_', ''))
     
-    success = db_manager.mark_debt_paid(debt_id, telegram_id, None)
+    success = await db_manager.mark_debt_paid(debt_id, telegram_id, None)
     
     if success:
         await query.edit_message_text("✅ Qarz to'langan deb belgilandi!")
@@ -564,7 +578,7 @@ async def delete_debt(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     telegram_id = context.user_data.get('telegram_id')
     debt_id = int(query.data.replace('debt_delete_', ''))
     
-    success = db_manager.delete_debt(debt_id, telegram_id)
+    success = await db_manager.delete_debt(debt_id, telegram_id)
     
     if success:
         await query.edit_message_text("✅ Qarz o'chirildi!")
@@ -0,0 +1,503 @@
+"""
+SmartWallet AI Bot - Message Dispatcher
+=======================================
+Chiquvchi xabarlar navbati - Telegram flood limitlariga mos yuborish
+
+Classes:
+    - TokenBucket: Global tezlik cheklovi (~30 xabar/soniya)
+    - MessageDispatcher: Navbat, worker'lar, retry-after, dead-letter
+    - FakeBot: Offline throughput testlari uchun soxta bot
+
+Usage:
+    dispatcher = MessageDispatcher(application.bot)
+    dispatcher.start()
+    ok = await dispatcher.send(chat_id, text, parse_mode='HTML')
+
+Author: SmartWallet AI Team
+Version: 1.0.0
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Optional, Dict, List, Any, Deque
+
+from telegram.error import RetryAfter, Forbidden, BadRequest, NetworkError
+
+from config import SchedulerConfig
+
+logger = logging.getLogger(__name__)
+
+
+# =====================================================
+# TOKEN BUCKET
+# =====================================================
+class TokenBucket:
+    """
+    Token bucket - o'rtacha `rate` token/soniya, `capacity` gacha burst
+    (default 1 - xabarlar bir tekis taqsimlanadi)
+    
+    Faqat bitta event loop ichida ishlatiladi (lock kerak emas).
+    pause() - RetryAfter kelganda barcha yuborishlarni to'xtatib turish.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or 1.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+    
+    def pause(self, seconds: float) -> None:
+        """Bucket'ni `seconds` davomida to'xtatish va tokenlarni nolga tushirish"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+    
+    async def acquire(self) -> None:
+        """Bitta token olish (kerak bo'lsa kutish)"""
+        while True:
+            now = time.monotonic()
+            
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# =====================================================
+# MESSAGE DISPATCHER
+# =====================================================
+@dataclass
+class OutboundMessage:
+    """Navbatdagi xabar"""
+    chat_id: int
+    text: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    future: Optional[asyncio.Future] = None
+
+
+@dataclass
+class DeadLetter:
+    """Yuborib bo'lmagan xabar"""
+    chat_id: int
+    text: str
+    error: str
+    attempts: int
+    failed_at: float
+
+
+class MessageDispatcher:
+    """
+    Rate-limited chiquvchi xabarlar navbati
+    
+    - Global token bucket (SchedulerConfig.DISPATCH_RATE, ~30 xabar/soniya)
+    - Har bir chat uchun minimal interval (DISPATCH_PER_CHAT_INTERVAL) -
+      vaqti kelmagan xabar chatning kechiktirilgan navbatiga qo'yiladi va
+      worker keyingi xabarni oladi (bitta band chat boshqalarni to'smaydi)
+    - DISPATCH_WORKERS ta worker parallel yuboradi
+    - RetryAfter - bucket to'xtatiladi, xabar chat navbatining boshiga
+      qaytariladi va chat kutish tugaguncha ushlab turiladi (tartib saqlanadi)
+    - Tarmoq xatolari - eksponensial kutish bilan (xuddi shunday) qayta urinish
+    - Forbidden/BadRequest yoki urinishlar tugasa - dead-letter
+    """
+    
+    DEAD_LETTER_LIMIT = 1000
+    
+    def __init__(
+        self,
+        bot,
+        rate: Optional[float] = None,
+        per_chat_interval: Optional[float] = None,
+        workers: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        queue_size: Optional[int] = None
+    ):
+        """
+        Args:
+            bot: Telegram bot (yoki FakeBot)
+            rate: Global tezlik (xabar/soniya)
+            per_chat_interval: Bitta chatga xabarlar orasidagi minimal vaqt (soniya)
+            workers: Worker'lar soni
+            max_retries: Vaqtinchalik xatolarda qayta urinishlar soni
+            queue_size: Navbat hajmi (to'lsa send() kutadi)
+        """
+        self.bot = bot
+        self.per_chat_interval = (
+            SchedulerConfig.DISPATCH_PER_CHAT_INTERVAL if per_chat_interval is None else per_chat_interval
+        )
+        self.max_retries = SchedulerConfig.DISPATCH_MAX_RETRIES if max_retries is None else max_retries
+        self._workers_count = workers or SchedulerConfig.DISPATCH_WORKERS
+        self._bucket = TokenBucket(rate or SchedulerConfig.DISPATCH_RATE)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or SchedulerConfig.DISPATCH_QUEUE_SIZE)
+        self._chat_next: Dict[int, float] = {}
+        self._deferred: Dict[int, Deque[OutboundMessage]] = {}
+        self._chat_tasks: Dict[int, asyncio.Task] = {}
+        # Worker hozir to'g'ridan-to'g'ri yuborayotgan chatlar
+        self._in_flight: Dict[int, asyncio.Event] = {}
+        self._workers: List[asyncio.Task] = []
+        
+        self.dead_letters: Deque[DeadLetter] = deque(maxlen=self.DEAD_LETTER_LIMIT)
+        self._sent = 0
+        self._retried = 0
+        self._dead = 0
+    
+    # ---------- Lifecycle ----------
+    
+    def start(self) -> None:
+        """Worker'larni ishga tushirish"""
+        if self._workers:
+            return
+        
+        loop = asyncio.get_running_loop()
+        self._workers = [
+            loop.create_task(self._worker()) for _ in range(self._workers_count)
+        ]
+        logger.info(
+            f"MessageDispatcher ishga tushdi: {self._workers_count} worker, "
+            f"{self._bucket.rate} xabar/s"
+        )
+    
+    async def stop(self, drain: bool = True, timeout: float = 30) -> None:
+        """
+        Dispatcher'ni to'xtatish
+        
+        Args:
+            drain: Navbatdagi xabarlarni yuborib bo'lishni kutish
+            timeout: Kutish chegarasi (soniya)
+        """
+        if drain and self._workers:
+            try:
+                await asyncio.wait_for(self._drain(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Dispatcher navbati to'liq yuborilmadi: {self._queue.qsize()} navbatda, "
+                    f"{self._deferred_count()} kechiktirilgan"
+                )
+        
+        tasks = list(self._chat_tasks.values()) + self._workers
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._chat_tasks.clear()
+        
+        # Qolgan xabarlarni kutayotganlarga javob berish
+        while not self._queue.empty():
+            message = self._queue.get_nowait()
+            self._resolve(message, False)
+            self._queue.task_done()
+        
+        logger.info("MessageDispatcher to'xtatildi")
+    
+    # ---------- Public API ----------
+    
+    def submit(self, chat_id: int, text: str, **kwargs) -> asyncio.Future:
+        """
+        Xabarni navbatga qo'yish (kutmasdan)
+        
+        Returns:
+            asyncio.Future: Yuborilsa True, dead-letter bo'lsa False
+        
+        Raises:
+            asyncio.QueueFull: Navbat to'la bo'lsa
+        """
+        message = OutboundMessage(
+            chat_id=chat_id,
+            text=text,
+            kwargs=kwargs,
+            future=asyncio.get_running_loop().create_future()
+        )
+        self._queue.put_nowait(message)
+        return message.future
+    
+    async def send(self, chat_id: int, text: str, **kwargs) -> bool:
+        """
+        Xabarni navbatga qo'yish va yuborilishini kutish
+        
+        Navbat to'la bo'lsa joy bo'shashini kutadi (backpressure).
+        
+        Returns:
+            bool: Yuborildi (True) yoki dead-letter (False)
+        """
+        message = OutboundMessage(
+            chat_id=chat_id,
+            text=text,
+            kwargs=kwargs,
+            future=asyncio.get_running_loop().create_future()
+        )
+        await self._queue.put(message)
+        return await message.future
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Dispatcher statistikasi
+        
+        Returns:
+            Dict: sent, retried, dead_lettered, queue_depth, deferred, workers
+        """
+        return {
+            'sent': self._sent,
+            'retried': self._retried,
+            'dead_lettered': self._dead,
+            'queue_depth': self._queue.qsize(),
+            'deferred': self._deferred_count(),
+            'workers': len(self._workers),
+        }
+    
+    # ---------- Internals ----------
+    
+    async def _worker(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                await self._process(message)
+            except asyncio.CancelledError:
+                self._resolve(message, False)
+                raise
+            except Exception as e:
+                self._dead_letter(message, e)
+            finally:
+                self._queue.task_done()
+    
+    def _deferred_count(self) -> int:
+        return sum(len(messages) for messages in self._deferred.values())
+    
+    async def _drain(self) -> None:
+        """Navbat va barcha kechiktirilgan xabarlar yuborilishini kutish"""
+        while True:
+            await self._queue.join()
+            if not self._chat_tasks:
+                return
+            await asyncio.gather(*self._chat_tasks.values(), return_exceptions=True)
+    
+    def _claim_chat(self, message: OutboundMessage) -> bool:
+        """
+        Chat bo'yicha limit - hozir yuborish mumkin bo'lsa slot band qilinadi
+        
+        Aks holda xabar chatning kechiktirilgan navbatiga qo'yiladi (tartib
+        saqlanadi) va worker kutmasdan keyingi xabarga o'tadi. Chatga xabar
+        hali yuborilayotgan yoki chat qayta urinish uchun ushlab turilgan
+        bo'lsa ham (interval 0 bo'lsa ham) shu navbatga tushadi.
+        
+        Returns:
+            bool: Xabarni hozir yuborish mumkin
+        """
+        chat_id = message.chat_id
+        deferred = self._deferred.get(chat_id)
+        if deferred is not None:
+            deferred.append(message)
+            return False
+        
+        if chat_id in self._in_flight:
+            self._open_lane(chat_id, message)
+            return False
+        
+        if self.per_chat_interval <= 0:
+            return True
+        
+        now = time.monotonic()
+        if self._chat_next.get(chat_id, 0.0) > now:
+            self._open_lane(chat_id, message)
+            return False
+        
+        self._chat_next[chat_id] = now + self.per_chat_interval
+        
+        # Eski yozuvlarni tozalash
+        if len(self._chat_next) > 10000:
+            self._chat_next = {k: v for k, v in self._chat_next.items() if v > now or k in self._deferred}
+        return True
+    
+    def _open_lane(self, chat_id: int, message: OutboundMessage) -> None:
+        """Chat uchun kechiktirilgan navbat va uni yuboradigan task yaratish"""
+        self._deferred[chat_id] = deque([message])
+        self._chat_tasks[chat_id] = asyncio.get_running_loop().create_task(self._send_deferred(chat_id))
+    
+    async def _send_deferred(self, chat_id: int) -> None:
+        """Chatning kechiktirilgan xabarlarini interval bilan ketma-ket yuborish"""
+        deferred = self._deferred[chat_id]
+        message = None
+        try:
+            while deferred:
+                in_flight = self._in_flight.get(chat_id)
+                if in_flight is not None:
+                    await in_flight.wait()
+                    continue
+                delay = self._chat_next.get(chat_id, 0.0) - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                message = deferred.popleft()
+                self._chat_next[chat_id] = time.monotonic() + self.per_chat_interval
+                try:
+                    await self._send(message)
+                except Exception as e:
+                    self._dead_letter(message, e)
+                message = None
+        except asyncio.CancelledError:
+            if message is not None:
+                self._resolve(message, False)
+            for pending in deferred:
+                self._resolve(pending, False)
+            raise
+        finally:
+            self._deferred.pop(chat_id, None)
+            self._chat_tasks.pop(chat_id, None)
+    
+    async def _process(self, message: OutboundMessage) -> None:
+        if not self._claim_chat(message):
+            return
+        
+        chat_id = message.chat_id
+        in_flight = self._in_flight[chat_id] = asyncio.Event()
+        try:
+            await self._send(message)
+        finally:
+            del self._in_flight[chat_id]
+            in_flight.set()
+    
+    async def _send(self, message: OutboundMessage) -> None:
+        await self._bucket.acquire()
+        
+        try:
+            await self.bot.send_message(chat_id=message.chat_id, text=message.text, **message.kwargs)
+        except RetryAfter as e:
+            delay = _retry_after_seconds(e)
+            logger.warning(f"Flood limit: {delay}s kutiladi")
+            self._bucket.pause(delay)
+            self._retry(message, e, delay)
+            return
+        except (Forbidden, BadRequest) as e:
+            # Doimiy xato - qayta urinish foydasiz (bot bloklangan, chat yo'q...)
+            self._dead_letter(message, e)
+            return
+        except NetworkError as e:
+            self._retry(message, e, min(2 ** message.attempts, 30))
+            return
+        
+        self._sent += 1
+        self._resolve(message, True)
+    
+    def _retry(self, message: OutboundMessage, error: Exception, delay: float) -> None:
+        """
+        Xabarni chat navbatining boshiga qaytarish
+        
+        Chat `delay` davomida ushlab turiladi: shu chatga keyin kelgan
+        xabarlar qayta urinilayotgan xabar orqasida kutadi, shuning uchun
+        chat ichidagi tartib buzilmaydi (global navbat oxiriga qo'yilmaydi).
+        """
+        message.attempts += 1
+        if message.attempts > self.max_retries:
+            self._dead_letter(message, error)
+            return
+        
+        self._retried += 1
+        chat_id = message.chat_id
+        self._chat_next[chat_id] = max(self._chat_next.get(chat_id, 0.0), time.monotonic() + delay)
+        
+        deferred = self._deferred.get(chat_id)
+        if deferred is not None:
+            deferred.appendleft(message)
+        else:
+            self._open_lane(chat_id, message)
+    
+    def _dead_letter(self, message: OutboundMessage, error: Exception) -> None:
+        self._dead += 1
+        self.dead_letters.append(DeadLetter(
+            chat_id=message.chat_id,
+            text=message.text,
+            error=str(error),
+            attempts=message.attempts,
+            failed_at=time.time()
+        ))
+        logger.error(f"Xabar yuborilmadi (dead-letter) chat={message.chat_id}: {error}")
+        self._resolve(message, False)
+    
+    @staticmethod
+    def _resolve(message: OutboundMessage, result: bool) -> None:
+        if message.future is not None and not message.future.done():
+            message.future.set_result(result)
+
+
+def _retry_after_seconds(error: RetryAfter) -> float:
+    """RetryAfter.retry_after - int yoki timedelta bo'lishi mumkin"""
+    retry_after = error.retry_after
+    if hasattr(retry_after, 'total_seconds'):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+# =====================================================
+# FAKE BOT (OFFLINE TESTING)
+# =====================================================
+class FakeBot:
+    """
+    Offline throughput testlari uchun soxta bot
+    
+    Telegram limitlarini taqlid qiladi: global `flood_rate` xabar/soniyadan
+    oshsa RetryAfter ko'taradi, `blocked_chats` uchun Forbidden.
+    
+    Usage:
+        bot = FakeBot(latency=0.05, flood_rate=30)
+        dispatcher = MessageDispatcher(bot)
+        dispatcher.start()
+        await asyncio.gather(*(dispatcher.send(i, 'test') for i in range(300)))
+        print(bot.throughput())
+    """
+    
+    def __init__(
+        self,
+        latency: float = 0.0,
+        flood_rate: Optional[int] = None,
+        retry_after: int = 1,
+        blocked_chats: Optional[set] = None
+    ):
+        self.latency = latency
+        self.flood_rate = flood_rate
+        self.retry_after = retry_after
+        self.blocked_chats = blocked_chats or set()
+        self.sent: List[SimpleNamespace] = []
+        self.flood_errors = 0
+        self._window: Deque[float] = deque()
+    
+    async def send_message(self, chat_id: int, text: str, **kwargs) -> SimpleNamespace:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        
+        if chat_id in self.blocked_chats:
+            raise Forbidden("Forbidden: bot was blocked by the user")
+        
+        now = time.monotonic()
+        if self.flood_rate:
+            while self._window and now - self._window[0] >= 1.0:
+                self._window.popleft()
+            if len(self._window) >= self.flood_rate:
+                self.flood_errors += 1
+                raise RetryAfter(self.retry_after)
+            self._window.append(now)
+        
+        message = SimpleNamespace(
+            message_id=len(self.sent) + 1,
+            chat_id=chat_id,
+            text=text,
+            sent_at=now
+        )
+        self.sent.append(message)
+        return message
+    
+    def throughput(self) -> float:
+        """Yuborilgan xabarlar / soniya (birinchi va oxirgi xabar orasida)"""
+        if len(self.sent) < 2:
+            return 0.0
+        elapsed = self.sent[-1].sent_at - self.sent[0].sent_at
+        return (len(self.sent) - 1) / elapsed if elapsed > 0 else 0.0
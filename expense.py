@@ -28,10 +28,11 @@ from telegram.ext import (
 )
 
 from config import Categories
-from database.db_manager import DatabaseManager
+from database.db_manager import get_async_db_manager, category_registry
 from keyboards.inline import get_category_keyboard, get_yes_no_keyboard, get_back_button, get_edit_cancel_keyboard
 from states.user_states import EXPENSE_AMOUNT, EXPENSE_CATEGORY, EXPENSE_DESCRIPTION, EXPENSE_CONFIRM, MAIN_MENU
 from utils.ai_parser import parse_expense_text
+from utils.classifier import category_classifier
 from utils.translations import get_text, get_category_name, format_currency, format_date
 from utils.validators import validate_amount
 
@@ -39,7 +40,7 @@ from utils.validators import validate_amount
 logger = logging.getLogger(__name__)
 
 # Database manager
-db_manager = DatabaseManager()
+db_manager = get_async_db_manager()
 
 
 # =====================================================
@@ -96,8 +97,10 @@ async def expense_amount_handler(update: Update, context: ContextTypes.DEFAULT_T
     user_language = context.user_data.get('language', 'uz')
     text = update.message.text
     
-    # AI parser bilan tahlil qilish
-    parsed = parse_expense_text(text)
+    # AI parser bilan tahlil qilish (kalit so'z topilmasa shaxsiy model to'ldiradi)
+    parsed = await category_classifier.apply(
+        context.user_data.get('telegram_id'), text, parse_expense_text(text)
+    )
     
     # Summa tekshirish
     if not parsed['amount']:
@@ -113,6 +116,7 @@ async def expense_amount_handler(update: Update, context: ContextTypes.DEFAULT_T
     
     # Context'ga saqlash
     context.user_data['expense_amount'] = amount
+    context.user_data['expense_text'] = text
     context.user_data['expense_ai_category'] = parsed['category_key']
     context.user_data['expense_ai_description'] = parsed['description']
     context.user_data['expense_ai_confidence'] = parsed['confidence']
@@ -124,7 +128,7 @@ async def expense_amount_handler(update: Update, context: ContextTypes.DEFAULT_T
         category_name = get_category_name(parsed['category_key'], user_language)
         
         # Kategoriya topildi - foydalanuvchiga tasdiqlash uchun so'rash
-        category_obj = db_manager.get_category_by_key(parsed['category_key'])
+        category_obj = category_registry.get(parsed['category_key'])
         if category_obj:
             confirm_texts = {
                 'uz': f"✅ AI kategoriya aniqladi:\n\n"
@@ -309,7 +313,7 @@ async def show_expense_confirmation(update: Update, context: ContextTypes.DEFAUL
     
     # Kategoriya ma'lumotlari
     category_name = get_category_name(category_key, user_language)
-    category_obj = db_manager.get_category_by_key(category_key)
+    category_obj = category_registry.get(category_key)
     category_icon = category_obj.icon if category_obj else '📂'
     
     # Tasdiqlash matni
@@ -402,7 +406,7 @@ async def expense_confirm_handler(update: Update, context: ContextTypes.DEFAULT_
         description = context.user_data.get('expense_description') or context.user_data.get('expense_ai_description')
         
         # Database'ga saqlash
-        expense = db_manager.add_expense(
+        expense = await db_manager.add_expense(
             telegram_id=telegram_id,
             amount=amount,
             category_key=category_key,
@@ -431,6 +435,11 @@ async def expense_confirm_handler(update: Update, context: ContextTypes.DEFAULT_
             )
             
             logger.info(f"Expense saved: user={telegram_id}, amount={amount}, category={category_key}")
+            
+            # Yakuniy (tasdiqlangan yoki tuzatilgan) kategoriyadan o'rganish
+            await category_classifier.learn(
+                telegram_id, context.user_data.get('expense_text'), category_key, expense.id
+            )
         else:
             # Xato
             error_msg = get_text('error_occurred', user_language)
@@ -479,6 +488,7 @@ def _clear_expense_context(context: ContextTypes.DEFAULT_TYPE):
     """Context'dan xarajat ma'lumotlarini tozalash"""
     keys_to_remove = [
         'expense_amount',
+        'expense_text',
         'expense_category',
         'expense_description',
         'expense_ai_category',
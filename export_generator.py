@@ -0,0 +1,123 @@
+"""
+SmartWallet AI Bot - Export Generator
+=====================================
+Butun tarixni CSV yoki Excel (XLSX) faylga oqim bilan yozish
+
+Qatorlar DatabaseManager.iter_export_rows() generatoridan birma-bir
+olinadi va SpooledTemporaryFile'ga yoziladi - kichik fayllar xotirada,
+kattalari vaqtinchalik faylda qoladi. Excel uchun openpyxl write-only
+rejimi ishlatiladi (qatorlar xotirada yig'ilmaydi).
+
+Ustunlar import bilan bir xil (date, type, category, amount, description),
+shuning uchun eksport qilingan CSV qayta import qilinishi mumkin.
+
+Author: SmartWallet AI Team
+Version: 1.0.0
+"""
+
+import codecs
+import csv
+import logging
+import tempfile
+from typing import Iterable, Tuple
+
+from config import ReportConfig
+
+# Excel - ixtiyoriy (openpyxl kerak)
+try:
+    from openpyxl import Workbook
+    EXCEL_AVAILABLE = True
+except ImportError:
+    # openpyxl o'rnatilmagan
+    Workbook = None
+    EXCEL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Eksport formatlari: format -> fayl kengaytmasi
+EXPORT_FORMATS = {
+    'csv': 'csv',
+    'excel': 'xlsx',
+}
+
+# Ustun sarlavhalari (importer.COLUMN_ALIASES bilan mos)
+EXPORT_HEADER = ('date', 'type', 'category', 'amount', 'description')
+
+
+def write_csv(rows: Iterable[Tuple], buffer) -> int:
+    """
+    Qatorlarni CSV (UTF-8 BOM - Excel to'g'ri ochadi) sifatida yozish
+    
+    Args:
+        rows: (date, type, category, amount, description) qatorlari
+        buffer: Binary fayl obyekti
+    
+    Returns:
+        int: Yozilgan qatorlar soni (sarlavhasiz)
+    """
+    buffer.write(codecs.BOM_UTF8)
+    writer = csv.writer(codecs.getwriter('utf-8')(buffer))
+    writer.writerow(EXPORT_HEADER)
+    
+    count = 0
+    for when, kind, category, amount, description in rows:
+        writer.writerow((
+            when.strftime('%Y-%m-%d %H:%M') if when else '',
+            kind,
+            category or '',
+            amount,
+            description or ''
+        ))
+        count += 1
+    return count
+
+
+def write_xlsx(rows: Iterable[Tuple], buffer) -> int:
+    """
+    Qatorlarni XLSX sifatida yozish (openpyxl write-only rejimi)
+    
+    Args:
+        rows: (date, type, category, amount, description) qatorlari
+        buffer: Binary fayl obyekti
+    
+    Returns:
+        int: Yozilgan qatorlar soni (sarlavhasiz)
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('SmartWallet')
+    sheet.append(EXPORT_HEADER)
+    
+    count = 0
+    for row in rows:
+        sheet.append(row)
+        count += 1
+    
+    workbook.save(buffer)
+    return count
+
+
+def build_export(rows: Iterable[Tuple], export_format: str) -> Tuple[tempfile.SpooledTemporaryFile, int]:
+    """
+    Eksport faylini yaratish (sync - thread'da chaqiriladi)
+    
+    Args:
+        rows: DatabaseManager.iter_export_rows() generatori
+        export_format: 'csv' yoki 'excel'
+    
+    Returns:
+        Tuple[SpooledTemporaryFile, int]: (boshiga qaytarilgan fayl, qatorlar soni)
+    """
+    buffer = tempfile.SpooledTemporaryFile(max_size=ReportConfig.EXPORT_SPOOL_SIZE)
+    try:
+        if export_format == 'excel':
+            count = write_xlsx(rows, buffer)
+        else:
+            count = write_csv(rows, buffer)
+    except Exception:
+        buffer.close()
+        raise
+    
+    size = buffer.tell()
+    buffer.seek(0)
+    logger.info(f"Eksport tayyor: {export_format}, {count} qator, {size} bayt")
+    return buffer, count
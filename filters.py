@@ -14,7 +14,7 @@ Version: 1.0.0
 
 import logging
 from datetime import datetime, date, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from decimal import Decimal
 
 from database.models import Expense, Income
@@ -409,3 +409,31 @@ def paginate(items: List[Any], page: int = 1, per_page: int = 10) -> tuple:
     page_items = items[start_idx:end_idx]
     
     return page_items, total_pages, total_items
+
+
+def parse_page_callback(callback_data: str, prefix: str) -> Tuple[Optional[int], str, int]:
+    """
+    Keyset sahifalash callback'ini o'qish
+    
+    Formatlar (get_pagination_keyboard bilan mos):
+        "{prefix}"                  -> birinchi sahifa
+        "{prefix}_n{cursor}_{page}" -> keyingi (eskiroq) sahifa
+        "{prefix}_p{cursor}_{page}" -> oldingi (yangiroq) sahifa
+    
+    Args:
+        callback_data: Callback data
+        prefix: Callback prefix
+        
+    Returns:
+        tuple: (cursor, direction, page) - direction 'next' yoki 'prev'
+    """
+    suffix = callback_data[len(prefix):].lstrip('_')
+    if not suffix:
+        return None, 'next', 1
+    
+    try:
+        token, page = suffix.split('_', 1)
+        direction = 'prev' if token[0] == 'p' else 'next'
+        return int(token[1:]), direction, max(1, int(page))
+    except (ValueError, IndexError):
+        return None, 'next', 1
@@ -10,9 +10,9 @@ Version: 3.0.0 - FIXED
 import logging
 import json
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from config import Paths
 from utils.translations import format_currency, format_date, get_category_name
@@ -30,11 +30,16 @@ def generate_html_report(
     expenses_by_category: List[Dict[str, Any]],
     expenses: List,
     start_date: datetime,
-    end_date: datetime
+    end_date: datetime,
+    daily_totals: Optional[Dict[date, Decimal]] = None
 ) -> Path:
     """
     HTML hisobot yaratish (demo dizayniga to'liq o'xshash)
     
+    Args:
+        daily_totals: Kunlik xarajat yig'indilari (get_report_snapshot'dan).
+            Berilmasa, expenses ro'yxatidan hisoblanadi.
+    
     Returns:
         Path: HTML fayl yo'li
     """
@@ -120,7 +125,9 @@ def generate_html_report(
             
             # O'sha kundagi xarajatlar
             day_total = 0
-            if expenses:
+            if daily_totals is not None:
+                day_total = float(daily_totals.get(day.date(), 0))
+            elif expenses:
                 for e in expenses:
                     try:
                         if day_start <= e.expense_date <= day_end:
@@ -0,0 +1,453 @@
+"""
+SmartWallet AI Bot - CSV Import Handler
+=======================================
+Bank ko'chirmasi / CSV fayldan tarixni import qilish
+
+Fayl vaqtinchalik faylga yuklab olinadi va qatorma-qator o'qiladi
+(generator) - butun fayl xotiraga olinmaydi. Har bir qator
+validate_amount, validate_date va detect_category orqali o'tadi va
+ImportConfig.CHUNK_SIZE tadan bitta bulk_add tranzaksiyasida yoziladi.
+
+Qo'llab-quvvatlanadigan ustunlar (sarlavha, katta-kichik harf farqsiz):
+    - sana: date, sana, дата, tarih ... (vaqt bo'lsa saqlanadi: 14:35, 2:35 PM)
+    - summa: amount, summa, сумма ... yoki alohida debit / credit
+    - ixtiyoriy: description, category, type
+
+Xarajat yoki daromad:
+    1. debit -> xarajat, credit -> daromad
+    2. type ustuni (income, kirim, доход ...) -> daromad
+    3. manfiy summa -> xarajat
+    4. musbat summa -> izohda daromad so'zi bo'lsa daromad, aks holda xarajat
+
+Author: SmartWallet AI Team
+Version: 1.0.0
+"""
+
+import csv
+import logging
+import os
+import re
+import tempfile
+import time
+from datetime import datetime, time as time_of_day
+from decimal import Decimal
+from typing import Optional, Dict, Tuple, Iterator, List, TextIO
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from config import ImportConfig
+from database.db_manager import get_async_db_manager, category_registry
+from handlers.quick_expense import detect_income_keyword, SALARY_KEYWORDS
+from utils.ai_parser import detect_category_source, ParseCache, CATEGORY_SOURCE_KEYWORD
+from utils.classifier import category_classifier
+from utils.translations import get_text
+from utils.validators import validate_amount, validate_date, validate_description
+
+logger = logging.getLogger(__name__)
+
+# Sarlavha nomlari -> ichki ustun nomi
+COLUMN_ALIASES = {
+    'date': ['date', 'sana', 'дата', 'tarih', 'التاريخ', 'transaction date', 'operation date',
+             'дата операции', 'дата проводки', 'vaqt', 'time', 'datetime'],
+    'amount': ['amount', 'summa', 'сумма', 'tutar', 'المبلغ', 'sum', 'value', 'miqdor'],
+    'debit': ['debit', 'дебет', 'chiqim', 'expense', 'расход', 'gider', 'withdrawal'],
+    'credit': ['credit', 'кредит', 'kirim', 'income', 'приход', 'доход', 'gelir', 'deposit'],
+    'description': ['description', 'izoh', 'tavsif', 'описание', 'назначение', 'назначение платежа',
+                    'açıklama', 'الوصف', 'details', 'memo', 'comment', 'note', 'payee'],
+    'category': ['category', 'kategoriya', 'категория', 'kategori', 'الفئة'],
+    'type': ['type', 'tur', 'turi', 'тип', 'tür', 'النوع'],
+}
+_COLUMN_BY_ALIAS = {alias: column for column, aliases in COLUMN_ALIASES.items() for alias in aliases}
+
+# type ustunidagi daromad qiymatlari
+INCOME_TYPES = frozenset([
+    'income', 'kirim', 'daromad', 'credit', 'доход', 'приход', 'кредит', 'gelir', 'دخل', 'in', '+'
+])
+
+# Izoh -> kategoriya (ko'chirmalarda bir xil do'kon nomlari ko'p takrorlanadi)
+_category_cache = ParseCache('import_categories')
+
+# Summadagi raqam, belgi va ajratkichlardan boshqa hamma narsa (valyuta, bo'sh joy)
+_AMOUNT_NOISE = re.compile(r"[^\d,.\-+()]")
+
+# Sana katagidagi vaqt: "05.01.2026 14:35", "2026-01-05T14:35:20", "01/05/2026 2:35 PM"
+_TIME_PATTERN = re.compile(r"(?:^|[\sT])(\d{1,2}):(\d{2})(?::(\d{2}))?(?:\s*([AaPp])\.?[Mm]\.?)?")
+
+
+# =====================================================
+# ROW PARSING
+# =====================================================
+def parse_import_amount(raw: str) -> Tuple[Optional[Decimal], bool]:
+    """
+    Bank ko'chirmasidagi summani o'qish
+    
+    "1 200 000", "-50,000.00", "1.200.000,50", "(300)" va "45000 UZS"
+    kabi yozuvlarni tushunadi.
+    
+    Args:
+        raw: Ustun qiymati
+    
+    Returns:
+        Tuple[Optional[Decimal], bool]: (musbat summa yoki None, manfiymi)
+    """
+    value = _AMOUNT_NOISE.sub('', raw)
+    if not value:
+        return None, False
+    
+    negative = value[0] == '-' or value[-1] == '-' or (value[0] == '(' and value[-1] == ')')
+    value = value.strip('-+()')
+    
+    if ',' in value and '.' in value:
+        # Oxirgi ajratkich - kasr qismi
+        if value.rfind(',') > value.rfind('.'):
+            value = value.replace('.', '').replace(',', '.')
+    elif ',' in value:
+        head, _, tail = value.rpartition(',')
+        if len(tail) in (1, 2) and ',' not in head:
+            value = f"{head}.{tail}"
+    elif value.count('.') > 1:
+        value = value.replace('.', '')
+    
+    is_valid, amount, _ = validate_amount(value)
+    return (amount if is_valid else None), negative
+
+
+def read_csv_header(handle: TextIO) -> Tuple[Optional[str], Optional[Dict[str, int]]]:
+    """
+    Birinchi qatordan ajratkich va ustunlarni aniqlash
+    
+    Sarlavhadan faqat ajratkich aniqlanadi - qo'shtirnoq qoidalari
+    standart (excel) qoladi, aks holda "" ichidagi qo'shtirnoqlar buziladi.
+    
+    Args:
+        handle: Ochiq matnli fayl (birinchi qator o'qilmagan)
+    
+    Returns:
+        Tuple: (ajratkich, {ustun: indeks}) - sana va summa
+               ustunlari topilmasa (None, None)
+    """
+    first_line = handle.readline()
+    if not first_line.strip():
+        return None, None
+    
+    try:
+        delimiter = csv.Sniffer().sniff(first_line, delimiters=',;\t|').delimiter
+    except csv.Error:
+        delimiter = ','
+    
+    header = next(csv.reader([first_line], delimiter=delimiter), [])
+    columns: Dict[str, int] = {}
+    for index, name in enumerate(header):
+        column = _COLUMN_BY_ALIAS.get(name.strip().strip('"').lower())
+        if column and column not in columns:
+            columns[column] = index
+    
+    if 'date' not in columns or not ('amount' in columns or 'debit' in columns or 'credit' in columns):
+        return None, None
+    return delimiter, columns
+
+
+def parse_import_time(raw: str) -> time_of_day:
+    """
+    Sana katagidagi kun vaqtini o'qish
+    
+    Args:
+        raw: Sana katagi ("05.01.2026 14:35", "2026-01-05T14:35:20" ...)
+    
+    Returns:
+        time_of_day: Vaqt (topilmasa yoki yaroqsiz bo'lsa - 00:00)
+    """
+    midnight = time_of_day()
+    match = _TIME_PATTERN.search(raw)
+    if not match:
+        return midnight
+    
+    hour, minute, second = int(match.group(1)), int(match.group(2)), int(match.group(3) or 0)
+    meridiem = match.group(4)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return midnight
+        hour = hour % 12 + (12 if meridiem.lower() == 'p' else 0)
+    
+    if hour > 23 or minute > 59 or second > 59:
+        return midnight
+    return midnight.replace(hour=hour, minute=minute, second=second)
+
+
+def parse_import_row(row: List[str], columns: Dict[str, int]) -> Optional[Tuple[str, Dict]]:
+    """
+    Bitta CSV qatorini xarajat yoki daromad yozuviga aylantirish
+    
+    Args:
+        row: csv.reader qatori
+        columns: read_csv_header() ustunlari
+    
+    Returns:
+        Optional[Tuple[str, Dict]]: ('expense' | 'income', bulk_add yozuvi) -
+            qator yaroqsiz bo'lsa None
+    """
+    def cell(column: str) -> str:
+        index = columns.get(column)
+        return row[index].strip() if index is not None and index < len(row) else ''
+    
+    is_valid, date_obj, _ = validate_date(cell('date'), allow_future=False)
+    if not is_valid:
+        return None
+    
+    # Summa va yo'nalish
+    kind = None
+    amount = None
+    if 'debit' in columns or 'credit' in columns:
+        amount, _ = parse_import_amount(cell('debit'))
+        if amount is not None:
+            kind = 'expense'
+        else:
+            amount, _ = parse_import_amount(cell('credit'))
+            kind = 'income'
+    if amount is None and 'amount' in columns:
+        amount, negative = parse_import_amount(cell('amount'))
+        if cell('type'):
+            kind = 'income' if cell('type').lower() in INCOME_TYPES else 'expense'
+        elif negative:
+            kind = 'expense'
+        else:
+            kind = None
+    if amount is None:
+        return None
+    
+    _, description, _ = validate_description(cell('description'))
+    when = datetime.combine(date_obj, parse_import_time(cell('date')))
+    
+    found_keyword = None
+    if description and kind != 'expense':
+        is_income, found_keyword = detect_income_keyword(description)
+        if kind is None and is_income:
+            kind = 'income'
+    
+    if kind == 'income':
+        return 'income', {
+            'amount': amount,
+            'source': description[:255] if description else None,
+            'income_type': 'salary' if found_keyword in SALARY_KEYWORDS else 'other',
+            'income_date': when
+        }
+    
+    # learnable - kategoriya faylda berilgan yoki kalit so'z bilan topilgan
+    category_text = cell('category')
+    if category_text and category_registry.get(category_text.lower()):
+        category_key, learnable = category_text.lower(), True
+    else:
+        category_text = f"{category_text} {description or ''}"
+        key = ParseCache.key(category_text)
+        cached = _category_cache.get(key)
+        if cached is None:
+            category_key, _, source = detect_category_source(category_text)
+            cached = (category_key or 'other', source == CATEGORY_SOURCE_KEYWORD)
+            _category_cache.set(key, cached)
+        category_key, learnable = cached
+    
+    return 'expense', {
+        'amount': amount,
+        'category_key': category_key,
+        'description': description,
+        'expense_date': when,
+        'learnable': learnable
+    }
+
+
+def iter_import_records(
+    handle: TextIO,
+    delimiter: str,
+    columns: Dict[str, int]
+) -> Iterator[Optional[Tuple[str, Dict]]]:
+    """
+    Fayl qatorlarini birma-bir yozuvga aylantirish (generator)
+    
+    Args:
+        handle: read_csv_header() dan keyingi fayl
+        delimiter: Ustun ajratkichi
+        columns: Ustunlar
+    
+    Yields:
+        Optional[Tuple[str, Dict]]: parse_import_row() natijasi - bo'sh
+            bo'lmagan har bir qator uchun (yaroqsiz bo'lsa None)
+    """
+    for row in csv.reader(handle, delimiter=delimiter):
+        if not row or not any(row):
+            continue
+        yield parse_import_row(row, columns)
+
+
+def count_remaining_rows(handle: TextIO, delimiter: str) -> int:
+    """
+    Fayldagi qolgan bo'sh bo'lmagan qatorlar soni (parse qilinmaydi)
+    
+    MAX_ROWS dan keyin nechta qator import qilinmaganini aytish uchun.
+    """
+    return sum(1 for row in csv.reader(handle, delimiter=delimiter) if row and any(row))
+
+
+# =====================================================
+# IMPORT PIPELINE
+# =====================================================
+async def _edit_status(message, text: str) -> None:
+    """Progress xabarini yangilash (Telegram xatolari importni to'xtatmaydi)"""
+    try:
+        await message.edit_text(text, parse_mode='HTML')
+    except Exception as e:
+        logger.debug(f"Import progress xabari yangilanmadi: {e}")
+
+
+async def import_csv_file(path: str, telegram_id: int, status_message, language: str) -> Dict[str, int]:
+    """
+    CSV faylni oqim bilan o'qib, bo'laklab bazaga yozish
+    
+    Har bir bo'lak (ImportConfig.CHUNK_SIZE qator) - bitta tranzaksiya.
+    Xato bo'lsa oldingi bo'laklar saqlangan holda qoladi.
+    
+    Args:
+        path: Yuklab olingan fayl yo'li
+        telegram_id: Foydalanuvchi ID
+        status_message: Progress ko'rsatiladigan xabar
+        language: Til kodi
+    
+    Returns:
+        Dict: expenses, incomes, skipped, truncated (MAX_ROWS dan keyingi qatorlar)
+    """
+    db = get_async_db_manager()
+    stats = {'expenses': 0, 'incomes': 0, 'skipped': 0, 'truncated': 0}
+    file_size = os.path.getsize(path) or 1
+    
+    with open(path, 'r', encoding='utf-8-sig', errors='replace', newline='') as handle:
+        delimiter, columns = read_csv_header(handle)
+        if columns is None:
+            await _edit_status(status_message, get_text('import_bad_header', language))
+            return stats
+        
+        expenses: List[Dict] = []
+        incomes: List[Dict] = []
+        rows = 0
+        last_progress = time.monotonic()
+        
+        async def flush() -> None:
+            expense_ids, income_ids = await db.bulk_add(expenses=expenses, incomes=incomes)
+            saved = sum(1 for new_id in expense_ids if new_id)
+            stats['expenses'] += saved
+            await category_classifier.learn_many(telegram_id, [
+                (item['description'], item['category_key'], new_id)
+                for item, new_id in zip(expenses, expense_ids) if new_id and item['learnable']
+            ])
+            stats['incomes'] += len(income_ids)
+            stats['skipped'] += len(expense_ids) - saved
+        
+        try:
+            for record in iter_import_records(handle, delimiter, columns):
+                rows += 1
+                if rows > ImportConfig.MAX_ROWS:
+                    # Shu qator va qolganlari import qilinmaydi - faqat sanaladi
+                    stats['truncated'] = 1 + count_remaining_rows(handle, delimiter)
+                    logger.warning(
+                        f"Import: {telegram_id} uchun {ImportConfig.MAX_ROWS} qatordan keyingi "
+                        f"{stats['truncated']} qator o'tkazildi"
+                    )
+                    break
+                
+                if record is None:
+                    stats['skipped'] += 1
+                    continue
+                
+                kind, item = record
+                item['telegram_id'] = telegram_id
+                (expenses if kind == 'expense' else incomes).append(item)
+                
+                if len(expenses) + len(incomes) >= ImportConfig.CHUNK_SIZE:
+                    await flush()
+                    expenses, incomes = [], []
+                    
+                    if time.monotonic() - last_progress >= ImportConfig.PROGRESS_INTERVAL:
+                        last_progress = time.monotonic()
+                        await _edit_status(status_message, get_text(
+                            'import_progress',
+                            language,
+                            percent=min(99, handle.buffer.tell() * 100 // file_size),
+                            saved=stats['expenses'] + stats['incomes'],
+                            skipped=stats['skipped']
+                        ))
+            
+            if expenses or incomes:
+                await flush()
+        except Exception as e:
+            logger.error(f"CSV import xatosi (user={telegram_id}): {e}", exc_info=True)
+            await _edit_status(status_message, get_text(
+                'import_failed', language, saved=stats['expenses'] + stats['incomes']
+            ))
+            return stats
+    
+    message = get_text('import_done', language, **stats)
+    if stats['truncated']:
+        message += '\n\n' + get_text(
+            'import_truncated', language, limit=ImportConfig.MAX_ROWS, truncated=stats['truncated']
+        )
+    await _edit_status(status_message, message)
+    logger.info(
+        f"📥 IMPORT: user={telegram_id}, {stats['expenses']} xarajat, "
+        f"{stats['incomes']} daromad, {stats['skipped']} o'tkazildi"
+    )
+    return stats
+
+
+# =====================================================
+# DOCUMENT HANDLER
+# =====================================================
+async def import_document_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Yuborilgan CSV faylni import qilish
+    
+    Fayl diskka yuklab olinadi (xotiraga emas) va import_csv_file
+    orqali qayta ishlanadi. Bitta foydalanuvchi uchun bir vaqtda bitta import.
+    
+    Args:
+        update: Telegram update
+        context: Callback context
+    """
+    user_language = context.user_data.get('language', 'uz')
+    
+    # Faqat foydalanuvchi ro'yxatdan o'tgan bo'lsa ishlaydi
+    if 'telegram_id' not in context.user_data:
+        return
+    
+    telegram_id = context.user_data.get('telegram_id')
+    document = update.message.document
+    
+    if document.file_size and document.file_size > ImportConfig.MAX_FILE_SIZE:
+        await update.message.reply_text(
+            get_text('import_too_large', user_language, limit=ImportConfig.MAX_FILE_SIZE // (1024 * 1024))
+        )
+        return
+    
+    if context.user_data.get('import_running'):
+        await update.message.reply_text(get_text('import_busy', user_language))
+        return
+    
+    context.user_data['import_running'] = True
+    fd, path = tempfile.mkstemp(prefix='smartwallet_import_', suffix='.csv')
+    os.close(fd)
+    
+    try:
+        status_message = await update.message.reply_text(
+            get_text('import_started', user_language),
+            parse_mode='HTML'
+        )
+        telegram_file = await document.get_file()
+        await telegram_file.download_to_drive(path)
+        await import_csv_file(path, telegram_id, status_message, user_language)
+    except Exception as e:
+        logger.error(f"Import faylini yuklashda xato: {e}", exc_info=True)
+        await update.message.reply_text(get_text('error_occurred', user_language))
+    finally:
+        context.user_data.pop('import_running', None)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -13,20 +13,60 @@ Functions:
     - get_device_type_keyboard: Gadjet turlari
     - get_yes_no_keyboard: Ha/Yo'q
     - get_back_button: Orqaga
+    - prebuild_keyboards: Statik keyboard'larni oldindan qurish
+
+Statik keyboard'lar (faqat tilga bog'liq) bir marta quriladi va keshdan
+qaytariladi. Dinamik keyboard'lar (ID bilan) tayyor matn shablonlaridan
+quriladi.
 
 Author: SmartWallet AI Team
 Version: 1.0.0
 """
 
-from typing import Optional, List
+from functools import wraps
+from typing import Optional, List, Dict, Tuple, Callable, Any
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
-from config import Categories
+from config import Categories, AppConfig, ReportConfig
+
+
+# =====================================================
+# KEYBOARD CACHE
+# =====================================================
+# Keshdagi keyboard'lar soni chegarasi (til x callback kombinatsiyalari)
+KEYBOARD_CACHE_SIZE = 512
+
+_keyboard_cache: Dict[Tuple[Any, ...], InlineKeyboardMarkup] = {}
+
+
+def _static_keyboard(func: Callable[..., InlineKeyboardMarkup]) -> Callable[..., InlineKeyboardMarkup]:
+    """
+    Keyboard factory natijasini argumentlar bo'yicha keshlash
+    
+    PTB v20 ob'ektlari o'zgarmas (frozen), shuning uchun bitta
+    InlineKeyboardMarkup'ni barcha foydalanuvchilarga qaytarish xavfsiz.
+    language birinchi parametr - f('uz') va f(language='uz') bitta kalit.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if 'language' in kwargs:
+            args = (kwargs.pop('language'),) + args
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        
+        keyboard = _keyboard_cache.get(key)
+        if keyboard is None:
+            keyboard = func(*args, **kwargs)
+            if len(_keyboard_cache) < KEYBOARD_CACHE_SIZE:
+                _keyboard_cache[key] = keyboard
+        return keyboard
+    
+    return wrapper
 
 
 # =====================================================
 # LANGUAGE KEYBOARD
 # =====================================================
+@_static_keyboard
 def get_language_keyboard() -> InlineKeyboardMarkup:
     """
     Til tanlash keyboard'i
@@ -53,6 +93,7 @@ def get_language_keyboard() -> InlineKeyboardMarkup:
 # =====================================================
 # MAIN MENU KEYBOARD
 # =====================================================
+@_static_keyboard
 def get_main_menu_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     """
     Asosiy menyu keyboard'i
@@ -127,6 +168,7 @@ def get_main_menu_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
 # =====================================================
 # SETTINGS KEYBOARD
 # =====================================================
+@_static_keyboard
 def get_settings_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     """
     Sozlamalar keyboard'i
@@ -184,6 +226,7 @@ def get_settings_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
 # =====================================================
 # CATEGORY KEYBOARD
 # =====================================================
+@_static_keyboard
 def get_category_keyboard(language: str = 'uz', columns: int = 2) -> InlineKeyboardMarkup:
     """
     Kategoriyalar keyboard'i
@@ -239,6 +282,7 @@ def get_category_keyboard(language: str = 'uz', columns: int = 2) -> InlineKeybo
 # =====================================================
 # REPORT TYPE KEYBOARD
 # =====================================================
+@_static_keyboard
 def get_report_type_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     """
     Hisobot turlari keyboard'i
@@ -314,10 +358,13 @@ def get_report_type_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
 # =====================================================
 # EXPORT FORMAT KEYBOARD
 # =====================================================
+@_static_keyboard
 def get_export_format_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     """
     Eksport format keyboard'i
     
+    Excel tugmasi faqat ReportConfig.ENABLE_EXCEL yoqilgan bo'lsa ko'rsatiladi.
+    
     Args:
         language: Til kodi
         
@@ -326,32 +373,27 @@ def get_export_format_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     """
     texts = {
         'uz': {
-            'html': '🌐 HTML — Brauzerda ko\'rish',
-            'pdf': '📑 PDF — Chop etish uchun',
+            'csv': '📄 CSV — Istalgan dastur uchun',
             'excel': '📊 Excel — Tahlil qilish',
             'back': '🔙 Orqaga qaytish',
         },
         'ru': {
-            'html': '🌐 HTML — Просмотр в браузере',
-            'pdf': '📑 PDF — Для печати',
+            'csv': '📄 CSV — Для любой программы',
             'excel': '📊 Excel — Для анализа',
             'back': '🔙 Вернуться назад',
         },
         'en': {
-            'html': '🌐 HTML — View in browser',
-            'pdf': '📑 PDF — For printing',
+            'csv': '📄 CSV — For any app',
             'excel': '📊 Excel — For analysis',
             'back': '🔙 Go Back',
         },
         'tr': {
-            'html': '🌐 HTML — Tarayıcıda görüntüle',
-            'pdf': '📑 PDF — Yazdırmak için',
+            'csv': '📄 CSV — Her uygulama için',
             'excel': '📊 Excel — Analiz için',
             'back': '🔙 Geri Dön',
         },
         'ar': {
-            'html': '🌐 HTML — عرض في المتصفح',
-            'pdf': '📑 PDF — للطباعة',
+            'csv': '📄 CSV — لأي تطبيق',
             'excel': '📊 Excel — للتحليل',
             'back': '🔙 العودة',
         }
@@ -359,18 +401,17 @@ def get_export_format_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     
     t = texts.get(language, texts['uz'])
     
-    keyboard = [
-        [InlineKeyboardButton(t['html'], callback_data='export_html')],
-        [InlineKeyboardButton(t['pdf'], callback_data='export_pdf')],
-        [InlineKeyboardButton(t['excel'], callback_data='export_excel')],
-        [InlineKeyboardButton(t['back'], callback_data='back_reports')],
-    ]
+    keyboard = [[InlineKeyboardButton(t['csv'], callback_data='export_csv')]]
+    if ReportConfig.ENABLE_EXCEL:
+        keyboard.append([InlineKeyboardButton(t['excel'], callback_data='export_excel')])
+    keyboard.append([InlineKeyboardButton(t['back'], callback_data='settings')])
     return InlineKeyboardMarkup(keyboard)
 
 
 # =====================================================
 # DEVICE TYPE KEYBOARD
 # =====================================================
+@_static_keyboard
 def get_device_type_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     """
     Gadjet turi keyboard'i
@@ -433,6 +474,7 @@ def get_device_type_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
 # =====================================================
 # YES/NO KEYBOARD
 # =====================================================
+@_static_keyboard
 def get_yes_no_keyboard(
     language: str = 'uz',
     yes_callback: str = 'yes',
@@ -471,6 +513,7 @@ def get_yes_no_keyboard(
 # =====================================================
 # BACK BUTTON
 # =====================================================
+@_static_keyboard
 def get_back_button(
     language: str = 'uz',
     callback_data: str = 'back_main'
@@ -504,46 +547,80 @@ def get_back_button(
 # =====================================================
 def get_pagination_keyboard(
     current_page: int,
-    total_pages: int,
+    total_pages: Optional[int],
     callback_prefix: str = 'page',
-    language: str = 'uz'
+    language: str = 'uz',
+    prev_cursor: Optional[int] = None,
+    next_cursor: Optional[int] = None,
+    rows: Optional[List[List[InlineKeyboardButton]]] = None,
+    back_callback: str = 'back_main'
 ) -> InlineKeyboardMarkup:
     """
     Sahifalash keyboard'i
     
+    total_pages berilsa - sahifa raqamlari bilan ({prefix}_{page}).
+    total_pages None bo'lsa - keyset rejimi: tugmalar cursor'ni olib yuradi
+    ({prefix}_p{cursor}_{page} / {prefix}_n{cursor}_{page}), cursor None
+    bo'lsa o'sha yo'nalishdagi tugma ko'rsatilmaydi.
+    
     Args:
         current_page: Joriy sahifa
-        total_pages: Jami sahifalar
+        total_pages: Jami sahifalar (keyset rejimida None)
         callback_prefix: Callback prefix
         language: Til kodi
+        prev_cursor: Oldingi sahifa cursor'i (keyset)
+        next_cursor: Keyingi sahifa cursor'i (keyset)
+        rows: Sahifa elementlari tugmalari (navigatsiyadan oldin)
+        back_callback: Orqaga tugmasi callback'i
         
     Returns:
         InlineKeyboardMarkup: Sahifalash tugmalari
     """
-    keyboard = []
+    keyboard = list(rows) if rows else []
     row = []
     
-    # Previous button
-    if current_page > 1:
-        row.append(InlineKeyboardButton(
-            "⬅️",
-            callback_data=f"{callback_prefix}_{current_page - 1}"
-        ))
-    
-    # Page indicator
-    row.append(InlineKeyboardButton(
-        f"{current_page}/{total_pages}",
-        callback_data='current_page'
-    ))
-    
-    # Next button
-    if current_page < total_pages:
+    if total_pages is None:
+        # Keyset rejimi
+        if prev_cursor is not None:
+            row.append(InlineKeyboardButton(
+                "⬅️",
+                callback_data=f"{callback_prefix}_p{prev_cursor}_{current_page - 1}"
+            ))
+        
+        if prev_cursor is not None or next_cursor is not None:
+            row.append(InlineKeyboardButton(
+                f"{current_page}",
+                callback_data='current_page'
+            ))
+        
+        if next_cursor is not None:
+            row.append(InlineKeyboardButton(
+                "➡️",
+                callback_data=f"{callback_prefix}_n{next_cursor}_{current_page + 1}"
+            ))
+    else:
+        # Previous button
+        if current_page > 1:
+            row.append(InlineKeyboardButton(
+                "⬅️",
+                callback_data=f"{callback_prefix}_{current_page - 1}"
+            ))
+        
+        # Page indicator
         row.append(InlineKeyboardButton(
-            "➡️",
-            callback_data=f"{callback_prefix}_{current_page + 1}"
+            f"{current_page}/{total_pages}",
+            callback_data='current_page'
         ))
+        
+        # Next button
+        if current_page < total_pages:
+            row.append(InlineKeyboardButton(
+                "➡️",
+                callback_data=f"{callback_prefix}_{current_page + 1}"
+            ))
     
-    keyboard.append(row)
+    if row:
+        keyboard.append(row)
     
     # Back button
     back_texts = {
@@ -556,7 +633,7 @@ def get_pagination_keyboard(
     keyboard.append([
         InlineKeyboardButton(
             back_texts.get(language, back_texts['uz']),
-            callback_data='back_main'
+            callback_data=back_callback
         )
     ])
     
@@ -566,6 +643,7 @@ def get_pagination_keyboard(
 # =====================================================
 # INCOME TYPE KEYBOARD
 # =====================================================
+@_static_keyboard
 def get_income_type_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     """
     Daromad turi keyboard'i
@@ -635,6 +713,30 @@ def get_income_type_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
 # =====================================================
 # EDIT & CANCEL KEYBOARD FOR INCOME/EXPENSE
 # =====================================================
+_EDIT_CANCEL_TEXTS = {
+    'uz': {
+        'cancel': '🗑️ O\'chirish',
+        'edit': '✏️ Tahrirlash',
+    },
+    'ru': {
+        'cancel': '🗑️ Удалить',
+        'edit': '✏️ Редактировать',
+    },
+    'en': {
+        'cancel': '🗑️ Delete',
+        'edit': '✏️ Edit',
+    },
+    'tr': {
+        'cancel': '🗑️ Sil',
+        'edit': '✏️ Düzenle',
+    },
+    'ar': {
+        'cancel': '🗑️ حذف',
+        'edit': '✏️ تعديل',
+    }
+}
+
+
 def get_edit_cancel_keyboard(
     language: str = 'uz',
     item_type: str = 'expense',
@@ -647,34 +749,11 @@ def get_edit_cancel_keyboard(
         language: Til kodi
         item_type: 'expense' yoki 'income'
         item_id: Element ID
-        
+    
     Returns:
         InlineKeyboardMarkup: Tahrirlash va Bekor qilish tugmalari
     """
-    texts = {
-        'uz': {
-            'cancel': '🗑️ O\'chirish',
-            'edit': '✏️ Tahrirlash',
-        },
-        'ru': {
-            'cancel': '🗑️ Удалить',
-            'edit': '✏️ Редактировать',
-        },
-        'en': {
-            'cancel': '🗑️ Delete',
-            'edit': '✏️ Edit',
-        },
-        'tr': {
-            'cancel': '🗑️ Sil',
-            'edit': '✏️ Düzenle',
-        },
-        'ar': {
-            'cancel': '🗑️ حذف',
-            'edit': '✏️ تعديل',
-        }
-    }
-    
-    t = texts.get(language, texts['uz'])
+    t = _EDIT_CANCEL_TEXTS.get(language, _EDIT_CANCEL_TEXTS['uz'])
     
     keyboard = [
         [
@@ -694,6 +773,7 @@ def get_edit_cancel_keyboard(
 # =====================================================
 # DELETE DATA KEYBOARD
 # =====================================================
+@_static_keyboard
 def get_delete_data_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     """
     Ma'lumot o'chirish keyboard'i - Daromad va Xarajatlar
@@ -745,6 +825,7 @@ def get_delete_data_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
 # =====================================================
 # REPORT FORMAT CHOICE KEYBOARD
 # =====================================================
+@_static_keyboard
 def get_report_format_choice_keyboard(language: str = 'uz', report_type: str = 'daily') -> InlineKeyboardMarkup:
     """
     Hisobot formatini tanlash keyboard'i - Botda yoki HTML
@@ -797,6 +878,7 @@ def get_report_format_choice_keyboard(language: str = 'uz', report_type: str = '
 # =====================================================
 # DEBT KEYBOARDS
 # =====================================================
+@_static_keyboard
 def get_debt_menu_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     """Qarzlar menyu keyboard'i"""
     texts = {
@@ -855,6 +937,7 @@ def get_debt_menu_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@_static_keyboard
 def get_debt_reminder_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     """Qarz eslatma kunlari keyboard'i"""
     texts = {
@@ -877,47 +960,48 @@ def get_debt_reminder_keyboard(language: str = 'uz') -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+_DEBT_ACTION_TEXTS = {
+    'uz': {
+        'paid_full': '✅ To\'liq to\'landi',
+        'paid_partial': '💵 Qisman to\'landi',
+        'edit': '✏️ Tahrirlash',
+        'delete': '🗑️ O\'chirish',
+        'back': '« Orqaga'
+    },
+    'ru': {
+        'paid_full': '✅ Полностью оплачено',
+        'paid_partial': '💵 Частично оплачено',
+        'edit': '✏️ Редактировать',
+        'delete': '🗑️ Удалить',
+        'back': '« Назад'
+    },
+    'en': {
+        'paid_full': '✅ Fully paid',
+        'paid_partial': '💵 Partially paid',
+        'edit': '✏️ Edit',
+        'delete': '🗑️ Delete',
+        'back': '« Back'
+    },
+    'tr': {
+        'paid_full': '✅ Tamamen ödendi',
+        'paid_partial': '💵 Kısmen ödendi',
+        'edit': '✏️ Düzenle',
+        'delete': '🗑️ Sil',
+        'back': '« Geri'
+    },
+    'ar': {
+        'paid_full': '✅ مدفوع بالكامل',
+        'paid_partial': '💵 مدفوع جزئياً',
+        'edit': '✏️ تعديل',
+        'delete': '🗑️ حذف',
+        'back': '« رجوع'
+    }
+}
+
+
 def get_debt_action_keyboard(language: str = 'uz', debt_id: int = None) -> InlineKeyboardMarkup:
     """Qarz tahrirlash/o'chirish keyboard'i"""
-    texts = {
-        'uz': {
-            'paid_full': '✅ To\'liq to\'landi',
-            'paid_partial': '💵 Qisman to\'landi',
-            'edit': '✏️ Tahrirlash',
-            'delete': '🗑️ O\'chirish',
-            'back': '« Orqaga'
-        },
-        'ru': {
-            'paid_full': '✅ Полностью оплачено',
-            'paid_partial': '💵 Частично оплачено',
-            'edit': '✏️ Редактировать',
-            'delete': '🗑️ Удалить',
-            'back': '« Назад'
-        },
-        'en': {
-            'paid_full': '✅ Fully paid',
-            'paid_partial': '💵 Partially paid',
-            'edit': '✏️ Edit',
-            'delete': '🗑️ Delete',
-            'back': '« Back'
-        },
-        'tr': {
-            'paid_full': '✅ Tamamen ödendi',
-            'paid_partial': '💵 Kısmen ödendi',
-            'edit': '✏️ Düzenle',
-            'delete': '🗑️ Sil',
-            'back': '« Geri'
-        },
-        'ar': {
-            'paid_full': '✅ مدفوع بالكامل',
-            'paid_partial': '💵 مدفوع جزئياً',
-            'edit': '✏️ تعديل',
-            'delete': '🗑️ حذف',
-            'back': '« رجوع'
-        }
-    }
-    
-    t = texts.get(language, texts['uz'])
+    t = _DEBT_ACTION_TEXTS.get(language, _DEBT_ACTION_TEXTS['uz'])
     
     keyboard = [
         [
@@ -932,3 +1016,37 @@ def get_debt_action_keyboard(language: str = 'uz', debt_id: int = None) -> Inlin
     ]
     return InlineKeyboardMarkup(keyboard)
 
+
+# =====================================================
+# PREBUILD
+# =====================================================
+# Faqat tilga bog'liq keyboard'lar - ishga tushishda har bir til uchun quriladi
+_LANGUAGE_KEYBOARDS = (
+    get_main_menu_keyboard,
+    get_settings_keyboard,
+    get_category_keyboard,
+    get_report_type_keyboard,
+    get_export_format_keyboard,
+    get_device_type_keyboard,
+    get_income_type_keyboard,
+    get_delete_data_keyboard,
+    get_debt_menu_keyboard,
+    get_debt_reminder_keyboard,
+)
+
+
+def prebuild_keyboards(languages: Optional[List[str]] = None) -> int:
+    """
+    Statik keyboard'larni oldindan qurib keshga joylash
+    
+    Args:
+        languages: Tillar ro'yxati (default: AppConfig.SUPPORTED_LANGUAGES)
+        
+    Returns:
+        int: Keshdagi keyboard'lar soni
+    """
+    get_language_keyboard()
+    for language in languages or AppConfig.SUPPORTED_LANGUAGES:
+        for factory in _LANGUAGE_KEYBOARDS:
+            factory(language)
+    return len(_keyboard_cache)
@@ -11,7 +11,7 @@ import asyncio
 import logging
 import sys
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 from telegram import Update
 from telegram.ext import (
@@ -24,9 +24,20 @@ from telegram.ext import (
 )
 
 # Local imports
-from config import BotConfig, AppConfig, SchedulerConfig, initialize as config_init
-from database.db_manager import DatabaseManager
-from utils.reminders import ReminderScheduler
+from config import BotConfig, AppConfig, DatabaseConfig, SchedulerConfig, Features, initialize as config_init
+from database.db_manager import (
+    DatabaseManager, AsyncDatabaseManager, ThreadPoolDatabaseManager,
+    WriteBehindQueue, get_async_db_manager, user_cache
+)
+from utils.reminders import ReminderScheduler, OverdueSweeper
+from utils.dispatcher import MessageDispatcher
+from utils.summaries import SummaryScheduler
+from utils.router import CallbackRouter
+from utils.update_processor import ChatUpdateProcessor
+from utils.ai_parser import get_parse_cache_stats
+from utils.classifier import category_classifier
+from keyboards.inline import prebuild_keyboards
+from utils.translations import get_text
 
 # Handlers
 from handlers.start import (
@@ -72,6 +83,8 @@ from handlers.reports import (
     custom_report_handler,
     export_handler
 )
+from handlers.quick_expense import quick_batch_handler
+from handlers.importer import import_document_handler
 
 # Logging setup
 logger = logging.getLogger(__name__)
@@ -111,11 +124,16 @@ async def error_handler(update: object, context: Exception) -> None:
             if isinstance(update, Update) and update.effective_user:
                 error_text += f"<b>Foydalanuvchi:</b> {update.effective_user.id}\n"
             
-            await context.application.bot.send_message(
-                chat_id=BotConfig.ADMIN_ID,
-                text=error_text,
-                parse_mode='HTML'
-            )
+            # Xatolar ko'p bo'lsa ham flood limitiga tushmaslik uchun navbat orqali
+            dispatcher = context.application.bot_data.get('dispatcher')
+            if dispatcher:
+                dispatcher.submit(BotConfig.ADMIN_ID, error_text, parse_mode='HTML')
+            else:
+                await context.application.bot.send_message(
+                    chat_id=BotConfig.ADMIN_ID,
+                    text=error_text,
+                    parse_mode='HTML'
+                )
         except Exception as e:
             logger.error(f"Admin'ga xabar yuborishda xato: {e}")
 
@@ -132,10 +150,39 @@ async def shutdown_handler(application: Application) -> None:
     """
     logger.info("Bot to'xtatilmoqda...")
     
+    # Davriy vazifalarni to'xtatish
+    # Dispatcher oxirida - navbatdagi xabarlar yuborib bo'linadi
+    for key in ('reminder_scheduler', 'overdue_sweeper', 'summary_scheduler', 'dispatcher'):
+        task = application.bot_data.get(key)
+        if task:
+            try:
+                await task.stop()
+            except Exception as e:
+                logger.error(f"{key} to'xtatishda xato: {e}")
+    
+    metrics = callback_router.get_metrics()
+    if metrics:
+        logger.info(f"Callback marshrutlari statistikasi: {metrics}")
+    logger.info(f"Foydalanuvchi profili keshi: {user_cache.get_stats()}")
+    logger.info(f"Tahlil keshi statistikasi: {get_parse_cache_stats()}")
+    logger.info(f"Shaxsiy kategoriya modeli: {category_classifier.get_stats()}")
+    
+    # Write-behind navbatidagi yozuvlarni saqlash (DB yopilishidan oldin)
+    if DatabaseConfig.WRITE_BEHIND:
+        try:
+            await WriteBehindQueue().close()
+        except Exception as e:
+            logger.error(f"Write-behind navbatini yopishda xato: {e}")
+    
     # Database connection'ni yopish
     try:
         db_manager = DatabaseManager()
         await db_manager.close()
+        if DatabaseConfig.USE_THREAD_POOL:
+            logger.info(f"DB thread pool statistikasi: {ThreadPoolDatabaseManager().get_metrics()}")
+            await ThreadPoolDatabaseManager().close()
+        else:
+            await AsyncDatabaseManager().close()
         logger.info("Database ulanishi yopildi")
     except Exception as e:
         logger.error(f"Database yopishda xato: {e}")
@@ -164,15 +211,42 @@ async def post_init(application: Application) -> None:
         logger.error(f"Database yaratishda xato: {e}")
         raise
     
+    # Statik keyboard'lar keshini oldindan to'ldirish
+    logger.info(f"Keyboard keshi tayyor: {prebuild_keyboards()} ta")
+    
+    # Chiquvchi xabarlar navbati (flood limitlariga mos)
+    dispatcher = MessageDispatcher(application.bot)
+    dispatcher.start()
+    application.bot_data['dispatcher'] = dispatcher
+    
     # Scheduler'ni ishga tushirish
     if SchedulerConfig.REMINDER_CHECK_INTERVAL > 0:
         try:
-            scheduler = ReminderScheduler(application.bot)
+            scheduler = ReminderScheduler(application.bot, send=dispatcher.send)
             scheduler.start()
+            application.bot_data['reminder_scheduler'] = scheduler
             logger.info("Reminder scheduler ishga tushdi")
         except Exception as e:
             logger.error(f"Scheduler ishga tushirishda xato: {e}")
     
+    # Muddati o'tgan qarzlarni davriy yangilash
+    if SchedulerConfig.OVERDUE_SWEEP_INTERVAL > 0:
+        try:
+            sweeper = OverdueSweeper()
+            sweeper.start()
+            application.bot_data['overdue_sweeper'] = sweeper
+        except Exception as e:
+            logger.error(f"OverdueSweeper ishga tushirishda xato: {e}")
+    
+    # Kunlik/haftalik xulosalar (checkpoint bilan)
+    if Features.SUMMARIES:
+        try:
+            summary_scheduler = SummaryScheduler(send=dispatcher.send)
+            summary_scheduler.start()
+            application.bot_data['summary_scheduler'] = summary_scheduler
+        except Exception as e:
+            logger.error(f"SummaryScheduler ishga tushirishda xato: {e}")
+    
     # Admin'ga xabar yuborish
 # Line 168-180 fix
     if BotConfig.ADMIN_ID:
@@ -218,24 +292,20 @@ def setup_handlers(application: Application) -> None:
     income_conv_handler = setup_income_handler()
     application.add_handler(income_conv_handler, group=-1)
     
-    # 4. Debt callback handlers (text input handled inside start conversation handler)
-    application.add_handler(CallbackQueryHandler(debt_menu, pattern='^debt_menu$'), group=-1)
-    application.add_handler(CallbackQueryHandler(add_debt_start, pattern='^debt_add_(given|taken)$'), group=-1)
-    application.add_handler(CallbackQueryHandler(list_debts, pattern='^debt_list_(given|taken)$'), group=-1)
-    application.add_handler(CallbackQueryHandler(view_debt_details, pattern='^debt_view_'), group=-1)
-    application.add_handler(CallbackQueryHandler(debt_statistics, pattern='^debt_statistics$'), group=-1)
-    application.add_handler(CallbackQueryHandler(handle_debt_date_selection, pattern='^debt_date_'), group=-1)
-    application.add_handler(CallbackQueryHandler(handle_debt_reminder_selection, pattern='^debt_reminder_'), group=-1)
-    application.add_handler(CallbackQueryHandler(handle_debt_description_skip, pattern='^debt_desc_skip$'), group=-1)
-    application.add_handler(CallbackQueryHandler(handle_debt_save, pattern='^debt_save$'), group=-1)
-    application.add_handler(CallbackQueryHandler(handle_debt_cancel, pattern='^debt_cancel$'), group=-1)
-    application.add_handler(CallbackQueryHandler(mark_debt_paid, pattern='^debt_paid_(full|partial)_'), group=-1)
-    application.add_handler(CallbackQueryHandler(delete_debt, pattern='^debt_delete_'), group=-1)
-    
-    # 5. Callback query handler (global - barcha inline button'lar uchun)
-    # GROUP 0 = Default, conversation handler'lardan KEYIN ishlaydi
+    # 4. Inline tugmalar: xarajat, daromad, qarz va hisobot callback'lari
+    # bitta router'da (setup_callback_router), GROUP 0 - conversation
+    # handler'lardan KEYIN ishlaydi
+    setup_callback_router(callback_router)
     application.add_handler(CallbackQueryHandler(handle_callback), group=0)
     
+    # 5. CSV import (bank ko'chirmasi) - uzoq davom etadi, shuning uchun
+    # block=False: boshqa update'lar import tugashini kutmaydi
+    application.add_handler(MessageHandler(
+        filters.Document.FileExtension('csv') | filters.Document.MimeType('text/csv'),
+        import_document_handler,
+        block=False
+    ))
+    
     # 6. Unknown command handler - /start va /help ni chiqarib tashlash
     application.add_handler(MessageHandler(
         filters.COMMAND & ~filters.Regex(r'^/(start|help|cancel)'),
@@ -251,455 +321,450 @@ def setup_handlers(application: Application) -> None:
 # =====================================================
 # CALLBACK QUERY HANDLER
 # =====================================================
-async def handle_callback(update: Update, context) -> None:
-    """
-    Global callback query handler - barcha inline button'larni qayta ishlaydi
+async def _safe_edit_message(query, text, reply_markup=None, parse_mode=None) -> None:
+    """Xabarni xavfsiz tahrirlash - xato bo'lsa yangi xabar yuborish"""
+    try:
+        await query.edit_message_text(text, reply_markup=reply_markup, parse_mode=parse_mode)
+    except Exception:
+        try:
+            await query.message.reply_text(text, reply_markup=reply_markup, parse_mode=parse_mode)
+        except Exception:
+            pass
+
+
+async def _cb_settings(update: Update, context) -> None:
+    """Sozlamalar menyusiga qaytish"""
+    from handlers.start import settings_menu
+    await settings_menu(update, context)
+
+
+async def _cb_delete_expenses_list(update: Update, context) -> None:
+    """Xarajatlar ro'yxatini ko'rsatish (keyset sahifalash)"""
+    query = update.callback_query
+    db_manager = get_async_db_manager()
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
     
-    Args:
-        update: Telegram update
-        context: Callback context
-    """
+    from utils.filters import get_last_n_days_range, parse_page_callback
+    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+    from keyboards.inline import get_pagination_keyboard
+    
+    cursor, direction, page = parse_page_callback(query.data, 'delete_expenses_list')
+    start_date, end_date = get_last_n_days_range(30)  # Oxirgi 30 kun
+    expenses, prev_cursor, next_cursor = await db_manager.get_user_expenses_page(
+        telegram_id, cursor=cursor, direction=direction, limit=10, start_date=start_date
+    )
+    if prev_cursor is None:
+        page = 1
+    
+    if not expenses:
+        keyboard = InlineKeyboardMarkup([[InlineKeyboardButton(get_text('back_short', user_language), callback_data='delete_data')]])
+        await _safe_edit_message(query, get_text('no_expenses_found', user_language), reply_markup=keyboard)
+        return
+    
+    # Xarajatlar ro'yxati
+    from config import Categories
+    
+    keyboard_buttons = []
+    for exp in expenses:
+        cat_icon = '📌'
+        for cat in Categories.LIST:
+            if cat['key'] == exp.category:
+                cat_icon = cat['icon']
+                break
+        
+        btn_text = f"{cat_icon} {exp.amount:,.0f} - {exp.created_at.strftime('%d.%m')}"
+        keyboard_buttons.append([InlineKeyboardButton(btn_text, callback_data=f'edit_expense_{exp.id}')])
+    
+    keyboard = get_pagination_keyboard(
+        page, None, 'delete_expenses_list', user_language,
+        prev_cursor=prev_cursor, next_cursor=next_cursor,
+        rows=keyboard_buttons, back_callback='delete_data'
+    )
+    
+    await _safe_edit_message(
+        query,
+        get_text('expenses_list_header', user_language),
+        reply_markup=keyboard,
+        parse_mode='HTML'
+    )
+
+
+async def _cb_delete_incomes_list(update: Update, context) -> None:
+    """Daromadlar ro'yxatini ko'rsatish (keyset sahifalash)"""
     query = update.callback_query
-    await query.answer()
+    db_manager = get_async_db_manager()
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
     
-    callback_data = query.data
+    from utils.filters import get_last_n_days_range, parse_page_callback
+    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+    from keyboards.inline import get_pagination_keyboard
     
-    # Database manager
-    db_manager = DatabaseManager()
+    cursor, direction, page = parse_page_callback(query.data, 'delete_incomes_list')
+    start_date, end_date = get_last_n_days_range(30)  # Oxirgi 30 kun
+    incomes, prev_cursor, next_cursor = await db_manager.get_user_incomes_page(
+        telegram_id, cursor=cursor, direction=direction, limit=10, start_date=start_date
+    )
+    if prev_cursor is None:
+        page = 1
+    
+    if not incomes:
+        keyboard = InlineKeyboardMarkup([[InlineKeyboardButton(get_text('back_short', user_language), callback_data='delete_data')]])
+        await _safe_edit_message(query, get_text('no_incomes_found', user_language), reply_markup=keyboard)
+        return
+    
+    # Daromadlar ro'yxati
+    keyboard_buttons = []
+    for inc in incomes:
+        btn_text = f"💰 {inc.amount:,.0f} - {inc.created_at.strftime('%d.%m')}"
+        keyboard_buttons.append([InlineKeyboardButton(btn_text, callback_data=f'edit_income_{inc.id}')])
+    
+    keyboard = get_pagination_keyboard(
+        page, None, 'delete_incomes_list', user_language,
+        prev_cursor=prev_cursor, next_cursor=next_cursor,
+        rows=keyboard_buttons, back_callback='delete_data'
+    )
+    
+    await _safe_edit_message(
+        query,
+        get_text('incomes_list_header', user_language),
+        reply_markup=keyboard,
+        parse_mode='HTML'
+    )
+
+
+async def _cb_delete_data(update: Update, context) -> None:
+    """Ma'lumot o'chirish menyusi - Daromad va Xarajatlar"""
+    query = update.callback_query
+    user_language = context.user_data.get('language', 'uz')
+    
+    from keyboards.inline import get_delete_data_keyboard
+    
+    keyboard = get_delete_data_keyboard(user_language)
+    await _safe_edit_message(
+        query,
+        get_text('delete_data_menu', user_language),
+        reply_markup=keyboard,
+        parse_mode='HTML'
+    )
+
+
+async def _cb_delete_expense(update: Update, context, args: List[str]) -> None:
+    """Xarajatni o'chirish"""
+    query = update.callback_query
+    db_manager = get_async_db_manager()
     user_language = context.user_data.get('language', 'uz')
     telegram_id = context.user_data.get('telegram_id')
     
-    # Helper function for safe message editing
-    async def safe_edit_message(text, reply_markup=None, parse_mode=None):
-        """Xabarni xavfsiz tahrirlash - xato bo'lsa yangi xabar yuborish"""
-        try:
-            await safe_edit_message(text, reply_markup=reply_markup, parse_mode=parse_mode)
-        except Exception:
-            try:
-                await query.message.reply_text(text, reply_markup=reply_markup, parse_mode=parse_mode)
-            except Exception:
-                pass
+    expense_id = args[0]
     
-    # Callback data'ga qarab yo'naltirish
-    # NOTE: lang_ callbacks are handled by start conversation handler
+    try:
+        # Xarajatni o'chirish
+        if await db_manager.delete_expense(int(expense_id), telegram_id):
+            await category_classifier.forget(telegram_id, int(expense_id))
+            await _safe_edit_message(query, get_text('expense_deleted', user_language))
+        else:
+            await _safe_edit_message(query, "❌ Xato yuz berdi")
+    except Exception as e:
+        logger.error(f"Delete expense error: {e}")
+        await _safe_edit_message(query, "❌ Xato yuz berdi")
+
+
+async def _cb_cancel_expense(update: Update, context, args: List[str]) -> None:
+    """Xarajatni bekor qilish"""
+    query = update.callback_query
+    db_manager = get_async_db_manager()
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
     
-    if callback_data == 'add_expense':
-        # Xarajat qo'shish
-        await add_expense_command(update, context)
+    expense_id = int(args[0])
     
-    elif callback_data == 'add_income':
-        # Daromad qo'shish
-        await add_income_command(update, context)
+    try:
+        # Xarajatni o'chirish
+        if await db_manager.delete_expense(expense_id, telegram_id):
+            await category_classifier.forget(telegram_id, expense_id)
+            await _safe_edit_message(query, get_text('expense_cancelled_deleted', user_language))
+        else:
+            await _safe_edit_message(query, "❌ Xato yuz berdi")
+    except Exception as e:
+        logger.error(f"Cancel expense error: {e}")
+        await _safe_edit_message(query, "❌ Xato yuz berdi")
+
+
+async def _cb_cancel_income(update: Update, context, args: List[str]) -> None:
+    """Daromadni bekor qilish"""
+    query = update.callback_query
+    db_manager = get_async_db_manager()
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
     
-    elif callback_data == 'reports':
-        # Hisobotlar menyusi
-        await reports_menu_command(update, context)
+    income_id = int(args[0])
     
-    elif callback_data == 'settings':
-        # Sozlamalar menyusiga qaytish
-        from handlers.start import settings_menu
-        await settings_menu(update, context)
+    try:
+        # Daromadni o'chirish
+        if await db_manager.delete_income(income_id, telegram_id):
+            await _safe_edit_message(query, get_text('income_cancelled_deleted', user_language))
+        else:
+            await _safe_edit_message(query, "❌ Xato yuz berdi")
+    except Exception as e:
+        logger.error(f"Cancel income error: {e}")
+        await _safe_edit_message(query, "❌ Xato yuz berdi")
+
+
+async def _cb_edit_expense(update: Update, context, args: List[str]) -> None:
+    """Xarajat ma'lumotlarini ko'rsatish va tahrirlash/o'chirish opsiyalari"""
+    query = update.callback_query
+    db_manager = get_async_db_manager()
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
     
-    elif callback_data == 'delete_data':
-        # Ma'lumot o'chirish menyusi - Daromad va Xarajatlar
-        from keyboards.inline import get_delete_data_keyboard
-        
-        delete_texts = {
-            'uz': '🗑️ <b>Ma\'lumot o\'chirish</b>\n\nNimani tahrirlash/o\'chirmoqchisiz?',
-            'ru': '🗑️ <b>Удаление данных</b>\n\nЧто хотите редактировать/удалить?',
-            'en': '🗑️ <b>Delete Data</b>\n\nWhat do you want to edit/delete?',
-            'tr': '🗑️ <b>Veri Silme</b>\n\nNeyi düzenlemek/silmek istiyorsunuz?',
-            'ar': '🗑️ <b>حذف البيانات</b>\n\nماذا تريد تعديل/حذف؟'
-        }
-        
-        keyboard = get_delete_data_keyboard(user_language)
-        await safe_edit_message(
-            delete_texts.get(user_language, delete_texts['uz']),
-            reply_markup=keyboard,
-            parse_mode='HTML'
-        )
+    expense_id = int(args[0])
     
-    elif callback_data == 'delete_expenses_list':
-        # Xarajatlar ro'yxatini ko'rsatish
-        from utils.filters import get_last_n_days_range
-        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-        
-        start_date, end_date = get_last_n_days_range(30)  # Oxirgi 30 kun
-        expenses = db_manager.get_user_expenses(telegram_id, start_date, end_date)
-        
-        if not expenses:
-            no_data = {
-                'uz': '📭 Xarajatlar topilmadi.',
-                'ru': '📭 Расходы не найдены.',
-                'en': '📭 No expenses found.',
-                'tr': '📭 Gider bulunamadı.',
-                'ar': '📭 لم يتم العثور على مصروفات.'
-            }
-            back_text = {'uz': '« Orqaga', 'ru': '« Назад', 'en': '« Back', 'tr': '« Geri', 'ar': '« رجوع'}
-            keyboard = InlineKeyboardMarkup([[InlineKeyboardButton(back_text.get(user_language, back_text['uz']), callback_data='delete_data')]])
-            await safe_edit_message(no_data.get(user_language, no_data['uz']), reply_markup=keyboard)
-            return
-        
-        # Xarajatlar ro'yxati
-        from config import Categories
-        
-        header = {
-            'uz': '💸 <b>Xarajatlar</b>\n\nTahrirlash uchun tanlang:',
-            'ru': '💸 <b>Расходы</b>\n\nВыберите для редактирования:',
-            'en': '💸 <b>Expenses</b>\n\nSelect to edit:',
-            'tr': '💸 <b>Giderler</b>\n\nDüzenlemek için seçin:',
-            'ar': '💸 <b>المصروفات</b>\n\nاختر للتعديل:'
-        }
+    try:
+        # Xarajat ma'lumotlarini olish
+        expense = await db_manager.get_expense_by_id(expense_id, telegram_id)
         
-        keyboard_buttons = []
-        for exp in expenses[:10]:  # Oxirgi 10 ta
+        if expense:
+            from config import Categories
+            from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+            
+            # Kategoriya nomini olish
+            cat_name = Categories.NAMES.get(expense.category, {}).get(user_language, expense.category)
             cat_icon = '📌'
             for cat in Categories.LIST:
-                if cat['key'] == exp.category:
+                if cat['key'] == expense.category:
                     cat_icon = cat['icon']
                     break
             
-            btn_text = f"{cat_icon} {exp.amount:,.0f} - {exp.created_at.strftime('%d.%m')}"
-            keyboard_buttons.append([InlineKeyboardButton(btn_text, callback_data=f'edit_expense_{exp.id}')])
-        
-        back_text = {'uz': '« Orqaga', 'ru': '« Назад', 'en': '« Back', 'tr': '« Geri', 'ar': '« رجوع'}
-        keyboard_buttons.append([InlineKeyboardButton(back_text.get(user_language, back_text['uz']), callback_data='delete_data')])
-        
-        await safe_edit_message(
-            header.get(user_language, header['uz']),
-            reply_markup=InlineKeyboardMarkup(keyboard_buttons),
-            parse_mode='HTML'
-        )
-    
-    elif callback_data == 'delete_incomes_list':
-        # Daromadlar ro'yxatini ko'rsatish
-        from utils.filters import get_last_n_days_range
-        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-        
-        start_date, end_date = get_last_n_days_range(30)  # Oxirgi 30 kun
-        incomes = db_manager.get_user_incomes(telegram_id, start_date, end_date)
-        
-        if not incomes:
-            no_data = {
-                'uz': '📭 Daromadlar topilmadi.',
-                'ru': '📭 Доходы не найдены.',
-                'en': '📭 No incomes found.',
-                'tr': '📭 Gelir bulunamadı.',
-                'ar': '📭 لم يتم العثور على دخل.'
-            }
-            back_text = {'uz': '« Orqaga', 'ru': '« Назад', 'en': '« Back', 'tr': '« Geri', 'ar': '« رجوع'}
-            keyboard = InlineKeyboardMarkup([[InlineKeyboardButton(back_text.get(user_language, back_text['uz']), callback_data='delete_data')]])
-            await safe_edit_message(no_data.get(user_language, no_data['uz']), reply_markup=keyboard)
-            return
-        
-        # Daromadlar ro'yxati
-        header = {
-            'uz': '💰 <b>Daromadlar</b>\n\nTahrirlash uchun tanlang:',
-            'ru': '💰 <b>Доходы</b>\n\nВыберите для редактирования:',
-            'en': '💰 <b>Incomes</b>\n\nSelect to edit:',
-            'tr': '💰 <b>Gelirler</b>\n\nDüzenlemek için seçin:',
-            'ar': '💰 <b>الدخل</b>\n\nاختر للتعديل:'
-        }
-        
-        keyboard_buttons = []
-        for inc in incomes[:10]:  # Oxirgi 10 ta
-            btn_text = f"💰 {inc.amount:,.0f} - {inc.created_at.strftime('%d.%m')}"
-            keyboard_buttons.append([InlineKeyboardButton(btn_text, callback_data=f'edit_income_{inc.id}')])
-        
-        back_text = {'uz': '« Orqaga', 'ru': '« Назад', 'en': '« Back', 'tr': '« Geri', 'ar': '« رجوع'}
-        keyboard_buttons.append([InlineKeyboardButton(back_text.get(user_language, back_text['uz']), callback_data='delete_data')])
-        
-        await safe_edit_message(
-            header.get(user_language, header['uz']),
-            reply_markup=InlineKeyboardMarkup(keyboard_buttons),
-            parse_mode='HTML'
-        )
-    
-    elif callback_data.startswith('report_bot_'):
-        # Hisobotni botda ko'rsatish
-        await report_bot_handler(update, context)
+            keyboard = InlineKeyboardMarkup([
+                [
+                    InlineKeyboardButton(get_text('btn_delete', user_language), callback_data=f'confirm_del_expense_{expense_id}'),
+                    InlineKeyboardButton(get_text('btn_edit', user_language), callback_data=f'do_edit_expense_{expense_id}')
+                ],
+                [InlineKeyboardButton(get_text('back_short', user_language), callback_data='delete_expenses_list')]
+            ])
+            
+            await _safe_edit_message(
+                query,
+                get_text(
+                    'expense_details', user_language,
+                    icon=cat_icon,
+                    category=cat_name,
+                    amount=expense.amount,
+                    date=expense.created_at.strftime('%d.%m.%Y %H:%M')
+                ),
+                reply_markup=keyboard,
+                parse_mode='HTML'
+            )
+        else:
+            await _safe_edit_message(query, "❌ Xarajat topilmadi")
+    except Exception as e:
+        logger.error(f"Edit expense error: {e}")
+        await _safe_edit_message(query, "❌ Xato yuz berdi")
+
+
+async def _cb_confirm_del_expense(update: Update, context, args: List[str]) -> None:
+    """Xarajatni o'chirish"""
+    query = update.callback_query
+    db_manager = get_async_db_manager()
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
     
-    elif callback_data.startswith('report_html_'):
-        # Hisobotni HTML formatida yuborish
-        await report_html_handler(update, context)
+    expense_id = int(args[0])
     
-    elif callback_data.startswith('category_'):
-        # Kategoriya tanlash
-        await expense_category_handler(update, context)
+    try:
+        if await db_manager.delete_expense(expense_id, telegram_id):
+            await category_classifier.forget(telegram_id, expense_id)
+            await _safe_edit_message(query, get_text('expense_deleted', user_language))
+        else:
+            await _safe_edit_message(query, "❌ Xato yuz berdi")
+    except Exception as e:
+        logger.error(f"Confirm delete expense error: {e}")
+        await _safe_edit_message(query, "❌ Xato yuz berdi")
+
+
+async def _cb_do_edit_expense(update: Update, context, args: List[str]) -> None:
+    """Xarajatni tahrirlash - o'chirib, qayta qo'shish"""
+    query = update.callback_query
+    db_manager = get_async_db_manager()
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
     
-    elif callback_data.startswith('report_'):
-        # Hisobot turi tanlash - format so'rash
-        await report_type_handler(update, context)
+    expense_id = int(args[0])
     
-    elif callback_data.startswith('export_'):
-        # Export handler
-        await export_handler(update, context)
+    try:
+        if await db_manager.delete_expense(expense_id, telegram_id):
+            await category_classifier.forget(telegram_id, expense_id)
+            await _safe_edit_message(query, get_text('expense_edit_prompt', user_language))
+            await add_expense_command(update, context)
+        else:
+            await _safe_edit_message(query, "❌ Xato yuz berdi")
+    except Exception as e:
+        logger.error(f"Do edit expense error: {e}")
+        await _safe_edit_message(query, "❌ Xato yuz berdi")
+
+
+async def _cb_edit_income(update: Update, context, args: List[str]) -> None:
+    """Daromad ma'lumotlarini ko'rsatish va tahrirlash/o'chirish opsiyalari"""
+    query = update.callback_query
+    db_manager = get_async_db_manager()
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
     
-    elif callback_data.startswith('delete_expense_'):
-        # Xarajatni o'chirish
-        user_language = context.user_data.get('language', 'uz')
-        telegram_id = context.user_data.get('telegram_id')
-        expense_id = callback_data.replace('delete_expense_', '')
-        
-        try:
-            # Xarajatni o'chirish
-            if db_manager.delete_expense(int(expense_id), telegram_id):
-                delete_messages = {
-                    'uz': '✅ Xarajat o\'chirildi!',
-                    'ru': '✅ Расход удалён!',
-                    'en': '✅ Expense deleted!',
-                    'tr': '✅ Gider silindi!',
-                    'ar': '✅ تم حذف المصروف!'
-                }
-                await safe_edit_message(delete_messages.get(user_language, delete_messages['uz']))
-            else:
-                await safe_edit_message("❌ Xato yuz berdi")
-        except Exception as e:
-            logger.error(f"Delete expense error: {e}")
-            await safe_edit_message("❌ Xato yuz berdi")
-    
-    elif callback_data.startswith('cancel_expense_'):
-        # Xarajatni bekor qilish
-        user_language = context.user_data.get('language', 'uz')
-        telegram_id = context.user_data.get('telegram_id')
-        expense_id = int(callback_data.replace('cancel_expense_', ''))
-        
-        try:
-            # Xarajatni o'chirish
-            if db_manager.delete_expense(expense_id, telegram_id):
-                cancel_messages = {
-                    'uz': '✅ Xarajat bekor qilindi va o\'chirildi!',
-                    'ru': '✅ Расход отменён и удалён!',
-                    'en': '✅ Expense cancelled and deleted!',
-                    'tr': '✅ Gider iptal edildi ve silindi!',
-                    'ar': '✅ تم إلغاء وحذف المصروف!'
-                }
-                await safe_edit_message(cancel_messages.get(user_language, cancel_messages['uz']))
-            else:
-                await safe_edit_message("❌ Xato yuz berdi")
-        except Exception as e:
-            logger.error(f"Cancel expense error: {e}")
-            await safe_edit_message("❌ Xato yuz berdi")
-    
-    elif callback_data.startswith('cancel_income_'):
-        # Daromadni bekor qilish
-        user_language = context.user_data.get('language', 'uz')
-        telegram_id = context.user_data.get('telegram_id')
-        income_id = int(callback_data.replace('cancel_income_', ''))
-        
-        try:
-            # Daromadni o'chirish
-            if db_manager.delete_income(income_id, telegram_id):
-                cancel_messages = {
-                    'uz': '✅ Daromad bekor qilindi va o\'chirildi!',
-                    'ru': '✅ Доход отменён и удалён!',
-                    'en': '✅ Income cancelled and deleted!',
-                    'tr': '✅ Gelir iptal edildi ve silindi!',
-                    'ar': '✅ تم إلغاء وحذف الدخل!'
-                }
-                await safe_edit_message(cancel_messages.get(user_language, cancel_messages['uz']))
-            else:
-                await safe_edit_message("❌ Xato yuz berdi")
-        except Exception as e:
-            logger.error(f"Cancel income error: {e}")
-            await safe_edit_message("❌ Xato yuz berdi")
+    income_id = int(args[0])
     
-    elif callback_data.startswith('edit_expense_'):
-        # Xarajat ma'lumotlarini ko'rsatish va tahrirlash/o'chirish opsiyalari
-        expense_id = int(callback_data.replace('edit_expense_', ''))
+    try:
+        # Daromad ma'lumotlarini olish
+        income = await db_manager.get_income_by_id(income_id, telegram_id)
         
-        try:
-            # Xarajat ma'lumotlarini olish
-            expense = db_manager.get_expense_by_id(expense_id, telegram_id)
+        if income:
+            from telegram import InlineKeyboardButton, InlineKeyboardMarkup
             
-            if expense:
-                from config import Categories
-                from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-                
-                # Kategoriya nomini olish
-                cat_name = Categories.NAMES.get(expense.category, {}).get(user_language, expense.category)
-                cat_icon = '📌'
-                for cat in Categories.LIST:
-                    if cat['key'] == expense.category:
-                        cat_icon = cat['icon']
-                        break
-                
-                detail_texts = {
-                    'uz': f"💸 <b>Xarajat ma'lumotlari</b>\n\n{cat_icon} Kategoriya: {cat_name}\n💵 Summa: {expense.amount:,.0f} so'm\n📅 Sana: {expense.created_at.strftime('%d.%m.%Y %H:%M')}\n\nNima qilmoqchisiz?",
-                    'ru': f"💸 <b>Информация о расходе</b>\n\n{cat_icon} Категория: {cat_name}\n💵 Сумма: {expense.amount:,.0f} сум\n📅 Дата: {expense.created_at.strftime('%d.%m.%Y %H:%M')}\n\nЧто хотите сделать?",
-                    'en': f"💸 <b>Expense details</b>\n\n{cat_icon} Category: {cat_name}\n💵 Amount: {expense.amount:,.0f} sum\n📅 Date: {expense.created_at.strftime('%d.%m.%Y %H:%M')}\n\nWhat do you want to do?",
-                    'tr': f"💸 <b>Gider detayları</b>\n\n{cat_icon} Kategori: {cat_name}\n💵 Tutar: {expense.amount:,.0f} sum\n📅 Tarih: {expense.created_at.strftime('%d.%m.%Y %H:%M')}\n\nNe yapmak istiyorsunuz?",
-                    'ar': f"💸 <b>تفاصيل المصروف</b>\n\n{cat_icon} الفئة: {cat_name}\n💵 المبلغ: {expense.amount:,.0f} سوم\n📅 التاريخ: {expense.created_at.strftime('%d.%m.%Y %H:%M')}\n\nماذا تريد أن تفعل?"
-                }
-                
-                btn_texts = {
-                    'uz': {'delete': '🔴 O\'chirish', 'edit': '✏️ Tahrirlash', 'back': '« Orqaga'},
-                    'ru': {'delete': '🔴 Удалить', 'edit': '✏️ Редактировать', 'back': '« Назад'},
-                    'en': {'delete': '🔴 Delete', 'edit': '✏️ Edit', 'back': '« Back'},
-                    'tr': {'delete': '🔴 Sil', 'edit': '✏️ Düzenle', 'back': '« Geri'},
-                    'ar': {'delete': '🔴 حذف', 'edit': '✏️ تعديل', 'back': '« رجوع'}
-                }
-                btn = btn_texts.get(user_language, btn_texts['uz'])
-                
-                keyboard = InlineKeyboardMarkup([
-                    [
-                        InlineKeyboardButton(btn['delete'], callback_data=f'confirm_del_expense_{expense_id}'),
-                        InlineKeyboardButton(btn['edit'], callback_data=f'do_edit_expense_{expense_id}')
-                    ],
-                    [InlineKeyboardButton(btn['back'], callback_data='delete_expenses_list')]
-                ])
-                
-                await safe_edit_message(
-                    detail_texts.get(user_language, detail_texts['uz']),
-                    reply_markup=keyboard,
-                    parse_mode='HTML'
-                )
-            else:
-                await safe_edit_message("❌ Xarajat topilmadi")
-        except Exception as e:
-            logger.error(f"Edit expense error: {e}")
-            await safe_edit_message("❌ Xato yuz berdi")
+            keyboard = InlineKeyboardMarkup([
+                [
+                    InlineKeyboardButton(get_text('btn_delete', user_language), callback_data=f'confirm_del_income_{income_id}'),
+                    InlineKeyboardButton(get_text('btn_edit', user_language), callback_data=f'do_edit_income_{income_id}')
+                ],
+                [InlineKeyboardButton(get_text('back_short', user_language), callback_data='delete_incomes_list')]
+            ])
+            
+            await _safe_edit_message(
+                query,
+                get_text(
+                    'income_details', user_language,
+                    amount=income.amount,
+                    source=income.source or '-',
+                    date=income.created_at.strftime('%d.%m.%Y %H:%M')
+                ),
+                reply_markup=keyboard,
+                parse_mode='HTML'
+            )
+        else:
+            await _safe_edit_message(query, "❌ Daromad topilmadi")
+    except Exception as e:
+        logger.error(f"Edit income error: {e}")
+        await _safe_edit_message(query, "❌ Xato yuz berdi")
+
+
+async def _cb_confirm_del_income(update: Update, context, args: List[str]) -> None:
+    """Daromadni o'chirish"""
+    query = update.callback_query
+    db_manager = get_async_db_manager()
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
     
-    elif callback_data.startswith('confirm_del_expense_'):
-        # Xarajatni o'chirish
-        expense_id = int(callback_data.replace('confirm_del_expense_', ''))
-        
-        try:
-            if db_manager.delete_expense(expense_id, telegram_id):
-                delete_messages = {
-                    'uz': '✅ Xarajat o\'chirildi!',
-                    'ru': '✅ Расход удалён!',
-                    'en': '✅ Expense deleted!',
-                    'tr': '✅ Gider silindi!',
-                    'ar': '✅ تم حذف المصروف!'
-                }
-                await safe_edit_message(delete_messages.get(user_language, delete_messages['uz']))
-            else:
-                await safe_edit_message("❌ Xato yuz berdi")
-        except Exception as e:
-            logger.error(f"Confirm delete expense error: {e}")
-            await safe_edit_message("❌ Xato yuz berdi")
+    income_id = int(args[0])
     
-    elif callback_data.startswith('do_edit_expense_'):
-        # Xarajatni tahrirlash - o'chirib, qayta qo'shish
-        expense_id = int(callback_data.replace('do_edit_expense_', ''))
-        
-        try:
-            if db_manager.delete_expense(expense_id, telegram_id):
-                edit_messages = {
-                    'uz': '✏️ Xarajat o\'chirildi.\n\n💸 Endi yangi xarajat qo\'shing:',
-                    'ru': '✏️ Расход удалён.\n\n💸 Теперь добавьте новый расход:',
-                    'en': '✏️ Expense deleted.\n\n💸 Now add new expense:',
-                    'tr': '✏️ Gider silindi.\n\n💸 Şimdi yeni gider ekleyin:',
-                    'ar': '✏️ تم حذف المصروف.\n\n💸 الآن أضف مصروف جديد:'
-                }
-                
-                await safe_edit_message(edit_messages.get(user_language, edit_messages['uz']))
-                await add_expense_command(update, context)
-            else:
-                await safe_edit_message("❌ Xato yuz berdi")
-        except Exception as e:
-            logger.error(f"Do edit expense error: {e}")
-            await safe_edit_message("❌ Xato yuz berdi")
+    try:
+        if await db_manager.delete_income(income_id, telegram_id):
+            await _safe_edit_message(query, get_text('income_deleted', user_language))
+        else:
+            await _safe_edit_message(query, "❌ Xato yuz berdi")
+    except Exception as e:
+        logger.error(f"Confirm delete income error: {e}")
+        await _safe_edit_message(query, "❌ Xato yuz berdi")
+
+
+async def _cb_do_edit_income(update: Update, context, args: List[str]) -> None:
+    """Daromadni tahrirlash - o'chirib, qayta qo'shish"""
+    query = update.callback_query
+    db_manager = get_async_db_manager()
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
     
-    elif callback_data.startswith('edit_income_'):
-        # Daromad ma'lumotlarini ko'rsatish va tahrirlash/o'chirish opsiyalari
-        income_id = int(callback_data.replace('edit_income_', ''))
-        
-        try:
-            # Daromad ma'lumotlarini olish
-            income = db_manager.get_income_by_id(income_id, telegram_id)
-            
-            if income:
-                from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-                
-                detail_texts = {
-                    'uz': f"💰 <b>Daromad ma'lumotlari</b>\n\n💵 Summa: {income.amount:,.0f} so'm\n📝 Manba: {income.source or '-'}\n📅 Sana: {income.created_at.strftime('%d.%m.%Y %H:%M')}\n\nNima qilmoqchisiz?",
-                    'ru': f"💰 <b>Информация о доходе</b>\n\n💵 Сумма: {income.amount:,.0f} сум\n📝 Источник: {income.source or '-'}\n📅 Дата: {income.created_at.strftime('%d.%m.%Y %H:%M')}\n\nЧто хотите сделать?",
-                    'en': f"💰 <b>Income details</b>\n\n💵 Amount: {income.amount:,.0f} sum\n📝 Source: {income.source or '-'}\n📅 Date: {income.created_at.strftime('%d.%m.%Y %H:%M')}\n\nWhat do you want to do?",
-                    'tr': f"💰 <b>Gelir detayları</b>\n\n💵 Tutar: {income.amount:,.0f} sum\n📝 Kaynak: {income.source or '-'}\n📅 Tarih: {income.created_at.strftime('%d.%m.%Y %H:%M')}\n\nNe yapmak istiyorsunuz?",
-                    'ar': f"💰 <b>تفاصيل الدخل</b>\n\n💵 المبلغ: {income.amount:,.0f} سوم\n📝 المصدر: {income.source or '-'}\n📅 التاريخ: {income.created_at.strftime('%d.%m.%Y %H:%M')}\n\nماذا تريد أن تفعل?"
-                }
-                
-                btn_texts = {
-                    'uz': {'delete': '🔴 O\'chirish', 'edit': '✏️ Tahrirlash', 'back': '« Orqaga'},
-                    'ru': {'delete': '🔴 Удалить', 'edit': '✏️ Редактировать', 'back': '« Назад'},
-                    'en': {'delete': '🔴 Delete', 'edit': '✏️ Edit', 'back': '« Back'},
-                    'tr': {'delete': '🔴 Sil', 'edit': '✏️ Düzenle', 'back': '« Geri'},
-                    'ar': {'delete': '🔴 حذف', 'edit': '✏️ تعديل', 'back': '« رجوع'}
-                }
-                btn = btn_texts.get(user_language, btn_texts['uz'])
-                
-                keyboard = InlineKeyboardMarkup([
-                    [
-                        InlineKeyboardButton(btn['delete'], callback_data=f'confirm_del_income_{income_id}'),
-                        InlineKeyboardButton(btn['edit'], callback_data=f'do_edit_income_{income_id}')
-                    ],
-                    [InlineKeyboardButton(btn['back'], callback_data='delete_incomes_list')]
-                ])
-                
-                await safe_edit_message(
-                    detail_texts.get(user_language, detail_texts['uz']),
-                    reply_markup=keyboard,
-                    parse_mode='HTML'
-                )
-            else:
-                await safe_edit_message("❌ Daromad topilmadi")
-        except Exception as e:
-            logger.error(f"Edit income error: {e}")
-            await safe_edit_message("❌ Xato yuz berdi")
+    income_id = int(args[0])
     
-    elif callback_data.startswith('confirm_del_income_'):
-        # Daromadni o'chirish
-        income_id = int(callback_data.replace('confirm_del_income_', ''))
-        
-        try:
-            if db_manager.delete_income(income_id, telegram_id):
-                delete_messages = {
-                    'uz': '✅ Daromad o\'chirildi!',
-                    'ru': '✅ Доход удалён!',
-                    'en': '✅ Income deleted!',
-                    'tr': '✅ Gelir silindi!',
-                    'ar': '✅ تم حذف الدخل!'
-                }
-                await safe_edit_message(delete_messages.get(user_language, delete_messages['uz']))
-            else:
-                await safe_edit_message("❌ Xato yuz berdi")
-        except Exception as e:
-            logger.error(f"Confirm delete income error: {e}")
-            await safe_edit_message("❌ Xato yuz berdi")
+    try:
+        if await db_manager.delete_income(income_id, telegram_id):
+            await _safe_edit_message(query, get_text('income_edit_prompt', user_language))
+            await add_income_command(update, context)
+        else:
+            await _safe_edit_message(query, "❌ Xato yuz berdi")
+    except Exception as e:
+        logger.error(f"Do edit income error: {e}")
+        await _safe_edit_message(query, "❌ Xato yuz berdi")
+
+
+# Process-wide callback router
+callback_router = CallbackRouter()
+
+
+def setup_callback_router(router: CallbackRouter) -> None:
+    """
+    Barcha inline tugma marshrutlarini ro'yxatdan o'tkazish
     
-    elif callback_data.startswith('do_edit_income_'):
-        # Daromadni tahrirlash - o'chirib, qayta qo'shish
-        income_id = int(callback_data.replace('do_edit_income_', ''))
-        
-        try:
-            if db_manager.delete_income(income_id, telegram_id):
-                edit_messages = {
-                    'uz': '✏️ Daromad o\'chirildi.\n\n💰 Endi yangi daromad qo\'shing:',
-                    'ru': '✏️ Доход удалён.\n\n💰 Теперь добавьте новый доход:',
-                    'en': '✏️ Income deleted.\n\n💰 Now add new income:',
-                    'tr': '✏️ Gelir silindi.\n\n💰 Şimdi yeni gelir ekleyin:',
-                    'ar': '✏️ تم حذف الدخل.\n\n💰 الآن أضف دخل جديد:'
-                }
-                
-                await safe_edit_message(edit_messages.get(user_language, edit_messages['uz']))
-                await add_income_command(update, context)
-            else:
-                await safe_edit_message("❌ Xato yuz berdi")
-        except Exception as e:
-            logger.error(f"Do edit income error: {e}")
-            await safe_edit_message("❌ Xato yuz berdi")
+    Xarajat, daromad, qarz va hisobot callback'lari uchun yagona joy.
+    answer=False - handler query.answer() ni o'zi chaqiradi.
+    
+    Args:
+        router: Callback router
+    """
+    # Asosiy menyu
+    router.add('add_expense', add_expense_command, exact=True, answer=False)
+    router.add('add_income', add_income_command, exact=True, answer=False)
+    router.add('reports', reports_menu_command, exact=True)
+    router.add('settings', _cb_settings, exact=True, answer=False)
+    router.add('back_main', start_command, exact=True, answer=False)
+    router.add('main_menu', start_command, exact=True, answer=False)
+    
+    # Ma'lumot o'chirish / tahrirlash
+    router.add('delete_data', _cb_delete_data, exact=True)
+    router.add('delete_expenses_list', _cb_delete_expenses_list)
+    router.add('delete_incomes_list', _cb_delete_incomes_list)
+    
+    # Xarajatlar
+    router.add('category', expense_category_handler, answer=False)
+    router.add('delete_expense', _cb_delete_expense, pass_args=True)
+    router.add('cancel_expense', _cb_cancel_expense, pass_args=True)
+    router.add('edit_expense', _cb_edit_expense, pass_args=True)
+    router.add('confirm_del_expense', _cb_confirm_del_expense, pass_args=True)
+    router.add('do_edit_expense', _cb_do_edit_expense, pass_args=True)
+    router.add('quick_batch', quick_batch_handler, pass_args=True)
+    
+    # Daromadlar
+    router.add('cancel_income', _cb_cancel_income, pass_args=True)
+    router.add('edit_income', _cb_edit_income, pass_args=True)
+    router.add('confirm_del_income', _cb_confirm_del_income, pass_args=True)
+    router.add('do_edit_income', _cb_do_edit_income, pass_args=True)
+    
+    # Qarzlar (matn kiritish start conversation handler ichida)
+    router.add('debt_menu', debt_menu, exact=True, answer=False)
+    router.add('debt_add', add_debt_start, answer=False)
+    router.add('debt_list', list_debts, answer=False)
+    router.add('debt_view', view_debt_details, answer=False)
+    router.add('debt_statistics', debt_statistics, exact=True, answer=False)
+    router.add('debt_date', handle_debt_date_selection, answer=False)
+    router.add('debt_reminder', handle_debt_reminder_selection, answer=False)
+    router.add('debt_desc_skip', handle_debt_description_skip, exact=True, answer=False)
+    router.add('debt_save', handle_debt_save, exact=True, answer=False)
+    router.add('debt_cancel', handle_debt_cancel, exact=True, answer=False)
+    router.add('debt_paid_full', mark_debt_paid, answer=False)
+    router.add('debt_paid_partial', mark_debt_paid, answer=False)
+    router.add('debt_delete', delete_debt, answer=False)
+    
+    # Hisobotlar
+    router.add('report', report_type_handler, answer=False)
+    router.add('report_bot', report_bot_handler, answer=False)
+    router.add('report_html', report_html_handler, answer=False)
+    router.add('export', export_handler, answer=False)
+
+
+async def handle_callback(update: Update, context) -> None:
+    """
+    Global callback query handler - barcha inline button'larni qayta ishlaydi
     
-    elif callback_data == 'back_main' or callback_data == 'main_menu':
-        # Asosiy menyuga qaytish
-        await start_command(update, context)
+    callback_router orqali yo'naltiriladi (setup_callback_router).
     
-    else:
+    Args:
+        update: Telegram update
+        context: Callback context
+    """
+    if not await callback_router.dispatch(update, context):
         # Noma'lum callback - conversation handler ichida qayta ishlangan bo'lishi mumkin
-        # Faqat log qilamiz, xabar yubormimiz
-        logger.info(f"Callback '{callback_data}' handled by conversation handler or ignored")
-        # Query.answer() allaqachon yuqorida chaqirilgan, shuning uchun hech narsa qilmasimiz
+        # NOTE: lang_ callbacks are handled by start conversation handler
+        await update.callback_query.answer()
+        logger.info(f"Callback '{update.callback_query.data}' handled by conversation handler or ignored")
 
 
 # =====================================================
@@ -715,16 +780,8 @@ async def unknown_command_handler(update: Update, context) -> None:
     """
     user_lang = context.user_data.get('language', 'uz')
     
-    messages = {
-        'uz': "❌ Noma'lum buyruq. /start ni bosing.",
-        'ru': "❌ Неизвестная команда. Нажмите /start.",
-        'en': "❌ Unknown command. Press /start.",
-        'tr': "❌ Bilinmeyen komut. /start'a basın.",
-        'ar': "❌ أمر غير معروف. اضغط /start."
-    }
-    
     await update.message.reply_text(
-        messages.get(user_lang, messages['uz'])
+        get_text('unknown_command', user_lang)
     )
 
 
@@ -753,6 +810,7 @@ def main() -> None:
         application = (
             Application.builder()
             .token(BotConfig.TOKEN)
+            .concurrent_updates(ChatUpdateProcessor(BotConfig.CONCURRENT_UPDATES))
             .post_init(post_init)
             .post_shutdown(shutdown_handler)
             .build()
@@ -789,10 +847,31 @@ def main() -> None:
         sys.exit(1)
 
 
+# =====================================================
+# MAINTENANCE COMMANDS
+# =====================================================
+def rebuild_rollups_command() -> None:
+    """
+    Rollup jadvallarini (kunlik/oylik yig'indilar) qayta qurish
+    
+    Usage:
+        python main.py --rebuild-rollups
+    """
+    config_init()
+    db_manager = DatabaseManager()
+    asyncio.run(db_manager.create_tables())
+    result = db_manager.rebuild_rollups()
+    logger.info(f"Rollup backfill tugadi: {result}")
+
+
 # =====================================================
 # ENTRY POINT
 # =====================================================
 if __name__ == '__main__':
+    if '--rebuild-rollups' in sys.argv:
+        rebuild_rollups_command()
+        sys.exit(0)
+    
     try:
         main()
     except Exception as e:
@@ -9,6 +9,10 @@ Tables:
     - expenses: Xarajatlar
     - incomes: Daromadlar
     - reminders: Eslatmalar
+    - daily_user_category_totals: Kunlik xarajat yig'indilari (rollup)
+    - monthly_user_totals: Oylik xarajat/daromad yig'indilari (rollup)
+    - job_checkpoints: Davriy vazifalar holati
+    - user_category_tokens: Foydalanuvchi kategoriya klassifikatori hisoblagichlari
 
 Author: SmartWallet AI Team
 Version: 1.0.0
@@ -406,6 +410,8 @@ class Debt(Base):
         Index('idx_debt_status', 'status'),
         Index('idx_debt_due_date', 'due_date'),
         Index('idx_debt_created_at', 'created_at'),
+        Index('idx_debt_user_created', 'user_id', 'created_at'),
+        Index('idx_debt_status_due', 'status', 'due_date'),
     )
     
     def __repr__(self) -> str:
@@ -479,6 +485,190 @@ class Reminder(Base):
         return f"<Reminder(id={self.id}, user_id={self.user_id}, type={self.reminder_type}, is_sent={self.is_sent})>"
 
 
+# =====================================================
+# ROLLUP MODELS
+# =====================================================
+class DailyUserCategoryTotal(Base):
+    """
+    Kunlik xarajat yig'indilari (foydalanuvchi + kategoriya + kun)
+    
+    add_expense / delete_expense bilan bir tranzaksiyada yangilanadi.
+    
+    Attributes:
+        id: Primary key
+        user_id: Foydalanuvchi ID (FK)
+        category_id: Kategoriya ID (FK)
+        day: Kun
+        expense_total: Jami xarajat
+        expense_count: Xarajatlar soni
+    """
+    __tablename__ = 'daily_user_category_totals'
+    
+    # Primary Key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    
+    # Foreign Keys
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('users.telegram_id', ondelete='CASCADE'),
+        nullable=False
+    )
+    category_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey('categories.id', ondelete='SET NULL'),
+        nullable=True
+    )
+    
+    # Yig'indilar
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    expense_total: Mapped[Decimal] = mapped_column(Numeric(15, 2), default=Decimal('0'), nullable=False)
+    expense_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('user_id', 'category_id', 'day', name='uq_daily_user_category_day'),
+        Index('idx_daily_totals_user_day', 'user_id', 'day'),
+        Index('idx_daily_totals_day', 'day'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<DailyUserCategoryTotal(user_id={self.user_id}, category_id={self.category_id}, day={self.day}, total={self.expense_total})>"
+
+
+class MonthlyUserTotal(Base):
+    """
+    Oylik xarajat va daromad yig'indilari (foydalanuvchi + oy)
+    
+    add_expense / delete_expense / add_income / delete_income bilan
+    bir tranzaksiyada yangilanadi.
+    
+    Attributes:
+        id: Primary key
+        user_id: Foydalanuvchi ID (FK)
+        year: Yil
+        month: Oy (1-12)
+        expense_total: Jami xarajat
+        expense_count: Xarajatlar soni
+        income_total: Jami daromad
+        income_count: Daromadlar soni
+    """
+    __tablename__ = 'monthly_user_totals'
+    
+    # Primary Key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    
+    # Foreign Keys
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('users.telegram_id', ondelete='CASCADE'),
+        nullable=False
+    )
+    
+    # Davr
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    month: Mapped[int] = mapped_column(Integer, nullable=False)
+    
+    # Yig'indilar
+    expense_total: Mapped[Decimal] = mapped_column(Numeric(15, 2), default=Decimal('0'), nullable=False)
+    expense_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    income_total: Mapped[Decimal] = mapped_column(Numeric(15, 2), default=Decimal('0'), nullable=False)
+    income_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('user_id', 'year', 'month', name='uq_monthly_user_period'),
+        CheckConstraint('month BETWEEN 1 AND 12', name='check_monthly_month_range'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<MonthlyUserTotal(user_id={self.user_id}, {self.year}-{self.month:02d}, expense={self.expense_total}, income={self.income_total})>"
+
+
+# =====================================================
+# JOB CHECKPOINT MODEL
+# =====================================================
+class JobCheckpoint(Base):
+    """
+    Davriy vazifalar (kunlik/haftalik xulosa) holati
+    
+    Vazifa foydalanuvchilarni telegram_id tartibida qayta ishlaydi va har
+    bir bo'lakdan keyin oxirgi ID'ni saqlaydi - qayta ishga tushganda
+    shu joydan davom etadi.
+    
+    Attributes:
+        name: Vazifa nomi (primary key)
+        period_key: Davr kaliti (masalan, '2024-05-01')
+        last_user_id: Oxirgi qayta ishlangan foydalanuvchi
+        completed: Davr uchun tugallanganmi
+        updated_at: Yangilangan vaqt
+    """
+    __tablename__ = 'job_checkpoints'
+    
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    period_key: Mapped[str] = mapped_column(String(20), nullable=False)
+    last_user_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+    
+    def __repr__(self) -> str:
+        return f"<JobCheckpoint(name={self.name}, period={self.period_key}, last_user_id={self.last_user_id}, completed={self.completed})>"
+
+
+# =====================================================
+# CATEGORY CLASSIFIER MODEL
+# =====================================================
+class UserCategoryToken(Base):
+    """
+    Foydalanuvchining kategoriya klassifikatori uchun siyrak hisoblagichlar
+    
+    Har bir (foydalanuvchi, token, kategoriya) juftligi uchun bitta qator.
+    token = DOC_TOKEN ('') qatori shu kategoriyada saqlangan xarajatlar
+    sonini saqlaydi (naive Bayes prior).
+    
+    Attributes:
+        id: Primary key
+        user_id: Foydalanuvchi ID (FK)
+        category_id: Kategoriya ID (FK)
+        token: Xarajat matnidagi so'z
+        count: Necha marta uchragani
+    """
+    __tablename__ = 'user_category_tokens'
+    
+    # Hujjatlar (xarajatlar) sonini saqlovchi maxsus token
+    DOC_TOKEN = ''
+    
+    # Primary Key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    
+    # Foreign Keys
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('users.telegram_id', ondelete='CASCADE'),
+        nullable=False
+    )
+    category_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey('categories.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    
+    token: Mapped[str] = mapped_column(String(64), nullable=False)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    
+    # Constraints (user_id bilan boshlanadi - foydalanuvchi modelini yuklash uchun indeks)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'token', 'category_id', name='uq_user_category_token'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<UserCategoryToken(user_id={self.user_id}, token={self.token!r}, category_id={self.category_id}, count={self.count})>"
+
+
 # =====================================================
 # HELPER FUNCTIONS
 # =====================================================
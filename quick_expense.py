@@ -7,22 +7,28 @@ AQLLI FUNKSIYALAR:
 - "50000 ovqat" → Xarajatga qo'shiladi
 - "5000000 oylik" → DAROMADGA qo'shiladi (avtomatik!)
 - "3000000 maosh" → DAROMADGA qo'shiladi (avtomatik!)
+- "non 5000\ngo'sht 80000\ntaksi 20000" → bitta tasdiqlash, bitta tranzaksiya
 
 Author: SmartWallet AI Team
 Version: 3.0.0 - SMART AUTO-DETECTION
 """
 
+import html
 import logging
-import re
 from datetime import datetime
 from decimal import Decimal
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 
-from database.db_manager import DatabaseManager
-from keyboards.inline import get_edit_cancel_keyboard
-from utils.ai_parser import parse_expense_text
+from config import Categories, DatabaseConfig
+from database.db_manager import WriteBehindQueue, get_async_db_manager, category_registry
+from keyboards.inline import get_edit_cancel_keyboard, get_yes_no_keyboard
+from utils.ai_parser import (
+    parse_expense_text, parse_expense_items, extract_amount, tokenize, lookup_keyword,
+    ParseCache, TypoIndex, TOKEN_WORD
+)
+from utils.classifier import category_classifier
 from utils.translations import get_text, get_category_name, format_currency, format_date
 from utils.validators import validate_amount
 
@@ -30,7 +36,7 @@ from utils.validators import validate_amount
 logger = logging.getLogger(__name__)
 
 # Database manager
-db_manager = DatabaseManager()
+db_manager = get_async_db_manager()
 
 # State import
 from states.user_states import MAIN_MENU
@@ -39,22 +45,27 @@ from states.user_states import MAIN_MENU
 # =====================================================
 # DAROMAD KALIT SO'ZLARI (INCOME KEYWORDS)
 # =====================================================
-INCOME_KEYWORDS = {
-    'uz': ['oylik', 'maosh', 'ish haqi', 'daromad', 'kirim', 'oldi', 'bonus', 
-           'freelance', 'freelans', 'mukofot', 'stipendiya', 'pension',
-           'ustama', 'grant', 'investitsiya', 'foyda', 'daromat'],
-    'ru': ['зарплата', 'оклад', 'доход', 'получил', 'бонус', 'фриланс',
-           'премия', 'стипендия', 'пенсия', 'надбавка', 'грант',
-           'инвестиция', 'прибыль'],
-    'en': ['salary', 'wage', 'income', 'received', 'bonus', 'freelance',
-           'reward', 'scholarship', 'pension', 'allowance', 'grant',
-           'investment', 'profit']
-}
+# config'da - ai_parser ham ularni kategoriya typo fallback'idan chiqaradi
+INCOME_KEYWORDS = Categories.INCOME_KEYWORDS
+
+# Shu so'zlar bilan kelgan daromad turi 'salary', qolganlari 'other'
+SALARY_KEYWORDS = frozenset(['oylik', 'maosh', 'зарплата', 'salary'])
+
+# Bitta xabarda qabul qilinadigan maksimal bandlar soni (chek)
+MAX_BATCH_ITEMS = 50
+
+# Xato yozilgan daromad so'zlari uchun indeks ("oylk" -> "oylik")
+_income_typo_index = TypoIndex(
+    keyword for lang_keywords in INCOME_KEYWORDS.values() for keyword in lang_keywords
+)
+
+# detect_income_keyword natijalari (normallashgan matn bo'yicha)
+_income_keyword_cache = ParseCache('income')
 
 
 def detect_income_keyword(text: str) -> tuple[bool, str]:
     """
-    Matnda daromad kalit so'zini topish
+    Matnda daromad kalit so'zini topish (natija keshlanadi)
     
     Args:
         text: Tekshiriladigan matn
@@ -62,21 +73,47 @@ def detect_income_keyword(text: str) -> tuple[bool, str]:
     Returns:
         tuple: (topildi_mi, topilgan_so'z)
     """
-    text_lower = text.lower()
+    text_lower = ParseCache.key(text)
+    cached = _income_keyword_cache.get(text_lower)
+    if cached is not None:
+        return cached
     
     # Barcha tillardagi kalit so'zlarni tekshirish
-    for lang_keywords in INCOME_KEYWORDS.values():
-        for keyword in lang_keywords:
-            if keyword in text_lower:
-                logger.info(f"💰 DAROMAD SO'ZI TOPILDI: '{keyword}'")
-                return True, keyword
+    result = next(
+        (
+            (True, keyword)
+            for lang_keywords in INCOME_KEYWORDS.values()
+            for keyword in lang_keywords
+            if keyword in text_lower
+        ),
+        (False, "")
+    )
     
-    return False, ""
+    # Xato yozilgan kalit so'z - xarajat kalit so'ziga teng yoki undan
+    # yaqinroq bo'lsa daromad hisoblanmaydi ("kiyim" ≠ "kirim")
+    if not result[0]:
+        for token in tokenize(text_lower):
+            if token.kind != TOKEN_WORD:
+                continue
+            match = _income_typo_index.lookup(token.text)
+            if match is None:
+                continue
+            category_match = lookup_keyword(token.text)
+            if category_match is not None and category_match[2] <= match[1]:
+                continue
+            result = (True, match[0])
+            break
+    
+    if result[0]:
+        logger.info(f"💰 DAROMAD SO'ZI TOPILDI: '{result[1]}'")
+    
+    _income_keyword_cache.set(text_lower, result)
+    return result
 
 
 def extract_amount_from_text(text: str) -> Decimal:
     """
-    Matndan summa ajratib olish
+    Matndan summa ajratib olish (ai_parser lekseri orqali)
     
     Args:
         text: Matn
@@ -84,24 +121,7 @@ def extract_amount_from_text(text: str) -> Decimal:
     Returns:
         Decimal: Summa yoki None
     """
-    # Raqamlarni qidirish
-    patterns = [
-        r'(\d+[\s,]?\d*)\s*so[\'m]?',  # 50000 so'm
-        r'(\d+[\s,]?\d*)\s*UZS',        # 50000 UZS
-        r'(\d{1,3}(?:[\s,]\d{3})+)',    # 50 000 yoki 50,000
-        r'(\d+)',                        # Oddiy raqam
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            amount_str = match.group(1).replace(' ', '').replace(',', '')
-            try:
-                return Decimal(amount_str)
-            except:
-                continue
-    
-    return None
+    return extract_amount(text)
 
 
 def extract_source_from_text(text: str, found_keyword: str) -> str:
@@ -148,6 +168,13 @@ async def quick_expense_handler(update: Update, context: ContextTypes.DEFAULT_TY
     
     telegram_id = context.user_data.get('telegram_id')
     
+    # =====================================================
+    # 0. KO'P BANDLI XABAR (chek) - kamida 2 ta summali band
+    # =====================================================
+    items = parse_expense_items(text)
+    if sum(1 for _, parsed in items if parsed['amount']) > 1:
+        return await _quick_batch_prepare(update, context, items)
+    
     # =====================================================
     # 1. DAROMAD TEKSHIRUVI
     # =====================================================
@@ -160,21 +187,7 @@ async def quick_expense_handler(update: Update, context: ContextTypes.DEFAULT_TY
         amount = extract_amount_from_text(text)
         
         if not amount or amount <= 0:
-            hint_texts = {
-                'uz': """ℹ️ Daromad summasi topilmadi!
-
-Iltimos, to'g'ri formatda yozing:
-📝 Masalan: "5000000 oylik" yoki "3000000 maosh"
-
-Yoki "💰 Daromad qo'shish" tugmasini bosing.""",
-                'ru': """ℹ️ Сумма дохода не найдена!
-
-Пожалуйста, напишите в правильном формате:
-📝 Например: "5000000 зарплата" или "3000000 оклад"
-
-Или нажмите "💰 Добавить доход".""",
-            }
-            await update.message.reply_text(hint_texts.get(user_language, hint_texts['uz']))
+            await update.message.reply_text(get_text('quick_income_no_amount', user_language))
             return MAIN_MENU
         
         # Manba aniqlash
@@ -184,42 +197,41 @@ Yoki "💰 Daromad qo'shish" tugmasini bosing.""",
         logger.info(f"💰 AVTOMATIK DAROMAD: user={telegram_id}, amount={amount}, source={source}")
         
         try:
-            income = db_manager.add_income(
-                telegram_id=telegram_id,
-                amount=amount,
-                source=source,
-                income_type='salary' if found_keyword in ['oylik', 'maosh', 'зарплата', 'salary'] else 'other',
-                income_date=datetime.now()
-            )
+            income_date = datetime.now()
+            income_type = 'salary' if found_keyword in SALARY_KEYWORDS else 'other'
             
-            if income:
-                logger.info(f"✅ DAROMAD SAQLANDI: id={income.id}, amount={income.amount}")
-                
-                success_texts = {
-                    'uz': f"""✅ <b>DAROMAD QO'SHILDI!</b>
-
-💰 Summa: {amount:,.0f} so'm
-📝 Manba: {source}
-📅 Sana: {income.income_date.strftime('%d.%m.%Y %H:%M')}
-
-✅ Bu summa umumiy DAROMADINGIZGA qo'shildi!
-
-💡 <i>Keyingi safar ham shunday yozing va avtomatik qo'shiladi!</i>""",
-                    'ru': f"""✅ <b>ДОХОД ДОБАВЛЕН!</b>
-
-💰 Сумма: {amount:,.0f} сум
-📝 Источник: {source}
-📅 Дата: {income.income_date.strftime('%d.%m.%Y %H:%M')}
-
-✅ Эта сумма добавлена к вашему общему ДОХОДУ!
-
-💡 <i>В следующий раз пишите также и будет добавлено автоматически!</i>""",
-                }
+            if DatabaseConfig.WRITE_BEHIND:
+                # Batch bilan yoziladi - ID flush'dan keyin keladi
+                future = await WriteBehindQueue().submit_income(
+                    telegram_id=telegram_id,
+                    amount=amount,
+                    source=source,
+                    income_type=income_type,
+                    income_date=income_date
+                )
+                income_id = await future
+            else:
+                income = await db_manager.add_income(
+                    telegram_id=telegram_id,
+                    amount=amount,
+                    source=source,
+                    income_type=income_type,
+                    income_date=income_date
+                )
+                income_id = income.id if income else None
+            
+            if income_id:
+                logger.info(f"✅ DAROMAD SAQLANDI: id={income_id}, amount={amount}")
                 
-                success_msg = success_texts.get(user_language, success_texts['uz'])
+                success_msg = get_text(
+                    'quick_income_added', user_language,
+                    amount=amount,
+                    source=source,
+                    date=income_date.strftime('%d.%m.%Y %H:%M')
+                )
                 
                 # BEKOR QILISH VA TAHRIRLASH TUGMALARI
-                keyboard = get_edit_cancel_keyboard(user_language, 'income', income.id)
+                keyboard = get_edit_cancel_keyboard(user_language, 'income', income_id)
                 
                 await update.message.reply_text(
                     success_msg,
@@ -228,11 +240,11 @@ Yoki "💰 Daromad qo'shish" tugmasini bosing.""",
                 )
             else:
                 logger.error(f"❌ DAROMAD SAQLANMADI: user={telegram_id}")
-                await update.message.reply_text("❌ Xatolik yuz berdi")
+                await update.message.reply_text(get_text('error_short', user_language))
                 
         except Exception as e:
             logger.error(f"Daromad qo'shishda xato: {e}", exc_info=True)
-            await update.message.reply_text("❌ Xatolik yuz berdi")
+            await update.message.reply_text(get_text('error_short', user_language))
         
         return MAIN_MENU
     
@@ -240,8 +252,8 @@ Yoki "💰 Daromad qo'shish" tugmasini bosing.""",
     # 2. XARAJAT QISMI (agar daromad emas bo'lsa)
     # =====================================================
     
-    # AI parser bilan tahlil qilish
-    parsed = parse_expense_text(text)
+    # AI parser bilan tahlil qilish (kalit so'z topilmasa shaxsiy model to'ldiradi)
+    parsed = await category_classifier.apply(telegram_id, text, parse_expense_text(text))
     
     # Agar summa va kategoriya topilmasa, oddiy xabar deb qaytarish
     if not parsed['amount'] or not parsed['category_key']:
@@ -263,46 +275,50 @@ Yoki "💰 Daromad qo'shish" tugmasini bosing.""",
     logger.info(f"💸 AVTOMATIK XARAJAT: user={telegram_id}, amount={amount}, category={category_key}")
     
     try:
-        expense = db_manager.add_expense(
-            telegram_id=telegram_id,
-            amount=amount,
-            category_key=category_key,
-            description=description,
-            expense_date=datetime.now()
-        )
+        expense_date = datetime.now()
+        
+        if DatabaseConfig.WRITE_BEHIND:
+            # Batch bilan yoziladi - ID flush'dan keyin keladi
+            future = await WriteBehindQueue().submit_expense(
+                telegram_id=telegram_id,
+                amount=amount,
+                category_key=category_key,
+                description=description,
+                expense_date=expense_date
+            )
+            expense_id = await future
+        else:
+            expense = await db_manager.add_expense(
+                telegram_id=telegram_id,
+                amount=amount,
+                category_key=category_key,
+                description=description,
+                expense_date=expense_date
+            )
+            expense_id = expense.id if expense else None
         
-        if expense:
-            logger.info(f"✅ XARAJAT SAQLANDI: id={expense.id}, amount={expense.amount}")
+        if expense_id:
+            logger.info(f"✅ XARAJAT SAQLANDI: id={expense_id}, amount={amount}")
+            if category_classifier.is_learnable(parsed):
+                await category_classifier.learn(telegram_id, text, category_key, expense_id)
             
             # Kategoriya ma'lumotlari
             category_name = get_category_name(category_key, user_language)
-            category_obj = db_manager.get_category_by_key(category_key)
+            category_obj = category_registry.get(category_key)
             category_icon = category_obj.icon if category_obj else '📂'
             
             # Muvaffaqiyat xabari
-            success_messages = {
-                'uz': f"""✅ <b>XARAJAT QO'SHILDI!</b>
-
-{category_icon} Kategoriya: {category_name}
-💸 Summa: {format_currency(amount, user_language)}
-📝 Tavsif: {description if description else '-'}
-📅 Sana: {expense.expense_date.strftime('%d.%m.%Y %H:%M')}
-
-✅ Bu summa umumiy XARAJATLARINGIZGA qo'shildi.""",
-                'ru': f"""✅ <b>РАСХОД ДОБАВЛЕН!</b>
-
-{category_icon} Категория: {category_name}
-💸 Сумма: {format_currency(amount, user_language)}
-📝 Описание: {description if description else '-'}
-📅 Дата: {expense.expense_date.strftime('%d.%m.%Y %H:%M')}
-
-✅ Эта сумма добавлена к вашим общим РАСХОДАМ.""",
-            }
-            
-            success_msg = success_messages.get(user_language, success_messages['uz'])
+            success_msg = get_text(
+                'quick_expense_added', user_language,
+                icon=category_icon,
+                category=category_name,
+                amount=format_currency(amount, user_language),
+                description=description if description else '-',
+                date=expense_date.strftime('%d.%m.%Y %H:%M')
+            )
             
             # BEKOR QILISH VA TAHRIRLASH TUGMALARI
-            keyboard = get_edit_cancel_keyboard(user_language, 'expense', expense.id)
+            keyboard = get_edit_cancel_keyboard(user_language, 'expense', expense_id)
             
             await update.message.reply_text(
                 success_msg,
@@ -319,6 +335,154 @@ Yoki "💰 Daromad qo'shish" tugmasini bosing.""",
     return MAIN_MENU
 
 
+# =====================================================
+# MULTI-ITEM (RECEIPT) ENTRY
+# =====================================================
+async def _quick_batch_prepare(update: Update, context: ContextTypes.DEFAULT_TYPE, items: list) -> int:
+    """
+    Ko'p bandli xabar: har bir bandni tasniflash va bitta tasdiqlash ko'rsatish
+    
+    Tayyorlangan yozuvlar context.user_data['quick_batch'] da saqlanadi va
+    quick_batch_handler ularni bitta bulk_add tranzaksiyasida yozadi.
+    
+    Args:
+        update: Telegram update
+        context: Callback context
+        items: parse_expense_items() natijasi
+        
+    Returns:
+        int: MAIN_MENU state
+    """
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
+    
+    if len(items) > MAX_BATCH_ITEMS:
+        await update.message.reply_text(
+            get_text('quick_batch_too_many', user_language, limit=MAX_BATCH_ITEMS)
+        )
+        return MAIN_MENU
+    
+    expenses = []
+    incomes = []
+    lines = []
+    texts = []
+    skipped = []
+    
+    for item_text, parsed in items:
+        is_valid, amount, _ = validate_amount(parsed['amount']) if parsed['amount'] else (False, None, None)
+        if not is_valid:
+            skipped.append(item_text)
+            continue
+        
+        is_income, found_keyword = detect_income_keyword(item_text)
+        if is_income:
+            source = extract_source_from_text(item_text, found_keyword)
+            incomes.append({
+                'amount': amount,
+                'source': source,
+                'income_type': 'salary' if found_keyword in SALARY_KEYWORDS else 'other'
+            })
+            lines.append(f"💰 {html.escape(source)} — {format_currency(amount, user_language)}")
+            continue
+        
+        parsed = await category_classifier.apply(telegram_id, item_text, parsed)
+        category_key = parsed['category_key']
+        category_obj = category_registry.get(category_key)
+        expenses.append({
+            'amount': amount,
+            'category_key': category_key,
+            'description': parsed['description']
+        })
+        # Faqat kalit so'z bilan topilgan kategoriyadan o'rganiladi
+        texts.append(item_text if category_classifier.is_learnable(parsed) else None)
+        lines.append(
+            f"{category_obj.icon if category_obj else '📂'} "
+            f"{get_category_name(category_key, user_language)} — {format_currency(amount, user_language)}"
+            + (f" <i>({html.escape(parsed['description'])})</i>" if parsed['description'] else '')
+        )
+    
+    context.user_data['quick_batch'] = {'expenses': expenses, 'incomes': incomes, 'texts': texts}
+    
+    message = get_text(
+        'quick_batch_confirm',
+        user_language,
+        count=len(lines),
+        items='\n'.join(lines),
+        expense=format_currency(sum(item['amount'] for item in expenses), user_language),
+        income=format_currency(sum(item['amount'] for item in incomes), user_language)
+    )
+    if skipped:
+        message += '\n\n' + get_text(
+            'quick_batch_skipped', user_language,
+            lines=', '.join(html.escape(line) for line in skipped)
+        )
+    
+    keyboard = get_yes_no_keyboard(
+        language=user_language,
+        yes_callback='quick_batch_save',
+        no_callback='quick_batch_cancel'
+    )
+    await update.message.reply_text(message, reply_markup=keyboard, parse_mode='HTML')
+    
+    logger.info(f"🧾 CHEK: user={telegram_id}, {len(expenses)} xarajat, {len(incomes)} daromad, {len(skipped)} o'tkazildi")
+    return MAIN_MENU
+
+
+async def quick_batch_handler(update: Update, context: ContextTypes.DEFAULT_TYPE, args: list) -> None:
+    """
+    Ko'p bandli yozuvlarni saqlash (quick_batch_save) yoki bekor qilish
+    (quick_batch_cancel) - barcha yozuvlar bitta tranzaksiyada
+    
+    Args:
+        update: Telegram update
+        context: Callback context
+        args: ['save'] yoki ['cancel']
+    """
+    query = update.callback_query
+    user_language = context.user_data.get('language', 'uz')
+    batch = context.user_data.pop('quick_batch', None)
+    
+    if args[:1] == ['cancel']:
+        await query.edit_message_text(get_text('process_cancelled', user_language))
+        return
+    
+    if batch is None:
+        await query.edit_message_text(get_text('quick_batch_expired', user_language))
+        return
+    
+    telegram_id = context.user_data.get('telegram_id')
+    now = datetime.now()
+    
+    try:
+        expense_ids, income_ids = await db_manager.bulk_add(
+            expenses=[dict(item, telegram_id=telegram_id, expense_date=now) for item in batch['expenses']],
+            incomes=[dict(item, telegram_id=telegram_id, income_date=now) for item in batch['incomes']]
+        )
+    except Exception as e:
+        logger.error(f"Chekni saqlashda xato: {e}", exc_info=True)
+        await query.edit_message_text(get_text('error_occurred', user_language))
+        return
+    
+    saved_expenses = [item for item, new_id in zip(batch['expenses'], expense_ids) if new_id]
+    await category_classifier.learn_many(telegram_id, [
+        (item_text, item['category_key'], new_id)
+        for item, item_text, new_id in zip(batch['expenses'], batch['texts'], expense_ids)
+        if new_id and item_text
+    ])
+    
+    await query.edit_message_text(
+        get_text(
+            'quick_batch_saved',
+            user_language,
+            count=len(saved_expenses) + len(income_ids),
+            expense=format_currency(sum(item['amount'] for item in saved_expenses), user_language),
+            income=format_currency(sum(item['amount'] for item in batch['incomes']), user_language)
+        ),
+        parse_mode='HTML'
+    )
+    logger.info(f"✅ CHEK SAQLANDI: user={telegram_id}, {len(saved_expenses)} xarajat, {len(income_ids)} daromad")
+
+
 # =====================================================
 # DELETE EXPENSE HANDLER
 # =====================================================
@@ -336,19 +500,10 @@ async def delete_quick_expense_handler(update: Update, context: ContextTypes.DEF
     expense_id = int(query.data.replace('delete_expense_', ''))
     
     # O'chirish
-    success = db_manager.delete_expense(expense_id, telegram_id)
+    success = await db_manager.delete_expense(expense_id, telegram_id)
     
     if success:
-        delete_messages = {
-            'uz': '✅ Xarajat o\'chirildi',
-            'ru': '✅ Расход удалён',
-            'en': '✅ Expense deleted'
-        }
-        await query.edit_message_text(delete_messages.get(user_language, delete_messages['uz']))
+        await category_classifier.forget(telegram_id, expense_id)
+        await query.edit_message_text(get_text('quick_expense_deleted', user_language))
     else:
-        error_messages = {
-            'uz': '❌ Xatolik yuz berdi',
-            'ru': '❌ Произошла ошибка',
-            'en': '❌ An error occurred'
-        }
-        await query.edit_message_text(error_messages.get(user_language, error_messages['uz']))
+        await query.edit_message_text(get_text('error_short', user_language))
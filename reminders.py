@@ -1,58 +1,350 @@
 """
-SmartWallet AI Bot - Reminders (DISABLED)
-==========================================
-Reminders o'chirilgan - qarz tizimi to'siqsiz ishlashi uchun
+SmartWallet AI Bot - Reminders
+==============================
+Eslatmalar scheduler'i va muddati o'tgan qarzlarni yangilash
+
+Classes:
+    - ReminderScheduler: Eslatmalarni vaqtida yuborish (min-heap navbat)
+    - OverdueSweeper: Muddati o'tgan qarzlarni davriy yangilash
 
 Author: SmartWallet AI Team
-Version: 2.0.0 - REMINDERS DISABLED
+Version: 2.1.0
 """
 
+import asyncio
+import heapq
+import html
 import logging
 from datetime import datetime, timedelta, date
-from typing import Optional
+from typing import Optional, Callable, Awaitable, List, Tuple, Set, Dict, Any
 
 from telegram import Bot
-from database.db_manager import DatabaseManager
+from telegram.error import Forbidden, BadRequest
+from config import SchedulerConfig
+from database.db_manager import (
+    get_async_db_manager, add_reminder_listener, remove_reminder_listener
+)
+from utils.translations import get_text
 
 logger = logging.getLogger(__name__)
 
 
 # =====================================================
-# REMINDER SCHEDULER CLASS (DISABLED)
+# REMINDER SCHEDULER CLASS
 # =====================================================
+# Heap elementi: (reminder_date, reminder_id, user_id, reminder_type, message)
+ReminderEntry = Tuple[datetime, int, int, str, Optional[str]]
+
+
 class ReminderScheduler:
     """
-    Reminders o'chirilgan - qarz tizimi to'siqsiz ishlashi uchun
+    Eslatmalarni vaqtida yuboruvchi scheduler
+    
+    - Yaqin eslatmalar xotiradagi min-heap'da (reminder_date bo'yicha)
+    - Bazadan idx_reminder_sent indeksi bo'yicha bo'laklab (keyset) yuklanadi:
+      faqat joriy oyna (hozir + REMINDER_CHECK_INTERVAL) ichidagilar
+    - Keyingi eslatma vaqtigacha uxlaydi; yangi eslatma qo'shilsa
+      (add_reminder hook'i) darhol uyg'onadi
+    - Yuborilganlar bitta UPDATE bilan belgilanadi
+    
+    Oyna tugaganda bazadan qayta yuklanadi - shu bilan boshqa jarayon
+    qo'shgan yoki yuborilmay qolgan eslatmalar ham olinadi. Yuborilmagan
+    eslatma REMINDER_MAX_ATTEMPTS ta oynadan keyin (Forbidden/BadRequest
+    bo'lsa darhol) yuborilgan deb belgilanadi - abadiy qayta yuborilmaydi.
     """
     
-    def __init__(self, bot: Bot):
+    def __init__(
+        self,
+        bot: Bot,
+        send: Optional[Callable[..., Awaitable[Any]]] = None,
+        window: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ):
+        """
+        Args:
+            bot: Telegram bot
+            send: Xabar yuborish funksiyasi (chat_id, text, **kwargs) -
+                odatda MessageDispatcher.send; default bot.send_message
+            window: Yuklash oynasi (soniya), default REMINDER_CHECK_INTERVAL
+            batch_size: Bir martada yuklanadigan eslatmalar soni
+        """
         self.bot = bot
-        logger.info("ReminderScheduler o'chirilgan (disabled)")
+        self.send = send or self._send_via_bot
+        self.window = window or SchedulerConfig.REMINDER_CHECK_INTERVAL
+        self.batch_size = batch_size or SchedulerConfig.REMINDER_BATCH_SIZE
+        
+        self._heap: List[ReminderEntry] = []
+        self._known: Set[int] = set()
+        self._failures: Dict[int, int] = {}
+        self._cursor: Optional[Tuple[datetime, int]] = None
+        self._exhausted = False
+        self._window_end = datetime.min
+        
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    # ---------- Lifecycle ----------
     
     def start(self):
-        """Scheduler ishga tushmaydi"""
-        logger.info("ReminderScheduler start() - o'chirilgan")
-        pass
+        """Scheduler'ni event loop'da ishga tushirish"""
+        if self._task is not None:
+            return
+        
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        add_reminder_listener(self._on_reminder_added)
+        self._task = self._loop.create_task(self._run())
+        logger.info("ReminderScheduler ishga tushdi")
+    
+    async def stop(self):
+        """Scheduler'ni to'xtatish"""
+        remove_reminder_listener(self._on_reminder_added)
+        
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("ReminderScheduler to'xtatildi")
+    
+    # ---------- Notification hook ----------
+    
+    def _on_reminder_added(self, reminder) -> None:
+        """
+        add_reminder() hook'i - boshqa thread'dan ham chaqirilishi mumkin
+        """
+        if self._loop is None or self._loop.is_closed():
+            return
+        
+        entry = self._to_entry(reminder)
+        self._loop.call_soon_threadsafe(self._push_new, entry)
+    
+    def _push_new(self, entry: ReminderEntry) -> None:
+        """Yangi eslatmani heap'ga qo'shish (faqat joriy oyna ichida bo'lsa)"""
+        # Oynadan keyingilari keyingi yuklashda olinadi
+        if entry[1] in self._known or entry[0] > self._window_end:
+            return
+        
+        self._push(entry)
+        self._wakeup.set()
+    
+    # ---------- Heap ----------
+    
+    @staticmethod
+    def _to_entry(reminder) -> ReminderEntry:
+        return (
+            reminder.reminder_date,
+            reminder.id,
+            reminder.user_id,
+            reminder.reminder_type,
+            reminder.message
+        )
+    
+    def _push(self, entry: ReminderEntry) -> None:
+        heapq.heappush(self._heap, entry)
+        self._known.add(entry[1])
+    
+    async def _refill(self) -> None:
+        """Joriy oynadan keyingi bo'lakni yuklash"""
+        db_manager = get_async_db_manager()
+        reminders = await db_manager.get_upcoming_reminders(
+            until=self._window_end,
+            after=self._cursor,
+            limit=self.batch_size
+        )
+        
+        for reminder in reminders:
+            if reminder.id not in self._known:
+                self._push(self._to_entry(reminder))
+        
+        if reminders:
+            last = reminders[-1]
+            self._cursor = (last.reminder_date, last.id)
+        self._exhausted = len(reminders) < self.batch_size
+    
+    async def _new_window(self, now: datetime) -> None:
+        """Yangi oyna - bazadan boshidan yuklash"""
+        self._window_end = now + timedelta(seconds=self.window)
+        self._cursor = None
+        self._exhausted = False
+        await self._refill()
     
-    def stop(self):
-        """Scheduler to'xtamaydi"""
-        logger.info("ReminderScheduler stop() - o'chirilgan")
-        pass
+    # ---------- Main loop ----------
+    
+    async def _run(self):
+        """Asosiy sikl"""
+        while True:
+            try:
+                self._wakeup.clear()
+                now = datetime.now()
+                
+                if now >= self._window_end:
+                    await self._new_window(now)
+                elif not self._exhausted and len(self._heap) < self.batch_size // 2:
+                    await self._refill()
+                
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap))
+                
+                if due:
+                    await self._deliver(due)
+                    continue
+                
+                await self._sleep(now)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"ReminderScheduler xatosi: {e}")
+                await asyncio.sleep(1)
+    
+    async def _sleep(self, now: datetime) -> None:
+        """Keyingi eslatma (yoki oyna oxiri) gacha uxlash"""
+        next_time = self._window_end
+        if self._heap and self._heap[0][0] < next_time:
+            next_time = self._heap[0][0]
+        
+        timeout = max(0.0, (next_time - now).total_seconds())
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def _deliver(self, due: List[ReminderEntry]) -> None:
+        """
+        Eslatmalarni parallel yuborish va bitta UPDATE bilan belgilash
+        
+        Tezlik cheklovi send hook'ida (MessageDispatcher) - bu yerda hammasi
+        birdaniga navbatga qo'yiladi.
+        """
+        db_manager = get_async_db_manager()
+        results = await asyncio.gather(*(self._send_entry(entry) for entry in due))
+        sent_ids = [entry[1] for entry, ok in zip(due, results) if ok]
+        
+        # Yuborilmaganlar keyingi oynada qayta uriniladi - chegaragacha
+        dropped_ids = []
+        for entry, ok in zip(due, results):
+            reminder_id = entry[1]
+            if ok:
+                self._failures.pop(reminder_id, None)
+                continue
+            attempts = self._failures.get(reminder_id, 0) + 1
+            if ok is None or attempts >= SchedulerConfig.REMINDER_MAX_ATTEMPTS:
+                self._failures.pop(reminder_id, None)
+                dropped_ids.append(reminder_id)
+            else:
+                self._failures[reminder_id] = attempts
+        
+        await db_manager.mark_reminders_sent(sent_ids + dropped_ids)
+        self._known.difference_update(entry[1] for entry in due)
+        logger.info(f"Eslatmalar yuborildi: {len(sent_ids)}/{len(due)}")
+        if dropped_ids:
+            logger.warning(f"Eslatmalar yuborib bo'lmadi va bekor qilindi: {dropped_ids}")
+    
+    async def _send_entry(self, entry: ReminderEntry) -> Optional[bool]:
+        """
+        Bitta eslatmani yuborish
+        
+        Returns:
+            Optional[bool]: True - yuborildi, False - keyinroq qayta urinish,
+                None - doimiy xato (bot bloklangan, chat topilmadi)
+        """
+        reminder_date, reminder_id, user_id, reminder_type, message = entry
+        try:
+            db_manager = get_async_db_manager()
+            language = await db_manager.get_user_language(user_id)
+            text = get_text(
+                'reminder_message', language,
+                message=html.escape(message or '')
+            )
+            # send hook False qaytarsa (dead-letter) - yuborilmagan
+            return await self.send(user_id, text, parse_mode='HTML') is not False
+        except (Forbidden, BadRequest) as e:
+            logger.error(f"Eslatma yuborib bo'lmaydi ({reminder_id}): {e}")
+            return None
+        except Exception as e:
+            # Yuborilmagan eslatma keyingi oynada qayta yuklanadi
+            logger.error(f"Eslatma yuborishda xato ({reminder_id}): {e}")
+            return False
+    
+    async def _send_via_bot(self, chat_id: int, text: str, **kwargs) -> None:
+        await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+
 
 # =====================================================
-# HELPER FUNCTIONS (DISABLED)
+# OVERDUE DEBT SWEEPER
 # =====================================================
-# Qarzlar tizimi o'chirilgani uchun bu funksiya ishlamaydi
+class OverdueSweeper:
+    """
+    Muddati o'tgan qarzlarni davriy ravishda 'overdue' holatiga o'tkazish
+    
+    sweep_overdue_debts() ni SchedulerConfig.OVERDUE_SWEEP_INTERVAL da bir
+    marta chaqiradi. on_chunk har bir yangilangan bo'lak uchun
+    (debt_id, user_id) ro'yxati bilan chaqiriladi.
+    """
+    
+    def __init__(
+        self,
+        interval: Optional[int] = None,
+        on_chunk: Optional[Callable[[List[Tuple[int, int]]], Any]] = None
+    ):
+        self.interval = interval or SchedulerConfig.OVERDUE_SWEEP_INTERVAL
+        self.on_chunk = on_chunk
+        self._task: Optional[asyncio.Task] = None
+    
+    async def run_once(self) -> int:
+        """
+        Bitta sweep
+        
+        Returns:
+            int: Yangilangan qarzlar soni
+        """
+        db_manager = get_async_db_manager()
+        return await db_manager.sweep_overdue_debts(on_chunk=self.on_chunk)
+    
+    async def _run(self):
+        """Asosiy sikl - xato bo'lsa keyingi intervalda qayta urinadi"""
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Overdue sweep xatosi: {e}")
+            await asyncio.sleep(self.interval)
+    
+    def start(self):
+        """Sweep siklini event loop'da ishga tushirish"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"OverdueSweeper ishga tushdi (har {self.interval}s)")
+    
+    async def stop(self):
+        """Siklni to'xtatish"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("OverdueSweeper to'xtatildi")
 
 
+# =====================================================
+# HELPER FUNCTIONS
+# =====================================================
 def get_scheduler_instance(bot: Bot) -> ReminderScheduler:
     """
-    Scheduler instance'ni olish (o'chirilgan)
+    Scheduler instance'ni olish
     
     Args:
         bot: Telegram bot
         
     Returns:
-        ReminderScheduler: Scheduler instance (o'chirilgan)
+        ReminderScheduler: Scheduler instance
     """
     return ReminderScheduler(bot)
@@ -7,13 +7,15 @@ Author: SmartWallet AI Team
 Version: 7.0.0 - HTML Edition with Demo Design
 """
 
+import asyncio
+import functools
 import logging
 from datetime import datetime
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 
-from database.db_manager import DatabaseManager
-from keyboards.inline import get_report_type_keyboard, get_report_format_choice_keyboard
+from database.db_manager import DatabaseManager, get_async_db_manager
+from keyboards.inline import get_report_type_keyboard, get_report_format_choice_keyboard, get_export_format_keyboard
 from utils.translations import get_text
 from utils.filters import (
     get_today_range, 
@@ -23,35 +25,37 @@ from utils.filters import (
     get_last_n_days_range
 )
 from reports.html_generator import generate_html_report
-from config import Categories
+from reports.export_generator import build_export, EXPORT_FORMATS, EXCEL_AVAILABLE
+from config import Categories, ReportConfig
 
 logger = logging.getLogger(__name__)
-db_manager = DatabaseManager()
+db_manager = get_async_db_manager()
+
+# HTML fayl nomidagi hisobot nomi (faqat uz/en, qolganlar 'Report')
+_REPORT_FILE_NAMES = {
+    'daily': {'uz': 'Kunlik', 'en': 'Daily'},
+    'three_days': {'uz': '3kunlik', 'en': '3days'},
+    'weekly': {'uz': 'Haftalik', 'en': 'Weekly'},
+    'monthly': {'uz': 'Oylik', 'en': 'Monthly'},
+    'yearly': {'uz': 'Yillik', 'en': 'Yearly'}
+}
 
 
 async def reports_menu_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Hisobotlar menyusini ko'rsatish"""
     user_language = context.user_data.get('language', 'uz')
     
-    menu_text = {
-        'uz': '📊 <b>Hisobotlar</b>\n\nKerakli hisobot turini tanlang:',
-        'ru': '📊 <b>Отчёты</b>\n\nВыберите тип отчёта:',
-        'en': '📊 <b>Reports</b>\n\nSelect report type:',
-        'tr': '📊 <b>Raporlar</b>\n\nRapor türünü seçin:',
-        'ar': '📊 <b>التقارير</b>\n\nاختر نوع التقرير:'
-    }
-    
     keyboard = get_report_type_keyboard(user_language)
     
     if update.callback_query:
         await update.callback_query.edit_message_text(
-            menu_text.get(user_language, menu_text['uz']),
+            get_text('reports_menu', user_language),
             reply_markup=keyboard,
             parse_mode='HTML'
         )
     else:
         await update.message.reply_text(
-            menu_text.get(user_language, menu_text['uz']),
+            get_text('reports_menu', user_language),
             reply_markup=keyboard,
             parse_mode='HTML'
         )
@@ -65,19 +69,10 @@ async def report_type_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
     user_language = context.user_data.get('language', 'uz')
     report_type = query.data.replace('report_', '')
     
-    # Format tanlash so'rovi
-    format_texts = {
-        'uz': '📊 <b>Hisobot formatini tanlang:</b>\n\nQayerda ko\'rishni xohlaysiz?',
-        'ru': '📊 <b>Выберите формат отчёта:</b>\n\nГде хотите посмотреть?',
-        'en': '📊 <b>Select report format:</b>\n\nWhere do you want to view?',
-        'tr': '📊 <b>Rapor formatını seçin:</b>\n\nNerede görmek istiyorsunuz?',
-        'ar': '📊 <b>اختر صيغة التقرير:</b>\n\nأين تريد المشاهدة؟'
-    }
-    
     keyboard = get_report_format_choice_keyboard(user_language, report_type)
     
     await query.edit_message_text(
-        format_texts.get(user_language, format_texts['uz']),
+        get_text('report_format_prompt', user_language),
         reply_markup=keyboard,
         parse_mode='HTML'
     )
@@ -96,26 +91,27 @@ async def report_bot_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
     # Sana oralig'ini aniqlash
     if report_type == 'daily':
         start_date, end_date = get_today_range()
-        period_name = {'uz': 'Kunlik', 'ru': 'Ежедневный', 'en': 'Daily', 'tr': 'Günlük', 'ar': 'يومي'}
+        period_key = 'daily'
     elif report_type == 'three_days':
         start_date, end_date = get_last_n_days_range(3)
-        period_name = {'uz': '3 kunlik', 'ru': '3-дневный', 'en': '3-Day', 'tr': '3 Günlük', 'ar': '3 أيام'}
+        period_key = 'three_days'
     elif report_type == 'weekly':
         start_date, end_date = get_this_week_range()
-        period_name = {'uz': 'Haftalik', 'ru': 'Недельный', 'en': 'Weekly', 'tr': 'Haftalık', 'ar': 'أسبوعي'}
+        period_key = 'weekly'
     elif report_type == 'monthly':
         start_date, end_date = get_this_month_range()
-        period_name = {'uz': 'Oylik', 'ru': 'Месячный', 'en': 'Monthly', 'tr': 'Aylık', 'ar': 'شهري'}
+        period_key = 'monthly'
     elif report_type == 'yearly':
         start_date, end_date = get_this_year_range()
-        period_name = {'uz': 'Yillik', 'ru': 'Годовой', 'en': 'Yearly', 'tr': 'Yıllık', 'ar': 'سنوي'}
+        period_key = 'yearly'
     else:
         start_date, end_date = get_this_week_range()
-        period_name = {'uz': 'Haftalik', 'ru': 'Недельный', 'en': 'Weekly', 'tr': 'Haftalık', 'ar': 'أسبوعي'}
+        period_key = 'weekly'
     
-    # Ma'lumotlarni olish
-    expenses = db_manager.get_user_expenses(telegram_id, start_date, end_date)
-    incomes = db_manager.get_user_incomes(telegram_id, start_date, end_date)
+    # Ma'lumotlarni olish (bitta session - snapshot)
+    snapshot = await db_manager.get_report_snapshot(telegram_id, start_date, end_date, top_n=5)
+    expenses = snapshot['expenses']
+    incomes = snapshot['incomes']
     
     if not expenses and not incomes:
         no_data_msg = get_text('no_data_for_report', user_language)
@@ -123,13 +119,13 @@ async def report_bot_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     # Ma'lumotlarni hisoblash
-    total_expense = db_manager.get_total_expenses(telegram_id, start_date, end_date)
-    total_income = db_manager.get_total_income(telegram_id, start_date, end_date)
-    balance = total_income - total_expense
-    expenses_by_category = db_manager.get_expenses_by_category(telegram_id, start_date, end_date)
+    total_expense = snapshot['total_expense']
+    total_income = snapshot['total_income']
+    balance = snapshot['balance']
+    expenses_by_category = snapshot['expenses_by_category']
     
     # Text hisobot yaratish
-    period = period_name.get(user_language, period_name['uz'])
+    period = get_text(f'report_period_{period_key}', user_language)
     
     # Header
     report_text = f"📊 <b>{period} hisobot</b>\n"
@@ -137,31 +133,15 @@ async def report_bot_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
     report_text += "━" * 25 + "\n\n"
     
     # Summary
-    summary_labels = {
-        'uz': {'income': '💰 Jami daromad', 'expense': '💸 Jami xarajat', 'balance': '💵 Balans'},
-        'ru': {'income': '💰 Всего доход', 'expense': '💸 Всего расход', 'balance': '💵 Баланс'},
-        'en': {'income': '💰 Total Income', 'expense': '💸 Total Expense', 'balance': '💵 Balance'},
-        'tr': {'income': '💰 Toplam Gelir', 'expense': '💸 Toplam Gider', 'balance': '💵 Bakiye'},
-        'ar': {'income': '💰 إجمالي الدخل', 'expense': '💸 إجمالي المصروف', 'balance': '💵 الرصيد'}
-    }
-    labels = summary_labels.get(user_language, summary_labels['uz'])
-    
-    report_text += f"{labels['income']}: <b>{total_income:,.0f}</b> so'm\n"
-    report_text += f"{labels['expense']}: <b>{total_expense:,.0f}</b> so'm\n"
+    report_text += f"{get_text('report_total_income', user_language)}: <b>{total_income:,.0f}</b> so'm\n"
+    report_text += f"{get_text('report_total_expense', user_language)}: <b>{total_expense:,.0f}</b> so'm\n"
     
     balance_emoji = "📈" if balance >= 0 else "📉"
-    report_text += f"{balance_emoji} {labels['balance']}: <b>{balance:,.0f}</b> so'm\n\n"
+    report_text += f"{balance_emoji} {get_text('report_balance', user_language)}: <b>{balance:,.0f}</b> so'm\n\n"
     
     # Kategoriyalar bo'yicha xarajatlar
     if expenses_by_category:
-        category_header = {
-            'uz': '📂 Kategoriyalar bo\'yicha:',
-            'ru': '📂 По категориям:',
-            'en': '📂 By categories:',
-            'tr': '📂 Kategorilere göre:',
-            'ar': '📂 حسب الفئات:'
-        }
-        report_text += f"\n{category_header.get(user_language, category_header['uz'])}\n"
+        report_text += f"\n{get_text('report_by_category', user_language)}\n"
         report_text += "─" * 20 + "\n"
         
         # expenses_by_category is a list of dicts: [{'category': Category, 'total': Decimal, 'count': int}]
@@ -183,14 +163,7 @@ async def report_bot_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     # Oxirgi tranzaksiyalar
     if expenses or incomes:
-        transactions_header = {
-            'uz': '\n📋 Oxirgi tranzaksiyalar:',
-            'ru': '\n📋 Последние транзакции:',
-            'en': '\n📋 Recent transactions:',
-            'tr': '\n📋 Son işlemler:',
-            'ar': '\n📋 آخر المعاملات:'
-        }
-        report_text += f"\n{transactions_header.get(user_language, transactions_header['uz'])}\n"
+        report_text += f"\n{get_text('report_recent_transactions', user_language)}\n"
         report_text += "─" * 20 + "\n"
         
         # Oxirgi 5 ta xarajat
@@ -207,16 +180,8 @@ async def report_bot_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
             report_text += f"💰 +{inc.amount:,.0f} - {inc.created_at.strftime('%d.%m')}\n"
     
     # Orqaga tugmasi
-    back_texts = {
-        'uz': '« Orqaga',
-        'ru': '« Назад',
-        'en': '« Back',
-        'tr': '« Geri',
-        'ar': '« رجوع'
-    }
-    
     keyboard = InlineKeyboardMarkup([
-        [InlineKeyboardButton(back_texts.get(user_language, back_texts['uz']), callback_data='reports')]
+        [InlineKeyboardButton(get_text('back_short', user_language), callback_data='reports')]
     ])
     
     await query.edit_message_text(
@@ -250,9 +215,10 @@ async def report_html_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
     else:
         start_date, end_date = get_this_week_range()
     
-    # Ma'lumotlarni olish
-    expenses = db_manager.get_user_expenses(telegram_id, start_date, end_date)
-    incomes = db_manager.get_user_incomes(telegram_id, start_date, end_date)
+    # Ma'lumotlarni olish (bitta session - snapshot)
+    snapshot = await db_manager.get_report_snapshot(telegram_id, start_date, end_date)
+    expenses = snapshot['expenses']
+    incomes = snapshot['incomes']
     
     if not expenses and not incomes:
         no_data_msg = get_text('no_data_for_report', user_language)
@@ -260,28 +226,20 @@ async def report_html_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
     
     # Hisobot yaratish xabari - har safar boshqacha qilib yuborish
-    generating_texts = {
-        'uz': '⏳ HTML hisobot tayyorlanmoqda...',
-        'ru': '⏳ Подготовка HTML отчёта...',
-        'en': '⏳ Generating HTML report...',
-        'tr': '⏳ HTML rapor hazırlanıyor...',
-        'ar': '⏳ جاري إنشاء تقرير HTML...'
-    }
-    
     try:
-        await query.edit_message_text(generating_texts.get(user_language, generating_texts['uz']))
+        await query.edit_message_text(get_text('report_html_generating', user_language))
     except Exception:
         # Xabar bir xil bo'lsa, davom etamiz
         pass
     
     try:
         # Ma'lumotlarni tayyorlash
-        total_expense = db_manager.get_total_expenses(telegram_id, start_date, end_date)
-        total_income = db_manager.get_total_income(telegram_id, start_date, end_date)
-        balance = total_income - total_expense
+        total_expense = snapshot['total_expense']
+        total_income = snapshot['total_income']
+        balance = snapshot['balance']
         
         # Kategoriyalar bo'yicha
-        expenses_by_category = db_manager.get_expenses_by_category(telegram_id, start_date, end_date)
+        expenses_by_category = snapshot['expenses_by_category']
         
         # HTML yaratish
         device_type = 'desktop'  # Standart
@@ -295,33 +253,18 @@ async def report_html_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
             expenses_by_category=expenses_by_category,
             expenses=expenses,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            daily_totals=snapshot['daily_totals']
         )
         
         # HTML faylni yuborish
         # Fayl nomini yaratish
-        report_names = {
-            'daily': {'uz': 'Kunlik', 'en': 'Daily'},
-            'three_days': {'uz': '3kunlik', 'en': '3days'},
-            'weekly': {'uz': 'Haftalik', 'en': 'Weekly'},
-            'monthly': {'uz': 'Oylik', 'en': 'Monthly'},
-            'yearly': {'uz': 'Yillik', 'en': 'Yearly'}
-        }
-        
-        report_name = report_names.get(report_type, report_names['daily']).get(user_language, 'Report')
+        report_name = _REPORT_FILE_NAMES.get(report_type, _REPORT_FILE_NAMES['daily']).get(user_language, 'Report')
         filename = f"SmartWallet_{report_name}_{datetime.now().strftime('%d%m%Y_%H%M')}.html"
         
-        success_texts = {
-            'uz': '✅ HTML hisobot tayyor! Brauzerda oching 🌐',
-            'ru': '✅ HTML отчёт готов! Откройте в браузере 🌐',
-            'en': '✅ HTML report ready! Open in browser 🌐',
-            'tr': '✅ HTML rapor hazır! Tarayıcıda açın 🌐',
-            'ar': '✅ تقرير HTML جاهز! افتح في المتصفح 🌐'
-        }
-        
         # Avval xabarni yangilab, keyin fayl yuboramiz
         try:
-            await query.edit_message_text(success_texts.get(user_language, success_texts['uz']))
+            await query.edit_message_text(get_text('report_html_ready', user_language))
         except Exception:
             pass
         
@@ -329,24 +272,17 @@ async def report_html_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
             await query.message.reply_document(
                 document=f,
                 filename=filename,
-                caption=success_texts.get(user_language, success_texts['uz'])
+                caption=get_text('report_html_ready', user_language)
             )
         
         logger.info(f"HTML hisobot yuborildi: user={telegram_id}, type={report_type}")
         
     except Exception as e:
         logger.error(f"HTML yaratishda xato: {e}", exc_info=True)
-        error_texts = {
-            'uz': '❌ Xatolik yuz berdi. Qaytadan urinib ko\'ring.',
-            'ru': '❌ Произошла ошибка. Попробуйте снова.',
-            'en': '❌ An error occurred. Please try again.',
-            'tr': '❌ Bir hata oluştu. Lütfen tekrar deneyin.',
-            'ar': '❌ حدث خطأ. يرجى المحاولة مرة أخرى.'
-        }
         try:
-            await query.edit_message_text(error_texts.get(user_language, error_texts['uz']))
+            await query.edit_message_text(get_text('error_try_again', user_language))
         except Exception:
-            await query.message.reply_text(error_texts.get(user_language, error_texts['uz']))
+            await query.message.reply_text(get_text('error_try_again', user_language))
 
 
 # Dummy functions
@@ -366,7 +302,64 @@ async def custom_report_handler(update: Update, context: ContextTypes.DEFAULT_TY
     return await report_type_handler(update, context)
 
 async def export_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    return await report_type_handler(update, context)
+    """
+    Ma'lumotlarni yuklab olish
+    
+    export_data - format tanlash, export_csv / export_excel - butun tarixni
+    fayl qilib yuborish. Qatorlar server-side kursordan oqim bilan o'qiladi
+    va fayl thread'da yoziladi (event loop bloklanmaydi).
+    """
+    query = update.callback_query
+    await query.answer()
+    
+    user_language = context.user_data.get('language', 'uz')
+    telegram_id = context.user_data.get('telegram_id')
+    export_format = query.data.replace('export_', '')
+    
+    if export_format not in EXPORT_FORMATS:
+        await query.edit_message_text(
+            get_text('export_menu', user_language),
+            reply_markup=get_export_format_keyboard(user_language),
+            parse_mode='HTML'
+        )
+        return
+    
+    if export_format == 'excel' and not (ReportConfig.ENABLE_EXCEL and EXCEL_AVAILABLE):
+        await query.edit_message_text(
+            get_text('export_excel_unavailable', user_language),
+            reply_markup=get_export_format_keyboard(user_language)
+        )
+        return
+    
+    try:
+        await query.edit_message_text(get_text('export_preparing', user_language))
+    except Exception:
+        pass
+    
+    try:
+        loop = asyncio.get_running_loop()
+        buffer, count = await loop.run_in_executor(
+            None,
+            functools.partial(build_export, DatabaseManager().iter_export_rows(telegram_id), export_format)
+        )
+    except Exception as e:
+        logger.error(f"Eksportda xato: {e}", exc_info=True)
+        await query.message.reply_text(get_text('error_try_again', user_language))
+        return
+    
+    with buffer:
+        if count == 0:
+            await query.message.reply_text(get_text('export_empty', user_language))
+            return
+        
+        filename = f"SmartWallet_{datetime.now().strftime('%d%m%Y_%H%M')}.{EXPORT_FORMATS[export_format]}"
+        await query.message.reply_document(
+            document=buffer,
+            filename=filename,
+            caption=get_text('export_ready', user_language, count=count)
+        )
+    
+    logger.info(f"Eksport yuborildi: user={telegram_id}, format={export_format}, {count} qator")
 
 def setup_conversation_handler():
     return None
@@ -0,0 +1,217 @@
+"""
+SmartWallet AI Bot - Callback Router
+====================================
+Inline tugmalar (callback_data) uchun yo'naltirish jadvali
+
+callback_data '_' bo'yicha bir marta bo'linadi va token trie orqali eng
+uzun mos prefix topiladi: 'debt_paid_full_12' -> ('debt_paid_full', ['12']).
+Har bir marshrut uchun chaqiruvlar soni, xatolar va kechikish yig'iladi.
+
+Classes:
+    - CallbackRouter: Marshrutlarni ro'yxatdan o'tkazish va yo'naltirish
+
+Usage:
+    router = CallbackRouter()
+    router.add('debt_menu', debt_menu, exact=True, answer=False)
+    router.add('edit_expense', edit_expense, pass_args=True)
+    handled = await router.dispatch(update, context)
+
+Author: SmartWallet AI Team
+Version: 1.0.0
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional, Callable, Awaitable, Dict, List, Tuple, Any
+
+from telegram import Update
+
+logger = logging.getLogger(__name__)
+
+# Handler: (update, context) yoki pass_args=True bo'lsa (update, context, args)
+CallbackHandler = Callable[..., Awaitable[Any]]
+
+
+@dataclass
+class Route:
+    """Bitta marshrut va uning statistikasi"""
+    prefix: str
+    handler: CallbackHandler
+    exact: bool = False
+    answer: bool = True
+    pass_args: bool = False
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+class _RouteNode:
+    """Token trie tuguni"""
+
+    __slots__ = ('children', 'exact_route', 'prefix_route')
+
+    def __init__(self):
+        self.children: Dict[str, '_RouteNode'] = {}
+        self.exact_route: Optional[Route] = None
+        self.prefix_route: Optional[Route] = None
+
+
+# =====================================================
+# CALLBACK ROUTER CLASS
+# =====================================================
+class CallbackRouter:
+    """
+    callback_data -> handler yo'naltirish jadvali
+
+    Marshrutlar ikki turda:
+        - exact=True: callback_data prefix'ga to'liq teng bo'lishi kerak
+        - exact=False: prefix'dan keyingi tokenlar args sifatida beriladi
+          (args bo'sh bo'lishi ham mumkin)
+
+    Bir xil tugunda exact marshrut prefix marshrutdan ustun turadi,
+    turli tugunlarda eng uzun prefix tanlanadi.
+    """
+
+    SEPARATOR = '_'
+
+    def __init__(self):
+        self._root = _RouteNode()
+        self._routes: Dict[str, Route] = {}
+
+    def add(
+        self,
+        prefix: str,
+        handler: CallbackHandler,
+        exact: bool = False,
+        answer: bool = True,
+        pass_args: bool = False
+    ) -> Route:
+        """
+        Marshrut qo'shish
+
+        Args:
+            prefix: callback_data prefiksi (masalan 'edit_expense')
+            handler: Async handler
+            exact: Faqat to'liq moslik
+            answer: query.answer() ni router chaqiradi (handler o'zi
+                chaqirmasa True bo'lishi kerak)
+            pass_args: Handler'ga args (tokenlar ro'yxati) uzatiladi
+
+        Returns:
+            Route: Yaratilgan marshrut
+        """
+        key = f"{prefix}{'' if exact else '*'}"
+        if key in self._routes:
+            raise ValueError(f"Marshrut allaqachon mavjud: {key}")
+
+        route = Route(
+            prefix=prefix,
+            handler=handler,
+            exact=exact,
+            answer=answer,
+            pass_args=pass_args
+        )
+
+        node = self._root
+        for token in prefix.split(self.SEPARATOR):
+            node = node.children.setdefault(token, _RouteNode())
+        if exact:
+            node.exact_route = route
+        else:
+            node.prefix_route = route
+
+        self._routes[key] = route
+        return route
+
+    def resolve(self, callback_data: str) -> Tuple[Optional[Route], List[str]]:
+        """
+        callback_data uchun marshrutni topish
+
+        Args:
+            callback_data: Tugma ma'lumoti
+
+        Returns:
+            Tuple[Optional[Route], List[str]]: (marshrut, args) - topilmasa (None, [])
+        """
+        tokens = callback_data.split(self.SEPARATOR)
+        node = self._root
+        best: Optional[Route] = None
+        best_depth = 0
+
+        for depth, token in enumerate(tokens):
+            node = node.children.get(token)
+            if node is None:
+                break
+            if node.prefix_route is not None:
+                best, best_depth = node.prefix_route, depth + 1
+        else:
+            if node.exact_route is not None:
+                return node.exact_route, []
+
+        if best is None:
+            return None, []
+        return best, tokens[best_depth:]
+
+    async def dispatch(self, update: Update, context) -> bool:
+        """
+        Callback query'ni mos handler'ga yo'naltirish
+
+        Args:
+            update: Telegram update
+            context: Callback context
+
+        Returns:
+            bool: Marshrut topildi va handler chaqirildi
+        """
+        query = update.callback_query
+        route, args = self.resolve(query.data or '')
+        if route is None:
+            return False
+
+        if route.answer:
+            await query.answer()
+
+        started = time.perf_counter()
+        try:
+            if route.pass_args:
+                await route.handler(update, context, args)
+            else:
+                await route.handler(update, context)
+        except Exception:
+            route.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            route.calls += 1
+            route.total_seconds += elapsed
+            if elapsed > route.max_seconds:
+                route.max_seconds = elapsed
+        return True
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Marshrutlar bo'yicha kechikish statistikasi
+
+        Returns:
+            Dict: {prefix: {calls, errors, avg_ms, max_ms}} - faqat chaqirilganlar
+        """
+        return {
+            key: {
+                'calls': route.calls,
+                'errors': route.errors,
+                'avg_ms': round(route.total_seconds / route.calls * 1000, 2),
+                'max_ms': round(route.max_seconds * 1000, 2),
+            }
+            for key, route in self._routes.items()
+            if route.calls
+        }
+
+    def reset_metrics(self) -> None:
+        """Statistikani nolga tushirish"""
+        for route in self._routes.values():
+            route.calls = 0
+            route.errors = 0
+            route.total_seconds = 0.0
+            route.max_seconds = 0.0
@@ -27,7 +27,7 @@ from telegram.ext import (
 )
 
 from config import Messages, AppConfig
-from database.db_manager import DatabaseManager
+from database.db_manager import get_async_db_manager
 from keyboards.inline import (
     get_language_keyboard,
     get_main_menu_keyboard,
@@ -35,6 +35,7 @@ from keyboards.inline import (
 )
 from utils.translations import get_text
 from handlers.quick_expense import quick_expense_handler
+from utils.classifier import category_classifier
 
 # Logger
 logger = logging.getLogger(__name__)
@@ -43,8 +44,11 @@ logger = logging.getLogger(__name__)
 SELECTING_LANGUAGE = 0
 MAIN_MENU = 1
 
+# Asosiy menyu tugmalari (matnlari katalogda: menu_btn_<action>)
+MENU_ACTIONS = ('add_expense', 'add_income', 'debts', 'reports', 'settings')
+
 # Database manager
-db_manager = DatabaseManager()
+db_manager = get_async_db_manager()
 
 
 # =====================================================
@@ -64,7 +68,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     user = update.effective_user
     
     # Foydalanuvchini database'ga qo'shish yoki olish
-    db_user = db_manager.get_or_create_user(
+    db_user = await db_manager.get_or_create_user(
         telegram_id=user.id,
         username=user.username,
         first_name=user.first_name,
@@ -141,21 +145,13 @@ async def language_selection(update: Update, context: ContextTypes.DEFAULT_TYPE)
     # Tilni database'ga saqlash
     telegram_id = context.user_data.get('telegram_id')
     if telegram_id:
-        db_manager.update_user_language(telegram_id, selected_language)
+        await db_manager.update_user_language(telegram_id, selected_language)
         context.user_data['language'] = selected_language
         logger.info(f"User {telegram_id} til tanladi: {selected_language}")
     
     # Muvaffaqiyatli xabar
-    success_messages = {
-        'uz': "✅ Til muvaffaqiyatli tanlandi!",
-        'ru': "✅ Язык успешно выбран!",
-        'en': "✅ Language selected successfully!",
-        'tr': "✅ Dil başarıyla seçildi!",
-        'ar': "✅ تم اختيار اللغة بنجاح!"
-    }
-    
     await query.edit_message_text(
-        text=success_messages.get(selected_language, success_messages['uz'])
+        text=get_text('language_selected', selected_language)
     )
     
     # Asosiy menyuga o'tish
@@ -179,103 +175,10 @@ async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     language = context.user_data.get('language', 'uz')
     
     # Menyu matni
-    menu_texts = {
-        'uz': """🏠 <b>SmartWallet AI — Asosiy Menyu</b>
-
-━━━━━━━━━━━━━━━━━━━━
-
-📌 <b>Tezkor xarajat kiritish:</b>
-Summa va izoh yozing: <code>50000 non</code>
-
-━━━━━━━━━━━━━━━━━━━━
-
-⬇️ <i>Quyidagi tugmalardan birini tanlang:</i>""",
-        'ru': """🏠 <b>SmartWallet AI — Главное Меню</b>
-
-━━━━━━━━━━━━━━━━━━━━
-
-📌 <b>Быстрый ввод расхода:</b>
-Введите сумму и описание: <code>50000 хлеб</code>
-
-━━━━━━━━━━━━━━━━━━━━
-
-⬇️ <i>Выберите одну из кнопок ниже:</i>""",
-        'en': """🏠 <b>SmartWallet AI — Main Menu</b>
-
-━━━━━━━━━━━━━━━━━━━━
-
-📌 <b>Quick expense entry:</b>
-Type amount and note: <code>50000 bread</code>
-
-━━━━━━━━━━━━━━━━━━━━
-
-⬇️ <i>Select one of the buttons below:</i>""",
-        'tr': """🏠 <b>SmartWallet AI — Ana Menü</b>
-
-━━━━━━━━━━━━━━━━━━━━
-
-📌 <b>Hızlı gider girişi:</b>
-Tutar ve not yazın: <code>50000 ekmek</code>
-
-━━━━━━━━━━━━━━━━━━━━
-
-⬇️ <i>Aşağıdaki butonlardan birini seçin:</i>""",
-        'ar': """🏠 <b>SmartWallet AI — القائمة الرئيسية</b>
-
-━━━━━━━━━━━━━━━━━━━━
-
-📌 <b>إدخال سريع للمصروف:</b>
-اكتب المبلغ والملاحظة: <code>50000 خبز</code>
-
-━━━━━━━━━━━━━━━━━━━━
-
-⬇️ <i>اختر أحد الأزرار أدناه:</i>"""
-    }
-    
-    menu_text = menu_texts.get(language, menu_texts['uz'])
-    
-    # Reply Keyboard yaratish
-    button_texts = {
-        'uz': {
-            'add_expense': '💳 Xarajat qo\'shish',
-            'add_income': '💰 Daromad qo\'shish',
-            'debts': '💼 Qarzlar',
-            'reports': '📊 Hisobotlar',
-            'settings': '⚙️ Sozlamalar',
-        },
-        'ru': {
-            'add_expense': '💳 Добавить расход',
-            'add_income': '💰 Добавить доход',
-            'debts': '💼 Долги',
-            'reports': '📊 Отчёты',
-            'settings': '⚙️ Настройки',
-        },
-        'en': {
-            'add_expense': '💳 Add Expense',
-            'add_income': '💰 Add Income',
-            'debts': '💼 Debts',
-            'reports': '📊 Reports',
-            'settings': '⚙️ Settings',
-        },
-        'tr': {
-            'add_expense': '💳 Gider Ekle',
-            'add_income': '💰 Gelir Ekle',
-            'debts': '💼 Borçlar',
-            'reports': '📊 Raporlar',
-            'settings': '⚙️ Ayarlar',
-        },
-        'ar': {
-            'add_expense': '💳 إضافة مصروف',
-            'add_income': '💰 إضافة دخل',
-            'debts': '💼 الديون',
-            'reports': '📊 التقارير',
-            'settings': '⚙️ الإعدادات',
-        }
-    }
-    
-    t = button_texts.get(language, button_texts['uz'])
+    menu_text = get_text('main_menu_text', language)
     
     # Reply keyboard - 2x2 grid + 1 bottom button
+    t = {action: get_text(f'menu_btn_{action}', language) for action in MENU_ACTIONS}
     keyboard = [
         [KeyboardButton(t['add_expense']), KeyboardButton(t['add_income'])],
         [KeyboardButton(t['debts']), KeyboardButton(t['reports'])],
@@ -337,35 +240,17 @@ async def settings_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     
     language = context.user_data.get('language', 'uz')
     
-    settings_texts = {
-        'uz': """⚙️ <b>Sozlamalar</b>
-
-Kerakli sozlamani tanlang:""",
-        'ru': """⚙️ <b>Настройки</b>
-
-Выберите настройку:""",
-        'en': """⚙️ <b>Settings</b>
-
-Choose a setting:""",
-        'tr': """⚙️ <b>Ayarlar</b>
-
-Bir ayar seçin:""",
-        'ar': """⚙️ <b>الإعدادات</b>
-
-اختر إعداداً:"""
-    }
-    
     keyboard = get_settings_keyboard(language)
     
     if query:
         await query.edit_message_text(
-            text=settings_texts.get(language, settings_texts['uz']),
+            text=get_text('settings_menu_text', language),
             reply_markup=keyboard,
             parse_mode='HTML'
         )
     else:
         await update.message.reply_text(
-            text=settings_texts.get(language, settings_texts['uz']),
+            text=get_text('settings_menu_text', language),
             reply_markup=keyboard,
             parse_mode='HTML'
         )
@@ -392,18 +277,10 @@ async def change_language(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     language = context.user_data.get('language', 'uz')
     
-    change_lang_texts = {
-        'uz': "🌍 Tilni tanlang:",
-        'ru': "🌍 Выберите язык:",
-        'en': "🌍 Choose language:",
-        'tr': "🌍 Dil seçin:",
-        'ar': "🌍 اختر اللغة:"
-    }
-    
     keyboard = get_language_keyboard()
     
     await query.edit_message_text(
-        text=change_lang_texts.get(language, change_lang_texts['uz']),
+        text=get_text('choose_language', language),
         reply_markup=keyboard
     )
     
@@ -423,164 +300,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     """
     language = context.user_data.get('language', 'uz')
     
-    help_texts = {
-        'uz': """📖 <b>SmartWallet AI - Yordam</b>
-
-<b>Asosiy buyruqlar:</b>
-/start - Botni ishga tushirish
-/help - Yordam ma'lumoti
-
-<b>Qanday ishlatish:</b>
-
-1️⃣ <b>Xarajat qo'shish:</b>
-   • "Xarajat qo'shish" tugmasini bosing
-   • Summani kiriting (masalan: 50000)
-   • Kategoriyani tanlang
-   • AI avtomatik aniqlaydi!
-
-2️⃣ <b>Daromad qo'shish:</b>
-   • "Daromad qo'shish" tugmasini bosing
-   • Summani kiriting
-   • Manba va turini belgilang
-
-3️⃣ <b>Hisobotlar:</b>
-   • Kunlik/Haftalik/Oylik hisobotlar
-   • PDF va HTML formatda
-   • Grafiklar va tahlil
-
-<b>AI xususiyatlari:</b>
-• Matndan summa aniqlash
-• Kategoriya tavsiya qilish
-• Smart eslatmalar
-
-Savollar bo'lsa, /start ni bosing!""",
-        
-        'ru': """📖 <b>SmartWallet AI - Справка</b>
-
-<b>Основные команды:</b>
-/start - Запустить бота
-/help - Справочная информация
-
-<b>Как использовать:</b>
-
-1️⃣ <b>Добавить расход:</b>
-   • Нажмите "Добавить расход"
-   • Введите сумму (например: 50000)
-   • Выберите категорию
-   • AI автоматически определит!
-
-2️⃣ <b>Добавить доход:</b>
-   • Нажмите "Добавить доход"
-   • Введите сумму
-   • Укажите источник и тип
-
-3️⃣ <b>Отчёты:</b>
-   • Ежедневные/Недельные/Месячные отчёты
-   • Форматы PDF и HTML
-   • Графики и анализ
-
-<b>Возможности AI:</b>
-• Определение суммы из текста
-• Рекомендация категории
-• Умные напоминания
-
-При вопросах нажмите /start!""",
-        
-        'en': """📖 <b>SmartWallet AI - Help</b>
-
-<b>Main commands:</b>
-/start - Start bot
-/help - Help information
-
-<b>How to use:</b>
-
-1️⃣ <b>Add expense:</b>
-   • Click "Add expense"
-   • Enter amount (e.g.: 50000)
-   • Select category
-   • AI detects automatically!
-
-2️⃣ <b>Add income:</b>
-   • Click "Add income"
-   • Enter amount
-   • Specify source and type
-
-3️⃣ <b>Reports:</b>
-   • Daily/Weekly/Monthly reports
-   • PDF and HTML formats
-   • Charts and analysis
-
-<b>AI features:</b>
-• Detect amount from text
-• Recommend category
-• Smart reminders
-
-Questions? Press /start!""",
-        
-        'tr': """📖 <b>SmartWallet AI - Yardım</b>
-
-<b>Ana komutlar:</b>
-/start - Botu başlat
-/help - Yardım bilgisi
-
-<b>Nasıl kullanılır:</b>
-
-1️⃣ <b>Gider ekle:</b>
-   • "Gider ekle" düğmesine basın
-   • Tutarı girin (örn: 50000)
-   • Kategori seçin
-   • AI otomatik algılar!
-
-2️⃣ <b>Gelir ekle:</b>
-   • "Gelir ekle" düğmesine basın
-   • Tutarı girin
-   • Kaynak ve türü belirtin
-
-3️⃣ <b>Raporlar:</b>
-   • Günlük/Haftalık/Aylık raporlar
-   • PDF ve HTML formatları
-   • Grafikler ve analiz
-
-<b>AI özellikleri:</b>
-• Metinden tutar algılama
-• Kategori önerisi
-• Akıllı hatırlatmalar
-
-Sorularınız mı var? /start'a basın!""",
-        
-        'ar': """📖 <b>SmartWallet AI - مساعدة</b>
-
-<b>الأوامر الرئيسية:</b>
-/start - تشغيل البوت
-/help - معلومات المساعدة
-
-<b>كيفية الاستخدام:</b>
-
-1️⃣ <b>إضافة مصروف:</b>
-   • انقر على "إضافة مصروف"
-   • أدخل المبلغ (مثال: 50000)
-   • اختر الفئة
-   • الذكاء الاصطناعي يكتشف تلقائياً!
-
-2️⃣ <b>إضافة دخل:</b>
-   • انقر على "إضافة دخل"
-   • أدخل المبلغ
-   • حدد المصدر والنوع
-
-3️⃣ <b>التقارير:</b>
-   • تقارير يومية/أسبوعية/شهرية
-   • صيغ PDF و HTML
-   • رسوم بيانية وتحليل
-
-<b>ميزات الذكاء الاصطناعي:</b>
-• اكتشاف المبلغ من النص
-• اقتراح الفئة
-• تذكيرات ذكية
-
-أسئلة؟ اضغط /start!"""
-    }
-    
-    help_text = help_texts.get(language, help_texts['uz'])
+    help_text = get_text('help_text', language)
     
     await update.message.reply_text(
         text=help_text,
@@ -607,46 +327,8 @@ async def menu_button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
     
     logger.info(f"🔍 MENU_BUTTON_HANDLER: text='{text}', language='{language}'")
     
-    # Tugma matnlarini tekshirish
-    button_mapping = {
-        'uz': {
-            '💳 Xarajat qo\'shish': 'add_expense',
-            '💰 Daromad qo\'shish': 'add_income',
-            '💼 Qarzlar': 'debts',
-            '📊 Hisobotlar': 'reports',
-            '⚙️ Sozlamalar': 'settings',
-        },
-        'ru': {
-            '💳 Добавить расход': 'add_expense',
-            '💰 Добавить доход': 'add_income',
-            '💼 Долги': 'debts',
-            '📊 Отчёты': 'reports',
-            '⚙️ Настройки': 'settings',
-        },
-        'en': {
-            '💳 Add Expense': 'add_expense',
-            '💰 Add Income': 'add_income',
-            '💼 Debts': 'debts',
-            '📊 Reports': 'reports',
-            '⚙️ Settings': 'settings',
-        },
-        'tr': {
-            '💳 Gider Ekle': 'add_expense',
-            '💰 Gelir Ekle': 'add_income',
-            '💼 Borçlar': 'debts',
-            '📊 Raporlar': 'reports',
-            '⚙️ Ayarlar': 'settings',
-        },
-        'ar': {
-            '💳 إضافة مصروف': 'add_expense',
-            '💰 إضافة دخل': 'add_income',
-            '💼 الديون': 'debts',
-            '📊 التقارير': 'reports',
-            '⚙️ الإعدادات': 'settings',
-        }
-    }
-    
-    mapping = button_mapping.get(language, button_mapping['uz'])
+    # Tugma matnlarini tekshirish (matn katalogdan - klaviatura bilan bir xil)
+    mapping = {get_text(f'menu_btn_{action}', language): action for action in MENU_ACTIONS}
     action = mapping.get(text)
     
     logger.info(f"🎯 Aniqlangan action: '{action}'")
@@ -713,22 +395,14 @@ async def cancel_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     """
     language = context.user_data.get('language', 'uz')
     
-    cancel_texts = {
-        'uz': "❌ Jarayon bekor qilindi. /start ni bosing.",
-        'ru': "❌ Процесс отменён. Нажмите /start.",
-        'en': "❌ Process cancelled. Press /start.",
-        'tr': "❌ İşlem iptal edildi. /start'a basın.",
-        'ar': "❌ تم إلغاء العملية. اضغط /start."
-    }
-    
     if update.callback_query:
         await update.callback_query.answer()
         await update.callback_query.edit_message_text(
-            text=cancel_texts.get(language, cancel_texts['uz'])
+            text=get_text('start_process_cancelled', language)
         )
     else:
         await update.message.reply_text(
-            text=cancel_texts.get(language, cancel_texts['uz'])
+            text=get_text('start_process_cancelled', language)
         )
     
     return ConversationHandler.END
@@ -746,26 +420,18 @@ async def delete_data_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     
     language = context.user_data.get('language', 'uz')
     
-    delete_texts = {
-        'uz': '🗑️ <b>Ma\'lumot o\'chirish</b>\n\nNimani tahrirlash/o\'chirmoqchisiz?',
-        'ru': '🗑️ <b>Удаление данных</b>\n\nЧто хотите редактировать/удалить?',
-        'en': '🗑️ <b>Delete Data</b>\n\nWhat do you want to edit/delete?',
-        'tr': '🗑️ <b>Veri Silme</b>\n\nNeyi düzenlemek/silmek istiyorsunuz?',
-        'ar': '🗑️ <b>حذف البيانات</b>\n\nماذا تريد تعديل/حذف؟'
-    }
-    
     from keyboards.inline import get_delete_data_keyboard
     keyboard = get_delete_data_keyboard(language)
     
     try:
         await query.edit_message_text(
-            delete_texts.get(language, delete_texts['uz']),
+            get_text('delete_data_menu', language),
             reply_markup=keyboard,
             parse_mode='HTML'
         )
     except Exception:
         await query.message.reply_text(
-            delete_texts.get(language, delete_texts['uz']),
+            get_text('delete_data_menu', language),
             reply_markup=keyboard,
             parse_mode='HTML'
         )
@@ -781,39 +447,30 @@ async def delete_expenses_list_handler(update: Update, context: ContextTypes.DEF
     language = context.user_data.get('language', 'uz')
     telegram_id = context.user_data.get('telegram_id')
     
-    from utils.filters import get_last_n_days_range
+    from utils.filters import get_last_n_days_range, parse_page_callback
     from telegram import InlineKeyboardButton, InlineKeyboardMarkup
     from config import Categories
+    from keyboards.inline import get_pagination_keyboard
     
+    cursor, direction, page = parse_page_callback(query.data, 'delete_expenses_list')
     start_date, end_date = get_last_n_days_range(30)
-    expenses = db_manager.get_user_expenses(telegram_id, start_date, end_date)
+    # Baza faqat bitta sahifani qaytaradi (keyset)
+    expenses, prev_cursor, next_cursor = await db_manager.get_user_expenses_page(
+        telegram_id, cursor=cursor, direction=direction, limit=10, start_date=start_date
+    )
+    if prev_cursor is None:
+        page = 1
     
     if not expenses:
-        no_data = {
-            'uz': '📭 Xarajatlar topilmadi.',
-            'ru': '📭 Расходы не найдены.',
-            'en': '📭 No expenses found.',
-            'tr': '📭 Gider bulunamadı.',
-            'ar': '📭 لم يتم العثور على مصروفات.'
-        }
-        back_text = {'uz': '« Orqaga', 'ru': '« Назад', 'en': '« Back', 'tr': '« Geri', 'ar': '« رجوع'}
-        keyboard = InlineKeyboardMarkup([[InlineKeyboardButton(back_text.get(language, back_text['uz']), callback_data='delete_data')]])
+        keyboard = InlineKeyboardMarkup([[InlineKeyboardButton(get_text('back_short', language), callback_data='delete_data')]])
         try:
-            await query.edit_message_text(no_data.get(language, no_data['uz']), reply_markup=keyboard)
+            await query.edit_message_text(get_text('no_expenses_found', language), reply_markup=keyboard)
         except Exception:
             pass
         return MAIN_MENU
     
-    header = {
-        'uz': '💸 <b>Xarajatlar</b>\n\nTahrirlash uchun tanlang:',
-        'ru': '💸 <b>Расходы</b>\n\nВыберите для редактирования:',
-        'en': '💸 <b>Expenses</b>\n\nSelect to edit:',
-        'tr': '💸 <b>Giderler</b>\n\nDüzenlemek için seçin:',
-        'ar': '💸 <b>المصروفات</b>\n\nاختر للتعديل:'
-    }
-    
     keyboard_buttons = []
-    for exp in expenses[:10]:
+    for exp in expenses:
         # Get category info
         cat_icon = '📌'
         cat_name_short = 'other'  # default category key
@@ -838,13 +495,16 @@ async def delete_expenses_list_handler(update: Update, context: ContextTypes.DEF
         btn_text = f"{cat_icon} {cat_name_short}\n💰 {amount_formatted} so'm\n📅 {date_formatted}{description_text}"
         keyboard_buttons.append([InlineKeyboardButton(btn_text, callback_data=f'edit_expense_{exp.id}')])
     
-    back_text = {'uz': '« Orqaga', 'ru': '« Назад', 'en': '« Back', 'tr': '« Geri', 'ar': '« رجوع'}
-    keyboard_buttons.append([InlineKeyboardButton(back_text.get(language, back_text['uz']), callback_data='delete_data')])
+    keyboard = get_pagination_keyboard(
+        page, None, 'delete_expenses_list', language,
+        prev_cursor=prev_cursor, next_cursor=next_cursor,
+        rows=keyboard_buttons, back_callback='delete_data'
+    )
     
     try:
         await query.edit_message_text(
-            header.get(language, header['uz']),
-            reply_markup=InlineKeyboardMarkup(keyboard_buttons),
+            get_text('expenses_list_header', language),
+            reply_markup=keyboard,
             parse_mode='HTML'
         )
     except Exception:
@@ -861,38 +521,29 @@ async def delete_incomes_list_handler(update: Update, context: ContextTypes.DEFA
     language = context.user_data.get('language', 'uz')
     telegram_id = context.user_data.get('telegram_id')
     
-    from utils.filters import get_last_n_days_range
+    from utils.filters import get_last_n_days_range, parse_page_callback
     from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+    from keyboards.inline import get_pagination_keyboard
     
+    cursor, direction, page = parse_page_callback(query.data, 'delete_incomes_list')
     start_date, end_date = get_last_n_days_range(30)
-    incomes = db_manager.get_user_incomes(telegram_id, start_date, end_date)
+    # Baza faqat bitta sahifani qaytaradi (keyset)
+    incomes, prev_cursor, next_cursor = await db_manager.get_user_incomes_page(
+        telegram_id, cursor=cursor, direction=direction, limit=10, start_date=start_date
+    )
+    if prev_cursor is None:
+        page = 1
     
     if not incomes:
-        no_data = {
-            'uz': '📭 Daromadlar topilmadi.',
-            'ru': '📭 Доходы не найдены.',
-            'en': '📭 No incomes found.',
-            'tr': '📭 Gelir bulunamadı.',
-            'ar': '📭 لم يتم العثور على دخل.'
-        }
-        back_text = {'uz': '« Orqaga', 'ru': '« Назад', 'en': '« Back', 'tr': '« Geri', 'ar': '« رجوع'}
-        keyboard = InlineKeyboardMarkup([[InlineKeyboardButton(back_text.get(language, back_text['uz']), callback_data='delete_data')]])
+        keyboard = InlineKeyboardMarkup([[InlineKeyboardButton(get_text('back_short', language), callback_data='delete_data')]])
         try:
-            await query.edit_message_text(no_data.get(language, no_data['uz']), reply_markup=keyboard)
+            await query.edit_message_text(get_text('no_incomes_found', language), reply_markup=keyboard)
         except Exception:
             pass
         return MAIN_MENU
     
-    header = {
-        'uz': '💰 <b>Daromadlar</b>\n\nTahrirlash uchun tanlang:',
-        'ru': '💰 <b>Доходы</b>\n\nВыберите для редактирования:',
-        'en': '💰 <b>Incomes</b>\n\nSelect to edit:',
-        'tr': '💰 <b>Gelirler</b>\n\nDüzenlemek için seçin:',
-        'ar': '💰 <b>الدخل</b>\n\nاختر للتعديل:'
-    }
-    
     keyboard_buttons = []
-    for inc in incomes[:10]:
+    for inc in incomes:
         # Format display
         amount_formatted = f"{inc.amount:,.0f}".replace(',', ' ')
         date_formatted = inc.created_at.strftime('%d.%m.%Y')
@@ -904,24 +555,20 @@ async def delete_incomes_list_handler(update: Update, context: ContextTypes.DEFA
             source_text = f"\n📝 {source_short}"
         
         # Localized "Income" label
-        income_labels = {
-            'uz': '💰 Daromad',
-            'ru': '💰 Доход', 
-            'en': '💰 Income',
-            'tr': '💰 Gelir',
-            'ar': '💰 دخل'
-        }
         
-        btn_text = f"{income_labels.get(language, income_labels['uz'])}\n💵 {amount_formatted} so'm\n📅 {date_formatted}{source_text}"
+        btn_text = f"{get_text('income_label', language)}\n💵 {amount_formatted} so'm\n📅 {date_formatted}{source_text}"
         keyboard_buttons.append([InlineKeyboardButton(btn_text, callback_data=f'edit_income_{inc.id}')])
     
-    back_text = {'uz': '« Orqaga', 'ru': '« Назад', 'en': '« Back', 'tr': '« Geri', 'ar': '« رجوع'}
-    keyboard_buttons.append([InlineKeyboardButton(back_text.get(language, back_text['uz']), callback_data='delete_data')])
+    keyboard = get_pagination_keyboard(
+        page, None, 'delete_incomes_list', language,
+        prev_cursor=prev_cursor, next_cursor=next_cursor,
+        rows=keyboard_buttons, back_callback='delete_data'
+    )
     
     try:
         await query.edit_message_text(
-            header.get(language, header['uz']),
-            reply_markup=InlineKeyboardMarkup(keyboard_buttons),
+            get_text('incomes_list_header', language),
+            reply_markup=keyboard,
             parse_mode='HTML'
         )
     except Exception:
@@ -942,7 +589,7 @@ async def edit_expense_handler(update: Update, context: ContextTypes.DEFAULT_TYP
     from telegram import InlineKeyboardButton, InlineKeyboardMarkup
     from config import Categories
     
-    expense = db_manager.get_expense_by_id(expense_id, telegram_id)
+    expense = await db_manager.get_expense_by_id(expense_id, telegram_id)
     
     if not expense:
         try:
@@ -961,34 +608,23 @@ async def edit_expense_handler(update: Update, context: ContextTypes.DEFAULT_TYP
             cat_icon = cat['icon']
             break
     
-    detail_texts = {
-        'uz': f"💸 <b>Xarajat ma'lumotlari</b>\n\n{cat_icon} Kategoriya: {cat_name}\n💵 Summa: {expense.amount:,.0f} so'm\n📅 Sana: {expense.created_at.strftime('%d.%m.%Y %H:%M')}\n\nNima qilmoqchisiz?",
-        'ru': f"💸 <b>Информация о расходе</b>\n\n{cat_icon} Категория: {cat_name}\n💵 Сумма: {expense.amount:,.0f} сум\n📅 Дата: {expense.created_at.strftime('%d.%m.%Y %H:%M')}\n\nЧто хотите сделать?",
-        'en': f"💸 <b>Expense details</b>\n\n{cat_icon} Category: {cat_name}\n💵 Amount: {expense.amount:,.0f} sum\n📅 Date: {expense.created_at.strftime('%d.%m.%Y %H:%M')}\n\nWhat do you want to do?",
-        'tr': f"💸 <b>Gider detayları</b>\n\n{cat_icon} Kategori: {cat_name}\n💵 Tutar: {expense.amount:,.0f} sum\n📅 Tarih: {expense.created_at.strftime('%d.%m.%Y %H:%M')}\n\nNe yapmak istiyorsunuz?",
-        'ar': f"💸 <b>تفاصيل المصروف</b>\n\n{cat_icon} الفئة: {cat_name}\n💵 المبلغ: {expense.amount:,.0f} سوم\n📅 التاريخ: {expense.created_at.strftime('%d.%m.%Y %H:%M')}\n\nماذا تريد أن تفعل?"
-    }
-    
-    btn_texts = {
-        'uz': {'delete': '🔴 O\'chirish', 'edit': '✏️ Tahrirlash', 'back': '« Orqaga'},
-        'ru': {'delete': '🔴 Удалить', 'edit': '✏️ Редактировать', 'back': '« Назад'},
-        'en': {'delete': '🔴 Delete', 'edit': '✏️ Edit', 'back': '« Back'},
-        'tr': {'delete': '🔴 Sil', 'edit': '✏️ Düzenle', 'back': '« Geri'},
-        'ar': {'delete': '🔴 حذف', 'edit': '✏️ تعديل', 'back': '« رجوع'}
-    }
-    btn = btn_texts.get(language, btn_texts['uz'])
-    
     keyboard = InlineKeyboardMarkup([
         [
-            InlineKeyboardButton(btn['delete'], callback_data=f'confirm_del_expense_{expense_id}'),
-            InlineKeyboardButton(btn['edit'], callback_data=f'do_edit_expense_{expense_id}')
+            InlineKeyboardButton(get_text('btn_delete', language), callback_data=f'confirm_del_expense_{expense_id}'),
+            InlineKeyboardButton(get_text('btn_edit', language), callback_data=f'do_edit_expense_{expense_id}')
         ],
-        [InlineKeyboardButton(btn['back'], callback_data='delete_expenses_list')]
+        [InlineKeyboardButton(get_text('back_short', language), callback_data='delete_expenses_list')]
     ])
     
     try:
         await query.edit_message_text(
-            detail_texts.get(language, detail_texts['uz']),
+            get_text(
+                'expense_details', language,
+                icon=cat_icon,
+                category=cat_name,
+                amount=expense.amount,
+                date=expense.created_at.strftime('%d.%m.%Y %H:%M')
+            ),
             reply_markup=keyboard,
             parse_mode='HTML'
         )
@@ -1009,7 +645,7 @@ async def edit_income_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
     
     from telegram import InlineKeyboardButton, InlineKeyboardMarkup
     
-    income = db_manager.get_income_by_id(income_id, telegram_id)
+    income = await db_manager.get_income_by_id(income_id, telegram_id)
     
     if not income:
         try:
@@ -1018,34 +654,22 @@ async def edit_income_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
             pass
         return MAIN_MENU
     
-    detail_texts = {
-        'uz': f"💰 <b>Daromad ma'lumotlari</b>\n\n💵 Summa: {income.amount:,.0f} so'm\n📝 Manba: {income.source or '-'}\n📅 Sana: {income.created_at.strftime('%d.%m.%Y %H:%M')}\n\nNima qilmoqchisiz?",
-        'ru': f"💰 <b>Информация о доходе</b>\n\n💵 Сумма: {income.amount:,.0f} сум\n📝 Источник: {income.source or '-'}\n📅 Дата: {income.created_at.strftime('%d.%m.%Y %H:%M')}\n\nЧто хотите сделать?",
-        'en': f"💰 <b>Income details</b>\n\n💵 Amount: {income.amount:,.0f} sum\n📝 Source: {income.source or '-'}\n📅 Date: {income.created_at.strftime('%d.%m.%Y %H:%M')}\n\nWhat do you want to do?",
-        'tr': f"💰 <b>Gelir detayları</b>\n\n💵 Tutar: {income.amount:,.0f} sum\n📝 Kaynak: {income.source or '-'}\n📅 Tarih: {income.created_at.strftime('%d.%m.%Y %H:%M')}\n\nNe yapmak istiyorsunuz?",
-        'ar': f"💰 <b>تفاصيل الدخل</b>\n\n💵 المبلغ: {income.amount:,.0f} سوم\n📝 المصدر: {income.source or '-'}\n📅 التاريخ: {income.created_at.strftime('%d.%m.%Y %H:%M')}\n\nماذا تريد أن تفعل?"
-    }
-    
-    btn_texts = {
-        'uz': {'delete': '🔴 O\'chirish', 'edit': '✏️ Tahrirlash', 'back': '« Orqaga'},
-        'ru': {'delete': '🔴 Удалить', 'edit': '✏️ Редактировать', 'back': '« Назад'},
-        'en': {'delete': '🔴 Delete', 'edit': '✏️ Edit', 'back': '« Back'},
-        'tr': {'delete': '🔴 Sil', 'edit': '✏️ Düzenle', 'back': '« Geri'},
-        'ar': {'delete': '🔴 حذف', 'edit': '✏️ تعديل', 'back': '« رجوع'}
-    }
-    btn = btn_texts.get(language, btn_texts['uz'])
-    
     keyboard = InlineKeyboardMarkup([
         [
-            InlineKeyboardButton(btn['delete'], callback_data=f'confirm_del_income_{income_id}'),
-            InlineKeyboardButton(btn['edit'], callback_data=f'do_edit_income_{income_id}')
+            InlineKeyboardButton(get_text('btn_delete', language), callback_data=f'confirm_del_income_{income_id}'),
+            InlineKeyboardButton(get_text('btn_edit', language), callback_data=f'do_edit_income_{income_id}')
         ],
-        [InlineKeyboardButton(btn['back'], callback_data='delete_incomes_list')]
+        [InlineKeyboardButton(get_text('back_short', language), callback_data='delete_incomes_list')]
     ])
     
     try:
         await query.edit_message_text(
-            detail_texts.get(language, detail_texts['uz']),
+            get_text(
+                'income_details', language,
+                amount=income.amount,
+                source=income.source or '-',
+                date=income.created_at.strftime('%d.%m.%Y %H:%M')
+            ),
             reply_markup=keyboard,
             parse_mode='HTML'
         )
@@ -1064,16 +688,10 @@ async def confirm_delete_expense_handler(update: Update, context: ContextTypes.D
     telegram_id = context.user_data.get('telegram_id')
     expense_id = int(query.data.replace('confirm_del_expense_', ''))
     
-    if db_manager.delete_expense(expense_id, telegram_id):
-        msg = {
-            'uz': '✅ Xarajat o\'chirildi!',
-            'ru': '✅ Расход удалён!',
-            'en': '✅ Expense deleted!',
-            'tr': '✅ Gider silindi!',
-            'ar': '✅ تم حذف المصروف!'
-        }
+    if await db_manager.delete_expense(expense_id, telegram_id):
+        await category_classifier.forget(telegram_id, expense_id)
         try:
-            await query.edit_message_text(msg.get(language, msg['uz']))
+            await query.edit_message_text(get_text('expense_deleted', language))
         except Exception:
             pass
     else:
@@ -1094,16 +712,9 @@ async def confirm_delete_income_handler(update: Update, context: ContextTypes.DE
     telegram_id = context.user_data.get('telegram_id')
     income_id = int(query.data.replace('confirm_del_income_', ''))
     
-    if db_manager.delete_income(income_id, telegram_id):
-        msg = {
-            'uz': '✅ Daromad o\'chirildi!',
-            'ru': '✅ Доход удалён!',
-            'en': '✅ Income deleted!',
-            'tr': '✅ Gelir silindi!',
-            'ar': '✅ تم حذف الدخل!'
-        }
+    if await db_manager.delete_income(income_id, telegram_id):
         try:
-            await query.edit_message_text(msg.get(language, msg['uz']))
+            await query.edit_message_text(get_text('income_deleted', language))
         except Exception:
             pass
     else:
@@ -1124,16 +735,10 @@ async def do_edit_expense_handler(update: Update, context: ContextTypes.DEFAULT_
     telegram_id = context.user_data.get('telegram_id')
     expense_id = int(query.data.replace('do_edit_expense_', ''))
     
-    if db_manager.delete_expense(expense_id, telegram_id):
-        msg = {
-            'uz': '✏️ Xarajat o\'chirildi.\n\n💸 Endi yangi xarajat qo\'shing:',
-            'ru': '✏️ Расход удалён.\n\n💸 Теперь добавьте новый расход:',
-            'en': '✏️ Expense deleted.\n\n💸 Now add new expense:',
-            'tr': '✏️ Gider silindi.\n\n💸 Şimdi yeni gider ekleyin:',
-            'ar': '✏️ تم حذف المصروف.\n\n💸 الآن أضف مصروف جديد:'
-        }
+    if await db_manager.delete_expense(expense_id, telegram_id):
+        await category_classifier.forget(telegram_id, expense_id)
         try:
-            await query.edit_message_text(msg.get(language, msg['uz']))
+            await query.edit_message_text(get_text('expense_edit_prompt', language))
         except Exception:
             pass
         
@@ -1157,16 +762,9 @@ async def do_edit_income_handler(update: Update, context: ContextTypes.DEFAULT_T
     telegram_id = context.user_data.get('telegram_id')
     income_id = int(query.data.replace('do_edit_income_', ''))
     
-    if db_manager.delete_income(income_id, telegram_id):
-        msg = {
-            'uz': '✏️ Daromad o\'chirildi.\n\n💰 Endi yangi daromad qo\'shing:',
-            'ru': '✏️ Доход удалён.\n\n💰 Теперь добавьте новый доход:',
-            'en': '✏️ Income deleted.\n\n💰 Now add new income:',
-            'tr': '✏️ Gelir silindi.\n\n💰 Şimdi yeni gelir ekleyin:',
-            'ar': '✏️ تم حذف الدخل.\n\n💰 الآن أضف دخل جديد:'
-        }
+    if await db_manager.delete_income(income_id, telegram_id):
         try:
-            await query.edit_message_text(msg.get(language, msg['uz']))
+            await query.edit_message_text(get_text('income_edit_prompt', language))
         except Exception:
             pass
         
@@ -1206,8 +804,8 @@ def setup_conversation_handler() -> ConversationHandler:
                 CallbackQueryHandler(settings_menu, pattern='^settings$'),
                 CallbackQueryHandler(change_language, pattern='^change_language$'),
                 CallbackQueryHandler(delete_data_menu, pattern='^delete_data$'),
-                CallbackQueryHandler(delete_expenses_list_handler, pattern='^delete_expenses_list$'),
-                CallbackQueryHandler(delete_incomes_list_handler, pattern='^delete_incomes_list$'),
+                CallbackQueryHandler(delete_expenses_list_handler, pattern=r'^delete_expenses_list(_[np]\d+_\d+)?$'),
+                CallbackQueryHandler(delete_incomes_list_handler, pattern=r'^delete_incomes_list(_[np]\d+_\d+)?$'),
                 CallbackQueryHandler(edit_expense_handler, pattern='^edit_expense_'),
                 CallbackQueryHandler(edit_income_handler, pattern='^edit_income_'),
                 CallbackQueryHandler(confirm_delete_expense_handler, pattern='^confirm_del_expense_'),
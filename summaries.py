@@ -0,0 +1,257 @@
+"""
+SmartWallet AI Bot - Scheduled Summaries
+========================================
+Kunlik va haftalik xulosalarni ommaviy hisoblash va yuborish
+
+Barcha faol foydalanuvchilar uchun xulosa bir nechta GROUP BY so'rov bilan
+hisoblanadi (foydalanuvchi boshiga so'rov yo'q). Yuborish dispatcher
+orqali (flood limitlariga mos), checkpoint yuborilgan foydalanuvchilar
+bo'yicha saqlanadi - restart bo'lsa ko'pi bilan SUMMARY_BATCH_SIZE ta
+xulosa qayta yuboriladi.
+
+Classes:
+    - SummaryScheduler: Kunlik/haftalik xulosa vazifasi
+
+Author: SmartWallet AI Team
+Version: 1.0.0
+"""
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timedelta, date
+from typing import Optional, Callable, Awaitable, Dict, Any
+
+from config import SchedulerConfig
+from database.db_manager import get_async_db_manager, category_registry
+from utils.translations import get_text, get_category_name, format_currency, format_date
+
+logger = logging.getLogger(__name__)
+
+# Yuborish funksiyasi: (chat_id, text, **kwargs) -> bool
+SendFunc = Callable[..., Awaitable[bool]]
+
+
+# =====================================================
+# SUMMARY SCHEDULER CLASS
+# =====================================================
+class SummaryScheduler:
+    """
+    Kunlik va haftalik xulosalarni yuboruvchi scheduler
+    
+    Har kuni SchedulerConfig.DAILY_SUMMARY_TIME da kunlik xulosa,
+    WEEKLY_SUMMARY_DAY kuni esa qo'shimcha ravishda haftalik xulosa
+    yuboriladi. Checkpoint (vazifa nomi, davr kaliti, oxirgi user_id)
+    job_checkpoints jadvalida saqlanadi.
+    """
+    
+    JOB_DAILY = 'daily_summary'
+    JOB_WEEKLY = 'weekly_summary'
+    
+    def __init__(self, send: SendFunc, batch_size: Optional[int] = None):
+        """
+        Args:
+            send: Xabar yuborish funksiyasi (masalan MessageDispatcher.send)
+            batch_size: Bir vaqtda yuborilayotgan xulosalar soni
+        """
+        self.send = send
+        self.batch_size = batch_size or SchedulerConfig.SUMMARY_BATCH_SIZE
+        self._task: Optional[asyncio.Task] = None
+    
+    
+    # =====================================================
+    # JOB
+    # =====================================================
+    
+    async def run_for(self, day: date) -> int:
+        """
+        Berilgan kun uchun kunlik (va kerak bo'lsa haftalik) xulosalar
+        
+        Args:
+            day: Xulosa kuni
+        
+        Returns:
+            int: Yuborilgan xabarlar soni
+        """
+        sent = await self.run_job(self.JOB_DAILY, day, day)
+        if day.weekday() == SchedulerConfig.WEEKLY_SUMMARY_DAY:
+            sent += await self.run_job(self.JOB_WEEKLY, day - timedelta(days=6), day)
+        return sent
+    
+    async def run_job(self, name: str, start_day: date, end_day: date) -> int:
+        """
+        Bitta xulosa vazifasini checkpoint'dan davom ettirib bajarish
+        
+        Xulosalar user_id tartibida, bir vaqtda ko'pi bilan batch_size ta
+        yuboriladi va tartib bo'yicha kutiladi: checkpoint - o'zi va
+        oldingilarning hammasi yakunlangan oxirgi foydalanuvchi. Yuborish
+        at-least-once: to'xtasa, faqat yakunlanmagan (ko'pi bilan
+        batch_size ta) xulosalar qayta yuboriladi.
+        
+        Args:
+            name: Vazifa nomi (JOB_DAILY yoki JOB_WEEKLY)
+            start_day: Davr boshi
+            end_day: Davr oxiri
+        
+        Returns:
+            int: Yuborilgan xabarlar soni
+        """
+        db_manager = get_async_db_manager()
+        period_key = end_day.isoformat()
+        
+        after_user_id = None
+        checkpoint = await db_manager.get_job_checkpoint(name)
+        if checkpoint and checkpoint['period_key'] == period_key:
+            if checkpoint['completed']:
+                logger.info(f"{name} ({period_key}) allaqachon yuborilgan")
+                return 0
+            after_user_id = checkpoint['last_user_id']
+        
+        summaries = await db_manager.get_period_summaries(
+            start_day, end_day, after_user_id=after_user_id
+        )
+        kind = 'weekly_summary' if name == self.JOB_WEEKLY else 'daily_summary'
+        
+        loop = asyncio.get_running_loop()
+        in_flight = deque()
+        sent = 0
+        
+        async def settle_oldest() -> None:
+            nonlocal sent
+            user_id, task = in_flight.popleft()
+            try:
+                sent += 1 if await task is True else 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{name}: xulosa yuborilmadi (user={user_id}): {e}")
+            
+            # Keyingisi ham tayyor bo'lsa - checkpoint'ni o'sha bilan birga yozamiz
+            if not in_flight or not in_flight[0][1].done():
+                await db_manager.save_job_checkpoint(name, period_key, last_user_id=user_id)
+        
+        try:
+            for summary in summaries:
+                in_flight.append((summary['user_id'], loop.create_task(self.send(
+                    summary['user_id'],
+                    self._render(summary, kind, start_day, end_day),
+                    parse_mode='HTML'
+                ))))
+                if len(in_flight) >= self.batch_size:
+                    await settle_oldest()
+            
+            while in_flight:
+                await settle_oldest()
+        finally:
+            for _, task in in_flight:
+                task.cancel()
+        
+        await db_manager.save_job_checkpoint(
+            name, period_key,
+            last_user_id=summaries[-1]['user_id'] if summaries else after_user_id,
+            completed=True
+        )
+        logger.info(f"{name} ({period_key}): {sent}/{len(summaries)} xulosa yuborildi")
+        return sent
+    
+    @staticmethod
+    def _render(
+        summary: Dict[str, Any],
+        kind: str,
+        start_day: date,
+        end_day: date
+    ) -> str:
+        """Xulosa matnini foydalanuvchi tilida tayyorlash"""
+        language = summary['language']
+        
+        top_category = '-'
+        category = category_registry.get_by_id(summary['top_category_id'])
+        if category is not None:
+            top_category = (
+                f"{get_category_name(category.key, language)} "
+                f"({format_currency(summary['top_category_total'], language)})"
+            )
+        
+        period = format_date(end_day, language)
+        if start_day != end_day:
+            period = f"{format_date(start_day, language)} - {period}"
+        
+        return get_text(
+            kind, language,
+            period=period,
+            expense=format_currency(summary['total_expense'], language),
+            expense_count=summary['expense_count'],
+            income=format_currency(summary['total_income'], language),
+            balance=format_currency(summary['balance'], language),
+            top_category=top_category
+        )
+    
+    
+    # =====================================================
+    # LOOP
+    # =====================================================
+    
+    @staticmethod
+    def _seconds_until(target: datetime) -> float:
+        """Berilgan vaqtgacha qolgan soniyalar"""
+        return max(0.0, (target - datetime.now()).total_seconds())
+    
+    def _next_run(self) -> datetime:
+        """Keyingi DAILY_SUMMARY_TIME"""
+        now = datetime.now()
+        target = datetime.combine(now.date(), SchedulerConfig.DAILY_SUMMARY_TIME)
+        if target <= now:
+            target += timedelta(days=1)
+        return target
+    
+    async def _run(self):
+        """Asosiy sikl - avval bugungi o'tkazib yuborilgan/tugallanmagan vazifani bajaradi"""
+        today = datetime.now().date()
+        if datetime.now().time() >= SchedulerConfig.DAILY_SUMMARY_TIME:
+            try:
+                await self._resume(today)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Xulosalarni davom ettirishda xato: {e}")
+        
+        while True:
+            target = self._next_run()
+            await asyncio.sleep(self._seconds_until(target))
+            try:
+                await self.run_for(target.date())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Xulosa vazifasi xatosi: {e}")
+    
+    async def _resume(self, day: date):
+        """
+        Vaqti o'tgan bugungi vazifalarni bajarish
+        
+        Bot DAILY_SUMMARY_TIME da ishlamay turgan bo'lsa vazifa boshidan,
+        o'rtada to'xtagan bo'lsa checkpoint'dan bajariladi. Tugallangan
+        vazifalarni run_job o'zi o'tkazib yuboradi.
+        """
+        logger.info(f"Bugungi xulosalar tekshirilmoqda ({day.isoformat()})")
+        await self.run_for(day)
+    
+    def start(self):
+        """Xulosa siklini event loop'da ishga tushirish"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(
+                f"SummaryScheduler ishga tushdi "
+                f"({SchedulerConfig.DAILY_SUMMARY_TIME.strftime('%H:%M')})"
+            )
+    
+    async def stop(self):
+        """Siklni to'xtatish"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("SummaryScheduler to'xtatildi")
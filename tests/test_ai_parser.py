@@ -0,0 +1,31 @@
+"""
+AI parser testlari - kategoriya typo fallback'i
+"""
+
+import pytest
+
+from utils.ai_parser import (
+    detect_category_source, is_typo_candidate,
+    CATEGORY_SOURCE_FALLBACK, CATEGORY_SOURCE_TYPO
+)
+
+
+@pytest.mark.parametrize('text', ['kirim', '500000 kirim', 'daromad', 'bekor', 'menyu'])
+def test_income_and_command_words_are_not_corrected(text):
+    category_key, _, source = detect_category_source(text)
+    
+    assert category_key == 'other'
+    assert source == CATEGORY_SOURCE_FALLBACK
+
+
+def test_short_words_are_not_typo_candidates():
+    assert not is_typo_candidate('kiyem')
+    assert not is_typo_candidate('kirim')
+    assert is_typo_candidate('supermarkt')
+
+
+def test_long_misspelled_keyword_is_still_detected():
+    category_key, _, source = detect_category_source('supermarkt 30000')
+    
+    assert category_key == 'food'
+    assert source == CATEGORY_SOURCE_TYPO
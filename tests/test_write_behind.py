@@ -0,0 +1,71 @@
+"""
+WriteBehindQueue testlari - parallel yozuvlar bitta batch'da yoziladi
+"""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from database.db_manager import WriteBehindQueue
+
+
+class FakeDatabase:
+    """bulk_add chaqiruvlarini yozib boradigan soxta DatabaseManager"""
+    
+    def __init__(self):
+        self.batches = []
+    
+    def bulk_add(self, expenses, incomes):
+        self.batches.append((len(expenses), len(incomes)))
+        return (
+            list(range(1, len(expenses) + 1)),
+            list(range(101, 101 + len(incomes)))
+        )
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    """Har bir test uchun yangi navbat (singleton qayta yaratiladi)"""
+    monkeypatch.setattr(WriteBehindQueue, '_instance', None)
+    instance = WriteBehindQueue()
+    instance._db = FakeDatabase()
+    return instance
+
+
+async def _save_expense(queue, telegram_id):
+    """quick_expense_handler kabi: navbatga qo'yib ID'ni kutish"""
+    future = await queue.submit_expense(
+        telegram_id=telegram_id,
+        amount=Decimal('5000'),
+        category_key='food'
+    )
+    return await future
+
+
+def test_concurrent_submits_share_one_batch(queue):
+    async def scenario():
+        ids = await asyncio.gather(*(_save_expense(queue, user_id) for user_id in range(5)))
+        future = await queue.submit_income(telegram_id=9, amount=Decimal('100000'))
+        income_id = await future
+        await queue.close()
+        return ids, income_id
+    
+    ids, income_id = asyncio.run(scenario())
+    
+    assert ids == [1, 2, 3, 4, 5]
+    assert income_id == 101
+    assert queue._db.batches[0] == (5, 0)
+    assert max(expenses + incomes for expenses, incomes in queue._db.batches) > 1
+
+
+def test_close_flushes_pending_items(queue):
+    async def scenario():
+        future = await queue.submit_expense(
+            telegram_id=1, amount=Decimal('1000'), category_key='food'
+        )
+        await queue.close()
+        return await future
+    
+    assert asyncio.run(scenario()) == 1
+    assert queue._db.batches == [(1, 0)]
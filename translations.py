@@ -4,7 +4,8 @@ SmartWallet AI Bot - Translations
 5 tilda tarjimalar (O'zbek, Rus, Ingliz, Turk, Arab)
 
 Functions:
-    - get_text: Matnni tarjima qilish
+    - get_text: Matnni tarjima qilish (kompilyatsiya qilingan katalogdan)
+    - register_translations: Katalogga yangi matnlar qo'shish
     - get_category_name: Kategoriya nomini olish
     - format_date: Sanani formatlash
     - format_currency: Valyutani formatlash
@@ -15,7 +16,8 @@ Version: 1.0.0
 
 from datetime import datetime, date
 from decimal import Decimal
-from typing import Optional, Dict, Any
+from string import Formatter
+from typing import Optional, Dict, Any, Tuple, FrozenSet
 
 from config import Categories, Currency
 
@@ -533,6 +535,67 @@ TRANSLATIONS = {
               '⏰ <b>المتبقي:</b> {days_left} يوم\n\n'
               '{debt_type}'
     },
+    'reminder_message': {
+        'uz': '🔔 <b>Eslatma</b>\n\n{message}',
+        'ru': '🔔 <b>Напоминание</b>\n\n{message}',
+        'en': '🔔 <b>Reminder</b>\n\n{message}',
+        'tr': '🔔 <b>Hatırlatma</b>\n\n{message}',
+        'ar': '🔔 <b>تذكير</b>\n\n{message}'
+    },
+    'daily_summary': {
+        'uz': '📊 <b>Kunlik xulosa</b> ({period})\n\n'
+              '💸 <b>Xarajat:</b> {expense} ({expense_count} ta)\n'
+              '💰 <b>Daromad:</b> {income}\n'
+              '⚖️ <b>Balans:</b> {balance}\n'
+              '🏷 <b>Eng ko\'p:</b> {top_category}',
+        'ru': '📊 <b>Итоги дня</b> ({period})\n\n'
+              '💸 <b>Расходы:</b> {expense} ({expense_count} шт.)\n'
+              '💰 <b>Доходы:</b> {income}\n'
+              '⚖️ <b>Баланс:</b> {balance}\n'
+              '🏷 <b>Больше всего:</b> {top_category}',
+        'en': '📊 <b>Daily summary</b> ({period})\n\n'
+              '💸 <b>Expenses:</b> {expense} ({expense_count})\n'
+              '💰 <b>Income:</b> {income}\n'
+              '⚖️ <b>Balance:</b> {balance}\n'
+              '🏷 <b>Top category:</b> {top_category}',
+        'tr': '📊 <b>Günlük özet</b> ({period})\n\n'
+              '💸 <b>Gider:</b> {expense} ({expense_count} adet)\n'
+              '💰 <b>Gelir:</b> {income}\n'
+              '⚖️ <b>Bakiye:</b> {balance}\n'
+              '🏷 <b>En çok:</b> {top_category}',
+        'ar': '📊 <b>ملخص اليوم</b> ({period})\n\n'
+              '💸 <b>المصروفات:</b> {expense} ({expense_count})\n'
+              '💰 <b>الدخل:</b> {income}\n'
+              '⚖️ <b>الرصيد:</b> {balance}\n'
+              '🏷 <b>الأكثر:</b> {top_category}'
+    },
+    'weekly_summary': {
+        'uz': '📅 <b>Haftalik xulosa</b> ({period})\n\n'
+              '💸 <b>Xarajat:</b> {expense} ({expense_count} ta)\n'
+              '💰 <b>Daromad:</b> {income}\n'
+              '⚖️ <b>Balans:</b> {balance}\n'
+              '🏷 <b>Eng ko\'p:</b> {top_category}',
+        'ru': '📅 <b>Итоги недели</b> ({period})\n\n'
+              '💸 <b>Расходы:</b> {expense} ({expense_count} шт.)\n'
+              '💰 <b>Доходы:</b> {income}\n'
+              '⚖️ <b>Баланс:</b> {balance}\n'
+              '🏷 <b>Больше всего:</b> {top_category}',
+        'en': '📅 <b>Weekly summary</b> ({period})\n\n'
+              '💸 <b>Expenses:</b> {expense} ({expense_count})\n'
+              '💰 <b>Income:</b> {income}\n'
+              '⚖️ <b>Balance:</b> {balance}\n'
+              '🏷 <b>Top category:</b> {top_category}',
+        'tr': '📅 <b>Haftalık özet</b> ({period})\n\n'
+              '💸 <b>Gider:</b> {expense} ({expense_count} adet)\n'
+              '💰 <b>Gelir:</b> {income}\n'
+              '⚖️ <b>Bakiye:</b> {balance}\n'
+              '🏷 <b>En çok:</b> {top_category}',
+        'ar': '📅 <b>ملخص الأسبوع</b> ({period})\n\n'
+              '💸 <b>المصروفات:</b> {expense} ({expense_count})\n'
+              '💰 <b>الدخل:</b> {income}\n'
+              '⚖️ <b>الرصيد:</b> {balance}\n'
+              '🏷 <b>الأكثر:</b> {top_category}'
+    },
     'no_debts_found': {
         'uz': '📭 Qarzlar topilmadi',
         'ru': '📭 Долги не найдены',
@@ -634,6 +697,704 @@ TRANSLATIONS = {
         'ar': '🚫 <b>تم إلغاء العملية</b>\n\n'
               '🏠 اضغط /start للعودة إلى القائمة'
     },
+    
+    # Umumiy tugmalar
+    'back_short': {
+        'uz': '« Orqaga',
+        'ru': '« Назад',
+        'en': '« Back',
+        'tr': '« Geri',
+        'ar': '« رجوع'
+    },
+    'btn_delete': {
+        'uz': '🔴 O\'chirish',
+        'ru': '🔴 Удалить',
+        'en': '🔴 Delete',
+        'tr': '🔴 Sil',
+        'ar': '🔴 حذف'
+    },
+    'btn_edit': {
+        'uz': '✏️ Tahrirlash',
+        'ru': '✏️ Редактировать',
+        'en': '✏️ Edit',
+        'tr': '✏️ Düzenle',
+        'ar': '✏️ تعديل'
+    },
+    'unknown_command': {
+        'uz': "❌ Noma'lum buyruq. /start ni bosing.",
+        'ru': "❌ Неизвестная команда. Нажмите /start.",
+        'en': "❌ Unknown command. Press /start.",
+        'tr': "❌ Bilinmeyen komut. /start'a basın.",
+        'ar': "❌ أمر غير معروف. اضغط /start."
+    },
+    'error_try_again': {
+        'uz': '❌ Xatolik yuz berdi. Qaytadan urinib ko\'ring.',
+        'ru': '❌ Произошла ошибка. Попробуйте снова.',
+        'en': '❌ An error occurred. Please try again.',
+        'tr': '❌ Bir hata oluştu. Lütfen tekrar deneyin.',
+        'ar': '❌ حدث خطأ. يرجى المحاولة مرة أخرى.'
+    },
+    
+    # Ma'lumot o'chirish / tahrirlash
+    'delete_data_menu': {
+        'uz': '🗑️ <b>Ma\'lumot o\'chirish</b>\n\nNimani tahrirlash/o\'chirmoqchisiz?',
+        'ru': '🗑️ <b>Удаление данных</b>\n\nЧто хотите редактировать/удалить?',
+        'en': '🗑️ <b>Delete Data</b>\n\nWhat do you want to edit/delete?',
+        'tr': '🗑️ <b>Veri Silme</b>\n\nNeyi düzenlemek/silmek istiyorsunuz?',
+        'ar': '🗑️ <b>حذف البيانات</b>\n\nماذا تريد تعديل/حذف؟'
+    },
+    'no_expenses_found': {
+        'uz': '📭 Xarajatlar topilmadi.',
+        'ru': '📭 Расходы не найдены.',
+        'en': '📭 No expenses found.',
+        'tr': '📭 Gider bulunamadı.',
+        'ar': '📭 لم يتم العثور على مصروفات.'
+    },
+    'no_incomes_found': {
+        'uz': '📭 Daromadlar topilmadi.',
+        'ru': '📭 Доходы не найдены.',
+        'en': '📭 No incomes found.',
+        'tr': '📭 Gelir bulunamadı.',
+        'ar': '📭 لم يتم العثور على دخل.'
+    },
+    'expenses_list_header': {
+        'uz': '💸 <b>Xarajatlar</b>\n\nTahrirlash uchun tanlang:',
+        'ru': '💸 <b>Расходы</b>\n\nВыберите для редактирования:',
+        'en': '💸 <b>Expenses</b>\n\nSelect to edit:',
+        'tr': '💸 <b>Giderler</b>\n\nDüzenlemek için seçin:',
+        'ar': '💸 <b>المصروفات</b>\n\nاختر للتعديل:'
+    },
+    'incomes_list_header': {
+        'uz': '💰 <b>Daromadlar</b>\n\nTahrirlash uchun tanlang:',
+        'ru': '💰 <b>Доходы</b>\n\nВыберите для редактирования:',
+        'en': '💰 <b>Incomes</b>\n\nSelect to edit:',
+        'tr': '💰 <b>Gelirler</b>\n\nDüzenlemek için seçin:',
+        'ar': '💰 <b>الدخل</b>\n\nاختر للتعديل:'
+    },
+    'expense_details': {
+        'uz': "💸 <b>Xarajat ma'lumotlari</b>\n\n{icon} Kategoriya: {category}\n💵 Summa: {amount:,.0f} so'm\n📅 Sana: {date}\n\nNima qilmoqchisiz?",
+        'ru': "💸 <b>Информация о расходе</b>\n\n{icon} Категория: {category}\n💵 Сумма: {amount:,.0f} сум\n📅 Дата: {date}\n\nЧто хотите сделать?",
+        'en': "💸 <b>Expense details</b>\n\n{icon} Category: {category}\n💵 Amount: {amount:,.0f} sum\n📅 Date: {date}\n\nWhat do you want to do?",
+        'tr': "💸 <b>Gider detayları</b>\n\n{icon} Kategori: {category}\n💵 Tutar: {amount:,.0f} sum\n📅 Tarih: {date}\n\nNe yapmak istiyorsunuz?",
+        'ar': "💸 <b>تفاصيل المصروف</b>\n\n{icon} الفئة: {category}\n💵 المبلغ: {amount:,.0f} سوم\n📅 التاريخ: {date}\n\nماذا تريد أن تفعل?"
+    },
+    'income_details': {
+        'uz': "💰 <b>Daromad ma'lumotlari</b>\n\n💵 Summa: {amount:,.0f} so'm\n📝 Manba: {source}\n📅 Sana: {date}\n\nNima qilmoqchisiz?",
+        'ru': "💰 <b>Информация о доходе</b>\n\n💵 Сумма: {amount:,.0f} сум\n📝 Источник: {source}\n📅 Дата: {date}\n\nЧто хотите сделать?",
+        'en': "💰 <b>Income details</b>\n\n💵 Amount: {amount:,.0f} sum\n📝 Source: {source}\n📅 Date: {date}\n\nWhat do you want to do?",
+        'tr': "💰 <b>Gelir detayları</b>\n\n💵 Tutar: {amount:,.0f} sum\n📝 Kaynak: {source}\n📅 Tarih: {date}\n\nNe yapmak istiyorsunuz?",
+        'ar': "💰 <b>تفاصيل الدخل</b>\n\n💵 المبلغ: {amount:,.0f} سوم\n📝 المصدر: {source}\n📅 التاريخ: {date}\n\nماذا تريد أن تفعل?"
+    },
+    'expense_deleted': {
+        'uz': '✅ Xarajat o\'chirildi!',
+        'ru': '✅ Расход удалён!',
+        'en': '✅ Expense deleted!',
+        'tr': '✅ Gider silindi!',
+        'ar': '✅ تم حذف المصروف!'
+    },
+    'income_deleted': {
+        'uz': '✅ Daromad o\'chirildi!',
+        'ru': '✅ Доход удалён!',
+        'en': '✅ Income deleted!',
+        'tr': '✅ Gelir silindi!',
+        'ar': '✅ تم حذف الدخل!'
+    },
+    'expense_cancelled_deleted': {
+        'uz': '✅ Xarajat bekor qilindi va o\'chirildi!',
+        'ru': '✅ Расход отменён и удалён!',
+        'en': '✅ Expense cancelled and deleted!',
+        'tr': '✅ Gider iptal edildi ve silindi!',
+        'ar': '✅ تم إلغاء وحذف المصروف!'
+    },
+    'income_cancelled_deleted': {
+        'uz': '✅ Daromad bekor qilindi va o\'chirildi!',
+        'ru': '✅ Доход отменён и удалён!',
+        'en': '✅ Income cancelled and deleted!',
+        'tr': '✅ Gelir iptal edildi ve silindi!',
+        'ar': '✅ تم إلغاء وحذف الدخل!'
+    },
+    'expense_edit_prompt': {
+        'uz': '✏️ Xarajat o\'chirildi.\n\n💸 Endi yangi xarajat qo\'shing:',
+        'ru': '✏️ Расход удалён.\n\n💸 Теперь добавьте новый расход:',
+        'en': '✏️ Expense deleted.\n\n💸 Now add new expense:',
+        'tr': '✏️ Gider silindi.\n\n💸 Şimdi yeni gider ekleyin:',
+        'ar': '✏️ تم حذف المصروف.\n\n💸 الآن أضف مصروف جديد:'
+    },
+    'income_edit_prompt': {
+        'uz': '✏️ Daromad o\'chirildi.\n\n💰 Endi yangi daromad qo\'shing:',
+        'ru': '✏️ Доход удалён.\n\n💰 Теперь добавьте новый доход:',
+        'en': '✏️ Income deleted.\n\n💰 Now add new income:',
+        'tr': '✏️ Gelir silindi.\n\n💰 Şimdi yeni gelir ekleyin:',
+        'ar': '✏️ تم حذف الدخل.\n\n💰 الآن أضف دخل جديد:'
+    },
+    
+    # Start / asosiy menyu
+    'language_selected': {
+        'uz': '✅ Til muvaffaqiyatli tanlandi!',
+        'ru': '✅ Язык успешно выбран!',
+        'en': '✅ Language selected successfully!',
+        'tr': '✅ Dil başarıyla seçildi!',
+        'ar': '✅ تم اختيار اللغة بنجاح!'
+    },
+    'main_menu_text': {
+        'uz': '🏠 <b>SmartWallet AI — Asosiy Menyu</b>\n\n'
+              '━━━━━━━━━━━━━━━━━━━━\n\n'
+              '📌 <b>Tezkor xarajat kiritish:</b>\n'
+              'Summa va izoh yozing: <code>50000 non</code>\n\n'
+              '━━━━━━━━━━━━━━━━━━━━\n\n'
+              '⬇️ <i>Quyidagi tugmalardan birini tanlang:</i>',
+        'ru': '🏠 <b>SmartWallet AI — Главное Меню</b>\n\n'
+              '━━━━━━━━━━━━━━━━━━━━\n\n'
+              '📌 <b>Быстрый ввод расхода:</b>\n'
+              'Введите сумму и описание: <code>50000 хлеб</code>\n\n'
+              '━━━━━━━━━━━━━━━━━━━━\n\n'
+              '⬇️ <i>Выберите одну из кнопок ниже:</i>',
+        'en': '🏠 <b>SmartWallet AI — Main Menu</b>\n\n'
+              '━━━━━━━━━━━━━━━━━━━━\n\n'
+              '📌 <b>Quick expense entry:</b>\n'
+              'Type amount and note: <code>50000 bread</code>\n\n'
+              '━━━━━━━━━━━━━━━━━━━━\n\n'
+              '⬇️ <i>Select one of the buttons below:</i>',
+        'tr': '🏠 <b>SmartWallet AI — Ana Menü</b>\n\n'
+              '━━━━━━━━━━━━━━━━━━━━\n\n'
+              '📌 <b>Hızlı gider girişi:</b>\n'
+              'Tutar ve not yazın: <code>50000 ekmek</code>\n\n'
+              '━━━━━━━━━━━━━━━━━━━━\n\n'
+              '⬇️ <i>Aşağıdaki butonlardan birini seçin:</i>',
+        'ar': '🏠 <b>SmartWallet AI — القائمة الرئيسية</b>\n\n'
+              '━━━━━━━━━━━━━━━━━━━━\n\n'
+              '📌 <b>إدخال سريع للمصروف:</b>\n'
+              'اكتب المبلغ والملاحظة: <code>50000 خبز</code>\n\n'
+              '━━━━━━━━━━━━━━━━━━━━\n\n'
+              '⬇️ <i>اختر أحد الأزرار أدناه:</i>'
+    },
+    'menu_btn_add_expense': {
+        'uz': '💳 Xarajat qo\'shish',
+        'ru': '💳 Добавить расход',
+        'en': '💳 Add Expense',
+        'tr': '💳 Gider Ekle',
+        'ar': '💳 إضافة مصروف'
+    },
+    'menu_btn_add_income': {
+        'uz': '💰 Daromad qo\'shish',
+        'ru': '💰 Добавить доход',
+        'en': '💰 Add Income',
+        'tr': '💰 Gelir Ekle',
+        'ar': '💰 إضافة دخل'
+    },
+    'menu_btn_debts': {
+        'uz': '💼 Qarzlar',
+        'ru': '💼 Долги',
+        'en': '💼 Debts',
+        'tr': '💼 Borçlar',
+        'ar': '💼 الديون'
+    },
+    'menu_btn_reports': {
+        'uz': '📊 Hisobotlar',
+        'ru': '📊 Отчёты',
+        'en': '📊 Reports',
+        'tr': '📊 Raporlar',
+        'ar': '📊 التقارير'
+    },
+    'menu_btn_settings': {
+        'uz': '⚙️ Sozlamalar',
+        'ru': '⚙️ Настройки',
+        'en': '⚙️ Settings',
+        'tr': '⚙️ Ayarlar',
+        'ar': '⚙️ الإعدادات'
+    },
+    'settings_menu_text': {
+        'uz': '⚙️ <b>Sozlamalar</b>\n\n'
+              'Kerakli sozlamani tanlang:',
+        'ru': '⚙️ <b>Настройки</b>\n\n'
+              'Выберите настройку:',
+        'en': '⚙️ <b>Settings</b>\n\n'
+              'Choose a setting:',
+        'tr': '⚙️ <b>Ayarlar</b>\n\n'
+              'Bir ayar seçin:',
+        'ar': '⚙️ <b>الإعدادات</b>\n\n'
+              'اختر إعداداً:'
+    },
+    'choose_language': {
+        'uz': '🌍 Tilni tanlang:',
+        'ru': '🌍 Выберите язык:',
+        'en': '🌍 Choose language:',
+        'tr': '🌍 Dil seçin:',
+        'ar': '🌍 اختر اللغة:'
+    },
+    'help_text': {
+        'uz': '📖 <b>SmartWallet AI - Yordam</b>\n\n'
+              '<b>Asosiy buyruqlar:</b>\n'
+              '/start - Botni ishga tushirish\n'
+              '/help - Yordam ma\'lumoti\n\n'
+              '<b>Qanday ishlatish:</b>\n\n'
+              '1️⃣ <b>Xarajat qo\'shish:</b>\n'
+              '   • "Xarajat qo\'shish" tugmasini bosing\n'
+              '   • Summani kiriting (masalan: 50000)\n'
+              '   • Kategoriyani tanlang\n'
+              '   • AI avtomatik aniqlaydi!\n\n'
+              '2️⃣ <b>Daromad qo\'shish:</b>\n'
+              '   • "Daromad qo\'shish" tugmasini bosing\n'
+              '   • Summani kiriting\n'
+              '   • Manba va turini belgilang\n\n'
+              '3️⃣ <b>Hisobotlar:</b>\n'
+              '   • Kunlik/Haftalik/Oylik hisobotlar\n'
+              '   • PDF va HTML formatda\n'
+              '   • Grafiklar va tahlil\n\n'
+              '<b>AI xususiyatlari:</b>\n'
+              '• Matndan summa aniqlash\n'
+              '• Kategoriya tavsiya qilish\n'
+              '• Smart eslatmalar\n\n'
+              'Savollar bo\'lsa, /start ni bosing!',
+        'ru': '📖 <b>SmartWallet AI - Справка</b>\n\n'
+              '<b>Основные команды:</b>\n'
+              '/start - Запустить бота\n'
+              '/help - Справочная информация\n\n'
+              '<b>Как использовать:</b>\n\n'
+              '1️⃣ <b>Добавить расход:</b>\n'
+              '   • Нажмите "Добавить расход"\n'
+              '   • Введите сумму (например: 50000)\n'
+              '   • Выберите категорию\n'
+              '   • AI автоматически определит!\n\n'
+              '2️⃣ <b>Добавить доход:</b>\n'
+              '   • Нажмите "Добавить доход"\n'
+              '   • Введите сумму\n'
+              '   • Укажите источник и тип\n\n'
+              '3️⃣ <b>Отчёты:</b>\n'
+              '   • Ежедневные/Недельные/Месячные отчёты\n'
+              '   • Форматы PDF и HTML\n'
+              '   • Графики и анализ\n\n'
+              '<b>Возможности AI:</b>\n'
+              '• Определение суммы из текста\n'
+              '• Рекомендация категории\n'
+              '• Умные напоминания\n\n'
+              'При вопросах нажмите /start!',
+        'en': '📖 <b>SmartWallet AI - Help</b>\n\n'
+              '<b>Main commands:</b>\n'
+              '/start - Start bot\n'
+              '/help - Help information\n\n'
+              '<b>How to use:</b>\n\n'
+              '1️⃣ <b>Add expense:</b>\n'
+              '   • Click "Add expense"\n'
+              '   • Enter amount (e.g.: 50000)\n'
+              '   • Select category\n'
+              '   • AI detects automatically!\n\n'
+              '2️⃣ <b>Add income:</b>\n'
+              '   • Click "Add income"\n'
+              '   • Enter amount\n'
+              '   • Specify source and type\n\n'
+              '3️⃣ <b>Reports:</b>\n'
+              '   • Daily/Weekly/Monthly reports\n'
+              '   • PDF and HTML formats\n'
+              '   • Charts and analysis\n\n'
+              '<b>AI features:</b>\n'
+              '• Detect amount from text\n'
+              '• Recommend category\n'
+              '• Smart reminders\n\n'
+              'Questions? Press /start!',
+        'tr': '📖 <b>SmartWallet AI - Yardım</b>\n\n'
+              '<b>Ana komutlar:</b>\n'
+              '/start - Botu başlat\n'
+              '/help - Yardım bilgisi\n\n'
+              '<b>Nasıl kullanılır:</b>\n\n'
+              '1️⃣ <b>Gider ekle:</b>\n'
+              '   • "Gider ekle" düğmesine basın\n'
+              '   • Tutarı girin (örn: 50000)\n'
+              '   • Kategori seçin\n'
+              '   • AI otomatik algılar!\n\n'
+              '2️⃣ <b>Gelir ekle:</b>\n'
+              '   • "Gelir ekle" düğmesine basın\n'
+              '   • Tutarı girin\n'
+              '   • Kaynak ve türü belirtin\n\n'
+              '3️⃣ <b>Raporlar:</b>\n'
+              '   • Günlük/Haftalık/Aylık raporlar\n'
+              '   • PDF ve HTML formatları\n'
+              '   • Grafikler ve analiz\n\n'
+              '<b>AI özellikleri:</b>\n'
+              '• Metinden tutar algılama\n'
+              '• Kategori önerisi\n'
+              '• Akıllı hatırlatmalar\n\n'
+              'Sorularınız mı var? /start\'a basın!',
+        'ar': '📖 <b>SmartWallet AI - مساعدة</b>\n\n'
+              '<b>الأوامر الرئيسية:</b>\n'
+              '/start - تشغيل البوت\n'
+              '/help - معلومات المساعدة\n\n'
+              '<b>كيفية الاستخدام:</b>\n\n'
+              '1️⃣ <b>إضافة مصروف:</b>\n'
+              '   • انقر على "إضافة مصروف"\n'
+              '   • أدخل المبلغ (مثال: 50000)\n'
+              '   • اختر الفئة\n'
+              '   • الذكاء الاصطناعي يكتشف تلقائياً!\n\n'
+              '2️⃣ <b>إضافة دخل:</b>\n'
+              '   • انقر على "إضافة دخل"\n'
+              '   • أدخل المبلغ\n'
+              '   • حدد المصدر والنوع\n\n'
+              '3️⃣ <b>التقارير:</b>\n'
+              '   • تقارير يومية/أسبوعية/شهرية\n'
+              '   • صيغ PDF و HTML\n'
+              '   • رسوم بيانية وتحليل\n\n'
+              '<b>ميزات الذكاء الاصطناعي:</b>\n'
+              '• اكتشاف المبلغ من النص\n'
+              '• اقتراح الفئة\n'
+              '• تذكيرات ذكية\n\n'
+              'أسئلة؟ اضغط /start!'
+    },
+    'start_process_cancelled': {
+        'uz': '❌ Jarayon bekor qilindi. /start ni bosing.',
+        'ru': '❌ Процесс отменён. Нажмите /start.',
+        'en': '❌ Process cancelled. Press /start.',
+        'tr': '❌ İşlem iptal edildi. /start\'a basın.',
+        'ar': '❌ تم إلغاء العملية. اضغط /start.'
+    },
+    'income_label': {
+        'uz': '💰 Daromad',
+        'ru': '💰 Доход',
+        'en': '💰 Income',
+        'tr': '💰 Gelir',
+        'ar': '💰 دخل'
+    },
+    
+    # Daromad qo'shish (bosqichma-bosqich)
+    'income_add_start': {
+        'uz': '💰 <b>Daromad qo\'shish</b>\n\n'
+              'Daromad summasini kiriting (so\'m):\n\n'
+              '<i>Masalan: 5000000 Oylik</i>',
+        'ru': '💰 <b>Добавить доход</b>\n\n'
+              'Введите сумму дохода (сум):\n\n'
+              '<i>Например: 5000000</i>',
+        'en': '💰 <b>Add Income</b>\n\n'
+              'Enter income amount (UZS):\n\n'
+              '<i>Example: 5000000</i>'
+    },
+    'income_add_source': {
+        'uz': '📝 <b>Daromad manbasi</b>\n\n'
+              'Daromad manbasini kiriting:\n\n'
+              '<i>Masalan: Oylik, Bonus, Freelance, va boshqalar</i>',
+        'ru': '📝 <b>Источник дохода</b>\n\n'
+              'Введите источник дохода:\n\n'
+              '<i>Например: Зарплата, Бонус, Фриланс, и т.д.</i>',
+        'en': '📝 <b>Income Source</b>\n\n'
+              'Enter income source:\n\n'
+              '<i>Example: Salary, Bonus, Freelance, etc.</i>'
+    },
+    'income_add_type': {
+        'uz': '💼 Daromad turini tanlang:',
+        'ru': '💼 Выберите тип дохода:',
+        'en': '💼 Select income type:'
+    },
+    'income_add_confirm': {
+        'uz': '📝 <b>DAROMADNI TASDIQLANG:</b>\n\n'
+              '💰 Summa: {amount:,.0f} so\'m\n'
+              '📝 Manba: {source}\n'
+              '💼 Turi: {type_name}\n\n'
+              '⚠️ <b>DI QAT!</b> Bu DAROMAD, XARAJAT emas!\n'
+              'Bu summa umumiy DAROMADINGIZGA qo\'shiladi.\n\n'
+              'Saqlashni xohlaysizmi?',
+        'ru': '📝 <b>ПОДТВЕРДИТЕ ДОХОД:</b>\n\n'
+              '💰 Сумма: {amount:,.0f} сум\n'
+              '📝 Источник: {source}\n'
+              '💼 Тип: {type_name}\n\n'
+              '⚠️ <b>ВНИМАНИЕ!</b> Это ДОХОД, не РАСХОД!\n'
+              'Эта сумма будет добавлена к вашему общему ДОХОДУ.\n\n'
+              'Хотите сохранить?',
+        'en': '📝 <b>CONFIRM INCOME:</b>\n\n'
+              '💰 Amount: {amount:,.0f} UZS\n'
+              '📝 Source: {source}\n'
+              '💼 Type: {type_name}\n\n'
+              '⚠️ <b>NOTE!</b> This is INCOME, not EXPENSE!\n'
+              'This amount will be added to your total INCOME.\n\n'
+              'Do you want to save?'
+    },
+    'income_add_cancelled': {
+        'uz': '❌ Daromad qo\'shish bekor qilindi',
+        'ru': '❌ Добавление дохода отменено',
+        'en': '❌ Income adding cancelled'
+    },
+    'income_add_saved': {
+        'uz': '✅ <b>DAROMAD MUVAFFAQIYATLI QO\'SHILDI!</b>\n\n'
+              '💰 Summa: {amount:,.0f} so\'m\n'
+              '📝 Manba: {source}\n'
+              '📅 Sana: {date}\n\n'
+              '✅ Bu summa umumiy DAROMADINGIZGA qo\'shildi.\n'
+              '📊 Hisobotda daromad sifatida ko\'rinadi.\n\n'
+              '💡 <i>Eslatma: Daromad va xarajat alohida hisoblanadi!</i>',
+        'ru': '✅ <b>ДОХОД УСПЕШНО ДОБАВЛЕН!</b>\n\n'
+              '💰 Сумма: {amount:,.0f} сум\n'
+              '📝 Источник: {source}\n'
+              '📅 Дата: {date}\n\n'
+              '✅ Эта сумма добавлена к вашему общему ДОХОДУ.\n'
+              '📊 В отчете будет показана как доход.\n\n'
+              '💡 <i>Примечание: Доход и расход считаются отдельно!</i>',
+        'en': '✅ <b>INCOME SUCCESSFULLY ADDED!</b>\n\n'
+              '💰 Amount: {amount:,.0f} UZS\n'
+              '📝 Source: {source}\n'
+              '📅 Date: {date}\n\n'
+              '✅ This amount has been added to your total INCOME.\n'
+              '📊 Will appear as income in reports.\n\n'
+              '💡 <i>Note: Income and expenses are calculated separately!</i>'
+    },
+    
+    # Tezkor kiritish (bitta xabar)
+    'quick_income_no_amount': {
+        'uz': 'ℹ️ Daromad summasi topilmadi!\n\n'
+              'Iltimos, to\'g\'ri formatda yozing:\n'
+              '📝 Masalan: "5000000 oylik" yoki "3000000 maosh"\n\n'
+              'Yoki "💰 Daromad qo\'shish" tugmasini bosing.',
+        'ru': 'ℹ️ Сумма дохода не найдена!\n\n'
+              'Пожалуйста, напишите в правильном формате:\n'
+              '📝 Например: "5000000 зарплата" или "3000000 оклад"\n\n'
+              'Или нажмите "💰 Добавить доход".'
+    },
+    'quick_income_added': {
+        'uz': '✅ <b>DAROMAD QO\'SHILDI!</b>\n\n'
+              '💰 Summa: {amount:,.0f} so\'m\n'
+              '📝 Manba: {source}\n'
+              '📅 Sana: {date}\n\n'
+              '✅ Bu summa umumiy DAROMADINGIZGA qo\'shildi!\n\n'
+              '💡 <i>Keyingi safar ham shunday yozing va avtomatik qo\'shiladi!</i>',
+        'ru': '✅ <b>ДОХОД ДОБАВЛЕН!</b>\n\n'
+              '💰 Сумма: {amount:,.0f} сум\n'
+              '📝 Источник: {source}\n'
+              '📅 Дата: {date}\n\n'
+              '✅ Эта сумма добавлена к вашему общему ДОХОДУ!\n\n'
+              '💡 <i>В следующий раз пишите также и будет добавлено автоматически!</i>'
+    },
+    'quick_expense_added': {
+        'uz': '✅ <b>XARAJAT QO\'SHILDI!</b>\n\n'
+              '{icon} Kategoriya: {category}\n'
+              '💸 Summa: {amount}\n'
+              '📝 Tavsif: {description}\n'
+              '📅 Sana: {date}\n\n'
+              '✅ Bu summa umumiy XARAJATLARINGIZGA qo\'shildi.',
+        'ru': '✅ <b>РАСХОД ДОБАВЛЕН!</b>\n\n'
+              '{icon} Категория: {category}\n'
+              '💸 Сумма: {amount}\n'
+              '📝 Описание: {description}\n'
+              '📅 Дата: {date}\n\n'
+              '✅ Эта сумма добавлена к вашим общим РАСХОДАМ.'
+    },
+    'quick_expense_deleted': {
+        'uz': '✅ Xarajat o\'chirildi',
+        'ru': '✅ Расход удалён',
+        'en': '✅ Expense deleted'
+    },
+    'error_short': {
+        'uz': '❌ Xatolik yuz berdi',
+        'ru': '❌ Произошла ошибка',
+        'en': '❌ An error occurred'
+    },
+    
+    # Hisobotlar menyusi
+    'reports_menu': {
+        'uz': '📊 <b>Hisobotlar</b>\n\nKerakli hisobot turini tanlang:',
+        'ru': '📊 <b>Отчёты</b>\n\nВыберите тип отчёта:',
+        'en': '📊 <b>Reports</b>\n\nSelect report type:',
+        'tr': '📊 <b>Raporlar</b>\n\nRapor türünü seçin:',
+        'ar': '📊 <b>التقارير</b>\n\nاختر نوع التقرير:'
+    },
+    'report_format_prompt': {
+        'uz': '📊 <b>Hisobot formatini tanlang:</b>\n\nQayerda ko\'rishni xohlaysiz?',
+        'ru': '📊 <b>Выберите формат отчёта:</b>\n\nГде хотите посмотреть?',
+        'en': '📊 <b>Select report format:</b>\n\nWhere do you want to view?',
+        'tr': '📊 <b>Rapor formatını seçin:</b>\n\nNerede görmek istiyorsunuz?',
+        'ar': '📊 <b>اختر صيغة التقرير:</b>\n\nأين تريد المشاهدة؟'
+    },
+    'report_period_daily': {
+        'uz': 'Kunlik', 'ru': 'Ежедневный', 'en': 'Daily', 'tr': 'Günlük', 'ar': 'يومي'
+    },
+    'report_period_three_days': {
+        'uz': '3 kunlik', 'ru': '3-дневный', 'en': '3-Day', 'tr': '3 Günlük', 'ar': '3 أيام'
+    },
+    'report_period_weekly': {
+        'uz': 'Haftalik', 'ru': 'Недельный', 'en': 'Weekly', 'tr': 'Haftalık', 'ar': 'أسبوعي'
+    },
+    'report_period_monthly': {
+        'uz': 'Oylik', 'ru': 'Месячный', 'en': 'Monthly', 'tr': 'Aylık', 'ar': 'شهري'
+    },
+    'report_period_yearly': {
+        'uz': 'Yillik', 'ru': 'Годовой', 'en': 'Yearly', 'tr': 'Yıllık', 'ar': 'سنوي'
+    },
+    'report_total_income': {
+        'uz': '💰 Jami daromad',
+        'ru': '💰 Всего доход',
+        'en': '💰 Total Income',
+        'tr': '💰 Toplam Gelir',
+        'ar': '💰 إجمالي الدخل'
+    },
+    'report_total_expense': {
+        'uz': '💸 Jami xarajat',
+        'ru': '💸 Всего расход',
+        'en': '💸 Total Expense',
+        'tr': '💸 Toplam Gider',
+        'ar': '💸 إجمالي المصروف'
+    },
+    'report_balance': {
+        'uz': '💵 Balans',
+        'ru': '💵 Баланс',
+        'en': '💵 Balance',
+        'tr': '💵 Bakiye',
+        'ar': '💵 الرصيد'
+    },
+    'report_by_category': {
+        'uz': '📂 Kategoriyalar bo\'yicha:',
+        'ru': '📂 По категориям:',
+        'en': '📂 By categories:',
+        'tr': '📂 Kategorilere göre:',
+        'ar': '📂 حسب الفئات:'
+    },
+    'report_recent_transactions': {
+        'uz': '\n📋 Oxirgi tranzaksiyalar:',
+        'ru': '\n📋 Последние транзакции:',
+        'en': '\n📋 Recent transactions:',
+        'tr': '\n📋 Son işlemler:',
+        'ar': '\n📋 آخر المعاملات:'
+    },
+    'report_html_generating': {
+        'uz': '⏳ HTML hisobot tayyorlanmoqda...',
+        'ru': '⏳ Подготовка HTML отчёта...',
+        'en': '⏳ Generating HTML report...',
+        'tr': '⏳ HTML rapor hazırlanıyor...',
+        'ar': '⏳ جاري إنشاء تقرير HTML...'
+    },
+    'report_html_ready': {
+        'uz': '✅ HTML hisobot tayyor! Brauzerda oching 🌐',
+        'ru': '✅ HTML отчёт готов! Откройте в браузере 🌐',
+        'en': '✅ HTML report ready! Open in browser 🌐',
+        'tr': '✅ HTML rapor hazır! Tarayıcıda açın 🌐',
+        'ar': '✅ تقرير HTML جاهز! افتح في المتصفح 🌐'
+    },
+    
+    # Ko'p bandli tezkor kiritish (chek)
+    'quick_batch_confirm': {
+        'uz': "🧾 <b>{count} ta yozuv topildi:</b>\n\n{items}\n\n💸 Xarajat: {expense}\n💰 Daromad: {income}\n\nHammasini saqlaymizmi?",
+        'ru': "🧾 <b>Найдено записей: {count}</b>\n\n{items}\n\n💸 Расход: {expense}\n💰 Доход: {income}\n\nСохранить все?",
+        'en': "🧾 <b>{count} entries found:</b>\n\n{items}\n\n💸 Expense: {expense}\n💰 Income: {income}\n\nSave all?",
+        'tr': "🧾 <b>{count} kayıt bulundu:</b>\n\n{items}\n\n💸 Gider: {expense}\n💰 Gelir: {income}\n\nHepsini kaydedelim mi?",
+        'ar': "🧾 <b>تم العثور على {count} سجلات:</b>\n\n{items}\n\n💸 المصروف: {expense}\n💰 الدخل: {income}\n\nحفظ الكل؟"
+    },
+    'quick_batch_skipped': {
+        'uz': "⚠️ Summasi topilmadi: {lines}",
+        'ru': "⚠️ Сумма не найдена: {lines}",
+        'en': "⚠️ No amount found: {lines}",
+        'tr': "⚠️ Tutar bulunamadı: {lines}",
+        'ar': "⚠️ لم يتم العثور على المبلغ: {lines}"
+    },
+    'quick_batch_too_many': {
+        'uz': "⚠️ Bir martada ko'pi bilan {limit} ta yozuv qo'shish mumkin.",
+        'ru': "⚠️ За один раз можно добавить не более {limit} записей.",
+        'en': "⚠️ You can add at most {limit} entries at once.",
+        'tr': "⚠️ Tek seferde en fazla {limit} kayıt eklenebilir.",
+        'ar': "⚠️ يمكن إضافة {limit} سجلات كحد أقصى في المرة الواحدة."
+    },
+    'quick_batch_saved': {
+        'uz': "✅ <b>{count} ta yozuv saqlandi!</b>\n\n💸 Xarajat: {expense}\n💰 Daromad: {income}",
+        'ru': "✅ <b>Сохранено записей: {count}</b>\n\n💸 Расход: {expense}\n💰 Доход: {income}",
+        'en': "✅ <b>{count} entries saved!</b>\n\n💸 Expense: {expense}\n💰 Income: {income}",
+        'tr': "✅ <b>{count} kayıt kaydedildi!</b>\n\n💸 Gider: {expense}\n💰 Gelir: {income}",
+        'ar': "✅ <b>تم حفظ {count} سجلات!</b>\n\n💸 المصروف: {expense}\n💰 الدخل: {income}"
+    },
+    'quick_batch_expired': {
+        'uz': "⌛ Bu ro'yxat eskirgan. Iltimos, qaytadan yuboring.",
+        'ru': "⌛ Этот список устарел. Пожалуйста, отправьте заново.",
+        'en': "⌛ This list has expired. Please send it again.",
+        'tr': "⌛ Bu liste süresi doldu. Lütfen tekrar gönderin.",
+        'ar': "⌛ انتهت صلاحية هذه القائمة. يرجى الإرسال مرة أخرى."
+    },
+    
+    # Eksport (CSV / Excel)
+    'export_menu': {
+        'uz': "📤 <b>Ma'lumotlarni yuklab olish</b>\n\nBarcha xarajat va daromadlaringiz bitta faylga yoziladi. Formatni tanlang:",
+        'ru': "📤 <b>Скачать данные</b>\n\nВсе ваши расходы и доходы будут записаны в один файл. Выберите формат:",
+        'en': "📤 <b>Download data</b>\n\nAll your expenses and incomes will be written to one file. Choose a format:",
+        'tr': "📤 <b>Verileri indir</b>\n\nTüm gider ve gelirleriniz tek bir dosyaya yazılacak. Format seçin:",
+        'ar': "📤 <b>تحميل البيانات</b>\n\nسيتم كتابة جميع مصروفاتك ودخلك في ملف واحد. اختر التنسيق:"
+    },
+    'export_preparing': {
+        'uz': "⏳ Fayl tayyorlanmoqda...",
+        'ru': "⏳ Файл готовится...",
+        'en': "⏳ Preparing the file...",
+        'tr': "⏳ Dosya hazırlanıyor...",
+        'ar': "⏳ جارٍ تجهيز الملف..."
+    },
+    'export_ready': {
+        'uz': "📤 {count} ta yozuv",
+        'ru': "📤 Записей: {count}",
+        'en': "📤 {count} entries",
+        'tr': "📤 {count} kayıt",
+        'ar': "📤 {count} سجلات"
+    },
+    'export_empty': {
+        'uz': "📭 Hali yuklab olinadigan ma'lumot yo'q.",
+        'ru': "📭 Пока нет данных для скачивания.",
+        'en': "📭 There is no data to download yet.",
+        'tr': "📭 Henüz indirilecek veri yok.",
+        'ar': "📭 لا توجد بيانات للتحميل بعد."
+    },
+    'export_excel_unavailable': {
+        'uz': "❌ Excel eksporti hozircha mavjud emas. CSV formatidan foydalaning.",
+        'ru': "❌ Экспорт в Excel сейчас недоступен. Используйте формат CSV.",
+        'en': "❌ Excel export is not available right now. Please use CSV.",
+        'tr': "❌ Excel dışa aktarımı şu anda kullanılamıyor. Lütfen CSV kullanın.",
+        'ar': "❌ تصدير Excel غير متاح حاليًا. يرجى استخدام CSV."
+    },
+    
+    # Import (CSV)
+    'import_started': {
+        'uz': "📥 <b>Import boshlandi...</b>\n\nFayl qatorma-qator o'qilmoqda.",
+        'ru': "📥 <b>Импорт начат...</b>\n\nФайл читается построчно.",
+        'en': "📥 <b>Import started...</b>\n\nReading the file row by row.",
+        'tr': "📥 <b>İçe aktarma başladı...</b>\n\nDosya satır satır okunuyor.",
+        'ar': "📥 <b>بدأ الاستيراد...</b>\n\nتتم قراءة الملف سطرًا بسطر."
+    },
+    'import_progress': {
+        'uz': "📥 <b>Import: {percent}%</b>\n\n✅ Saqlandi: {saved}\n⚠️ O'tkazib yuborildi: {skipped}",
+        'ru': "📥 <b>Импорт: {percent}%</b>\n\n✅ Сохранено: {saved}\n⚠️ Пропущено: {skipped}",
+        'en': "📥 <b>Import: {percent}%</b>\n\n✅ Saved: {saved}\n⚠️ Skipped: {skipped}",
+        'tr': "📥 <b>İçe aktarma: {percent}%</b>\n\n✅ Kaydedildi: {saved}\n⚠️ Atlandı: {skipped}",
+        'ar': "📥 <b>الاستيراد: {percent}%</b>\n\n✅ تم الحفظ: {saved}\n⚠️ تم التخطي: {skipped}"
+    },
+    'import_done': {
+        'uz': "✅ <b>Import tugadi!</b>\n\n💸 Xarajatlar: {expenses}\n💰 Daromadlar: {incomes}\n⚠️ O'tkazib yuborildi: {skipped}",
+        'ru': "✅ <b>Импорт завершён!</b>\n\n💸 Расходы: {expenses}\n💰 Доходы: {incomes}\n⚠️ Пропущено: {skipped}",
+        'en': "✅ <b>Import finished!</b>\n\n💸 Expenses: {expenses}\n💰 Incomes: {incomes}\n⚠️ Skipped: {skipped}",
+        'tr': "✅ <b>İçe aktarma tamamlandı!</b>\n\n💸 Giderler: {expenses}\n💰 Gelirler: {incomes}\n⚠️ Atlandı: {skipped}",
+        'ar': "✅ <b>اكتمل الاستيراد!</b>\n\n💸 المصروفات: {expenses}\n💰 الدخل: {incomes}\n⚠️ تم التخطي: {skipped}"
+    },
+    'import_truncated': {
+        'uz': "✂️ Fayl {limit} qatordan uzun: oxirgi {truncated} ta qator import qilinmadi.",
+        'ru': "✂️ Файл длиннее {limit} строк: последние {truncated} строк не импортированы.",
+        'en': "✂️ The file has more than {limit} rows: the last {truncated} rows were not imported.",
+        'tr': "✂️ Dosya {limit} satırdan uzun: son {truncated} satır içe aktarılmadı.",
+        'ar': "✂️ الملف أطول من {limit} سطر: لم يتم استيراد آخر {truncated} سطر."
+    },
+    'import_failed': {
+        'uz': "❌ Import to'xtadi. {saved} ta yozuv saqlangan, qolganlari saqlanmadi.",
+        'ru': "❌ Импорт остановлен. Сохранено записей: {saved}, остальные не сохранены.",
+        'en': "❌ Import stopped. {saved} entries were saved, the rest were not.",
+        'tr': "❌ İçe aktarma durdu. {saved} kayıt kaydedildi, geri kalanı kaydedilmedi.",
+        'ar': "❌ توقف الاستيراد. تم حفظ {saved} سجلات، ولم يتم حفظ الباقي."
+    },
+    'import_bad_header': {
+        'uz': "❌ Faylda <b>sana</b> va <b>summa</b> ustunlari topilmadi.\n\nBirinchi qator sarlavha bo'lishi kerak, masalan:\n<code>date,amount,description</code>",
+        'ru': "❌ В файле не найдены столбцы <b>дата</b> и <b>сумма</b>.\n\nПервая строка должна быть заголовком, например:\n<code>date,amount,description</code>",
+        'en': "❌ Could not find <b>date</b> and <b>amount</b> columns.\n\nThe first row must be a header, for example:\n<code>date,amount,description</code>",
+        'tr': "❌ Dosyada <b>tarih</b> ve <b>tutar</b> sütunları bulunamadı.\n\nİlk satır başlık olmalıdır, örneğin:\n<code>date,amount,description</code>",
+        'ar': "❌ لم يتم العثور على عمودي <b>التاريخ</b> و<b>المبلغ</b>.\n\nيجب أن يكون السطر الأول عنوانًا، مثلًا:\n<code>date,amount,description</code>"
+    },
+    'import_too_large': {
+        'uz': "❌ Fayl juda katta (maksimal {limit} MB).",
+        'ru': "❌ Файл слишком большой (максимум {limit} МБ).",
+        'en': "❌ The file is too large (maximum {limit} MB).",
+        'tr': "❌ Dosya çok büyük (en fazla {limit} MB).",
+        'ar': "❌ الملف كبير جدًا (الحد الأقصى {limit} ميغابايت)."
+    },
+    'import_busy': {
+        'uz': "⏳ Oldingi import hali tugamadi. Iltimos, kuting.",
+        'ru': "⏳ Предыдущий импорт ещё не завершён. Пожалуйста, подождите.",
+        'en': "⏳ The previous import is still running. Please wait.",
+        'tr': "⏳ Önceki içe aktarma henüz bitmedi. Lütfen bekleyin.",
+        'ar': "⏳ الاستيراد السابق لم ينتهِ بعد. يرجى الانتظار."
+    },
 }
 
 
@@ -706,6 +1467,81 @@ MONTH_NAMES = {
 }
 
 
+# =====================================================
+# COMPILED CATALOG
+# =====================================================
+# Matn va undagi format maydonlari (None - matnda '{' / '}' yo'q)
+CatalogEntry = Tuple[str, Optional[FrozenSet[str]]]
+
+DEFAULT_LANGUAGE = 'uz'
+
+
+def _template_fields(text: str) -> Optional[FrozenSet[str]]:
+    """
+    str.format shablonidagi maydon nomlari
+    
+    Returns:
+        Optional[FrozenSet[str]]: Maydonlar (None - format kerak emas)
+    """
+    if '{' not in text and '}' not in text:
+        return None
+    try:
+        return frozenset(
+            field.split('.', 1)[0].split('[', 1)[0]
+            for _, field, _, _ in Formatter().parse(text)
+            if field is not None
+        )
+    except ValueError:
+        # Noto'g'ri shablon - xato format() chaqirilganda chiqadi (avvalgidek)
+        return frozenset()
+
+
+def _compile_catalog(
+    translations: Dict[str, Dict[str, str]]
+) -> Dict[str, Dict[str, CatalogEntry]]:
+    """
+    TRANSLATIONS ni til bo'yicha tekis jadvalga aylantirish
+    
+    Har bir til uchun barcha kalitlar mavjud: tarjima bo'lmasa 'uz'
+    matni, u ham bo'lmasa kalitning o'zi (fallback oldindan hisoblangan).
+    
+    Args:
+        translations: {key: {language: text}}
+        
+    Returns:
+        Dict: {language: {key: (text, fields)}}
+    """
+    languages = {DEFAULT_LANGUAGE}
+    for texts in translations.values():
+        languages.update(texts)
+    
+    catalog = {}
+    for language in languages:
+        table = {}
+        for key, texts in translations.items():
+            text = texts.get(language, texts.get(DEFAULT_LANGUAGE, key))
+            table[key] = (text, _template_fields(text))
+        catalog[language] = table
+    return catalog
+
+
+_CATALOG = _compile_catalog(TRANSLATIONS)
+_DEFAULT_TABLE = _CATALOG[DEFAULT_LANGUAGE]
+
+
+def register_translations(translations: Dict[str, Dict[str, str]]) -> None:
+    """
+    Yangi tarjimalarni qo'shish va katalogni qayta yig'ish
+    
+    Args:
+        translations: {key: {language: text}}
+    """
+    global _CATALOG, _DEFAULT_TABLE
+    TRANSLATIONS.update(translations)
+    _CATALOG = _compile_catalog(TRANSLATIONS)
+    _DEFAULT_TABLE = _CATALOG[DEFAULT_LANGUAGE]
+
+
 # =====================================================
 # HELPER FUNCTIONS
 # =====================================================
@@ -721,15 +1557,17 @@ def get_text(key: str, language: str = 'uz', **kwargs) -> str:
     Returns:
         str: Tarjima qilingan matn
     """
-    translations = TRANSLATIONS.get(key, {})
-    text = translations.get(language, translations.get('uz', key))
-    
-    # Format parametrlarini qo'llash
-    if kwargs:
-        try:
-            text = text.format(**kwargs)
-        except KeyError:
-            pass  # Agar format parametrlari to'g'ri kelmasa, ignore qilish
+    entry = _CATALOG.get(language, _DEFAULT_TABLE).get(key)
+    if entry is None:
+        return key
+    
+    text, fields = entry
+    
+    # Format parametrlarini qo'llash (maydonlari yo'q matnlar o'tkazib yuboriladi)
+    if kwargs and fields is not None:
+        if fields <= kwargs.keys():
+            text = text.format_map(kwargs)
+        # Agar format parametrlari to'g'ri kelmasa, formatlanmagan matn qaytadi
     
     return text
 
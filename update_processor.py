@@ -0,0 +1,95 @@
+"""
+SmartWallet AI Bot - Update Processor
+=====================================
+Kiruvchi update'larni parallel qayta ishlash - chat ichida tartib saqlanadi
+
+PTB standart holatda update'larni birma-bir kutadi: bitta sekin DB
+so'rovi barcha chatlarni to'xtatib qo'yadi. ChatUpdateProcessor turli
+chatlarning update'larini parallel (ko'pi bilan max_concurrent_updates
+ta) bajaradi, bitta chatnikini esa kelgan tartibda ketma-ket - shuning
+uchun ConversationHandler holatlari va user_data buzilmaydi.
+
+Classes:
+    - ChatUpdateProcessor: Chat bo'yicha ketma-ket, chatlar orasida parallel
+
+Usage:
+    Application.builder().concurrent_updates(ChatUpdateProcessor(BotConfig.CONCURRENT_UPDATES))
+
+Author: SmartWallet AI Team
+Version: 1.0.0
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class ChatUpdateProcessor(BaseUpdateProcessor):
+    """
+    Chat (yoki foydalanuvchi) bo'yicha ketma-ket update protsessori
+    
+    Avval chat qulfi, keyin umumiy semafor olinadi: bitta chatdan kelgan
+    ko'p update navbatda turganda boshqa chatlarning o'rnini egallamaydi.
+    """
+    
+    def __init__(self, max_concurrent_updates: int):
+        """
+        Args:
+            max_concurrent_updates: Bir vaqtda bajariladigan update'lar soni
+        """
+        super().__init__(max_concurrent_updates)
+        # kalit -> (qulf, kutayotganlar soni)
+        self._chat_locks: Dict[int, Tuple[asyncio.Lock, int]] = {}
+    
+    @staticmethod
+    def _chat_key(update: object) -> Optional[int]:
+        """Update qaysi chatga tegishli (chat bo'lmasa - foydalanuvchi)"""
+        if not isinstance(update, Update):
+            return None
+        if update.effective_chat is not None:
+            return update.effective_chat.id
+        if update.effective_user is not None:
+            return update.effective_user.id
+        return None
+    
+    async def process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """
+        Chat qulfi ostida, keyin semafor bilan bajarish
+        
+        Args:
+            update: Telegram update
+            coroutine: Application.process_update(update)
+        """
+        key = self._chat_key(update)
+        if key is None:
+            await super().process_update(update, coroutine)
+            return
+        
+        lock, waiting = self._chat_locks.get(key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._chat_locks[key] = (lock, waiting + 1)
+        try:
+            async with lock:
+                await super().process_update(update, coroutine)
+        finally:
+            lock, waiting = self._chat_locks[key]
+            if waiting <= 1:
+                del self._chat_locks[key]
+            else:
+                self._chat_locks[key] = (lock, waiting - 1)
+    
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Update'ni bajarish"""
+        await coroutine
+    
+    async def initialize(self) -> None:
+        """Ishga tushirish (tayyorlanadigan resurs yo'q)"""
+    
+    async def shutdown(self) -> None:
+        """To'xtatish (yopiladigan resurs yo'q)"""
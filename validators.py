@@ -102,6 +102,8 @@ def validate_date(
         if isinstance(date_value, str):
             # DD.MM.YYYY formatni parse qilish
             match = re.match(r'(\d{1,2})[./](\d{1,2})[./](\d{2,4})', date_value.strip())
+            # YYYY-MM-DD (ISO, bank ko'chirmalari) formatni parse qilish
+            iso_match = None if match else re.match(r'(\d{4})-(\d{1,2})-(\d{1,2})', date_value.strip())
             if match:
                 day = int(match.group(1))
                 month = int(match.group(2))
@@ -112,6 +114,8 @@ def validate_date(
                     year += 2000
                 
                 date_obj = date(year, month, day)
+            elif iso_match:
+                date_obj = date(int(iso_match.group(1)), int(iso_match.group(2)), int(iso_match.group(3)))
             else:
                 return False, None, "Noto'g'ri sana formati. DD.MM.YYYY formatida kiriting"
         